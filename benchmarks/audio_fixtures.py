@@ -0,0 +1,87 @@
+"""
+Synthetic audio for the audio pipeline tests and benchmarks (16 kHz int16).
+
+speech_like() is a voiced signal (harmonics of a gliding pitch shaped by
+vowel formants, syllable-rate amplitude envelope) that passes for speech
+with energy and spectral features; noise() and tone() are the usual
+non-speech backgrounds, with hum(), chord() and clicks() for mains hum,
+music and keyboards. compose() lays segments end to end.
+"""
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# (F1, F2) formants of a few vowels
+VOWELS = [(730, 1090), (270, 2290), (530, 1840), (570, 840), (300, 870)]
+
+def speech_like(seconds, rng=None, level=6000, pitch=140.0, syllable_rate=4.0, sample_rate=SAMPLE_RATE, vowels=None):
+    """`vowels` (indices into VOWELS, one per syllable) makes a fixed "word"; random otherwise"""
+    rng = rng or np.random.default_rng(0)
+    n = int(seconds * sample_rate)
+    t = np.arange(n) / sample_rate
+    f0 = pitch * (1 + 0.1 * np.sin(2 * np.pi * 0.7 * t + rng.uniform(0, 6)))
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    # One vowel per syllable
+    syllables = max(1, int(np.ceil(seconds * syllable_rate)))
+    vowel_ids = np.resize(vowels, syllables) if vowels is not None else rng.integers(0, len(VOWELS), syllables)
+    syllable = np.minimum((t * syllable_rate).astype(int), syllables - 1)
+    signal = np.zeros(n)
+    for k in range(1, 30):
+        freq = k * f0
+        gain = np.zeros(n)
+        for formant in range(2):
+            centre = np.array([VOWELS[v][formant] for v in vowel_ids])[syllable]
+            gain += np.exp(-((freq - centre) / 120.0) ** 2)
+        signal += (gain + 0.05) / k * np.sin(k * phase)
+    envelope = np.clip(np.sin(np.pi * (t * syllable_rate % 1.0)), 0, None) ** 0.6
+    signal *= envelope
+    signal += 0.02 * rng.standard_normal(n)  # Breath noise
+    signal /= np.max(np.abs(signal)) + 1e-9
+    return (signal * level).astype(np.int16)
+
+def word(vowels, rng=None, syllable_rate=4.0, **options):
+    """A fixed syllable sequence at the given tempo (keyword fixtures)"""
+    return speech_like(len(vowels) / syllable_rate, rng, syllable_rate=syllable_rate, vowels=vowels, **options)
+
+def noise(seconds, rng=None, level=300, color="white", sample_rate=SAMPLE_RATE):
+    rng = rng or np.random.default_rng(1)
+    n = int(seconds * sample_rate)
+    white = rng.standard_normal(n)
+    if color == "pink":
+        spectrum = np.fft.rfft(white)
+        spectrum /= np.sqrt(np.arange(1, len(spectrum) + 1))
+        white = np.fft.irfft(spectrum, n)
+    white /= np.std(white) + 1e-9
+    return np.clip(white * level, -32768, 32767).astype(np.int16)
+
+def tone(seconds, freq=1000.0, level=3000, sample_rate=SAMPLE_RATE):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (np.sin(2 * np.pi * freq * t) * level).astype(np.int16)
+
+def hum(seconds, base=50.0, level=2000, sample_rate=SAMPLE_RATE):
+    """Mains hum: the base frequency and its first harmonics"""
+    return sum(tone(seconds, base * k, level / k, sample_rate) for k in (1, 2, 3)).astype(np.int16)
+
+def chord(seconds, freqs=(262.0, 330.0, 392.0), level=3000, sample_rate=SAMPLE_RATE):
+    """Sustained notes (music without a voice)"""
+    return sum(tone(seconds, f, level / len(freqs), sample_rate) for f in freqs).astype(np.int16)
+
+def clicks(seconds, rate=8.0, rng=None, level=8000, sample_rate=SAMPLE_RATE):
+    """Short decaying noise bursts at random times (typing, tapping)"""
+    rng = rng or np.random.default_rng(2)
+    n = int(seconds * sample_rate)
+    audio = np.zeros(n)
+    burst = rng.standard_normal(int(0.01 * sample_rate)) * np.exp(-np.linspace(0, 6, int(0.01 * sample_rate)))
+    for start in rng.integers(0, max(1, n - len(burst)), int(seconds * rate)):
+        audio[start:start + len(burst)] += burst * level
+    return np.clip(audio, -32768, 32767).astype(np.int16)
+
+def silence(seconds, sample_rate=SAMPLE_RATE):
+    return np.zeros(int(seconds * sample_rate), dtype=np.int16)
+
+def compose(*segments, background=None):
+    """Concatenate segments; `background` (int16 level) adds white noise under everything"""
+    audio = np.concatenate(segments)
+    if background:
+        audio = np.clip(audio.astype(np.int32) + noise(len(audio) / SAMPLE_RATE, level=background), -32768, 32767)
+    return audio.astype(np.int16)
@@ -0,0 +1,89 @@
+"""
+Benchmark: staged audio pipeline vs the serial listen -> classify -> speak loop.
+
+A WAV file with several commands (synthetic speech over background noise,
+short pauses between them) replaces the microphone and is played in real
+time. Recognition, intent and TTS are fakes with fixed latencies (cloud
+recognizer, LLM intent, speech synthesis), so the numbers only measure
+the architecture: per-stage and end-to-end latency from the end of each
+utterance, and how many utterances are lost. The serial loop is
+simulated on the same timeline: while it processes one command, the
+microphone is closed and anything said is missed.
+
+Usage: python benchmarks/bench_audio_pipeline.py [--utterances 6] [--gap 1.0] [--wav file.wav]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio.audio_source import WavFileSource, write_wav
+from src.audio.audio_pipeline import AudioPipeline
+from audio_fixtures import speech_like, silence, compose
+
+def fake_stage(name, seconds, key=None):
+    def fn(item):
+        time.sleep(seconds)
+        if key:
+            item[key] = f"{name} {item['t']['speech_end']:.2f}"
+        return item
+    return fn
+
+def serial_simulation(segments, end_silence, busy):
+    """Utterances handled by a loop that is deaf for `busy` seconds after each one"""
+    handled, ready = 0, 0.0
+    for start, end in segments:
+        if start >= ready:
+            handled += 1
+            ready = end + end_silence + busy
+    return handled
+
+def main():
+    parser = argparse.ArgumentParser(description="Audio pipeline benchmark")
+    parser.add_argument("--utterances", type=int, default=6)
+    parser.add_argument("--gap", type=float, default=1.0, help="seconds of pause between commands")
+    parser.add_argument("--recognize", type=float, default=0.7)
+    parser.add_argument("--intent", type=float, default=0.4)
+    parser.add_argument("--tts", type=float, default=0.5)
+    parser.add_argument("--wav", help="use this WAV file instead of the generated one")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(17)
+    segments, parts, cursor = [], [silence(0.5)], 0.5
+    for _ in range(args.utterances):
+        length = rng.uniform(0.8, 1.6)
+        parts += [speech_like(length, rng), silence(args.gap)]
+        segments.append((cursor, cursor + length))
+        cursor += length + args.gap
+    path = args.wav
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), "commands.wav")
+        write_wav(path, compose(*parts, background=120))
+    print(f"Input: {path} ({args.utterances} commands, {args.gap:.1f}s pauses), played in real time")
+
+    pipeline = AudioPipeline(
+        WavFileSource(path, realtime=True), fake_stage("recognize", args.recognize, "text"),
+        workers=[("intent", fake_stage("intent", args.intent, "intent")), ("tts", fake_stage("tts", args.tts))]
+    ).start()
+    handled = 0
+    while pipeline.next_item(timeout=30) is not None:
+        handled += 1
+    stats = pipeline.stats()
+
+    print(f"\n{'stage':12s} {'count':>5s} {'p50 ms':>9s} {'p95 ms':>9s}")
+    for name in pipeline.stage_names + ["end_to_end"]:
+        if name in stats:
+            s = stats[name]
+            print(f"{name:12s} {s['count']:5d} {s['p50_ms']:9.1f} {s['p95_ms']:9.1f}")
+
+    busy = args.recognize + args.intent + args.tts
+    serial = serial_simulation(segments, 0.5, busy)
+    print(f"\nPipelined: {handled}/{args.utterances} commands handled")
+    print(f"Serial loop (deaf {busy:.1f}s after each command): {serial}/{args.utterances} commands handled")
+
+if __name__ == "__main__":
+    main()
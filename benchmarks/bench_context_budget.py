@@ -0,0 +1,77 @@
+"""
+Benchmark: prompt size as a conversation grows.
+
+Simulates long sessions in a temporary memory.db and compares the tokens
+sent per turn by the previous approach (system prompt plus every turn kept
+in the chat session) with the token-budgeted ContextManager. Latency is
+modelled as a fixed round trip plus a per-input-token cost.
+
+Usage: python benchmarks/bench_context_budget.py [--turns 10 50 100 200 500] [--budget 3000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.brain.memory import MemoryManager
+from src.brain.context_manager import ContextManager, estimate_tokens
+
+SYSTEM_PROMPT = "You are ELEVEN, an advanced AI assistant for Windows PC control. " * 20
+QUESTIONS = [
+    "¿Qué tiempo hace hoy en Bogotá?", "Cuéntame un chiste de programadores",
+    "¿Cómo preparo una pasta carbonara?", "Explícame qué es una red neuronal",
+    "Recomiéndame una película de ciencia ficción", "¿Cuánto es 15% de 240?",
+]
+# Modelled latency: network round trip + prefill cost per input token
+BASE_LATENCY_MS = 400
+MS_PER_TOKEN = 0.25
+
+def answer(rng):
+    return " ".join(["Claro, aquí tienes la respuesta con algunos detalles adicionales."] * rng.randint(1, 6))
+
+def latency(tokens):
+    return BASE_LATENCY_MS + tokens * MS_PER_TOKEN
+
+def main():
+    parser = argparse.ArgumentParser(description="Context budget benchmark")
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 50, 100, 200, 500])
+    parser.add_argument("--budget", type=int, default=3000)
+    args = parser.parse_args()
+
+    rng = random.Random(8)
+    memory = MemoryManager(db_path=os.path.join(tempfile.mkdtemp(), "memory.db"))
+    context = ContextManager(memory, budget=args.budget)
+    system_tokens = estimate_tokens(SYSTEM_PROMPT)
+
+    unbounded_tokens = system_tokens
+    checkpoints = set(args.turns)
+    print(f"{'turns':>6} {'unbounded tok':>14} {'budgeted tok':>13} {'in history':>11} "
+          f"{'est. latency':>18} {'build':>9}")
+    for turn in range(1, max(checkpoints) + 1):
+        question = rng.choice(QUESTIONS)
+
+        if turn in checkpoints:
+            # The writer thread indexes new turns while the user is talking
+            memory.flush()
+            memory._sync_vectors()
+            start = time.perf_counter()
+            assembled = context.build(SYSTEM_PROMPT, question)
+            build_ms = (time.perf_counter() - start) * 1000
+            stats = assembled["stats"]
+            old = unbounded_tokens + estimate_tokens(question)
+            print(f"{turn:6d} {old:14d} {stats['total']:13d} {stats['turns_included']:11d} "
+                  f"{latency(old):7.0f} -> {latency(stats['total']):5.0f} ms {build_ms:6.2f} ms")
+
+        reply = answer(rng)
+        memory.add_message("user", question)
+        memory.add_message("model", reply)
+        unbounded_tokens += estimate_tokens(question) + estimate_tokens(reply)
+
+    memory.close()
+
+if __name__ == "__main__":
+    main()
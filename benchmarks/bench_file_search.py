@@ -0,0 +1,150 @@
+"""
+Benchmark: indexed file search vs the previous os.walk in search_file.
+
+1. Generates a real tree of files and times the previous search_file
+   (os.walk until the first substring match, the whole tree for a miss)
+   against crawling it once into the file index and searching that.
+2. Fills a temporary file_map with synthetic rows (no real files needed)
+   and reports the index size per million files and query latency of
+   LIKE '%x%' vs FolderMapper.search_files(), with and without an
+   extension filter.
+
+Usage: python benchmarks/bench_file_search.py [--rows 1000000] [--tree-files 100000] [--queries 200]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import logging
+import sqlite3
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.system.folder_mapper import FolderMapper
+from src.utils.logger import logger
+from bench_folder_index import generate_tree, backdate
+from bench_folder_search import vocabulary, percentile
+
+EXTENSIONS = ["pdf", "docx", "xlsx", "txt", "jpg", "png", "mp3", "mp4", "zip", "py", "csv", "pptx"]
+
+def file_name(rng, words):
+    name = "_".join(rng.choice(words) for _ in range(rng.randint(1, 3)))
+    if rng.random() < 0.3:
+        name += f" {rng.randint(1, 2024)}"
+    return f"{name}.{rng.choice(EXTENSIONS)}"
+
+def legacy_search(roots, name, max_depth=4):
+    """The previous search_file: os.walk every root until a substring match"""
+    name = name.lower()
+    for base_path in roots:
+        for root, _, files in os.walk(base_path):
+            if root[len(base_path):].count(os.sep) > max_depth:
+                continue
+            for file in files:
+                if name in file.lower():
+                    return os.path.join(root, file)
+    return None
+
+def timed(fn, queries):
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        times.append((time.perf_counter() - start) * 1000)
+    return sum(times) / len(times), percentile(times, 0.5), percentile(times, 0.95)
+
+def tree_comparison(rng, words, n_files, n_queries):
+    workdir = tempfile.mkdtemp()
+    root = os.path.join(workdir, "home")
+    os.mkdir(root)
+    dirs = generate_tree(root, max(1, n_files // 20), max_depth=4)
+    names = []
+    for i in range(n_files):
+        name = f"{i}_{file_name(rng, words)}"
+        with open(os.path.join(rng.choice(dirs), name), "w"):
+            pass
+        names.append(name)
+    backdate(dirs + [root])
+
+    mapper = FolderMapper(db_path=os.path.join(workdir, "memory.db"), roots=[root])
+    start = time.perf_counter()
+    stats = mapper.update_index(full=True)
+    print(f"Tree: {len(dirs)} dirs, {stats['files']} files, indexed in {time.perf_counter() - start:.1f} s")
+
+    # Half existing files, half misses (a miss walks the whole tree)
+    queries = [rng.choice(names).split("_", 1)[1].rsplit(".", 1)[0] for _ in range(n_queries // 2)]
+    queries += [f"no existe {i}" for i in range(n_queries // 2)]
+    queries = queries[:max(2, n_queries // 10)]  # the legacy walk is slow, keep it short
+    for label, fn in (("os.walk (legacy)", lambda q: legacy_search([root], q)),
+                      ("File index", lambda q: mapper.search_files(q, limit=1))):
+        avg, p50, p95 = timed(fn, queries)
+        print(f"  {label:30s} avg {avg:9.3f} ms   p50 {p50:9.3f} ms   p95 {p95:9.3f} ms")
+    shutil.rmtree(workdir)
+
+def index_size(rng, words, n_rows, n_queries):
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, "memory.db")
+    mapper = FolderMapper(db_path=db_path, roots=[])
+    empty = os.path.getsize(db_path)
+
+    rows = []
+    for i in range(n_rows):
+        name = file_name(rng, words)
+        parent = f"C:\\Users\\usuario\\{rng.choice(words)}\\{i // 50}"
+        rows.append((name.lower(), name.rsplit(".", 1)[1], f"{parent}\\{i}_{name}", parent,
+                     rng.randint(1, 6), rng.randint(0, 10**8), time.time_ns() - rng.randint(0, 10**17)))
+    conn = sqlite3.connect(db_path)
+    start = time.perf_counter()
+    with conn:
+        conn.executemany(
+            'INSERT INTO file_map (file_name, extension, full_path, parent_path, depth, size, mtime) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            rows
+        )
+    size = os.path.getsize(db_path) - empty
+    print(f"Synthetic index: {n_rows} files inserted in {time.perf_counter() - start:.1f} s, "
+          f"{size / 2**20:.0f} MB ({size / 2**20 * 10**6 / n_rows:.0f} MB per million files, with trigram index)")
+
+    def legacy(query):
+        return conn.execute(
+            'SELECT full_path FROM file_map WHERE file_name LIKE ? LIMIT 10', (f'%{query.lower()}%',)
+        ).fetchall()
+
+    queries = []
+    for _ in range(n_queries):
+        name = rng.choice(rows)[0].rsplit(".", 1)[0]
+        kind = rng.random()
+        if kind < 0.4:
+            queries.append(name)
+        elif kind < 0.8:
+            queries.append(rng.choice(name.split("_")))
+        else:
+            queries.append(file_name(rng, words)[:-4] + "xq")
+    mapper.search_files(queries[0])  # open the read connection
+    logger.setLevel(logging.WARNING)
+    for label, fn in (("LIKE '%x%'", legacy),
+                      ("search_files", mapper.search_files),
+                      ("search_files (pdf only)", lambda q: mapper.search_files(q, extensions=["pdf"]))):
+        avg, p50, p95 = timed(fn, queries)
+        print(f"  {label:30s} avg {avg:9.3f} ms   p50 {p50:9.3f} ms   p95 {p95:9.3f} ms")
+    conn.close()
+    shutil.rmtree(workdir)
+
+def main():
+    parser = argparse.ArgumentParser(description="File search benchmark")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--tree-files", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(14)
+    words = vocabulary(rng)
+    logger.setLevel(logging.WARNING)
+    if args.tree_files:
+        tree_comparison(rng, words, args.tree_files, args.queries)
+    index_size(rng, words, args.rows, args.queries)
+
+if __name__ == "__main__":
+    main()
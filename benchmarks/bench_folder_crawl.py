@@ -0,0 +1,98 @@
+"""
+Benchmark: folder crawl throughput (directories per second).
+
+Generates a synthetic tree split across several roots (like home, C:, D:
+and E:) and compares the previous sequential os.walk mapping, with one
+INSERT per folder, against the parallel scandir crawler and its single
+executemany writer, for several worker counts.
+--drop-caches (Linux, root only) crawls with a cold page cache, which is
+closer to the I/O-bound case the worker pool is meant for.
+
+Usage: python benchmarks/bench_folder_crawl.py [--dirs 200000] [--roots 4] [--workers 1 4 8 16] [--drop-caches]
+"""
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.system.folder_mapper import FolderMapper
+from bench_folder_index import generate_tree, backdate
+
+def legacy_map(db_path, roots, max_depth=5):
+    """The previous map_all_folders: roots one after another, one execute per folder"""
+    excluded_folders = FolderMapper.EXCLUDED_FOLDERS
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute('DELETE FROM folder_map')
+    total = 0
+    for base_path in roots:
+        for root, dirs, _ in os.walk(base_path):
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d.lower() not in excluded_folders]
+            if any(ex in root.lower().split(os.sep) for ex in excluded_folders):
+                dirs.clear()
+                continue
+            depth = root[len(str(base_path)):].count(os.sep)
+            if depth > max_depth:
+                dirs.clear()
+                continue
+            for dir_name in dirs:
+                cursor.execute(
+                    'INSERT OR IGNORE INTO folder_map (folder_name, full_path, parent_path) VALUES (?, ?, ?)',
+                    (dir_name.lower(), os.path.join(root, dir_name), root)
+                )
+                total += 1
+                if total % 1000 == 0:
+                    conn.commit()
+    conn.commit()
+    conn.close()
+    return total
+
+def drop_caches():
+    os.sync()
+    with open("/proc/sys/vm/drop_caches", "w") as f:
+        f.write("3\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Folder crawl throughput benchmark")
+    parser.add_argument("--dirs", type=int, default=200000)
+    parser.add_argument("--roots", type=int, default=4)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--drop-caches", action="store_true")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    roots = []
+    for i in range(args.roots):
+        root = os.path.join(workdir, f"root_{i}")
+        os.mkdir(root)
+        # Uneven roots, like a large C: next to a small E:
+        backdate(generate_tree(root, args.dirs * (args.roots - i) * 2 // (args.roots * (args.roots + 1))) + [root])
+        roots.append(root)
+
+    db_path = os.path.join(workdir, "memory.db")
+    mapper = FolderMapper(db_path=db_path, roots=roots)
+
+    def run(label, fn):
+        if args.drop_caches:
+            drop_caches()
+        start = time.perf_counter()
+        total = fn()
+        elapsed = time.perf_counter() - start
+        print(f"{label:28s} {total:8d} dirs {elapsed:7.2f} s {total / elapsed:10.0f} dirs/s")
+        return elapsed
+
+    baseline = run("Sequential os.walk (legacy)", lambda: legacy_map(db_path, roots))
+    for workers in args.workers:
+        elapsed = run(f"Parallel scandir, {workers:2d} workers",
+                      lambda: mapper.update_index(full=True, workers=workers)["total"])
+        print(f"{'':28s} {baseline / elapsed:.2f}x vs legacy")
+
+    shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
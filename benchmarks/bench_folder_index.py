@@ -0,0 +1,128 @@
+"""
+Benchmark: incremental folder index vs full rescans.
+
+Generates a directory tree, then times the previous DELETE + os.walk mapping,
+a full rebuild, a no-change update and an update after changing 1% of the
+directories (half gain a new subfolder, half lose a leaf folder).
+
+Usage: python benchmarks/bench_folder_index.py [--dirs 500000] [--change 0.01] [--keep]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import sqlite3
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.system.folder_mapper import FolderMapper
+
+def generate_tree(base, n_dirs, max_depth=5):
+    """Breadth-first tree of n_dirs directories, at most max_depth levels deep"""
+    fanout = 2
+    while sum(fanout ** level for level in range(1, max_depth + 1)) < n_dirs:
+        fanout += 1
+    created, level = [], [base]
+    while len(created) < n_dirs and level:
+        next_level = []
+        for parent in level:
+            for i in range(fanout):
+                if len(created) >= n_dirs:
+                    break
+                path = os.path.join(parent, f"dir_{i:02d}")
+                os.mkdir(path)
+                created.append(path)
+                next_level.append(path)
+        level = next_level
+    return created
+
+def backdate(paths, seconds=60):
+    past = time.time() - seconds
+    for path in paths:
+        os.utime(path, (past, past))
+
+def legacy_map(db_path, root, max_depth=5):
+    """The previous map_all_folders: DELETE everything, then os.walk and insert"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute('DELETE FROM folder_map')
+    total = 0
+    for current, dirs, _ in os.walk(root):
+        depth = current[len(root):].count(os.sep)
+        if depth > max_depth:
+            dirs.clear()
+            continue
+        for dir_name in dirs:
+            cursor.execute(
+                'INSERT OR IGNORE INTO folder_map (folder_name, full_path, parent_path) VALUES (?, ?, ?)',
+                (dir_name.lower(), os.path.join(current, dir_name), current)
+            )
+            total += 1
+            if total % 1000 == 0:
+                conn.commit()
+    conn.commit()
+    conn.close()
+    return total
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:28s} {elapsed:8.2f} s")
+    return result, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Folder index benchmark")
+    parser.add_argument("--dirs", type=int, default=500000)
+    parser.add_argument("--change", type=float, default=0.01)
+    parser.add_argument("--keep", action="store_true", help="keep the generated tree")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    root = os.path.join(workdir, "tree")
+    os.mkdir(root)
+    rng = random.Random(10)
+
+    start = time.perf_counter()
+    dirs = generate_tree(root, args.dirs)
+    backdate(dirs + [root])
+    print(f"Generated {len(dirs)} directories in {time.perf_counter() - start:.1f} s")
+
+    db_path = os.path.join(workdir, "memory.db")
+    mapper = FolderMapper(db_path=db_path, roots=[root])
+
+    timed("Legacy DELETE + os.walk", lambda: legacy_map(db_path, root))
+    full, full_time = timed("Full rebuild", lambda: mapper.update_index(full=True))
+    same, same_time = timed("No-change update", mapper.update_index)
+
+    # Change 1% of the directories
+    n_changes = int(len(dirs) * args.change)
+    leaves = [d for d in dirs if not os.listdir(d)]
+    touched = set()
+    for path in rng.sample(dirs, n_changes // 2):
+        os.mkdir(os.path.join(path, "nueva_carpeta"))
+        touched.update((path, os.path.join(path, "nueva_carpeta")))
+    for path in rng.sample(leaves, n_changes - n_changes // 2):
+        if path in touched:
+            continue
+        os.rmdir(path)
+        touched.add(os.path.dirname(path))
+    backdate([p for p in touched if os.path.exists(p)], seconds=30)
+
+    changed, changed_time = timed(f"{args.change:.0%}-change update", mapper.update_index)
+
+    print()
+    print(f"Indexed folders:   {full['total']}")
+    print(f"No-change update:  listed {same['listed']} of {same['checked']} dirs "
+          f"({full_time / same_time:.1f}x faster than a full rebuild)")
+    print(f"{args.change:.0%}-change update: listed {changed['listed']} dirs, "
+          f"+{changed['added']} / -{changed['removed']} ({full_time / changed_time:.1f}x faster)")
+
+    if not args.keep:
+        shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: folder resolution accuracy and latency on misheard names.
+
+Loads the labeled query set (benchmarks/data/folder_queries.json: folders,
+usage history and spoken queries with the folder the user meant) into a
+folder map padded with random folders, then reports top-1 accuracy and
+latency for the previous LIKE query, the trigram search_folders() and the
+FolderRanker.
+
+Usage: python benchmarks/bench_folder_ranking.py [--filler 200000]
+"""
+import os
+import sys
+import json
+import time
+import random
+import logging
+import sqlite3
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.system.folder_mapper import FolderMapper
+from src.system.folder_ranker import FolderRanker, phonetic_key
+from src.utils.logger import logger
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "folder_queries.json")
+LETTERS = "eeeeeeaaaaaoooooiiiisssssnnnnrrrrllldddttcccuuumppbgvyqhfzjkxw"
+
+HOME = "C:\\Users\\ana\\"
+
+def row_for(path):
+    """folder_map row, with depth relative to the mapper root it is found under (home first)"""
+    parent, name = path.rsplit("\\", 1)
+    depth = path[len(HOME):].count("\\") + 1 if path.startswith(HOME) else path.count("\\")
+    return (name.lower(), path, parent, depth, phonetic_key(name))
+
+def filler_rows(rng, n):
+    rows = []
+    for i in range(n):
+        name = " ".join("".join(rng.choice(LETTERS) for _ in range(rng.randint(4, 9)))
+                        for _ in range(rng.randint(1, 2)))
+        rows.append(row_for(f"E:\\Archivo\\{i // 1000}\\{i % 1000}\\{name}"))
+    return rows
+
+def evaluate(label, resolve, queries):
+    hits, times, misses = 0, [], []
+    for item in queries:
+        start = time.perf_counter()
+        best = resolve(item["query"])
+        times.append((time.perf_counter() - start) * 1000)
+        if best == item["expected"]:
+            hits += 1
+        else:
+            misses.append(f"{item['query']!r} -> {best}")
+    times.sort()
+    print(f"{label:26s} top-1 {hits:3d}/{len(queries)} ({hits / len(queries):6.1%})   "
+          f"avg {sum(times) / len(times):7.2f} ms   p95 {times[int(len(times) * 0.95)]:7.2f} ms")
+    return misses
+
+def main():
+    parser = argparse.ArgumentParser(description="Folder ranking benchmark")
+    parser.add_argument("--filler", type=int, default=200000)
+    parser.add_argument("--show-misses", action="store_true")
+    args = parser.parse_args()
+
+    with open(DATA, encoding="utf-8") as f:
+        data = json.load(f)
+
+    db_path = os.path.join(tempfile.mkdtemp(), "memory.db")
+    mapper = FolderMapper(db_path=db_path, roots=[])
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            'INSERT INTO folder_map (folder_name, full_path, parent_path, depth, phonetic_key) VALUES (?, ?, ?, ?, ?)',
+            filler_rows(random.Random(13), args.filler) + [row_for(p) for p in data["folders"]]
+        )
+        now = time.time()
+        conn.executemany(
+            'INSERT INTO folder_usage (full_path, open_count, last_opened) VALUES (?, ?, ?)',
+            [(u["path"], u["count"], now - u["days_ago"] * 86400) for u in data["usage"]]
+        )
+    print(f"Folder map: {args.filler + len(data['folders'])} folders, {len(data['queries'])} labeled queries")
+
+    def legacy(query):
+        row = conn.execute(
+            'SELECT full_path FROM folder_map WHERE folder_name LIKE ? LIMIT 10', (f'%{query.lower()}%',)
+        ).fetchone()
+        return row[0] if row else None
+
+    def trigram(query):
+        results = mapper.search_folders(query)
+        return results[0] if results else None
+
+    ranker = FolderRanker(mapper)
+
+    def ranked(query):
+        results = ranker.rank(query, limit=1)
+        return results[0][0] if results else None
+
+    logger.setLevel(logging.WARNING)
+    ranked(data["queries"][0]["query"])  # open the read connections
+    for label, resolve in (("LIKE (legacy)", legacy), ("Trigram search_folders", trigram), ("FolderRanker", ranked)):
+        misses = evaluate(label, resolve, data["queries"])
+        if args.show_misses:
+            for miss in misses:
+                print(f"    miss: {miss}")
+    conn.close()
+
+if __name__ == "__main__":
+    main()
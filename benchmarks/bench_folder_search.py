@@ -0,0 +1,110 @@
+"""
+Benchmark: folder name search, trigram FTS5 index vs LIKE '%x%'.
+
+Fills a temporary folder_map with synthetic folders (no real directories
+needed) and measures search latency of the previous LIKE query against
+FolderMapper.search_folders().
+
+Usage: python benchmarks/bench_folder_search.py [--rows 1000000] [--queries 200]
+"""
+import os
+import sys
+import time
+import random
+import logging
+import sqlite3
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.system.folder_mapper import FolderMapper
+from src.utils.logger import logger
+
+WORDS = ("proyectos documentos fotos musica videos descargas trabajo universidad facturas backup "
+         "python node_modules src build assets recetas viajes juegos clientes informes 2023 2024 "
+         "final nuevo copia temp datos escritorio tesis diseño logos contratos").split()
+# Approximate Spanish/English letter frequencies for pseudo-words
+LETTERS = "eeeeeeaaaaaoooooiiiisssssnnnnrrrrllldddttcccuuumppbgvyqhfzjkxw"
+
+def vocabulary(rng, size=20000):
+    """Common folder words plus pseudo-words (project names, people, clients...)"""
+    words = list(WORDS)
+    while len(words) < size:
+        words.append("".join(rng.choice(LETTERS) for _ in range(rng.randint(4, 10))))
+    return words
+
+def folder_name(rng, words):
+    name = "_".join(rng.choice(words) for _ in range(rng.randint(1, 2)))
+    if rng.random() < 0.3:
+        name += f" {rng.randint(1, 2024)}"
+    return name
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+def measure(fn, queries):
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        times.append((time.perf_counter() - start) * 1000)
+    return sum(times) / len(times), percentile(times, 0.5), percentile(times, 0.95)
+
+def main():
+    parser = argparse.ArgumentParser(description="Folder search benchmark")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(12)
+    db_path = os.path.join(tempfile.mkdtemp(), "memory.db")
+    mapper = FolderMapper(db_path=db_path, roots=[])
+
+    words = vocabulary(rng)
+    rows = []
+    for i in range(args.rows):
+        name = folder_name(rng, words)
+        parent = f"C:\\Users\\usuario\\{rng.choice(WORDS)}\\{i // 100}"
+        rows.append((name, f"{parent}\\{name}_{i}", parent, rng.randint(1, 6)))
+
+    conn = sqlite3.connect(db_path)
+    start = time.perf_counter()
+    with conn:
+        conn.executemany(
+            'INSERT INTO folder_map (folder_name, full_path, parent_path, depth) VALUES (?, ?, ?, ?)', rows
+        )
+    print(f"Inserted {args.rows} folders (with trigram index) in {time.perf_counter() - start:.1f} s")
+
+    def legacy(query):
+        return conn.execute(
+            'SELECT full_path FROM folder_map WHERE folder_name LIKE ? LIMIT 10', (f'%{query.lower()}%',)
+        ).fetchall()
+
+    # Names people ask for: whole folder names, single words, partial words and misses
+    queries = []
+    for _ in range(args.queries):
+        name = rng.choice(rows)[0]
+        kind = rng.random()
+        if kind < 0.4:
+            queries.append(name)
+        elif kind < 0.7:
+            queries.append(rng.choice(name.split("_")))
+        elif kind < 0.9:
+            queries.append(name[:max(3, len(name) // 2)])
+        else:
+            queries.append(folder_name(rng, words) + "xq")
+    mapper.search_folders(queries[0])  # open the read connection
+    logger.setLevel(logging.WARNING)  # time the lookup, not the per-search log line
+    for label, fn in (("LIKE '%x%' (legacy)", legacy), ("Trigram FTS5 (ranked)", mapper.search_folders)):
+        avg, p50, p95 = measure(fn, queries)
+        print(f"{label:24s} avg {avg:8.3f} ms   p50 {p50:8.3f} ms   p95 {p95:8.3f} ms")
+
+    print("Top results for 'tesis':", mapper.search_folders("tesis", limit=3))
+    avg, p50, p95 = measure(mapper.search_folders, WORDS)
+    print(f"{'Common words only':24s} avg {avg:8.3f} ms   p50 {p50:8.3f} ms   p95 {p95:8.3f} ms")
+    conn.close()
+
+if __name__ == "__main__":
+    main()
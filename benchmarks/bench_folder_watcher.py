@@ -0,0 +1,84 @@
+"""
+Benchmark: keeping the folder index fresh, watcher vs periodic rescans.
+
+Generates a directory tree, then for the inotify and polling backends
+measures idle CPU (process CPU time while nothing changes) and the delay
+between creating a folder and finding it with search_folders(). The
+periodic update is shown for comparison: a no-change update_index()
+costs one stat per directory, and a change can wait up to 30 minutes.
+inotify needs one watch per directory: keep --dirs under
+/proc/sys/fs/inotify/max_user_watches, or unwatched changes are missed.
+
+Usage: python benchmarks/bench_folder_watcher.py [--dirs 20000] [--idle 10] [--changes 20]
+"""
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.system.folder_mapper import FolderMapper
+from src.system.folder_watcher import FolderWatcher, InotifyBackend, PollingBackend
+from src.utils.logger import logger
+from bench_folder_index import generate_tree, backdate
+
+def main():
+    parser = argparse.ArgumentParser(description="Folder watcher benchmark")
+    parser.add_argument("--dirs", type=int, default=20000)
+    parser.add_argument("--idle", type=float, default=10.0, help="seconds of idle CPU measurement")
+    parser.add_argument("--changes", type=int, default=20)
+    parser.add_argument("--poll", type=float, default=5.0, help="polling backend interval (s)")
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)
+    workdir = tempfile.mkdtemp()
+    root = os.path.join(workdir, "home")
+    os.mkdir(root)
+    dirs = generate_tree(root, args.dirs)
+    backdate(dirs + [root])
+    mapper = FolderMapper(db_path=os.path.join(workdir, "memory.db"), roots=[root], index_files=False)
+    mapper.update_index(full=True)
+
+    cpu = time.process_time()
+    start = time.perf_counter()
+    mapper.update_index()
+    print(f"{len(dirs)} dirs. Periodic no-change update_index(): {time.perf_counter() - start:.2f} s wall, "
+          f"{time.process_time() - cpu:.2f} s CPU every 30 min; changes wait up to 1800 s")
+
+    backends = [("polling", lambda: PollingBackend(interval=args.poll))]
+    if InotifyBackend.available():
+        backends.insert(0, ("inotify", InotifyBackend))
+    for label, make in backends:
+        watcher = FolderWatcher(mapper, backend=make(), debounce=0.2)
+        watcher.start(catch_up=False)
+        watcher.wait_ready()
+
+        cpu = time.process_time()
+        time.sleep(args.idle)
+        idle = (time.process_time() - cpu) / args.idle * 100
+
+        delays, missed = [], 0
+        for i in range(args.changes):
+            name = f"nueva_{label}_{i}"
+            created = time.perf_counter()
+            os.mkdir(os.path.join(dirs[(i * 7919) % len(dirs)], name))
+            while not mapper.search_folders(name, limit=1):
+                if time.perf_counter() - created > args.poll * 2 + 5:
+                    missed += 1
+                    break
+                time.sleep(0.01)
+            else:
+                delays.append(time.perf_counter() - created)
+        watcher.stop()
+        delays.sort()
+        visible = (f"avg {sum(delays) / len(delays):6.2f} s, max {delays[-1]:6.2f} s" if delays else "never")
+        print(f"{label:8s} idle CPU {idle:6.2f}%   change visible after {visible}   missed {missed}   "
+              f"(all watched: {watcher.backend.complete}) {watcher.stats}")
+    shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
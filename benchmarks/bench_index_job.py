@@ -0,0 +1,61 @@
+"""
+Benchmark: background indexing job vs the blocking "map folders" command.
+
+Generates a directory tree and measures how long the main loop is blocked
+by the previous synchronous map_all_folders() against start_index_job(),
+then runs the job unthrottled and throttled, reporting folders per second
+and how close the first ETA estimate was to the real finish time.
+
+Usage: python benchmarks/bench_index_job.py [--dirs 100000] [--rates 0 20000 5000]
+"""
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.system.folder_mapper import FolderMapper
+from src.utils.logger import logger
+from bench_folder_index import generate_tree, backdate
+
+def main():
+    parser = argparse.ArgumentParser(description="Background indexing job benchmark")
+    parser.add_argument("--dirs", type=int, default=100000)
+    parser.add_argument("--rates", type=int, nargs="+", default=[0, 20000, 5000])
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)
+    workdir = tempfile.mkdtemp()
+    root = os.path.join(workdir, "home")
+    os.mkdir(root)
+    dirs = generate_tree(root, args.dirs)
+    backdate(dirs + [root])
+    mapper = FolderMapper(db_path=os.path.join(workdir, "memory.db"), roots=[root], index_files=False)
+    mapper.update_index(full=True)
+
+    start = time.perf_counter()
+    mapper.map_all_folders()
+    print(f"{len(dirs)} dirs. Blocking map_all_folders(): main loop deaf for {time.perf_counter() - start:.2f} s")
+
+    for rate in args.rates:
+        events = []
+        start = time.perf_counter()
+        job = mapper.start_index_job(full=True, max_rate=rate, progress_interval=0.5)
+        returned = time.perf_counter() - start
+        job.add_listener(lambda progress: events.append((time.perf_counter(), progress)))
+        job.wait()
+        finished = time.perf_counter()
+        progress = job.progress()
+        first_eta = next(((t, p["eta"]) for t, p in events if p["state"] == "running" and p["eta"]), None)
+        eta_error = f"{(first_eta[0] + first_eta[1]) - finished:+.2f} s" if first_eta else "n/a"
+        label = f"max {rate}/s" if rate else "unthrottled"
+        print(f"start_index_job ({label:12s}) returned in {returned * 1000:6.2f} ms, finished in "
+              f"{progress['elapsed']:6.2f} s, {progress['rate']:8.0f} folders/s, first ETA off by {eta_error}")
+    shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: local fast-path intent router vs. LLM-only classification.
+
+Runs a labeled corpus of utterances through IntentClassifier with a fake
+LLM that sleeps for a fixed latency, and reports how many turns were
+resolved locally and the average latency per turn with and without the
+fast path.
+
+Usage: python benchmarks/bench_intent_router.py [--llm-latency 0.8]
+"""
+import os
+import sys
+import time
+import json
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.brain.intent_classifier import IntentClassifier
+
+# (utterance, expected command or None for chat/ambiguous)
+CORPUS = [
+    ("sube el volumen", "system_control"),
+    ("baja el volumen por favor", "system_control"),
+    ("silenciar", "system_control"),
+    ("volume up", "system_control"),
+    ("turn the volume down", "system_control"),
+    ("mute", "system_control"),
+    ("abre chrome", "open_app"),
+    ("abre spotify", "open_app"),
+    ("open visual studio code", "open_app"),
+    ("open notepad", "open_app"),
+    ("abre la calculadora", "open_app"),
+    ("abre la carpeta descargas", "open_folder"),
+    ("open the projects folder", "open_folder"),
+    ("abre mi carpeta de documentos", "open_folder"),
+    ("abre el archivo informe final", "open_file"),
+    ("open file budget", "open_file"),
+    ("crea una carpeta llamada facturas en documentos", "create_folder"),
+    ("create folder reports", "create_folder"),
+    ("mapear carpetas", "map_folders"),
+    ("update index", "map_folders"),
+    ("busca en google recetas de pasta", "search_web"),
+    ("search google for python tutorials", "search_web"),
+    ("search for the weather today", "search_web"),
+    ("qué ves en mi pantalla", "analyze_screen"),
+    ("what is on my screen", "analyze_screen"),
+    ("estado del sistema", "system_info"),
+    ("cpu usage", "system_info"),
+    ("cuéntame un chiste", None),
+    ("qué hora es en tokio", None),
+    ("I want to write some code", None),
+    ("quién ganó el mundial de 2010", None),
+    ("explícame la relatividad", None),
+    ("abre youtube", None),
+    ("busca el clima de hoy", None),
+    ("buscar trabajo es difícil", None),
+    ("search results are bad today", None),
+    ("tell me something interesting", None),
+]
+
+class FakeLLM:
+    """Stands in for LLMClient.analyze_intent with a fixed latency"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+
+    def analyze_intent(self, text):
+        self.calls += 1
+        time.sleep(self.latency)
+        return json.dumps({"type": "chat", "confidence": 0.8})
+
+def run(classifier, corpus):
+    start = time.perf_counter()
+    results = [classifier.classify(text) for text, _ in corpus]
+    return results, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Intent fast-path benchmark")
+    parser.add_argument("--llm-latency", type=float, default=0.05,
+                        help="Simulated LLM round trip in seconds (Gemini is typically 0.5-1.5)")
+    args = parser.parse_args()
+
+    # LLM only (threshold above any possible confidence disables the fast path)
+    llm_only = IntentClassifier(FakeLLM(args.llm_latency), threshold=1.1, cache=False)
+    _, llm_only_time = run(llm_only, CORPUS)
+
+    # With local router
+    fast_llm = FakeLLM(args.llm_latency)
+    routed = IntentClassifier(fast_llm, cache=False)
+    results, routed_time = run(routed, CORPUS)
+
+    correct = 0
+    for (text, expected), result in zip(CORPUS, results):
+        got = result.get("command") if result.get("source") == "fast_path" else None
+        if got == expected or (got is None and expected is None):
+            correct += 1
+        elif got is not None:
+            print(f"  MISROUTE: '{text}' -> {got} (expected {expected})")
+
+    # Pure router cost
+    router = routed.router
+    iterations = 2000
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for text, _ in CORPUS:
+            router.route(text)
+    router_us = (time.perf_counter() - start) / (iterations * len(CORPUS)) * 1e6
+
+    n = len(CORPUS)
+    stats = routed.get_stats()
+    print(f"Corpus size:             {n} utterances")
+    print(f"Fast path hits:          {stats['fast_path']} ({stats['fast_path_rate']:.0%})")
+    print(f"LLM calls avoided:       {n - fast_llm.calls}")
+    print(f"Router cost:             {router_us:.1f} us/utterance")
+    print(f"Routing agreement:       {correct}/{n}")
+    print(f"LLM only:                {llm_only_time / n * 1000:.1f} ms/turn")
+    print(f"With fast path:          {routed_time / n * 1000:.1f} ms/turn")
+    print(f"Saved per turn:          {(llm_only_time - routed_time) / n * 1000:.1f} ms "
+          f"(at {args.llm_latency * 1000:.0f} ms simulated LLM latency)")
+
+if __name__ == "__main__":
+    main()
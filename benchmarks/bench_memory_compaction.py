@@ -0,0 +1,69 @@
+"""
+Benchmark: memory compaction on a large conversation history.
+
+Fills a temporary memory.db with synthetic messages, runs the compactor
+(first interrupted, then resumed from its watermark) and reports DB size
+and history query latency before and after.
+
+Usage: python benchmarks/bench_memory_compaction.py [--messages 200000] [--keep 1000]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.brain.memory import MemoryManager
+from src.brain.memory_compactor import MemoryCompactor
+
+TOPICS = [
+    "recordatorio de la reunión con el equipo", "receta de pasta con tomate",
+    "abrir la carpeta de proyectos", "clima para el fin de semana",
+    "música para concentrarse", "configurar el servidor de python",
+]
+
+# Fixed query timed before and after compaction
+PROBE_QUERY = "recordatorio reunión"
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory compaction benchmark")
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--keep", type=int, default=1000)
+    parser.add_argument("--chunk", type=int, default=40)
+    args = parser.parse_args()
+
+    rng = random.Random(9)
+    db_path = os.path.join(tempfile.mkdtemp(), "memory.db")
+    memory = MemoryManager(db_path=db_path, batch_size=10000, flush_interval=60)
+    for i in range(args.messages):
+        topic = rng.choice(TOPICS)
+        memory.add_message("user" if i % 2 == 0 else "model", f"{topic}. Detalle número {i} de la conversación.")
+    memory.flush()
+    memory._sync_vectors()
+
+    compactor = MemoryCompactor(memory, keep_recent=args.keep, chunk_size=args.chunk, idle_seconds=0,
+                                probe_query=PROBE_QUERY)
+
+    # Interrupted after a few chunks, then resumed from the watermark
+    first = compactor.run(max_chunks=50)
+    resumed = compactor.run()
+    before, after = first["before"], resumed["after"]
+
+    print(f"Messages:           {args.messages} (keeping newest {args.keep})")
+    print(f"Compacted:          {first['messages'] + resumed['messages']} messages -> "
+          f"{first['summaries'] + resumed['summaries']} summaries "
+          f"in {first['seconds'] + resumed['seconds']:.1f} s (resumed at id {first['watermark']})")
+    print(f"DB size:            {before['db_bytes'] / 1e6:8.1f} MB -> {after['db_bytes'] / 1e6:8.1f} MB")
+    print(f"get_recent_history: {before['recent_ms']:8.3f} ms -> {after['recent_ms']:8.3f} ms")
+    print(f"search_history:     {before['search_ms']:8.3f} ms -> {after['search_ms']:8.3f} ms")
+
+    start = time.perf_counter()
+    idle = compactor.run()
+    print(f"Caught-up run:      {idle['messages']} messages, {(time.perf_counter() - start) * 1000:.1f} ms (no rescan)")
+    memory.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: conversation memory retrieval latency at scale.
+
+Fills a temporary memory.db with synthetic messages and measures
+search_history() latency for the FTS5, semantic and hybrid modes.
+
+Usage: python benchmarks/bench_memory_search.py [--sizes 100000 1000000] [--queries 20]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.brain.memory import MemoryManager
+
+TOPICS = [
+    "receta de pasta con tomate y albahaca", "configurar el servidor de python en linux",
+    "resultado del partido de fútbol de ayer", "planear un viaje a japón en primavera",
+    "reunión de trabajo con el equipo de diseño", "cómo entrenar para una maratón",
+    "precio de las acciones de tecnología", "aprender a tocar la guitarra",
+    "error de memoria en la aplicación de escritorio", "película de ciencia ficción recomendada",
+]
+FILLER = ("el la de que y en un una por con para como más pero sus le ya o este sí porque esta entre "
+          "cuando muy sin sobre también me hasta hay donde quien desde todo nos durante todos uno les "
+          "ni contra otros ese eso ante ellos e esto mí antes algunos qué unos yo otro otras otra él").split()
+
+def synthetic_message(rng):
+    topic = rng.choice(TOPICS)
+    words = topic.split() + rng.sample(FILLER, 8) + [f"dato{rng.randint(0, 50000)}"]
+    rng.shuffle(words)
+    return " ".join(words)
+
+def fill(memory, n, rng):
+    start = time.perf_counter()
+    for i in range(n):
+        memory.add_message("user" if i % 2 == 0 else "model", synthetic_message(rng))
+        if i % 10000 == 0:
+            memory.flush()
+    memory.flush()
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    memory._sync_vectors()
+    embed_time = time.perf_counter() - start
+    return insert_time, embed_time
+
+def measure(memory, mode, queries):
+    # Warm-up (loads vectors into memory for semantic/hybrid)
+    memory.search_history(queries[0], k=5, mode=mode)
+    start = time.perf_counter()
+    for query in queries:
+        memory.search_history(query, k=5, mode=mode)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory search benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    queries = [rng.choice(TOPICS) for _ in range(args.queries)]
+
+    for n in args.sizes:
+        db_path = os.path.join(tempfile.mkdtemp(), "memory.db")
+        memory = MemoryManager(db_path=db_path, batch_size=10000, flush_interval=60)
+        insert_time, embed_time = fill(memory, n, rng)
+        size_mb = sum(os.path.getsize(db_path + suffix) for suffix in ("", "-wal") if os.path.exists(db_path + suffix)) / 1e6
+
+        print(f"--- {n} messages (db {size_mb:.0f} MB, insert {insert_time:.1f} s, embed {embed_time:.1f} s)")
+        for mode in ("fts", "semantic", "hybrid"):
+            print(f"  {mode:8s} {measure(memory, mode, queries):8.2f} ms/query")
+        memory.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: conversation memory write throughput.
+
+Compares the previous connect/insert/commit/close-per-message approach with
+the long-lived WAL connection and batched write-behind queue.
+
+Usage: python benchmarks/bench_memory_writes.py [--messages 10000]
+"""
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.brain.memory import MemoryManager
+
+def legacy_add_message(db_path, role, content):
+    """The previous MemoryManager.add_message"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(
+        'INSERT INTO conversations (role, content) VALUES (?, ?)',
+        (role, content)
+    )
+    conn.commit()
+    conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory write benchmark")
+    parser.add_argument("--messages", type=int, default=10000)
+    args = parser.parse_args()
+    n = args.messages
+    workdir = tempfile.mkdtemp()
+
+    # Legacy: same schema, default rollback journal
+    legacy_db = os.path.join(workdir, "legacy.db")
+    MemoryManager(db_path=legacy_db).close()
+    conn = sqlite3.connect(legacy_db)
+    conn.execute('PRAGMA journal_mode=DELETE')
+    conn.close()
+
+    start = time.perf_counter()
+    for i in range(n):
+        legacy_add_message(legacy_db, "user" if i % 2 == 0 else "model", f"Mensaje de prueba número {i}")
+    legacy_time = time.perf_counter() - start
+
+    # Write-behind
+    memory = MemoryManager(db_path=os.path.join(workdir, "batched.db"))
+    start = time.perf_counter()
+    for i in range(n):
+        memory.add_message("user" if i % 2 == 0 else "model", f"Mensaje de prueba número {i}")
+    enqueue_time = time.perf_counter() - start
+    memory.flush()
+    batched_time = time.perf_counter() - start
+
+    history = memory.get_recent_history(limit=n)
+    assert len(history) == n
+    memory.close()
+
+    print(f"Messages:              {n}")
+    print(f"Per-message connect:   {legacy_time:7.2f} s  ({n / legacy_time:9.0f} msg/s)")
+    print(f"Write-behind (total):  {batched_time:7.2f} s  ({n / batched_time:9.0f} msg/s)")
+    print(f"add_message() latency: {enqueue_time / n * 1e6:7.1f} us")
+    print(f"Speedup:               {legacy_time / batched_time:7.1f}x")
+
+if __name__ == "__main__":
+    main()
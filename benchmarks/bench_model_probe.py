@@ -0,0 +1,98 @@
+"""
+Benchmark: LLM startup model selection against a stubbed genai module.
+
+Compares the old serial "try each model until one answers" loop with the
+concurrent probe pool, and with a restart that hits the health cache.
+
+Usage: python benchmarks/bench_model_probe.py
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.brain.model_health import ModelHealthProbe
+
+MODELS = [
+    'gemini-2.5-flash-preview-09-2025',
+    'gemini-2.5-flash-lite-preview-09-2025',
+    'gemini-3-pro-preview',
+    'gemini-2.0-flash',
+    'gemini-2.0-flash-lite',
+    'gemini-1.5-flash',
+    'gemini-1.5-pro'
+]
+
+# (latency in seconds, fails) - a quota-limited key where only the 5th model answers
+SCENARIO = {
+    'gemini-2.5-flash-preview-09-2025': (0.4, True),
+    'gemini-2.5-flash-lite-preview-09-2025': (0.3, True),
+    'gemini-3-pro-preview': (0.6, True),
+    'gemini-2.0-flash': (0.35, True),
+    'gemini-2.0-flash-lite': (0.3, False),
+    'gemini-1.5-flash': (0.3, False),
+    'gemini-1.5-pro': (0.5, False),
+}
+
+class FakeGenAI:
+    """Minimal stand-in for google.generativeai"""
+
+    def __init__(self, scenario):
+        self.scenario = scenario
+        self.calls = 0
+
+    def GenerativeModel(self, name):
+        return FakeModel(self, name)
+
+class FakeModel:
+    def __init__(self, genai, name):
+        self.genai = genai
+        self.name = name
+
+    def generate_content(self, prompt):
+        self.genai.calls += 1
+        latency, fails = self.genai.scenario[self.name]
+        time.sleep(latency)
+        if fails:
+            raise RuntimeError("429 Quota exceeded")
+        return "ok"
+
+def serial_select(genai):
+    """The previous LLMClient._configure_model loop"""
+    for name in MODELS:
+        try:
+            genai.GenerativeModel(name).generate_content("Test")
+            return name
+        except Exception:
+            continue
+    return None
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def main():
+    cache_path = os.path.join(tempfile.mkdtemp(), "model_health.json")
+
+    serial_genai = FakeGenAI(SCENARIO)
+    serial_model, serial_time = timed(lambda: serial_select(serial_genai))
+
+    parallel_genai = FakeGenAI(SCENARIO)
+    probe = ModelHealthProbe(parallel_genai, MODELS, api_key="bench", cache_path=cache_path)
+    parallel_model, parallel_time = timed(probe.select_model)
+
+    # Let background probes finish and persist, then simulate a restart
+    time.sleep(1.0)
+    restart_genai = FakeGenAI(SCENARIO)
+    restarted = ModelHealthProbe(restart_genai, MODELS, api_key="bench", cache_path=cache_path)
+    cached_model, cached_time = timed(restarted.select_model)
+
+    print(f"Serial probing:    {serial_time * 1000:7.1f} ms -> {serial_model} ({serial_genai.calls} calls)")
+    print(f"Parallel probing:  {parallel_time * 1000:7.1f} ms -> {parallel_model}")
+    print(f"Cached restart:    {cached_time * 1000:7.1f} ms -> {cached_model} ({restart_genai.calls} calls)")
+
+if __name__ == "__main__":
+    main()
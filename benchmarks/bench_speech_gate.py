@@ -0,0 +1,140 @@
+"""
+Benchmark: local speech gate before cloud recognition.
+
+Every snippet captured in standby (wake word) or while speaking (barge-in)
+used to go to recognize_google. This runs a labelled clip set through
+three gates and reports, for each: speech clips forwarded (recall),
+non-speech clips rejected, recognizer calls avoided and CPU cost per
+second of audio.
+
+  none      forward everything (previous behaviour)
+  energy    EnergyVAD: enough frames above the noise floor
+  spectral  SpeechGate: SpectralVAD (energy + flatness, band ratio, ZCR,
+            hangover) plus syllable-rate envelope modulation
+
+Clips are synthetic (benchmarks/audio_fixtures.py), as sr.listen() would
+cut them: room noise, the event, room noise. --save DIR writes them as
+WAV files; --clips DIR adds recorded WAVs (16-bit), labelled speech when
+the file name starts with "speech".
+
+Usage: python benchmarks/bench_speech_gate.py [--seeds 5] [--clips DIR] [--save DIR]
+"""
+import os
+import sys
+import time
+import wave
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio.vad import EnergyVAD, SpeechGate
+from src.audio.audio_source import write_wav
+from audio_fixtures import speech_like, noise, tone, hum, chord, clicks, SAMPLE_RATE
+
+def mix(*parts):
+    n = max(len(p) for p in parts)
+    out = np.zeros(n, dtype=np.int32)
+    for p in parts:
+        out[:len(p)] += p
+    return np.clip(out, -32768, 32767).astype(np.int16)
+
+def snippet(event, rng, room=100):
+    """Room noise, event, room noise (the pre/post buffer sr.listen() keeps)"""
+    pad = lambda seconds: noise(seconds, rng, level=room)
+    return np.concatenate([pad(0.5), mix(event, noise(len(event) / SAMPLE_RATE, rng, level=room)), pad(0.3)])
+
+def synthetic_clips(seeds):
+    clips = []
+    for seed in range(seeds):
+        rng = np.random.default_rng(seed)
+        length = lambda: rng.uniform(0.6, 2.0)
+        for pitch in (100, 140, 220):
+            for level in (1500, 6000, 12000):
+                clips.append((f"speech_p{pitch}_l{level}_s{seed}", True, snippet(speech_like(length(), rng, level=level, pitch=pitch), rng)))
+        seconds = length()
+        clips.append((f"speech_white_s{seed}", True, snippet(mix(speech_like(seconds, rng), noise(seconds, rng, 500)), rng)))
+        seconds = length()
+        clips.append((f"speech_pink_s{seed}", True, snippet(mix(speech_like(seconds, rng), noise(seconds, rng, 800, "pink")), rng)))
+        seconds = length()
+        clips.append((f"speech_music_s{seed}", True, snippet(mix(speech_like(seconds, rng), chord(seconds, level=1500)), rng)))
+        non_speech = {
+            "white": noise(2.0, rng, 2000),
+            "fan": noise(2.0, rng, 3000, "pink"),
+            "hum": hum(2.0, rng.choice([50.0, 60.0])),
+            "beep": tone(0.4, 1000.0),
+            "music": chord(2.0, freqs=tuple(rng.choice([196.0, 262.0, 330.0, 392.0, 440.0], 3, replace=False))),
+            "typing": clicks(2.0, rng=rng),
+            "door": (noise(0.3, rng, 6000) * np.exp(-np.linspace(0, 5, int(0.3 * SAMPLE_RATE)))).astype(np.int16),
+        }
+        for name, event in non_speech.items():
+            clips.append((f"{name}_s{seed}", False, snippet(event, rng)))
+    return clips
+
+def load_clips(folder):
+    clips = []
+    for name in sorted(os.listdir(folder)):
+        if not name.lower().endswith(".wav"):
+            continue
+        with wave.open(os.path.join(folder, name), "rb") as wav:
+            if wav.getsampwidth() != 2:
+                continue
+            samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+            if wav.getnchannels() > 1:
+                samples = samples.reshape(-1, wav.getnchannels()).mean(axis=1).astype(np.int16)
+            clips.append((name, name.lower().startswith("speech"), samples, wav.getframerate()))
+    return clips
+
+def energy_gate(samples, sample_rate, min_speech=0.2):
+    vad = EnergyVAD(sample_rate=sample_rate)
+    frame = int(0.03 * sample_rate)
+    speech = sum(vad.is_speech(samples[i:i + frame]) for i in range(0, len(samples) - frame + 1, frame))
+    return speech * frame >= min_speech * sample_rate
+
+def main():
+    parser = argparse.ArgumentParser(description="Speech gate benchmark")
+    parser.add_argument("--seeds", type=int, default=5)
+    parser.add_argument("--clips", help="folder of recorded WAV clips (speech*.wav = speech)")
+    parser.add_argument("--save", help="write the synthetic clips to this folder")
+    args = parser.parse_args()
+
+    clips = [(name, label, samples, SAMPLE_RATE) for name, label, samples in synthetic_clips(args.seeds)]
+    if args.save:
+        os.makedirs(args.save, exist_ok=True)
+        for name, _, samples, _ in clips:
+            write_wav(os.path.join(args.save, f"{name}.wav"), samples)
+    if args.clips:
+        clips += load_clips(args.clips)
+    speech = sum(1 for clip in clips if clip[1])
+    audio_seconds = sum(len(clip[2]) / clip[3] for clip in clips)
+    print(f"{len(clips)} clips ({speech} speech, {len(clips) - speech} non-speech), {audio_seconds:.0f}s of audio\n")
+
+    gate = SpeechGate()
+    gates = {
+        "none": lambda samples, rate: True,
+        "energy": energy_gate,
+        "spectral": gate.allows,
+    }
+    print(f"{'gate':10s} {'speech fwd':>11s} {'noise rej':>10s} {'calls':>6s} {'avoided':>8s} {'CPU ms/s':>9s}")
+    misses = []
+    for name, fn in gates.items():
+        forwarded_speech = rejected_noise = calls = 0
+        started = time.process_time()
+        for clip_name, label, samples, rate in clips:
+            forward = fn(samples, rate)
+            calls += forward
+            if label and forward:
+                forwarded_speech += 1
+            elif not label and not forward:
+                rejected_noise += 1
+            elif name == "spectral":
+                misses.append(clip_name)
+        cpu = (time.process_time() - started) * 1000 / audio_seconds
+        print(f"{name:10s} {forwarded_speech:5d}/{speech:<5d} {rejected_noise:4d}/{len(clips) - speech:<5d}"
+              f" {calls:6d} {len(clips) - calls:8d} {cpu:9.2f}")
+    print(f"\nSpeechGate counters: {gate.stats()}")
+    if misses:
+        print(f"Spectral gate errors: {', '.join(misses)}")
+
+if __name__ == "__main__":
+    main()
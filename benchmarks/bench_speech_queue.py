@@ -0,0 +1,118 @@
+"""
+Benchmark: the open_folder selection menu (message, five options, "say the
+number") spoken three ways, end to end, on the fake streaming backend:
+
+  stop + sleep   the previous flow: every speak() stops what is playing
+                 and starts a new thread; time.sleep(0.5/0.3) in between
+  serial         one utterance at a time, waiting for each to finish
+                 (synthesis starts when the previous one has played)
+  queue          SpeechQueue.say_all on the TTS service: one batch, the
+                 next utterances synthesized while the current one plays
+
+Per flow: time to first audio, items heard to the end, silence between
+items, and the total until "say the number" has been played (when the
+assistant can start listening for the choice).
+
+Usage: python benchmarks/bench_speech_queue.py [--playback-speed 2]
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio.speech_queue import SpeechQueue
+from src.audio.tts_service import TTSService
+from src.config.locales import get_text
+from tts_fixtures import FakeCommunicate, FakeOutput
+
+FOLDERS = [("Proyectos", "Documentos"), ("Proyectos", "Escritorio"), ("proyectos-2023", "Descargas"),
+           ("Proyectos antiguos", "Backup"), ("Proyectos", "OneDrive")]
+
+def menu():
+    lines = ["Encontré varias carpetas que coinciden."]
+    lines += [get_text("option_prefix", "es-ES", i, name, parent) for i, (name, parent) in enumerate(FOLDERS, 1)]
+    return lines + [get_text("ask_selection", "es-ES")]
+
+class Timeline:
+    def __init__(self, speed):
+        self.speed = speed
+        self.spans = []  # (text, audio start, end, heard to the end)
+        self.lock = threading.Lock()
+
+    def play(self, stream, stop):
+        player = FakeOutput(speed=self.speed)
+        player.play(stream, stop)
+        with self.lock:
+            self.spans.append((stream.text, player.started_at, time.perf_counter(), not stop.is_set()))
+
+    def report(self, label, started, total):
+        spans = sorted((s for s in self.spans if s[1] is not None), key=lambda s: s[1])
+        heard = sum(1 for s in spans if s[3])
+        gaps = [max(0.0, b[1] - a[2]) for a, b in zip(spans, spans[1:])]
+        first = (spans[0][1] - started) * 1000 if spans else float("nan")
+        gap = statistics.median(gaps) * 1000 if gaps else float("nan")
+        print(f"{label:14s} {first:10.0f}ms {heard:>4d}/{len(menu())} {gap:9.0f}ms {total:8.2f}s")
+
+def stop_and_sleep(speed):
+    """The previous run_assistant menu: speak() = stop + new thread per item"""
+    timeline = Timeline(speed)
+    service = TTSService(workers=2).start()
+    current = [None, None]  # stop event, thread
+
+    def speak(text):
+        if current[0] is not None:
+            current[0].set()  # pygame.mixer.music.stop()
+        stop = threading.Event()
+        thread = threading.Thread(target=lambda: timeline.play(service.synthesize(FakeCommunicate(text), text), stop), daemon=True)
+        thread.start()
+        current[:] = [stop, thread]
+
+    started = time.perf_counter()
+    lines = menu()
+    speak(lines[0])
+    time.sleep(0.5)
+    for line in lines[1:-1]:
+        speak(line)
+        time.sleep(0.3)
+    speak(lines[-1])
+    current[1].join()
+    timeline.report("stop + sleep", started, time.perf_counter() - started)
+
+def serial(speed):
+    timeline = Timeline(speed)
+    service = TTSService(workers=2).start()
+    started = time.perf_counter()
+    for line in menu():
+        timeline.play(service.synthesize(FakeCommunicate(line), line), threading.Event())
+    timeline.report("serial", started, time.perf_counter() - started)
+
+def queued(speed):
+    timeline = Timeline(speed)
+    service = TTSService(workers=2).start()
+    queue = SpeechQueue(synthesize=lambda text, group: service.synthesize(FakeCommunicate(text), text), play=timeline.play,
+                        discard=lambda stream: stream.cancel())
+    started = time.perf_counter()
+    queue.say_all(menu())
+    queue.wait()
+    timeline.report("queue", started, time.perf_counter() - started)
+    service.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Speech queue menu benchmark")
+    parser.add_argument("--playback-speed", type=float, default=2.0, help="play faster than real time to keep the run short")
+    parser.add_argument("--first-chunk", type=float, default=0.25)
+    args = parser.parse_args()
+    FakeCommunicate.first_chunk = args.first_chunk
+    print(f"Menu of {len(menu())} utterances, first chunk after {args.first_chunk * 1000:.0f} ms, "
+          f"playback {args.playback_speed:g}x\n")
+    print(f"{'':14s} {'first audio':>12s} {'heard':>6s} {'gap p50':>11s} {'total':>9s}")
+    stop_and_sleep(args.playback_speed)
+    serial(args.playback_speed)
+    queued(args.playback_speed)
+
+if __name__ == "__main__":
+    main()
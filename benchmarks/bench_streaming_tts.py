@@ -0,0 +1,99 @@
+"""
+Benchmark: time-to-first-audio for blocking vs. streamed LLM + TTS.
+
+A fake model streams a reply in small chunks and a fake TTS engine has a
+fixed cost plus a per-character cost, so the numbers only depend on the
+simulated latencies below.
+
+Usage: python benchmarks/bench_streaming_tts.py [--scale 0.25]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio.speech_queue import SpeechQueue
+
+REPLY = (
+    "La fotosíntesis es el proceso por el cual las plantas convierten la luz en energía química. "
+    "Ocurre principalmente en las hojas, dentro de los cloroplastos. "
+    "La clorofila absorbe la luz y la usa para separar moléculas de agua. "
+    "El resultado es glucosa, que la planta usa como alimento, y oxígeno, que se libera al aire. "
+    "Sin este proceso la vida en la Tierra tal como la conocemos no sería posible."
+)
+
+class FakeModel:
+    """Streams REPLY a few words at a time"""
+
+    def __init__(self, first_token=0.6, per_chunk=0.05, words_per_chunk=4):
+        self.first_token = first_token
+        self.per_chunk = per_chunk
+        self.words_per_chunk = words_per_chunk
+
+    def stream(self, text):
+        words = text.split(" ")
+        time.sleep(self.first_token)
+        for i in range(0, len(words), self.words_per_chunk):
+            yield " ".join(words[i:i + self.words_per_chunk]) + " "
+            time.sleep(self.per_chunk)
+
+    def generate(self, text):
+        return "".join(self.stream(text))
+
+class FakeTTS:
+    """Fixed round-trip cost plus per-character synthesis time"""
+
+    def __init__(self, base=0.3, per_char=0.002, play_per_char=0.01):
+        self.base = base
+        self.per_char = per_char
+        self.play_per_char = play_per_char
+        self.first_audio = None
+        self.start = None
+
+    def synthesize(self, text, group=None):
+        time.sleep(self.base + self.per_char * len(text))
+        return text
+
+    def play(self, audio, stop=None):
+        if self.first_audio is None:
+            self.first_audio = time.perf_counter() - self.start
+        time.sleep(self.play_per_char * len(audio))
+
+def blocking(model, tts):
+    tts.start = time.perf_counter()
+    text = model.generate(REPLY)
+    tts.play(tts.synthesize(text))
+    return tts.first_audio, time.perf_counter() - tts.start
+
+def streaming(model, tts):
+    tts.start = time.perf_counter()
+    speech = SpeechQueue(tts.synthesize, tts.play)
+    speech.say_stream(model.stream(REPLY))
+    speech.wait()
+    return tts.first_audio, time.perf_counter() - tts.start, speech.stats["played"]
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming TTS benchmark")
+    parser.add_argument("--scale", type=float, default=0.25,
+                        help="Multiply all simulated latencies (1.0 = realistic)")
+    args = parser.parse_args()
+    k = args.scale
+
+    def model():
+        return FakeModel(first_token=0.6 * k, per_chunk=0.05 * k)
+
+    def tts():
+        return FakeTTS(base=0.3 * k, per_char=0.002 * k, play_per_char=0.01 * k)
+
+    block_first, block_total = blocking(model(), tts())
+    stream_first, stream_total, sentences = streaming(model(), tts())
+
+    print(f"Reply: {len(REPLY)} chars, {sentences} sentences (latency scale {k})")
+    print(f"Blocking:  first audio {block_first * 1000:7.1f} ms   total {block_total * 1000:7.1f} ms")
+    print(f"Streaming: first audio {stream_first * 1000:7.1f} ms   total {stream_total * 1000:7.1f} ms")
+    print(f"Time-to-first-audio reduced by {(1 - stream_first / block_first):.0%}")
+
+if __name__ == "__main__":
+    main()
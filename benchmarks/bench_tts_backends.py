@@ -0,0 +1,153 @@
+"""
+Benchmark: one TTS path (neural voice + phrase cache, nothing on failure)
+vs the backend registry (cached audio, neural voice and the local engine,
+chosen per utterance), on a session of short confirmations and longer
+replies with a network outage in the middle. The registry runs twice: by
+default (the local engine only as a fallback) and with short texts to the
+fastest engine (TTS_LOCAL_SHORT_TEXTS).
+
+The neural voice is the fake streaming backend on the TTS service; during
+the outage its connection times out. The network check only notices the
+outage a few utterances late (it is refreshed in the background), so the
+circuit breaker and the replay on the next backend carry those. The local
+engine is a stub with a fixed start-up time.
+
+Per flow: time to first audio (p50) for cached phrases, other short texts
+and long ones, utterances spoken vs failed (not heard at all), and
+which backend spoke them.
+
+Usage: python benchmarks/bench_tts_backends.py [--playback-speed 4] [--local-startup 0.06]
+"""
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import statistics
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio.speech_queue import SpeechQueue
+from src.audio.tts_backends import TTSBackendRegistry, StreamBackend, LocalBackend
+from src.audio.tts_cache import TTSCache
+from src.audio.tts_service import TTSService
+from src.utils.logger import logger
+from tts_fixtures import FakeCommunicate, FakeOutput, SECONDS_PER_CHAR
+
+VOICE, RATE = "es-ES-AlvaroNeural", "+0%"
+CACHED = ["Detenido.", "Subiendo volumen", "Bajando volumen"]
+SHORT = CACHED + ["Abriendo chrome", "Abriendo spotify", "Cerrando notepad"]
+LONG = ["Claro, te explico con calma cómo funciona la memoria de trabajo del asistente.",
+        "He encontrado tres archivos recientes en la carpeta de documentos del proyecto.",
+        "Mañana por la mañana se esperan lluvias débiles y una temperatura máxima de dieciocho grados.",
+        "Recuerda que la reunión con el equipo de diseño se movió al jueves a las diez."]
+SESSION = [SHORT[i % len(SHORT)] if i % 3 else LONG[i // 3 % len(LONG)] for i in range(24)]
+OUTAGE = range(9, 18)  # Utterances spoken while the network is down
+DETECTED = 3  # The network check notices the outage after this many of them
+
+class TimeoutCommunicate(FakeCommunicate):
+    """The network is down: the connection attempt times out"""
+    timeout = 0.5
+
+    async def stream(self):
+        await asyncio.sleep(self.timeout)
+        raise OSError("Cannot connect to host speech.platform.bing.com:443")
+        yield
+
+class FakeEngine:
+    """Local engine stand-in: a fixed start-up, then speaks in real time (scaled)"""
+
+    def __init__(self, startup, speed):
+        self.engine = self
+        self.startup = startup
+        self.speed = speed
+        self.started_at = None
+
+    def play(self, text, stop):
+        requested = time.perf_counter()
+        if stop.wait(self.startup):
+            return None
+        self.started_at = time.perf_counter()
+        stop.wait(len(text) * SECONDS_PER_CHAR / self.speed)
+        return self.started_at - requested
+
+class Session:
+    def __init__(self, speed, local_startup, cache_dir):
+        self.state = {"online": True, "network_check": True}
+        self.service = TTSService(workers=2).start()
+        self.cache = TTSCache(cache_dir, service=self.service)
+        self.cache.prewarm(VOICE, CACHED, RATE, FakeCommunicate)
+        self.output = FakeOutput(speed=speed)
+        self.engine = FakeEngine(local_startup, speed)
+
+    def communicate(self, text):
+        return FakeCommunicate(text) if self.state["online"] else TimeoutCommunicate(text)
+
+    def synthesize(self, text):
+        return self.cache.stream(VOICE, text, RATE, self.communicate)
+
+    def run(self, label, queue, backends=None):
+        results = []
+        for i, text in enumerate(SESSION):
+            self.state["online"] = i not in OUTAGE
+            self.state["network_check"] = i not in OUTAGE[DETECTED:]
+            self.output.started_at = self.engine.started_at = None
+            started = time.perf_counter()
+            item = queue.say(text)
+            queue.wait()
+            audio = [t for t in (self.output.started_at, self.engine.started_at) if t is not None]
+            first = (max(audio) - started) * 1000 if item.state == "played" and audio else None
+            results.append((text, first))
+        p50 = lambda texts: statistics.median(f for text, f in results if text in texts and f is not None)
+        spoken = sum(1 for _, f in results if f is not None)
+        short = [text for text in SHORT if text not in CACHED]
+        print(f"{label:12s} {p50(CACHED):9.0f}ms {p50(short):9.0f}ms {p50(LONG):9.0f}ms "
+              f"{spoken:>4d}/{len(SESSION)} {len(SESSION) - spoken:>8d}")
+        if backends is not None:
+            stats = backends.get_stats()
+            chosen = Counter({name: s["chosen"] for name, s in stats.items() if isinstance(s, dict)})
+            print(f"{'':12s} chosen: {dict(chosen)}, choose overhead {stats['choose_ms_avg'] * 1000:.0f}us")
+
+    def stop(self):
+        self.service.stop()
+
+def neural_only(session):
+    queue = SpeechQueue(synthesize=lambda text, group: session.synthesize(text), play=session.output.play, discard=lambda stream: stream.cancel())
+    session.run("neural", queue)
+
+def registry(session, short_texts_local=False):
+    backends = TTSBackendRegistry([
+        StreamBackend("cache", session.synthesize, session.output, prior_latency=0.01, requires_network=False,
+                      has=lambda text: (VOICE, text, RATE) in session.cache),
+        StreamBackend("neural", session.synthesize, session.output),
+        LocalBackend(session.engine)
+    ], network=lambda: session.state["network_check"], short_texts_local=short_texts_local)
+    queue = SpeechQueue(backends.synthesize, backends.play, backends.discard)
+    session.run("short local" if short_texts_local else "registry", queue, backends)
+
+def registry_short_local(session):
+    registry(session, short_texts_local=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="TTS backend registry benchmark")
+    parser.add_argument("--playback-speed", type=float, default=4.0, help="play faster than real time to keep the run short")
+    parser.add_argument("--first-chunk", type=float, default=0.25)
+    parser.add_argument("--local-startup", type=float, default=0.06)
+    args = parser.parse_args()
+    logger.setLevel(logging.CRITICAL)  # Connection errors are expected during the outage
+    FakeCommunicate.first_chunk = args.first_chunk
+    print(f"{len(SESSION)} utterances ({sum(t in SHORT for t in SESSION)} short), network down for {len(OUTAGE)} "
+          f"(noticed after {DETECTED}); neural first chunk {args.first_chunk * 1000:.0f} ms, "
+          f"local start-up {args.local_startup * 1000:.0f} ms\n")
+    print(f"{'':12s} {'cached p50':>11s} {'short p50':>11s} {'long p50':>11s} {'spoken':>7s} {'failed':>8s}")
+    for flow in (neural_only, registry, registry_short_local):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            session = Session(args.playback_speed, args.local_startup, cache_dir)
+            flow(session)
+            session.stop()
+
+if __name__ == "__main__":
+    main()
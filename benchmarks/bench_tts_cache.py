@@ -0,0 +1,95 @@
+"""
+Benchmark: TTS phrase cache (TTSCache) on a simulated session.
+
+Every spoken phrase used to be synthesized over the network, including the
+fixed locale responses ("Activado. ¿En qué puedo ayudarte?", "Detenido.",
+"Subiendo volumen"...). The session below mixes those, recurring templated
+phrases ("Abriendo chrome", menu options) and one-off chat replies, and is
+played through NeuralTTS' path (TTSCache.stream -> StreamPlayer) on the fake
+streaming backend, with and without the cache:
+
+  time to first audio   p50 / p95, hits vs misses
+  hit rate, estimated time saved, disk used
+
+Usage: python benchmarks/bench_tts_cache.py [--utterances 120] [--first-chunk 0.35]
+"""
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import threading
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio.tts_cache import TTSCache, locale_phrases
+from src.config.locales import get_text
+from tts_fixtures import FakeCommunicate, FakeOutput
+
+VOICE = "es-ES-AlvaroNeural"
+RATE = "+0%"
+
+def session(count, rng):
+    fixed = ["wake_response", "stopped_response", "volume_up", "volume_down", "mute", "ask_selection",
+             "no_selection", "sleep_response", "analyzing_screen"]
+    apps = ["chrome", "spotify", "la calculadora", "word", "el explorador"]
+    texts = []
+    for i in range(count):
+        kind = rng.choice(["fixed", "template", "reply"], p=[0.5, 0.25, 0.25])
+        if kind == "fixed":
+            texts.append(get_text(rng.choice(fixed), "es-ES"))
+        elif kind == "template":
+            texts.append(get_text("opening", "es-ES", rng.choice(apps)))
+        else:
+            texts.append(f"Respuesta número {i}: el resultado de tu consulta es {rng.integers(1000)}.")
+    return texts
+
+def play(stream):
+    player = FakeOutput(speed=50.0)
+    player.play(stream, threading.Event())
+    return player.metrics["first_audio"]
+
+def main():
+    parser = argparse.ArgumentParser(description="TTS phrase cache benchmark")
+    parser.add_argument("--utterances", type=int, default=120)
+    parser.add_argument("--first-chunk", type=float, default=0.35, help="network latency of the fake backend")
+    args = parser.parse_args()
+    FakeCommunicate.first_chunk = args.first_chunk
+    FakeCommunicate.speedup = 50.0
+    texts = session(args.utterances, np.random.default_rng(22))
+    cache_dir = tempfile.mkdtemp()
+
+    cache = TTSCache(cache_dir=cache_dir)
+    FakeCommunicate.first_chunk = 0.0  # Pre-warm timing is not part of the session
+    phrases = locale_phrases("es-ES")
+    cache.prewarm(VOICE, phrases, RATE, FakeCommunicate)
+    FakeCommunicate.first_chunk = args.first_chunk
+    print(f"Pre-warmed {len(phrases)} locale phrases ({cache.size / 1024:.0f} KB)\n")
+
+    uncached = [play(cache.service.synthesize(FakeCommunicate(text), text)) for text in texts]
+    calls = FakeCommunicate.calls
+    cached, hit = [], []
+    for text in texts:
+        hits = cache.stats["hits"]
+        cached.append(play(cache.stream(VOICE, text, RATE, FakeCommunicate)))
+        hit.append(cache.stats["hits"] > hits)
+    network_calls = FakeCommunicate.calls - calls
+
+    ms = lambda values, q: np.percentile(np.array(values) * 1000, q)
+    print(f"{len(texts)} utterances, first chunk after {args.first_chunk * 1000:.0f} ms\n")
+    print(f"{'time to first audio':26s} {'p50':>8s} {'p95':>8s}")
+    print(f"{'no cache':26s} {ms(uncached, 50):6.1f}ms {ms(uncached, 95):6.1f}ms")
+    print(f"{'cache':26s} {ms(cached, 50):6.1f}ms {ms(cached, 95):6.1f}ms")
+    print(f"{'  hits':26s} {ms([t for t, h in zip(cached, hit) if h], 50):6.1f}ms {ms([t for t, h in zip(cached, hit) if h], 95):6.1f}ms")
+    print(f"{'  misses':26s} {ms([t for t, h in zip(cached, hit) if not h], 50):6.1f}ms {ms([t for t, h in zip(cached, hit) if not h], 95):6.1f}ms")
+
+    stats = cache.get_stats()
+    print(f"\nHit rate {100 * stats['hit_rate']:.0f}% ({stats['hits']}/{stats['hits'] + stats['misses']}), "
+          f"network syntheses {network_calls} vs {len(texts)}, "
+          f"estimated time saved {stats['estimated_latency_saved']:.1f}s")
+    print(f"Disk: {stats['entries']} entries, {stats['bytes'] / 1024:.0f} KB (stored {stats['stored']}, evicted {stats['evicted']})")
+    shutil.rmtree(cache_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: in-memory streamed TTS playback vs the temp MP3 file flow.
+
+Before: NeuralTTS saved each utterance to a uuid-named MP3 under
+Settings.LOGS_DIR (Communicate.save), loaded it into pygame once complete,
+then slept 0.1 s and deleted it. Now the Communicate.stream() chunks go
+into an in-memory AudioByteStream and a StreamPlayer starts playing as soon
+as the first frames are there.
+
+Both flows run on the fake streaming backend (first chunk after 200 ms,
+audio 5x faster than real time) with a clock-based output, measuring per
+utterance:
+  time to first audio   from the synthesis request to playback start
+  file writes           files opened for writing / removed
+  total                 until playback (and cleanup) ends
+
+Usage: python benchmarks/bench_tts_memory.py [--utterances 8] [--playback-speed 4]
+"""
+import os
+import sys
+import time
+import uuid
+import asyncio
+import builtins
+import argparse
+import tempfile
+import threading
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio.tts_service import TTSService
+from tts_fixtures import FakeCommunicate, FakeOutput, mp3_seconds
+
+SENTENCES = [
+    "Claro, ya abro el navegador.",
+    "El archivo que buscas está en la carpeta de documentos.",
+    "Hoy la temperatura máxima será de veinticuatro grados, con cielo despejado por la tarde.",
+    "Listo.",
+    "He encontrado tres reuniones para mañana: a las nueve, a las once y a las cuatro.",
+    "El volumen está al cincuenta por ciento.",
+    "Voy a buscar esa información en internet y te leo los primeros resultados.",
+    "Recordatorio creado.",
+]
+
+class FileCounter:
+    """Counts files opened for writing and removed while active"""
+
+    def __init__(self):
+        self.writes = 0
+        self.removes = 0
+
+    def __enter__(self):
+        self._open, self._remove = builtins.open, os.remove
+
+        def counting_open(file, mode="r", *args, **kwargs):
+            if any(flag in mode for flag in "wax+"):
+                self.writes += 1
+            return self._open(file, mode, *args, **kwargs)
+
+        def counting_remove(path, *args, **kwargs):
+            self.removes += 1
+            return self._remove(path, *args, **kwargs)
+
+        builtins.open, os.remove = counting_open, counting_remove
+        return self
+
+    def __exit__(self, *exc):
+        builtins.open, os.remove = self._open, self._remove
+
+def temp_file_flow(text, logs_dir, speed):
+    """The previous NeuralTTS._synthesize/_play/_discard"""
+    started = time.perf_counter()
+    path = os.path.join(logs_dir, f"speech_{uuid.uuid4().hex}.mp3")
+    asyncio.run(FakeCommunicate(text).save(path))
+    with open(path, "rb") as f:  # pygame.mixer.music.load
+        seconds = mp3_seconds(f.read())
+    first_audio = time.perf_counter() - started
+    time.sleep(seconds / speed)
+    time.sleep(0.1)
+    os.remove(path)
+    return first_audio, time.perf_counter() - started
+
+def memory_flow(text, speed, service):
+    started = time.perf_counter()
+    player = FakeOutput(speed=speed)
+    stream = service.synthesize(FakeCommunicate(text), text)
+    player.play(stream, threading.Event())
+    return player.metrics["first_audio"], time.perf_counter() - started, player.stalls
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory TTS playback benchmark")
+    parser.add_argument("--utterances", type=int, default=len(SENTENCES))
+    parser.add_argument("--playback-speed", type=float, default=4.0, help="play faster than real time to keep the run short")
+    args = parser.parse_args()
+    texts = [SENTENCES[i % len(SENTENCES)] for i in range(args.utterances)]
+    logs_dir = tempfile.mkdtemp()
+
+    with FileCounter() as before:
+        old = [temp_file_flow(text, logs_dir, args.playback_speed) for text in texts]
+    service = TTSService().start()
+    with FileCounter() as after:
+        new = [memory_flow(text, args.playback_speed, service) for text in texts]
+    service.stop()
+    os.rmdir(logs_dir)
+
+    print(f"{len(texts)} utterances, first chunk after {FakeCommunicate.first_chunk * 1000:.0f} ms, "
+          f"audio {FakeCommunicate.speedup:.0f}x faster than real time\n")
+    print(f"{'':26s} {'temp MP3':>10s} {'in memory':>10s}")
+    for label, index in (("time to first audio", 0), ("total per utterance", 1)):
+        old_ms = statistics.median(r[index] for r in old) * 1000
+        new_ms = statistics.median(r[index] for r in new) * 1000
+        print(f"{label + ' (p50)':26s} {old_ms:8.0f}ms {new_ms:8.0f}ms")
+    worst_old = max(r[0] for r in old) * 1000
+    worst_new = max(r[0] for r in new) * 1000
+    print(f"{'time to first audio (max)':26s} {worst_old:8.0f}ms {worst_new:8.0f}ms")
+    print(f"{'file writes':26s} {before.writes / len(texts):10.1f} {after.writes / len(texts):10.1f}")
+    print(f"{'file removes':26s} {before.removes / len(texts):10.1f} {after.removes / len(texts):10.1f}")
+    print(f"\nPlayback stalls while streaming: {sum(r[2] for r in new)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark: persistent TTS service loop (TTSService) vs a thread and
+asyncio.run() per utterance, against a local fake websocket TTS server.
+
+  overhead   time to first chunk minus the server's own delays (handshake
+             + first audio), for short utterances spoken one after another
+  gaps       silence between the sentences of a multi-sentence reply:
+             serial (each sentence synthesized when the previous one has
+             played, as with per-utterance speak()) vs pipelined (the
+             SpeechQueue.say_stream on the service: sentence N+1 is synthesized
+             while N plays)
+
+edge-tts opens a websocket per request (its ClientSession owns and closes
+any connector passed in), so connections are not reused: the service hides
+the handshake by overlapping it with playback instead.
+
+Usage: python benchmarks/bench_tts_service.py [--utterances 40] [--handshake 0.08] [--first-audio 0.15]
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import threading
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio.tts_service import TTSService
+from src.audio.tts_stream import AudioByteStream, fill_stream
+from src.audio.speech_queue import SpeechQueue
+from src.audio.speech_stream import SentenceSegmenter
+from fake_tts_server import FakeTTSServer
+from tts_fixtures import FakeOutput
+
+REPLY = ("Claro, te explico cómo funciona. Primero abro la carpeta de documentos. "
+         "Después busco el archivo más reciente. Si hay varios, te leo las opciones. "
+         "Tú eliges el número que quieras. Y yo lo abro al momento.")
+
+def synthesize_per_utterance(communicate, text=""):
+    """The previous tts_stream.synthesize_stream: a new thread and asyncio.run() per utterance"""
+    stream = AudioByteStream(text)
+
+    def run():
+        error = None
+        try:
+            asyncio.run(fill_stream(communicate, stream))
+        except Exception as e:
+            error = e
+        stream.close(error)
+
+    threading.Thread(target=run, daemon=True).start()
+    return stream
+
+def first_chunk(stream):
+    stream.wait(1, timeout=10)
+    return stream.first_chunk - stream.created
+
+def overhead(server, synthesize, count):
+    delays = server.handshake + server.first_audio
+    samples = []
+    for i in range(count):
+        stream = synthesize(server.communicate(f"Frase corta número {i}."), "")
+        samples.append(first_chunk(stream) - delays)
+        stream.wait(stream.size + 10 ** 9, timeout=10)  # Let it finish
+    return samples
+
+class Recorder:
+    """play() for the speech queue that records when each sentence's audio starts and ends"""
+
+    def __init__(self, speed):
+        self.speed = speed
+        self.spans = []
+
+    def play(self, stream, stop=None):
+        player = FakeOutput(speed=self.speed)
+        player.play(stream, stop or threading.Event())
+        self.spans.append((player.started_at, time.perf_counter()))
+
+    def gaps(self):
+        return [start - end for (_, end), (start, _) in zip(self.spans, self.spans[1:])]
+
+def main():
+    parser = argparse.ArgumentParser(description="TTS service loop benchmark")
+    parser.add_argument("--utterances", type=int, default=40)
+    parser.add_argument("--handshake", type=float, default=0.08)
+    parser.add_argument("--first-audio", type=float, default=0.15)
+    parser.add_argument("--playback-speed", type=float, default=4.0)
+    args = parser.parse_args()
+
+    with FakeTTSServer(handshake=args.handshake, first_audio=args.first_audio) as server:
+        service = TTSService(workers=2).start()
+        per_utterance = overhead(server, synthesize_per_utterance, args.utterances)
+        persistent = overhead(server, service.synthesize, args.utterances)
+
+        serial = Recorder(args.playback_speed)
+        sentences = SentenceSegmenter().split(REPLY)
+        started = time.perf_counter()
+        for sentence in sentences:
+            serial.play(synthesize_per_utterance(server.communicate(sentence), sentence))
+        serial_total = time.perf_counter() - started
+
+        pipelined = Recorder(args.playback_speed)
+        speech = SpeechQueue(synthesize=lambda text, group: service.synthesize(server.communicate(text), text),
+                             play=pipelined.play)
+        started = time.perf_counter()
+        speech.say_stream(iter([REPLY]))
+        speech.wait()
+        pipelined_total = time.perf_counter() - started
+        service.stop()
+
+    print(f"Fake server: handshake {args.handshake * 1000:.0f} ms, first audio {args.first_audio * 1000:.0f} ms, "
+          f"{server.connections} connections\n")
+    print(f"Overhead per utterance ({args.utterances} utterances): thread + asyncio.run "
+          f"p50 {statistics.median(per_utterance) * 1000:.2f} ms, max {max(per_utterance) * 1000:.2f} ms; "
+          f"service loop p50 {statistics.median(persistent) * 1000:.2f} ms, max {max(persistent) * 1000:.2f} ms")
+    print(f"\n{str(len(sentences)) + '-sentence reply':27s} {'gap p50':>9s} {'gap max':>9s} {'total':>8s}")
+    for label, recorder, total in (("serial", serial, serial_total), ("pipelined", pipelined, pipelined_total)):
+        gaps = recorder.gaps()
+        print(f"{label:27s} {statistics.median(gaps) * 1000:7.0f}ms {max(gaps) * 1000:7.0f}ms {total:7.2f}s")
+    print(f"\nService: {service.stats['requests']} requests, {service.stats['failed']} failed")
+
+if __name__ == "__main__":
+    main()
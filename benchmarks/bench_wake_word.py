@@ -0,0 +1,178 @@
+"""
+Benchmark: offline keyword spotting (KeywordSpotter) for the wake word.
+
+The transcription backend needs a recognize_google round trip (1-3 s,
+network) for every standby snippet. The local backend is measured here on
+streamed fixtures:
+
+  detection   keyword utterances (varied pitch, tempo, level, background,
+              with and without a "hey" before) detected
+  latency     from the end of the keyword to the detection (stream time:
+              VAD hangover) plus matching time
+  false/hour  detections in a stream without the keyword (other words,
+              noise, music, hum, typing)
+  CPU         processing time per second of audio (one core)
+
+Synthetic by default; recorded fixtures: --templates DIR (enrollment WAVs),
+--positives DIR (keyword WAVs), --negatives WAV [WAV...] (background audio
+without the wake word). All 16 kHz, 16-bit mono.
+
+Usage: python benchmarks/bench_wake_word.py [--minutes 15] [--positives-count 60]
+"""
+import os
+import sys
+import time
+import glob
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio.kws import KeywordSpotter
+from src.audio.audio_source import WavFileSource
+from audio_fixtures import word, noise, hum, chord, clicks, silence, SAMPLE_RATE
+
+KEYWORD = (2, 0, 1)  # "e-le-ven"
+HEY = (2,)
+FRAME = 480
+
+def say(vowels, rng, **options):
+    options.setdefault("pitch", rng.uniform(100, 220))
+    options.setdefault("level", rng.uniform(2000, 10000))
+    return word(vowels, rng, syllable_rate=rng.uniform(3.3, 4.7), **options)
+
+def contains_keyword(vowels):
+    return any(tuple(vowels[i:i + len(KEYWORD)]) == KEYWORD for i in range(len(vowels) - len(KEYWORD) + 1))
+
+def phrase(rng):
+    """1-5 words spoken together, none of them (nor their joins) containing the keyword"""
+    while True:
+        words = [tuple(int(v) for v in rng.integers(0, 5, rng.integers(1, 5))) for _ in range(rng.integers(1, 6))]
+        if not contains_keyword(sum(words, ())):
+            return np.concatenate([say(w, rng) for w in words])
+
+def with_room(event, rng, background):
+    room = noise(len(event) / SAMPLE_RATE, rng, level=background)
+    return np.clip(event.astype(np.int32) + room, -32768, 32767).astype(np.int16)
+
+def positive_stream(count, rng):
+    """Keyword utterances between pauses; returns (audio, keyword end positions)"""
+    parts, ends, position = [], [], 0
+    for i in range(count):
+        pause = silence(rng.uniform(0.8, 1.5))
+        utterance = say(KEYWORD, rng)
+        if i % 3 == 1:
+            utterance = np.concatenate([say(HEY, rng), silence(0.05), utterance])
+        parts += [pause, utterance]
+        position += len(pause) + len(utterance)
+        ends.append(position)
+    parts.append(silence(1.0))
+    audio = np.concatenate(parts)
+    return with_room(audio, rng, rng.choice([80, 150, 300])), ends
+
+def negative_stream(seconds, rng):
+    parts, total = [], 0
+    makers = [
+        lambda: phrase(rng),
+        lambda: noise(rng.uniform(1, 4), rng, level=rng.uniform(500, 3000), color=rng.choice(["white", "pink"])),
+        lambda: chord(rng.uniform(2, 6), level=rng.uniform(1000, 4000)),
+        lambda: hum(rng.uniform(2, 6)),
+        lambda: clicks(rng.uniform(1, 4), rng=rng),
+    ]
+    while total < seconds * SAMPLE_RATE:
+        chunk = np.concatenate([silence(rng.uniform(0.3, 1.2)), makers[rng.choice(len(makers), p=[0.6, 0.1, 0.1, 0.1, 0.1])]()])
+        parts.append(chunk)
+        total += len(chunk)
+    return with_room(np.concatenate(parts), rng, 100)
+
+def run(spotter, audio):
+    """Feeds the stream frame by frame: [(segment end position, distance, matching seconds)]"""
+    segments = []
+    detect = spotter.detect
+
+    def timed_detect(segment):
+        started = time.perf_counter()
+        result = detect(segment)
+        segments.append([None, spotter.last_distance, time.perf_counter() - started])
+        return result
+
+    spotter.detect = timed_detect
+    for i in range(len(audio) // FRAME):
+        spotter.feed(audio[i * FRAME:(i + 1) * FRAME])
+        if segments and segments[-1][0] is None:
+            segments[-1][0] = (i + 1) * FRAME
+    spotter.detect = detect
+    return segments
+
+def load(path):
+    return WavFileSource(path, realtime=False).samples
+
+def main():
+    parser = argparse.ArgumentParser(description="Wake word keyword spotting benchmark")
+    parser.add_argument("--minutes", type=float, default=15, help="synthetic audio without the keyword")
+    parser.add_argument("--positives-count", type=int, default=60)
+    parser.add_argument("--enroll", type=int, default=3)
+    parser.add_argument("--templates", help="folder of recorded enrollment WAVs")
+    parser.add_argument("--positives", help="folder of recorded wake word WAVs")
+    parser.add_argument("--negatives", nargs="*", help="recorded WAVs without the wake word")
+    args = parser.parse_args()
+    rng = np.random.default_rng(11)
+
+    templates_dir = args.templates or tempfile.mkdtemp()
+    spotter = KeywordSpotter(templates_dir=templates_dir)
+    if not args.templates:
+        # Enrollment snippets come from standby detections, so they carry room noise
+        for _ in range(args.enroll):
+            spotter.add_template(with_room(np.concatenate([silence(0.3), say(KEYWORD, rng), silence(0.3)]), rng, 150), save=False)
+    print(f"Templates: {len(spotter.templates)}, threshold {spotter.threshold}")
+
+    if args.positives:
+        clips = [load(path) for path in sorted(glob.glob(os.path.join(args.positives, "*.wav")))]
+        parts, ends, position = [], [], 0
+        for clip in clips:
+            parts += [silence(1.0), clip]
+            position += SAMPLE_RATE + len(clip)
+            ends.append(position)
+        audio = np.concatenate(parts + [silence(1.0)])
+    else:
+        audio, ends = positive_stream(args.positives_count, rng)
+    started = time.process_time()
+    positive_segments = run(spotter, audio)
+    cpu_positive = time.process_time() - started
+    # Best-matching segment ending within a second after each keyword
+    keyword_hits = []
+    for end in ends:
+        found = [(distance, position) for position, distance, _ in positive_segments if end <= position <= end + SAMPLE_RATE]
+        keyword_hits.append(min(found) if found else (float("inf"), None))
+
+    if args.negatives:
+        background = np.concatenate([load(path) for path in args.negatives])
+    else:
+        background = negative_stream(args.minutes * 60, rng)
+    started = time.process_time()
+    negative_segments = run(spotter, background)
+    cpu_negative = time.process_time() - started
+    hours = len(background) / SAMPLE_RATE / 3600
+    print(f"{len(ends)} keywords, {hours * 60:.1f} min without the keyword "
+          f"({len(negative_segments)} speech segments: one cloud call each for the transcription backend)\n")
+
+    print(f"{'threshold':>9s} {'detected':>9s} {'false/hour':>11s}")
+    for threshold in sorted({spotter.threshold, 9.0, 10.0, 11.0, 12.0, 13.0}):
+        detected = sum(distance <= threshold for distance, _ in keyword_hits)
+        false_accepts = sum(distance <= threshold for _, distance, _ in negative_segments)
+        marker = "  <- Settings.WAKE_WORD_KWS_THRESHOLD" if threshold == spotter.threshold else ""
+        print(f"{threshold:9.1f} {100 * detected / len(ends):8.1f}% {false_accepts / hours:11.1f}{marker}")
+
+    latencies = [(position - end) / SAMPLE_RATE * 1000 for (distance, position), end in zip(keyword_hits, ends)
+                 if distance <= spotter.threshold]
+    match_ms = np.array([seconds for _, _, seconds in positive_segments + negative_segments]) * 1000
+    if latencies:
+        print(f"\nLatency after the keyword: p50 {np.percentile(latencies, 50):.0f} ms, p95 {np.percentile(latencies, 95):.0f} ms"
+              f" (+ matching p50 {np.percentile(match_ms, 50):.1f} ms, p95 {np.percentile(match_ms, 95):.1f} ms)")
+    audio_seconds = (len(audio) + len(background)) / SAMPLE_RATE
+    cpu = cpu_positive + cpu_negative
+    print(f"CPU: {cpu:.1f}s for {audio_seconds:.0f}s of audio = {100 * cpu / audio_seconds:.2f}% of one core")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Local fake of the edge-tts websocket service, for the TTS benchmarks.
+
+FakeTTSServer speaks just enough RFC 6455 (HTTP upgrade, masked client
+frames, unmasked server frames) over asyncio streams: per connection it
+reads a text frame with the request, waits `first_audio` seconds, sends the
+MP3 (tts_fixtures frames) in binary frames faster than real time, then a
+"turn.end" text frame. `handshake` seconds are added before the upgrade
+response (TLS + websocket round trips to the real service).
+
+WebSocketCommunicate is the client: like edge_tts.Communicate, every
+stream() opens its own connection.
+"""
+import os
+import json
+import base64
+import struct
+import asyncio
+import hashlib
+import threading
+
+from tts_fixtures import mp3_frames, FRAME_BYTES, FRAME_SECONDS, SECONDS_PER_CHAR
+
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+def accept_key(key):
+    return base64.b64encode(hashlib.sha1((key + GUID).encode()).digest()).decode()
+
+async def send_frame(writer, opcode, payload, mask=False):
+    header = bytes([0x80 | opcode])
+    length = len(payload)
+    bit = 0x80 if mask else 0
+    if length < 126:
+        header += bytes([bit | length])
+    elif length < 65536:
+        header += bytes([bit | 126]) + struct.pack("!H", length)
+    else:
+        header += bytes([bit | 127]) + struct.pack("!Q", length)
+    if mask:
+        key = os.urandom(4)
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+        header += key
+    writer.write(header + payload)
+    await writer.drain()
+
+async def read_frame(reader):
+    """(opcode, payload)"""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    key = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if key:
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+    return first & 0x0F, payload
+
+class FakeTTSServer:
+    """Runs on its own thread and loop; use as a context manager"""
+
+    def __init__(self, handshake=0.08, first_audio=0.15, speedup=5.0, chunk_bytes=4096):
+        self.handshake = handshake
+        self.first_audio = first_audio
+        self.speedup = speedup
+        self.chunk_bytes = chunk_bytes
+        self.connections = 0
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+            headers = dict(line.split(": ", 1) for line in request.decode().split("\r\n")[1:] if ": " in line)
+            await asyncio.sleep(self.handshake)
+            writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                          f"Sec-WebSocket-Accept: {accept_key(headers['Sec-WebSocket-Key'])}\r\n\r\n").encode())
+            await writer.drain()
+            _, payload = await read_frame(reader)
+            text = json.loads(payload)["text"]
+            data = mp3_frames(len(text) * SECONDS_PER_CHAR)
+            await asyncio.sleep(self.first_audio)
+            for i in range(0, len(data), self.chunk_bytes):
+                chunk = data[i:i + self.chunk_bytes]
+                await send_frame(writer, 0x2, chunk)
+                await asyncio.sleep(len(chunk) / FRAME_BYTES * FRAME_SECONDS / self.speedup)
+            await send_frame(writer, 0x1, b"Path:turn.end")
+            await read_frame(reader)  # Close
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def __enter__(self):
+        async def serve():
+            server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(serve(), self._loop)
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *exc):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def communicate(self, text, voice=None, rate="+0%"):
+        return WebSocketCommunicate(text, voice, rate, port=self.port)
+
+class WebSocketCommunicate:
+    """edge_tts.Communicate stand-in that talks to FakeTTSServer"""
+
+    def __init__(self, text, voice=None, rate="+0%", port=None):
+        self.text = text
+        self.voice = voice
+        self.rate = rate
+        self.port = port
+
+    async def stream(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        try:
+            key = base64.b64encode(os.urandom(16)).decode()
+            writer.write((f"GET /tts HTTP/1.1\r\nHost: 127.0.0.1:{self.port}\r\nUpgrade: websocket\r\n"
+                          f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+            await writer.drain()
+            response = await reader.readuntil(b"\r\n\r\n")
+            if accept_key(key) not in response.decode():
+                raise ConnectionError("websocket handshake failed")
+            request = json.dumps({"text": self.text, "voice": self.voice, "rate": self.rate}).encode()
+            await send_frame(writer, 0x1, request, mask=True)
+            while True:
+                opcode, payload = await read_frame(reader)
+                if opcode == 0x2:
+                    yield {"type": "audio", "data": payload}
+                elif opcode == 0x1 and payload.endswith(b"turn.end"):
+                    break
+            await send_frame(writer, 0x8, b"", mask=True)
+        finally:
+            writer.close()
@@ -0,0 +1,113 @@
+"""
+Fake TTS backend and audio output for the speech benchmarks and tests.
+
+FakeCommunicate mirrors edge_tts.Communicate (stream() / save()) with a
+network-like timing: a first-chunk latency, then MP3 data faster than real
+time in arbitrary chunk sizes. The MP3 is a sequence of valid frame headers
+(MPEG-2 layer III, 24 kHz mono 48 kbps: edge-tts' default format), 24 ms each.
+FakeOutput is a StreamPlayer whose "channel" is a clock.
+"""
+import os
+import sys
+import time
+import asyncio
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio.tts_stream import StreamPlayer, mp3_frames_end
+
+FRAME_HEADER = bytes([0xFF, 0xF3, 0x64, 0xC4])
+FRAME_BYTES = 144
+FRAME_SECONDS = 0.024
+SECONDS_PER_CHAR = 0.065  # Spoken duration of the text
+
+def mp3_frames(seconds):
+    count = max(1, int(seconds / FRAME_SECONDS))
+    frame = FRAME_HEADER + bytes(FRAME_BYTES - len(FRAME_HEADER))
+    return frame * count
+
+def mp3_seconds(data):
+    return mp3_frames_end(data) // FRAME_BYTES * FRAME_SECONDS
+
+class FakeCommunicate:
+    """edge_tts.Communicate stand-in"""
+    first_chunk = 0.2
+    speedup = 5.0  # Audio arrives this much faster than real time
+    chunk_bytes = 1000
+    calls = 0
+
+    def __init__(self, text, voice=None, rate="+0%"):
+        self.text = text
+        self.voice = voice
+        self.rate = rate
+
+    async def stream(self):
+        FakeCommunicate.calls += 1
+        data = mp3_frames(len(self.text) * SECONDS_PER_CHAR)
+        await asyncio.sleep(self.first_chunk)
+        for i in range(0, len(data), self.chunk_bytes):
+            chunk = data[i:i + self.chunk_bytes]
+            yield {"type": "audio", "data": chunk}
+            await asyncio.sleep(len(chunk) / FRAME_BYTES * FRAME_SECONDS / self.speedup)
+
+    async def save(self, path):
+        with open(path, "wb") as f:
+            async for chunk in self.stream():
+                if chunk["type"] == "audio":
+                    f.write(chunk["data"])
+
+class FakeOutput(StreamPlayer):
+    """
+    Plays "PCM" on the clock: one byte per MP3 frame decoded. Counts stalls
+    (the channel ran dry before the next part was queued).
+    """
+
+    def __init__(self, first_bytes=2048, poll=0.005, speed=1.0):
+        super().__init__(first_bytes, poll)
+        self.speed = speed
+        self.until = 0.0
+        self.queued = None
+        self.started_at = None
+        self.stalls = 0
+        self.played = 0.0
+
+    def _duration(self, pcm):
+        return len(pcm) * FRAME_SECONDS / self.speed
+
+    def _decode(self, mp3):
+        return bytes(mp3_frames_end(mp3) // FRAME_BYTES)
+
+    def _advance(self):
+        now = time.perf_counter()
+        if self.queued is not None and now >= self.until:
+            self.until += self.queued  # The queued part starts gaplessly
+            self.queued = None
+        return now
+
+    def _start(self, pcm):
+        self.started_at = time.perf_counter()
+        self.until = self.started_at + self._duration(pcm)
+        self.played += self._duration(pcm)
+
+    def _can_queue(self):
+        self._advance()
+        return self.queued is None
+
+    def _queue(self, pcm):
+        now = self._advance()
+        duration = self._duration(pcm)
+        self.played += duration
+        if now > self.until:
+            # The channel ran dry: this part starts late
+            self.stalls += now > self.until + self.poll * 3
+            self.until = now + duration
+        else:
+            self.queued = duration
+
+    def busy(self):
+        now = self._advance()
+        return self.queued is not None or now < self.until
+
+    def halt(self):
+        self.until = 0.0
+        self.queued = None
@@ -1,21 +1,53 @@
 from src.audio.speech_recognition import SpeechRecognizer
+from src.config.settings import Settings
 from src.audio.neural_tts import NeuralTTS
+from src.audio.speech_queue import SYSTEM
 from src.utils.sound_effects import SoundEffects
 from src.utils.logger import logger
 
 class AudioManager:
     def __init__(self):
-        self.recognizer = SpeechRecognizer()
+        self.pipeline = None
+        self.capture = self._open_capture()
+        if Settings.AUDIO_PIPELINE and self.capture is not None:
+            from src.audio.audio_pipeline import AudioPipeline
+            # Segmentation and recognition run continuously in their own threads
+            self.recognizer = SpeechRecognizer(open_microphone=False)
+            self.pipeline = AudioPipeline(self.capture, recognize=self.recognizer.recognize_item)
+            self.recognizer.pipeline = self.pipeline
+            self.pipeline.start()
+        else:
+            self.recognizer = SpeechRecognizer(capture=self.capture)
         self.tts = NeuralTTS()
         self.sfx = SoundEffects()
+
+    def _open_capture(self):
+        """One always-open microphone stream shared by every listener (None: each opens its own)"""
+        if not Settings.SHARED_MICROPHONE:
+            return None
+        try:
+            from src.audio.capture_service import CaptureService
+            from src.audio.audio_source import MicrophoneSource
+            return CaptureService(MicrophoneSource()).start()
+        except Exception as e:
+            logger.error(f"Could not open the shared microphone stream: {e}")
+            return None
         
     def listen(self):
         """Listen for user input"""
         return self.recognizer.listen()
         
-    def speak(self, text):
-        """Speak the given text"""
-        self.tts.speak(text)
+    def speak(self, text, priority=SYSTEM, interrupt=True):
+        """Speak the given text (replaces current speech unless interrupt=False)"""
+        self.tts.speak(text, priority, interrupt)
+        
+    def speak_all(self, texts, priority=SYSTEM):
+        """Speak several texts back to back, e.g. a menu"""
+        self.tts.speak_all(texts, priority)
+        
+    def speak_stream(self, chunks):
+        """Speak a stream of text chunks as they arrive"""
+        self.tts.speak_stream(chunks)
         
     def play_sound(self, name):
         """Play a sound effect"""
@@ -26,6 +58,9 @@ class AudioManager:
         self.tts.stop()
     
     def is_speaking(self):
-        """Check if currently speaking"""
+        """Check if currently speaking (or has speech queued)"""
         return self.tts.is_speaking()
-
+    
+    def wait_speaking(self, timeout=None):
+        """Wait until everything queued has been spoken"""
+        return self.tts.wait(timeout)
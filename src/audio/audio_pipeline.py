@@ -0,0 +1,224 @@
+import time
+import queue
+import threading
+from collections import deque
+from src.utils.logger import logger
+from src.audio.vad import EnergyVAD
+from src.audio.capture_service import CaptureService
+
+class SegmentStage:
+    """
+    Cuts the live stream into utterances: speech starts after `min_speech`
+    seconds of speech frames (with `pre_roll` seconds of audio kept before
+    it) and ends after `end_silence` seconds of non-speech, or at `max_utterance`.
+    Frames are ring views and only positions are tracked; each utterance is
+    copied out of the ring once, when it is emitted.
+    Emits {"audio", "sample_rate", "t": {"speech_start", "speech_end", "segment"}}.
+    """
+
+    def __init__(self, reader, sample_rate, output, vad=None, frame_samples=480,
+                 min_speech=0.15, end_silence=0.5, pre_roll=0.3, max_utterance=10.0):
+        self.reader = reader
+        self.sample_rate = sample_rate
+        self.output = output
+        self.vad = vad or EnergyVAD()
+        self.frame_samples = frame_samples
+        frame_seconds = frame_samples / sample_rate
+        self.min_speech_frames = max(1, int(round(min_speech / frame_seconds)))
+        self.end_silence_frames = max(1, int(round(end_silence / frame_seconds)))
+        self.pre_roll_frames = int(round(pre_roll / frame_seconds))
+        self.max_samples = int(max_utterance * sample_rate)
+        self.utterances = 0
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="AudioSegmenter", daemon=True)
+        self._thread.start()
+
+    def _emit(self, start, end, t):
+        audio, _, _ = self.reader.ring.read_at(start, end - start, timeout=0)
+        if audio is None:
+            return
+        t["segment"] = time.perf_counter()
+        self.utterances += 1
+        self.output.put({"audio": audio.copy(), "sample_rate": self.sample_rate, "t": t})
+
+    def _run(self):
+        history = deque(maxlen=self.pre_roll_frames + self.min_speech_frames)  # Frame start positions
+        start, t = None, None
+        speech_run = silence_run = 0
+        while True:
+            frame = self.reader.read(self.frame_samples)
+            if frame is None:
+                break
+            position = self.reader.position - len(frame)
+            now = time.perf_counter()
+            speech = self.vad.is_speech(frame)
+            if start is None:
+                history.append(position)
+                speech_run = speech_run + 1 if speech else 0
+                if speech_run >= self.min_speech_frames:
+                    start = history[0]
+                    t = {"speech_start": now, "speech_end": now}
+                    silence_run = 0
+                continue
+            if speech:
+                silence_run = 0
+                t["speech_end"] = now
+            else:
+                silence_run += 1
+            end = self.reader.position
+            if silence_run >= self.end_silence_frames or end - start >= self.max_samples:
+                if silence_run:
+                    end -= (silence_run - 1) * self.frame_samples  # Keep a little trailing silence
+                self._emit(start, end, t)
+                start, t = None, None
+                history.clear()
+                speech_run = 0
+        if start is not None:
+            self._emit(start, self.reader.position, t)
+        self.output.put(None)
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+class WorkerStage:
+    """
+    Queue-connected worker: item = fn(item) for every item, timestamped
+    under its name. fn returns None to drop the item (e.g. no speech recognized).
+    """
+
+    def __init__(self, name, fn, input_queue, output_queue):
+        self.name = name
+        self.fn = fn
+        self.input = input_queue
+        self.output = output_queue
+        self.processed = 0
+        self.dropped = 0
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"AudioStage-{self.name}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self.input.get()
+            if item is None:
+                self.output.put(None)
+                return
+            try:
+                result = self.fn(item)
+            except Exception as e:
+                logger.error(f"Audio stage '{self.name}' error: {e}")
+                result = None
+            if result is None:
+                self.dropped += 1
+                continue
+            result["t"][self.name] = time.perf_counter()
+            self.processed += 1
+            self.output.put(result)
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+class AudioPipeline:
+    """
+    capture -> ring buffer -> segmenter (VAD) -> recognize -> [more workers] -> output queue
+
+    One thread owns the audio device; every later stage is a worker
+    connected by a queue, so recognition of one utterance overlaps capture
+    and segmentation of the next, and a slow stage never drops audio.
+    `source` is a shared CaptureService (other consumers keep reading the
+    same stream) or a plain audio source, which gets a private one.
+    `workers` is a list of (name, fn) stages after recognition (intent,
+    TTS...). Each item records when it left every stage, and stats()
+    reports per-stage and end-to-end latency from the end of speech.
+    """
+
+    def __init__(self, source, recognize, workers=(), vad=None, buffer_seconds=None, **segment_options):
+        self._owns_capture = not isinstance(source, CaptureService)
+        self.capture = CaptureService(source, buffer_seconds) if self._owns_capture else source
+        self.stage_names = ["segment", "recognize"] + [name for name, _ in workers]
+
+        segments = queue.Queue()
+        self.segmenter = SegmentStage(
+            self.capture.reader(), self.capture.sample_rate, segments, vad=vad,
+            frame_samples=self.capture.frame_samples, **segment_options
+        )
+        self.workers = []
+        upstream = segments
+        for name, fn in [("recognize", recognize)] + list(workers):
+            downstream = queue.Queue()
+            self.workers.append(WorkerStage(name, fn, upstream, downstream))
+            upstream = downstream
+        self.output = upstream
+        self.latencies = {name: deque(maxlen=500) for name in self.stage_names + ["end_to_end"]}
+        self.finished = False
+
+    def start(self):
+        for stage in reversed(self.workers):
+            stage.start()
+        self.segmenter.start()
+        self.capture.start()
+        logger.info(f"Audio pipeline started: capture -> {' -> '.join(self.stage_names)}")
+        return self
+
+    def stop(self):
+        """Stops the pipeline; a shared capture service keeps running for its other consumers"""
+        if self._owns_capture:
+            self.capture.stop()
+        else:
+            self.segmenter.reader.close()
+
+    def next_item(self, timeout=None, max_age=None):
+        """
+        Next fully processed item (None on timeout or at the end of the input).
+        Items whose speech ended more than max_age seconds ago are skipped.
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            try:
+                item = self.output.get(timeout=remaining) if remaining != 0 else self.output.get_nowait()
+            except queue.Empty:
+                return None
+            if item is None:
+                self.finished = True
+                self.output.put(None)  # Keep reporting the end
+                return None
+            self._record(item)
+            if max_age is not None and time.perf_counter() - item["t"]["speech_end"] > max_age:
+                continue
+            return item
+
+    def next_text(self, timeout=None, max_age=None):
+        item = self.next_item(timeout, max_age)
+        return item.get("text") if item else None
+
+    def _record(self, item):
+        t = item["t"]
+        previous = t["speech_end"]
+        for name in self.stage_names:
+            if name in t:
+                self.latencies[name].append((t[name] - previous) * 1000)
+                previous = t[name]
+        self.latencies["end_to_end"].append((previous - t["speech_end"]) * 1000)
+
+    def stats(self):
+        """{stage: {"count", "p50_ms", "p95_ms"}} plus utterance and drop counters"""
+        report = {}
+        for name, values in self.latencies.items():
+            if values:
+                ordered = sorted(values)
+                report[name] = {
+                    "count": len(ordered),
+                    "p50_ms": ordered[len(ordered) // 2],
+                    "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                }
+        report["utterances"] = self.segmenter.utterances
+        report["dropped"] = {stage.name: stage.dropped for stage in self.workers}
+        report["overrun_samples"] = self.segmenter.reader.dropped
+        return report
@@ -0,0 +1,83 @@
+import time
+import wave
+import numpy as np
+from src.utils.logger import logger
+
+class MicrophoneSource:
+    """
+    Default input device through PyAudio: 16-bit mono frames as int16 arrays.
+    The stream stays open until close().
+    """
+
+    def __init__(self, sample_rate=16000, frame_samples=480, device_index=None):
+        import pyaudio
+        self.sample_rate = sample_rate
+        self.frame_samples = frame_samples
+        self._audio = pyaudio.PyAudio()
+        self._stream = self._audio.open(
+            format=pyaudio.paInt16, channels=1, rate=sample_rate, input=True,
+            frames_per_buffer=frame_samples, input_device_index=device_index
+        )
+        logger.info(f"Microphone stream opened ({sample_rate} Hz, {frame_samples} samples per frame)")
+
+    def read(self):
+        """Next frame (blocks for one frame of audio)"""
+        data = self._stream.read(self.frame_samples, exception_on_overflow=False)
+        return np.frombuffer(data, dtype=np.int16)
+
+    def close(self):
+        try:
+            self._stream.stop_stream()
+            self._stream.close()
+        finally:
+            self._audio.terminate()
+
+class WavFileSource:
+    """
+    Plays a 16-bit WAV file as if it were the microphone (tests, benchmarks).
+    realtime=True paces frames at the real audio rate so latencies match a live
+    mic; realtime=False delivers them as fast as they are read.
+    Returns None at the end (after `tail_silence` seconds of silence, if any).
+    """
+
+    def __init__(self, path, frame_samples=480, realtime=True, tail_silence=0.0):
+        with wave.open(path, "rb") as wav:
+            if wav.getsampwidth() != 2:
+                raise ValueError(f"Only 16-bit WAV files are supported: {path}")
+            self.sample_rate = wav.getframerate()
+            samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+            channels = wav.getnchannels()
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+        if tail_silence:
+            samples = np.concatenate([samples, np.zeros(int(tail_silence * self.sample_rate), dtype=np.int16)])
+        self.samples = samples
+        self.frame_samples = frame_samples
+        self.realtime = realtime
+        self.position = 0
+        self._started = None
+
+    def read(self):
+        if self.position >= len(self.samples):
+            return None
+        if self.realtime:
+            if self._started is None:
+                self._started = time.perf_counter()
+            due = self._started + (self.position + self.frame_samples) / self.sample_rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        frame = self.samples[self.position:self.position + self.frame_samples]
+        self.position += self.frame_samples
+        return frame
+
+    def close(self):
+        self.position = len(self.samples)
+
+def write_wav(path, samples, sample_rate=16000):
+    """Save int16 mono samples as a WAV file"""
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(np.asarray(samples, dtype=np.int16).tobytes())
@@ -0,0 +1,126 @@
+import threading
+from src.config.settings import Settings
+from src.utils.logger import logger
+from src.audio.ring_buffer import AudioRingBuffer
+from src.audio.vad import NoiseFloor
+
+try:
+    from speech_recognition import AudioSource as _AudioSource
+except ImportError:  # Only the legacy listeners need it
+    _AudioSource = object
+
+class CaptureService:
+    """
+    The one open input stream. A capture thread reads frames from the
+    source into a ring buffer; every consumer (wake word, command capture,
+    barge-in, the audio pipeline) follows it through its own reader and
+    gets zero-copy views. The device is opened once and stays open until stop().
+
+    The ambient noise floor is tracked continuously from the live stream,
+    replacing the per-listener adjust_for_ambient_noise() at startup.
+    """
+
+    def __init__(self, source, buffer_seconds=None):
+        self.source = source
+        self.sample_rate = source.sample_rate
+        self.frame_samples = getattr(source, "frame_samples", 480)
+        buffer_seconds = buffer_seconds or Settings.AUDIO_BUFFER_SECONDS
+        self.ring = AudioRingBuffer(int(self.sample_rate * buffer_seconds))
+        self.noise = NoiseFloor(self.sample_rate)
+        self.frames = 0
+        self._stop_flag = threading.Event()
+        self._thread = None
+
+    @property
+    def noise_rms(self):
+        """Current ambient RMS level (None before the first frame)"""
+        return self.noise.rms
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="AudioCapture", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            while not self._stop_flag.is_set():
+                frame = self.source.read()
+                if frame is None:
+                    break
+                self.ring.write(frame)
+                self.noise.update(frame)
+                self.frames += 1
+        except Exception as e:
+            logger.error(f"Audio capture error: {e}")
+        finally:
+            self.ring.close()
+
+    def reader(self):
+        """A new consumer starting at the newest sample"""
+        return self.ring.reader()
+
+    def microphone(self, chunk=1024, max_backlog=0.5):
+        """An sr.Microphone stand-in for the legacy speech_recognition listeners"""
+        return SharedMicrophone(self, chunk=chunk, max_backlog=max_backlog)
+
+    def stop(self):
+        self._stop_flag.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        self.source.close()
+        self.ring.close()
+
+class _ReaderStream:
+    """The `stream` of an sr.AudioSource: read(frames) -> bytes, b"" at the end"""
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    def read(self, size, exception_on_overflow=False):
+        samples = self.reader.read(size)
+        return samples.tobytes() if samples is not None else b""
+
+class SharedMicrophone(_AudioSource):
+    """
+    Drop-in for sr.Microphone on top of a CaptureService. Entering it opens
+    nothing: the reader resumes where the last listen stopped, skipping
+    audio older than `max_backlog` seconds, so each listen hears what was
+    said from roughly that moment on, like a freshly opened microphone.
+    """
+
+    MIN_ENERGY_THRESHOLD = 100
+
+    def __init__(self, service, chunk=1024, max_backlog=0.5):
+        self.service = service
+        self.SAMPLE_RATE = service.sample_rate
+        self.SAMPLE_WIDTH = 2
+        self.CHUNK = chunk
+        self.max_backlog = int(max_backlog * service.sample_rate)
+        self.reader = service.reader()
+        self.stream = None
+
+    def __enter__(self):
+        self.reader.skip_to(self.service.ring.written - self.max_backlog)
+        self.stream = _ReaderStream(self.reader)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream = None
+
+    def energy_threshold(self, ratio=1.5):
+        """Recognizer energy threshold from the live noise floor (None until measured)"""
+        noise = self.service.noise_rms
+        if noise is None:
+            return None
+        return max(self.MIN_ENERGY_THRESHOLD, noise * ratio)
+
+    def calibrate(self, recognizer):
+        """Applies the live noise floor to an sr.Recognizer (replaces adjust_for_ambient_noise)"""
+        threshold = self.energy_threshold(recognizer.dynamic_energy_ratio)
+        if threshold is not None:
+            recognizer.energy_threshold = threshold
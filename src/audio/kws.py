@@ -0,0 +1,202 @@
+import os
+import glob
+import time
+import functools
+from collections import deque
+import numpy as np
+from src.config.settings import Settings
+from src.utils.logger import logger
+from src.audio.vad import SpectralVAD
+from src.audio.audio_source import WavFileSource, write_wav
+
+@functools.lru_cache(maxsize=8)
+def mel_filterbank(sample_rate, nfft, n_mels=26, fmin=20.0, fmax=None):
+    """(n_mels, nfft // 2 + 1) triangular filters on the mel scale"""
+    fmax = fmax or sample_rate / 2
+    to_mel = lambda f: 2595.0 * np.log10(1.0 + f / 700.0)
+    to_hz = lambda m: 700.0 * (10 ** (m / 2595.0) - 1.0)
+    edges = to_hz(np.linspace(to_mel(fmin), to_mel(fmax), n_mels + 2))
+    freqs = np.fft.rfftfreq(nfft, 1.0 / sample_rate)
+    bank = np.zeros((n_mels, len(freqs)))
+    for m in range(n_mels):
+        left, centre, right = edges[m:m + 3]
+        bank[m] = np.clip(np.minimum((freqs - left) / (centre - left), (right - freqs) / (right - centre)), 0, None)
+    return bank
+
+@functools.lru_cache(maxsize=4)
+def _dct_matrix(n_mels, n_mfcc):
+    k = np.arange(n_mfcc)[:, np.newaxis]
+    n = np.arange(n_mels)[np.newaxis, :]
+    return np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels))
+
+def mfcc(samples, sample_rate=16000, n_mfcc=13, frame_ms=25, hop_ms=10):
+    """
+    (frames, n_mfcc - 1) cepstral features: pre-emphasis, Hamming window,
+    26 mel bands, log, DCT. c0 (loudness) is dropped and the mean of the
+    voiced part removed, so level and channel do not matter.
+    """
+    frame = int(sample_rate * frame_ms / 1000)
+    hop = int(sample_rate * hop_ms / 1000)
+    x = np.asarray(samples, dtype=np.float32)
+    if len(x) < frame:
+        return np.zeros((0, n_mfcc - 1), dtype=np.float32)
+    x = np.append(x[0], x[1:] - 0.97 * x[:-1])
+    count = 1 + (len(x) - frame) // hop
+    frames = np.lib.stride_tricks.sliding_window_view(x, frame)[::hop][:count] * np.hamming(frame)
+    nfft = 1 << (frame - 1).bit_length()
+    power = np.abs(np.fft.rfft(frames, nfft, axis=1)) ** 2
+    mel = power @ mel_filterbank(sample_rate, nfft).T
+    energies = np.log(mel + mel.max() * 1e-3 + 1e-6)  # 30 dB floor: valleys between harmonics are noise anyway
+    cepstra = energies @ _dct_matrix(energies.shape[1], n_mfcc).T
+    # Mean over the loud frames only (within 30 dB of the peak), so silence around the word does not shift it
+    loudness = np.log(power.sum(axis=1) + 1e-6)
+    loud = loudness >= loudness.max() - np.log(1000.0)
+    cepstra = cepstra[:, 1:]
+    return (cepstra - cepstra[loud].mean(axis=0)).astype(np.float32)
+
+def dtw_subsequence(template, segment):
+    """
+    Mean per-frame distance of the best alignment of the whole template to
+    any part of the segment. Steps (1,1), (1,2), (2,1) allow the keyword to
+    be spoken from half to twice the template's speed; every template frame
+    is counted once, so the score is comparable across templates.
+    """
+    n, m = len(template), len(segment)
+    if n == 0 or m == 0:
+        return float("inf")
+    cost = np.sqrt(((template[:, np.newaxis, :] - segment[np.newaxis, :, :]) ** 2).sum(axis=2))
+    inf = np.full(2, np.inf)
+    before = np.zeros(m + 2)  # Row -1: free start anywhere in the segment
+    previous = np.concatenate([inf, cost[0]])
+    for i in range(1, n):
+        diagonal = previous[1:-1]
+        skip = previous[:-2]
+        double = before[1:-1] + cost[i - 1]
+        row = np.concatenate([inf, cost[i] + np.minimum(np.minimum(diagonal, skip), double)])
+        before, previous = previous, row
+    return float(previous[2:].min() / n)
+
+class KeywordSpotter:
+    """
+    Offline wake word detection on the shared capture stream: SpectralVAD
+    cuts short speech segments (ring views, copied once per segment), each
+    is compared with the enrolled templates (MFCC + subsequence DTW), no
+    network involved.
+
+    Templates are WAV snippets of the user saying the wake word, kept in
+    Settings.WAKE_WORD_TEMPLATES_DIR. add_template() enrolls one (the
+    transcription backend does it on every confirmed detection), and the
+    spotter is ready() once it has Settings.WAKE_WORD_MIN_TEMPLATES.
+    """
+
+    def __init__(self, capture=None, templates_dir=None, threshold=None, max_segment=2.0, sample_rate=16000):
+        self.capture = capture
+        self.sample_rate = capture.sample_rate if capture is not None else sample_rate
+        self.templates_dir = templates_dir or Settings.WAKE_WORD_TEMPLATES_DIR
+        self.threshold = threshold or Settings.WAKE_WORD_KWS_THRESHOLD
+        self.max_segment = int(max_segment * self.sample_rate)
+        self.vad = SpectralVAD(self.sample_rate)
+        self.templates = []
+        self._paths = []
+        self.last_distance = None
+        self.misses = 0  # Speech segments rejected since the last detection
+        self._pre_roll = deque(maxlen=3)
+        self._frames = None
+        self.reader = capture.reader() if capture is not None else None
+        self.load_templates()
+
+    def load_templates(self):
+        self.templates, self._paths = [], []
+        for path in sorted(glob.glob(os.path.join(self.templates_dir, "*.wav"))):
+            try:
+                source = WavFileSource(path, realtime=False)
+                if source.sample_rate == self.sample_rate:
+                    self.templates.append(mfcc(source.samples, self.sample_rate))
+                    self._paths.append(path)
+            except Exception as e:
+                logger.error(f"Could not load wake word template {path}: {e}")
+        return len(self.templates)
+
+    def ready(self):
+        return len(self.templates) >= Settings.WAKE_WORD_MIN_TEMPLATES
+
+    def _trim(self, samples):
+        """Speech part of a snippet (drops the silence sr.listen() keeps around it)"""
+        _, raw = SpectralVAD(self.sample_rate).speech_mask(samples)
+        active = np.flatnonzero(raw)
+        if len(active) == 0:
+            return None
+        n = self.vad.frame_samples
+        return samples[max(0, active[0] - 1) * n:(active[-1] + 2) * n]
+
+    def add_template(self, samples, save=True):
+        """Enroll a snippet of the wake word; keeps the newest WAKE_WORD_MAX_TEMPLATES"""
+        samples = self._trim(np.asarray(samples, dtype=np.int16))
+        if samples is None or len(samples) < 0.2 * self.sample_rate:
+            return False
+        self.templates.append(mfcc(samples, self.sample_rate))
+        path = None
+        if save:
+            os.makedirs(self.templates_dir, exist_ok=True)
+            path = os.path.join(self.templates_dir, f"template_{time.time_ns()}.wav")
+            write_wav(path, samples, self.sample_rate)
+        self._paths.append(path)
+        while len(self.templates) > Settings.WAKE_WORD_MAX_TEMPLATES:
+            self.templates.pop(0)
+            old = self._paths.pop(0)
+            if old and os.path.exists(old):
+                os.remove(old)
+        logger.info(f"Wake word template enrolled ({len(self.templates)} total)")
+        return True
+
+    def distance(self, samples):
+        """Best DTW distance of a segment to any template"""
+        features = mfcc(samples, self.sample_rate)
+        return min((dtw_subsequence(template, features) for template in self.templates), default=float("inf"))
+
+    def detect(self, samples):
+        self.last_distance = self.distance(samples)
+        return self.last_distance <= self.threshold
+
+    def feed(self, frame):
+        """
+        Streaming input, one VAD frame at a time. Returns True when a speech
+        segment that matches the wake word ends with this frame.
+        """
+        speech = self.vad.is_speech(frame)
+        if self._frames is None:
+            self._pre_roll.append(frame)
+            if speech:
+                self._frames = list(self._pre_roll)
+            return False
+        self._frames.append(frame)
+        if speech and len(self._frames) * self.vad.frame_samples < self.max_segment:
+            return False
+        segment = np.concatenate(self._frames)
+        self._frames = None
+        self._pre_roll.clear()
+        if len(segment) < 0.25 * self.sample_rate:
+            return False
+        if self.detect(segment):
+            self.misses = 0
+            return True
+        self.misses += 1
+        return False
+
+    def listen(self, timeout=3.0, max_backlog=1.0):
+        """
+        Follows the shared stream for up to `timeout` seconds; True as soon
+        as a speech segment matches the wake word (when its speech ends).
+        """
+        self.reader.skip_to(self.capture.ring.written - int(max_backlog * self.sample_rate))
+        deadline = time.perf_counter() + timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return False
+            frame = self.reader.read(self.vad.frame_samples, timeout=remaining)
+            if frame is None:
+                return False
+            if self.feed(frame):
+                logger.info(f"✓ Wake word detectado (local, distancia {self.last_distance:.2f})")
+                return True
@@ -1,113 +1,109 @@
-import asyncio
 import edge_tts
 import pygame
-import os
-import threading
 from src.config.settings import Settings
 from src.utils.logger import logger
+from src.audio.speech_queue import SpeechQueue, SYSTEM, CHAT
+from src.audio.tts_stream import PygameStreamPlayer
+from src.audio.tts_service import TTSService
+from src.audio.tts_cache import TTSCache, locale_phrases
+from src.audio.tts_backends import TTSBackendRegistry, StreamBackend, LocalBackend, NetworkStatus
 
 class NeuralTTS:
     def __init__(self):
         self.voice = Settings.VOICE_NAME
+        self.rate = Settings.NEURAL_SPEECH_RATE
         logger.info(f"NeuralTTS initialized with voice: {self.voice}")
+        # One event loop thread synthesizes every utterance (queued, next sentence while this one plays)
+        self.service = TTSService().start()
+        self.cache = self._open_cache()
             
         # Initialize pygame mixer for playback
+        self.player = None
         try:
             pygame.mixer.init()
+            self.player = PygameStreamPlayer()
         except Exception as e:
             logger.error(f"Failed to initialize pygame mixer: {e}")
         
-        # Threading support for non-blocking speech
-        self._speaking_thread = None
-        self._stop_flag = threading.Event()
+        # Each utterance goes to the cached audio, the neural voice or the local engine
+        self.backends = TTSBackendRegistry(self._open_backends(), network=NetworkStatus())
+        # One playback thread speaks queued utterances by priority
+        self.queue = SpeechQueue(synthesize=self.backends.synthesize, play=self.backends.play, discard=self.backends.discard)
 
-    async def _generate_audio(self, text, output_file):
-        """Generate audio file using edge-tts"""
-        communicate = edge_tts.Communicate(text, self.voice)
-        await communicate.save(output_file)
-
-    def speak(self, text):
-        """Generate and play speech (non-blocking)"""
-        if not text:
-            return
-
-        # Stop any ongoing speech first
-        self.stop()
-        
-        # Reset stop flag
-        self._stop_flag.clear()
-        
-        # Start speaking in background thread
-        self._speaking_thread = threading.Thread(
-            target=self._speak_worker,
-            args=(text,),
-            daemon=True
-        )
-        self._speaking_thread.start()
-    
-    def _speak_worker(self, text):
-        """Worker thread for speech generation and playback"""
-        logger.info(f"Speaking (Neural): {text}")
-        
-        # Create a unique temporary file for the audio
-        import uuid
-        unique_filename = f"speech_{uuid.uuid4().hex}.mp3"
-        temp_file = os.path.join(Settings.LOGS_DIR, unique_filename)
-        
+    def _open_cache(self):
+        """Disk cache of recurring phrases, pre-warmed in the background with the voice's locale strings"""
+        if not Settings.TTS_CACHE_ENABLED:
+            return None
         try:
-            # Generate audio (run async function synchronously)
-            asyncio.run(self._generate_audio(text, temp_file))
-            
-            # Play audio
-            if os.path.exists(temp_file):
-                pygame.mixer.music.load(temp_file)
-                pygame.mixer.music.play()
-                
-                # Wait for playback to finish, checking stop flag
-                while pygame.mixer.music.get_busy() and not self._stop_flag.is_set():
-                    pygame.time.Clock().tick(10)
-                
-                # If stopped, halt playback immediately
-                if self._stop_flag.is_set():
-                    pygame.mixer.music.stop()
-                    logger.info("Speech interrupted by stop flag")
-                
-                # Unload to release file lock
-                pygame.mixer.music.unload()
-                
+            cache = TTSCache(service=self.service)
+            language = "-".join(self.voice.split("-")[:2])
+            self.service.run(cache.prewarm_async(self.voice, locale_phrases(language), self.rate, self._communicate))
+            return cache
         except Exception as e:
-            logger.error(f"Error in Neural TTS: {e}")
-            # Fallback to print if audio fails
-            print(f"ELEVEN: {text}")
-            
-        finally:
-            # Clean up temp file
+            logger.error(f"Could not open the TTS cache: {e}")
+            return None
+
+    def _open_backends(self):
+        backends = [StreamBackend("neural", self._synthesize, self.player)]
+        if self.cache is not None:
+            backends.insert(0, StreamBackend("cache", self._synthesize, self.player, prior_latency=0.01,
+                                             requires_network=False, has=lambda text: (self.voice, text, self.rate) in self.cache))
+        if Settings.TTS_LOCAL_ENGINE:
             try:
-                if os.path.exists(temp_file):
-                    # Small delay to ensure pygame fully released it
-                    import time
-                    time.sleep(0.1)
-                    os.remove(temp_file)
+                from src.audio.text_to_speech import TextToSpeech
+                tts = TextToSpeech()
+                if tts.engine is not None:
+                    backends.append(LocalBackend(tts))
             except Exception as e:
-                logger.warning(f"Could not remove temp file: {e}")
+                logger.error(f"Local TTS engine not available: {e}")
+        return backends
+
+    def _communicate(self, text):
+        return edge_tts.Communicate(text, self.voice, rate=self.rate)
+
+    def speak(self, text, priority=SYSTEM, interrupt=True):
+        """
+        Generate and play speech (non-blocking). By default it replaces
+        whatever is being said; interrupt=False queues it (a higher priority
+        still preempts lower ones).
+        """
+        if not text:
+            return
+        logger.info(f"Speaking: {text}")
+        self.queue.say(text, priority, interrupt)
+    
+    def speak_all(self, texts, priority=SYSTEM, interrupt=True):
+        """Speak several texts back to back (non-blocking), each synthesized ahead of its turn"""
+        for text in texts:
+            logger.info(f"Speaking: {text}")
+        self.queue.say_all(texts, priority, interrupt)
+    
+    def speak_stream(self, chunks, priority=CHAT):
+        """Speak a stream of text chunks sentence by sentence (non-blocking)"""
+        self.queue.say_stream(chunks, priority, interrupt=True)
+    
+    def _synthesize(self, text):
+        """Start streaming the synthesis of text into memory (or the cached audio) and return the stream right away"""
+        if self.cache is not None:
+            return self.cache.stream(self.voice, text, self.rate, self._communicate)
+        return self.service.synthesize(self._communicate(text), text)
     
     def stop(self):
-        """Stop current speech immediately"""
-        self._stop_flag.set()
-        try:
-            if pygame.mixer.music.get_busy():
-                pygame.mixer.music.stop()
-                pygame.mixer.music.unload()
-                logger.info("Speech stopped")
-        except Exception as e:
-            logger.error(f"Error stopping speech: {e}")
+        """Stop current speech immediately and drop everything queued"""
+        self.queue.stop()
+    
+    def get_cache_stats(self):
+        """Hit rate and time to first audio saved by the phrase cache"""
+        return self.cache.get_stats() if self.cache is not None else {}
+    
+    def get_backend_stats(self):
+        """Latency, error rate and selection count of each TTS backend"""
+        return self.backends.get_stats()
     
     def is_speaking(self):
-        """Check if currently speaking"""
-        try:
-            return (self._speaking_thread is not None and 
-                    self._speaking_thread.is_alive() and 
-                    pygame.mixer.music.get_busy())
-        except:
-            return False
-
+        """Something is playing, queued or still streaming in"""
+        return self.queue.is_speaking()
+    
+    def wait(self, timeout=None):
+        """Block until everything queued has been spoken; False on timeout"""
+        return self.queue.wait(timeout)
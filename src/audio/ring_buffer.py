@@ -0,0 +1,112 @@
+import threading
+import numpy as np
+
+class AudioRingBuffer:
+    """
+    Fixed-size int16 sample ring: one capture thread writes, any number of
+    readers follow at their own pace. Positions are absolute sample counts,
+    so a reader that falls more than `capacity` behind skips ahead (and
+    counts the dropped samples) instead of blocking the writer.
+
+    Storage is mirrored (every sample is written twice, `capacity` apart),
+    so any window of up to `capacity` samples is contiguous and reads are
+    read-only views instead of copies. A view stays valid until the writer
+    laps it; consumers that keep audio longer than the buffer copy it.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=np.int16)
+        self._written = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def written(self):
+        return self._written
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def write(self, samples):
+        samples = np.asarray(samples, dtype=np.int16)[-self.capacity:]
+        with self._cond:
+            start = self._written % self.capacity
+            first = min(len(samples), self.capacity - start)
+            rest = len(samples) - first
+            self._data[start:start + first] = samples[:first]
+            self._data[start + self.capacity:start + self.capacity + first] = samples[:first]
+            if rest:
+                self._data[:rest] = samples[first:]
+                self._data[self.capacity:self.capacity + rest] = samples[first:]
+            self._written += len(samples)
+            self._cond.notify_all()
+
+    def close(self):
+        """No more samples: readers get what is left, then None"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def wake(self):
+        """Wake blocked readers so they re-check their own stop conditions"""
+        with self._cond:
+            self._cond.notify_all()
+
+    def read_at(self, position, n, timeout=None, cancelled=None):
+        """
+        Samples [position, position + n) as a read-only view, waiting for them
+        to be written (or until `cancelled()` is true).
+        Returns (samples or None, next position, dropped samples).
+        """
+        n = min(n, self.capacity)
+        with self._cond:
+            ready = lambda: self._written >= position + n or self._closed or (cancelled is not None and cancelled())
+            if not self._cond.wait_for(ready, timeout) or (cancelled is not None and cancelled()):
+                return None, position, 0
+            dropped = 0
+            oldest = self._written - self.capacity
+            if position < oldest:
+                dropped, position = oldest - position, oldest
+            n = min(n, self._written - position)
+            if n <= 0:
+                return None, position, dropped
+            start = position % self.capacity
+            view = self._data[start:start + n]
+            view.flags.writeable = False
+            return view, position + n, dropped
+
+    def reader(self):
+        """A reader starting at the newest sample"""
+        return RingReader(self, self._written)
+
+class RingReader:
+    """One consumer's cursor into an AudioRingBuffer"""
+
+    def __init__(self, ring, position):
+        self.ring = ring
+        self.position = position
+        self.dropped = 0
+        self.closed = False
+
+    @property
+    def lag(self):
+        """Samples written but not read yet"""
+        return self.ring.written - self.position
+
+    def read(self, n, timeout=None):
+        """Next n samples (fewer at the end of the stream), None on timeout or when closed"""
+        samples, self.position, dropped = self.ring.read_at(
+            self.position, n, timeout, cancelled=lambda: self.closed
+        )
+        self.dropped += dropped
+        return samples
+
+    def skip_to(self, position):
+        self.position = max(self.position, min(position, self.ring.written))
+
+    def close(self):
+        """Stop this reader only (pending and later reads return None)"""
+        self.closed = True
+        self.ring.wake()
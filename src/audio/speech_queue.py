@@ -0,0 +1,228 @@
+import time
+import itertools
+import threading
+from src.utils.logger import logger
+from src.audio.speech_stream import SentenceSegmenter
+
+# Utterance priorities (lower plays first)
+BARGE_IN = 0  # Answers to the user interrupting ("Detenido.")
+SYSTEM = 1  # Command responses, menus, errors
+CHAT = 2  # LLM replies
+
+class Utterance:
+    """One queued text; done is set once it was played, dropped or failed"""
+
+    def __init__(self, text, priority, seq, group=None):
+        self.text = text
+        self.priority = priority
+        self.seq = seq
+        self.group = group
+        self.state = "queued"  # queued, playing, played, dropped, failed
+        self.audio = None
+        self.stop = threading.Event()
+        self.done = threading.Event()
+        self.queued_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+        self._requested = False
+        self._ready = threading.Event()
+
+class SpeechQueue:
+    """
+    Plays utterances one at a time in (priority, arrival) order on one
+    playback thread.
+
+    Queueing is atomic under one lock: an utterance with a higher priority
+    than the one playing stops it (its play() sees the stop flag within a
+    poll) and drops every queued utterance and stream of lower priority;
+    interrupt=True drops everything first. The next `lookahead` utterances
+    are synthesized ahead of their turn, so a batch (a menu) plays back to
+    back. is_speaking() is the queue's own state: something playing, queued
+    or still streaming in.
+
+    synthesize(text, group) -> audio handle (or None on failure); group is
+        shared by the texts of one say_all batch or stream (None for a
+        single text), e.g. to keep them in one voice
+    play(audio, stop) -> blocks until playback ends or the stop event is set
+    discard(audio) -> optional cleanup for audio that will not be played
+    """
+
+    def __init__(self, synthesize, play, discard=None, lookahead=2):
+        self.synthesize = synthesize
+        self.play = play
+        self.discard = discard
+        self.lookahead = lookahead
+
+        self._items = []
+        self._current = None
+        self._streams = set()
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self.stats = {"queued": 0, "played": 0, "dropped": 0, "preempted": 0}
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._playback_worker, name="SpeechQueue", daemon=True)
+            self._thread.start()
+
+    def say(self, text, priority=SYSTEM, interrupt=False):
+        """Queue one text; returns its Utterance"""
+        return self.say_all([text], priority, interrupt)[0]
+
+    def say_all(self, texts, priority=SYSTEM, interrupt=False):
+        """Queue several texts as one batch (nothing can be queued in between)"""
+        texts = [text for text in texts if text]
+        group = object() if len(texts) > 1 else None
+        with self._cond:
+            self._admit(priority, interrupt)
+            items = [self._enqueue(text, priority, group) for text in texts]
+        self._prefetch()
+        return items
+
+    def say_stream(self, chunks, priority=CHAT, interrupt=False):
+        """
+        Queue a stream of text chunks sentence by sentence, as they arrive.
+        Returns an Event that stops reading the stream when set.
+        """
+        cancelled = threading.Event()
+        with self._cond:
+            self._admit(priority, interrupt)
+            self._streams.add((priority, cancelled))
+        threading.Thread(target=self._feed, args=(chunks, priority, cancelled), name="SpeechStream", daemon=True).start()
+        return cancelled
+
+    def _feed(self, chunks, priority, cancelled):
+        segmenter = SentenceSegmenter()
+
+        def sentences():
+            for chunk in chunks:
+                if cancelled.is_set():
+                    return
+                yield from segmenter.feed(chunk)
+            yield from segmenter.flush()
+
+        try:
+            for sentence in sentences():
+                with self._cond:
+                    if cancelled.is_set():
+                        break
+                    self._enqueue(sentence, priority, group=cancelled)
+                logger.info(f"Speaking (stream): {sentence}")
+                self._prefetch()
+        except Exception as e:
+            logger.error(f"Error reading speech stream: {e}")
+        finally:
+            with self._cond:
+                self._streams.discard((priority, cancelled))
+                self._cond.notify_all()
+
+    def _admit(self, priority, interrupt):
+        """Make room for a new utterance (lock held): preempt and drop what it outranks"""
+        if interrupt:
+            outranked = lambda p: True
+        else:
+            outranked = lambda p: p > priority
+        current = self._current
+        if current is not None and current.state == "playing" and outranked(current.priority):
+            current.stop.set()
+            self.stats["preempted"] += 1
+        for item in [item for item in self._items if outranked(item.priority)]:
+            self._drop(item)
+        for stream in [stream for stream in self._streams if outranked(stream[0])]:
+            stream[1].set()
+            self._streams.discard(stream)
+
+    def _enqueue(self, text, priority, group=None):
+        item = Utterance(text, priority, next(self._seq), group)
+        position = len(self._items)
+        while position > 0 and (self._items[position - 1].priority, self._items[position - 1].seq) > (priority, item.seq):
+            position -= 1
+        self._items.insert(position, item)
+        self.stats["queued"] += 1
+        self._start()
+        self._cond.notify_all()
+        return item
+
+    def _drop(self, item):
+        self._items.remove(item)
+        item.state = "dropped"
+        self.stats["dropped"] += 1
+        if item._ready.is_set() and item.audio is not None and self.discard:
+            self.discard(item.audio)
+        item.done.set()
+
+    def _prefetch(self):
+        """Synthesize the next `lookahead` utterances ahead of their turn (outside the lock)"""
+        with self._cond:
+            pending = [item for item in self._items[:self.lookahead] if not item._requested]
+        for item in pending:
+            self._audio(item)
+
+    def _audio(self, item):
+        """The item's audio, synthesized once whichever thread asks first"""
+        with self._cond:
+            first = not item._requested
+            item._requested = True
+        if first:
+            try:
+                item.audio = self.synthesize(item.text, item.group)
+            except Exception as e:
+                logger.error(f"Error synthesizing speech: {e}")
+                item.audio = None
+            item._ready.set()
+            with self._cond:
+                dropped = item.state == "dropped"
+            if dropped and item.audio is not None and self.discard:
+                self.discard(item.audio)
+        item._ready.wait()
+        return item.audio
+
+    def _playback_worker(self):
+        while True:
+            with self._cond:
+                while not self._items:
+                    self._cond.wait()
+                item = self._items.pop(0)
+                item.state = "playing"
+                self._current = item
+            self._prefetch()
+            audio = self._audio(item)
+            if item.stop.is_set():
+                state = "dropped"
+            elif audio is None:
+                logger.error(f"No speech for '{item.text}': synthesis failed")
+                state = "failed"
+            else:
+                item.started_at = time.perf_counter()
+                try:
+                    self.play(audio, item.stop)
+                    state = "dropped" if item.stop.is_set() else "played"
+                except Exception as e:
+                    logger.error(f"Error playing speech '{item.text}': {e}")
+                    state = "failed"
+            if state == "dropped" and audio is not None and self.discard:
+                self.discard(audio)
+            with self._cond:
+                item.state = state
+                item.finished_at = time.perf_counter()
+                if state in ("played", "dropped"):
+                    self.stats[state] += 1
+                self._current = None
+                item.done.set()
+                self._cond.notify_all()
+
+    def stop(self):
+        """Stop the current utterance and drop everything queued or streaming"""
+        with self._cond:
+            self._admit(BARGE_IN, interrupt=True)
+            self._cond.notify_all()
+
+    def is_speaking(self):
+        with self._cond:
+            return self._current is not None or bool(self._items) or bool(self._streams)
+
+    def wait(self, timeout=None):
+        """Blocks until nothing is playing, queued or streaming; False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._current is None and not self._items and not self._streams, timeout)
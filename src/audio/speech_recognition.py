@@ -1,14 +1,26 @@
 import speech_recognition as sr
 from src.config.settings import Settings
 from src.utils.logger import logger
+from src.audio.vad import SpeechGate
 
 import threading
 
 class SpeechRecognizer:
-    def __init__(self):
+    def __init__(self, capture=None, open_microphone=True):
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
         self._lock = threading.Lock()
+        # With an AudioPipeline the microphone belongs to its capture thread (set self.pipeline)
+        self.pipeline = None
+        # Local VAD: background noise never reaches the cloud recognizer (pipeline and barge-in)
+        self.gate = SpeechGate() if Settings.SPEECH_GATE_ENABLED else None
+        if capture is not None:
+            # Shared always-open stream: nothing to open, noise floor already tracked live
+            self.microphone = capture.microphone()
+            return
+        if not open_microphone:
+            self.microphone = None
+            return
+        self.microphone = sr.Microphone()
         
         # Adjust for ambient noise
         with self.microphone as source:
@@ -16,13 +28,43 @@ class SpeechRecognizer:
             self.recognizer.adjust_for_ambient_noise(source, duration=1)
             logger.info("Ready to listen.")
 
+    def _calibrate(self):
+        if hasattr(self.microphone, "calibrate"):
+            self.microphone.calibrate(self.recognizer)
+
+    def recognize(self, samples, sample_rate):
+        """Transcribe int16 mono samples (pipeline recognition stage). Returns lowercase text or None."""
+        if self.gate is not None and not self.gate.allows(samples, sample_rate):
+            return None
+        try:
+            audio = sr.AudioData(samples.tobytes(), sample_rate, 2)
+            text = self.recognizer.recognize_google(audio, language=Settings.LANGUAGE)
+            logger.info(f"Heard: {text}")
+            return text.lower()
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            logger.error(f"Could not request results from Speech Recognition service; {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error in speech recognition: {e}")
+            return None
+
+    def recognize_item(self, item):
+        """Pipeline stage: adds "text" to a segmented utterance, drops it if nothing was understood"""
+        item["text"] = self.recognize(item["audio"], item["sample_rate"])
+        return item if item["text"] else None
+
     def listen(self):
         """Listen for audio input and return text"""
+        if self.pipeline is not None:
+            return self.pipeline.next_text(timeout=10, max_age=Settings.AUDIO_MAX_UTTERANCE_AGE)
         if not self._lock.acquire(blocking=False):
             # If microphone is busy (e.g. interruption thread), skip
             return None
             
         try:
+            self._calibrate()
             with self.microphone as source:
                 logger.info("Listening...")
                 audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=10)
@@ -49,14 +91,20 @@ class SpeechRecognizer:
     
     def listen_for_interruption(self):
         """Ultra-fast listen to detect interruptions"""
+        if self.pipeline is not None:
+            # Already recognized in the background: never blocks the speaking loop
+            return self.pipeline.next_text(timeout=0, max_age=Settings.AUDIO_MAX_UTTERANCE_AGE)
         # Try to acquire lock, but don't block if main thread is using it
         if not self._lock.acquire(blocking=False):
             return None
             
         try:
+            self._calibrate()
             with self.microphone as source:
                 # OPTIMIZED: Reduced timeout for faster interruption detection
                 audio = self.recognizer.listen(source, timeout=0.2, phrase_time_limit=1)
+            if self.gate is not None and not self.gate.allows_audio(audio):
+                return None
                 
             # Try to recognize what was said
             text = self.recognizer.recognize_google(audio, language=Settings.LANGUAGE)
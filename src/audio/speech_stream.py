@@ -0,0 +1,76 @@
+import re
+
+class SentenceSegmenter:
+    """
+    Groups streamed text chunks into sentences suitable for TTS.
+    Waits for whitespace after the punctuation so "3." + "5" is not split,
+    skips common abbreviations and merges very short fragments.
+    """
+
+    BOUNDARY = re.compile(r'[.!?…]+["\'»)\]]*\s+|\n+')
+    ABBREVIATIONS = {
+        "sr", "sra", "srta", "dr", "dra", "ud", "uds", "etc", "ej", "aprox", "pág", "núm",
+        "mr", "mrs", "ms", "vs", "e.g", "i.e", "no", "st", "jr"
+    }
+
+    def __init__(self, min_chars=12, max_chars=250):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.buffer = ""
+        self.pending = ""
+
+    def _is_abbreviation(self, dot_index):
+        words = self.buffer[:dot_index].split()
+        if not words:
+            return False
+        last = words[-1].lower().strip('¿¡("\'')
+        # Abbreviations and single-letter initials ("J. R. R. Tolkien")
+        return last in self.ABBREVIATIONS or (len(last) == 1 and last.isalpha())
+
+    def _next_boundary(self):
+        for match in self.BOUNDARY.finditer(self.buffer):
+            if match.group().startswith(".") and self._is_abbreviation(match.start()):
+                continue
+            return match.end()
+        return None
+
+    def _soft_break(self):
+        """Cut point for run-on text with no sentence boundary"""
+        index = self.buffer.rfind(", ", 0, self.max_chars)
+        if index != -1:
+            return index + 2
+        index = self.buffer.rfind(" ", 0, self.max_chars)
+        if index != -1:
+            return index + 1
+        return self.max_chars
+
+    def feed(self, chunk):
+        """Add a chunk of text, returns the list of sentences completed by it"""
+        self.buffer += chunk
+        sentences = []
+        while True:
+            end = self._next_boundary()
+            if end is None:
+                if len(self.buffer) <= self.max_chars:
+                    break
+                end = self._soft_break()
+
+            self.pending += self.buffer[:end]
+            self.buffer = self.buffer[end:]
+
+            if len(self.pending.strip()) >= self.min_chars:
+                sentences.append(" ".join(self.pending.split()))
+                self.pending = ""
+        return sentences
+
+    def flush(self):
+        """Return whatever text is left at the end of the stream"""
+        text = " ".join((self.pending + self.buffer).split())
+        self.pending = ""
+        self.buffer = ""
+        return [text] if text else []
+
+    def split(self, text):
+        """Segment a complete text in one go"""
+        return self.feed(text) + self.flush()
+
@@ -1,3 +1,4 @@
+import time
 import pyttsx3
 from src.config.settings import Settings
 from src.utils.logger import logger
@@ -56,3 +57,29 @@ class TextToSpeech:
             self.engine.runAndWait()
         except Exception as e:
             logger.error(f"Error during speech: {e}")
+
+    def play(self, text, stop):
+        """
+        Speak text, blocking until it ends or the stop event is set.
+        Drives the engine's loop itself so it can be interrupted; returns the
+        seconds until the engine started speaking.
+        """
+        if not self.engine:
+            raise RuntimeError("TTS engine not available")
+        requested = time.perf_counter()
+        started = []
+        token = self.engine.connect('started-utterance', lambda name: started.append(time.perf_counter()))
+        try:
+            self.engine.say(text)
+            self.engine.startLoop(False)
+            try:
+                while self.engine.isBusy() and not stop.is_set():
+                    self.engine.iterate()
+                    time.sleep(0.01)
+                if stop.is_set():
+                    self.engine.stop()
+            finally:
+                self.engine.endLoop()
+        finally:
+            self.engine.disconnect(token)
+        return started[0] - requested if started else None
@@ -0,0 +1,247 @@
+import time
+import socket
+import threading
+from collections import OrderedDict
+from src.config.settings import Settings
+from src.utils.logger import logger
+from src.brain.model_router import CircuitBreaker, ModelStats, HALF_OPEN
+
+class Rendition:
+    """An utterance synthesized by one backend (what the SpeechQueue holds as audio)"""
+
+    def __init__(self, backend, text, handle, group=None):
+        self.backend = backend
+        self.text = text
+        self.handle = handle
+        self.group = group
+
+class StreamBackend:
+    """
+    Neural voice (edge-tts) or its cached audio: in-memory MP3 streams played
+    by a StreamPlayer. The cached flavour only takes texts already in the
+    TTSCache, so it never needs the network. Both share the "neural" voice.
+    """
+
+    def __init__(self, name, synthesize, player, quality=1.0, prior_latency=0.4, requires_network=True, has=None,
+                 voice="neural"):
+        self.name = name
+        self.voice = voice
+        self._synthesize = synthesize
+        self.player = player
+        self.quality = quality
+        self.prior_latency = prior_latency
+        self.requires_network = requires_network
+        self._has = has
+
+    def available(self, text):
+        return self.player is not None and (self._has is None or self._has(text))
+
+    def synthesize(self, text):
+        return self._synthesize(text)
+
+    def play(self, stream, stop):
+        """Returns the time to first chunk (the backend's latency)"""
+        self.player.play(stream, stop)
+        if stream.first_chunk is None:
+            return None
+        return stream.first_chunk - stream.created
+
+    def discard(self, stream):
+        stream.cancel()
+
+class LocalBackend:
+    """The offline engine (TextToSpeech: pyttsx3 on SAPI5, NSSpeech or espeak)"""
+
+    def __init__(self, tts, quality=0.0, prior_latency=0.15):
+        self.name = "local"
+        self.voice = "local"
+        self.tts = tts
+        self.quality = quality
+        self.prior_latency = prior_latency
+        self.requires_network = False
+
+    def available(self, text):
+        return self.tts.engine is not None
+
+    def synthesize(self, text):
+        return text  # Spoken directly by the engine
+
+    def play(self, text, stop):
+        return self.tts.play(text, stop)
+
+    def discard(self, text):
+        pass
+
+class NetworkStatus:
+    """Whether the TTS service is reachable: a TCP connect, refreshed in the background when stale"""
+
+    def __init__(self, host="speech.platform.bing.com", port=443, interval=None, timeout=1.5):
+        self.host = host
+        self.port = port
+        self.interval = interval or Settings.TTS_NETWORK_CHECK_SECONDS
+        self.timeout = timeout
+        self.online = True
+        self._checked = 0.0
+        self._checking = threading.Lock()
+
+    def _probe(self):
+        try:
+            socket.create_connection((self.host, self.port), timeout=self.timeout).close()
+            online = True
+        except OSError:
+            online = False
+        if online != self.online:
+            logger.info(f"TTS network {'available' if online else 'unavailable'}")
+        self.online = online
+        self._checked = time.monotonic()
+        self._checking.release()
+
+    def __call__(self):
+        if time.monotonic() - self._checked > self.interval and self._checking.acquire(blocking=False):
+            threading.Thread(target=self._probe, name="TTSNetworkCheck", daemon=True).start()
+        return self.online
+
+class TTSBackendRegistry:
+    """
+    Picks a TTS backend per utterance. Backends that need the network are
+    skipped while it is down, and each has a circuit breaker; a failed
+    utterance is replayed on the next best one.
+
+    Among the backends with the best voice quality, the one with the
+    lowest rolling p50 latency (time to first audio, priors until
+    measured) penalized by error rate wins, so the local engine only
+    speaks when the neural voice cannot (offline, circuit open). With
+    short_texts_local (Settings.TTS_LOCAL_SHORT_TEXTS) single utterances
+    are scored across all backends instead, plus a quality cost for
+    low-quality voices that grows with the text length past
+    Settings.TTS_SHORT_TEXT_CHARS: short confirmations go to the fastest
+    engine. The utterances of one group (a say_all batch, a streamed
+    reply) keep the voice of the first one while it can speak.
+
+    Backends provide name, voice, quality (0-1), prior_latency,
+    requires_network, available(text), synthesize(text), play(handle,
+    stop) -> latency or None, discard(handle).
+    """
+
+    MAX_GROUPS = 64
+
+    def __init__(self, backends, network=None, short_texts_local=None, short_chars=None, penalty_per_char=None,
+                 **breaker_args):
+        self.backends = list(backends)
+        self.network = network or (lambda: True)
+        self.short_texts_local = short_texts_local if short_texts_local is not None else Settings.TTS_LOCAL_SHORT_TEXTS
+        self.short_chars = short_chars if short_chars is not None else Settings.TTS_SHORT_TEXT_CHARS
+        self.penalty_per_char = penalty_per_char if penalty_per_char is not None else Settings.TTS_LOCAL_PENALTY_PER_CHAR
+        self.breakers = {b.name: CircuitBreaker(**breaker_args) for b in self.backends}
+        self.stats = {b.name: ModelStats() for b in self.backends}
+        self.chosen = {b.name: 0 for b in self.backends}
+        self.choose_time_total = 0.0
+        self._voices = OrderedDict()  # group -> voice of its first utterance, most recent last
+        self._lock = threading.Lock()
+
+    def score(self, backend, text):
+        """Expected seconds to first audio plus the quality cost; lower is better"""
+        stats = self.stats[backend.name]
+        latency = stats.p50 if stats.latencies else backend.prior_latency
+        excess = max(0, len(text) - self.short_chars)
+        return latency * (1 + 2 * stats.error_rate) + (1 - backend.quality) * excess * self.penalty_per_char
+
+    def choose(self, text, exclude=(), group=None):
+        """Best backend for the text (in the voice of its group), None if none can speak it"""
+        started = time.perf_counter()
+        online = self.network()
+        with self._lock:
+            candidates = [b for b in self.backends
+                          if b.name not in exclude and (online or not b.requires_network)
+                          and b.available(text) and self.breakers[b.name].allow_request()]
+            best = None
+            if candidates:
+                voice = self._voices.get(group) if group is not None else None
+                if any(b.voice == voice for b in candidates):
+                    candidates = [b for b in candidates if b.voice == voice]
+                elif group is not None or not self.short_texts_local:
+                    quality = max(b.quality for b in candidates)
+                    candidates = [b for b in candidates if b.quality == quality]
+                trials = [b for b in candidates if self.breakers[b.name].state == HALF_OPEN]
+                best = min(trials or candidates, key=lambda b: self.score(b, text))
+                if group is not None:
+                    self._voices[group] = best.voice
+                    self._voices.move_to_end(group)
+                    if len(self._voices) > self.MAX_GROUPS:
+                        self._voices.popitem(last=False)
+                self.breakers[best.name].on_request()
+                self.chosen[best.name] += 1
+            self.choose_time_total += time.perf_counter() - started
+        return best
+
+    def record_success(self, backend, latency):
+        with self._lock:
+            self.breakers[backend.name].record_success()
+            self.stats[backend.name].record(True, latency)
+
+    def record_failure(self, backend, error=None):
+        with self._lock:
+            self.breakers[backend.name].record_failure()
+            self.stats[backend.name].record(False)
+        logger.warning(f"TTS backend {backend.name} failed: {error}")
+
+    def synthesize(self, text, group=None, exclude=()):
+        """Start synthesizing on the best backend; returns a Rendition (None if nothing can speak)"""
+        tried = set(exclude)
+        while True:
+            backend = self.choose(text, exclude=tried, group=group)
+            if backend is None:
+                return None
+            try:
+                return Rendition(backend, text, backend.synthesize(text), group)
+            except Exception as e:
+                self.record_failure(backend, e)
+                tried.add(backend.name)
+
+    def play(self, rendition, stop):
+        """Play a Rendition; on failure replay the text on the next best backend"""
+        tried = set()
+        while rendition is not None:
+            backend = rendition.backend
+            try:
+                latency = backend.play(rendition.handle, stop)
+            except Exception as e:
+                self.record_failure(backend, e)
+                tried.add(backend.name)
+                if stop.is_set():
+                    return
+                rendition = self.synthesize(rendition.text, rendition.group, exclude=tried)
+                continue
+            if not stop.is_set() or latency is not None:
+                self.record_success(backend, latency)
+            else:
+                self._release(backend)
+            return
+        raise RuntimeError("No TTS backend available")
+
+    def discard(self, rendition):
+        self._release(rendition.backend)
+        rendition.backend.discard(rendition.handle)
+
+    def _release(self, backend):
+        """An utterance dropped before telling anything: a half-open backend may take another trial"""
+        with self._lock:
+            self.breakers[backend.name].trial_in_flight = False
+
+    def get_stats(self):
+        """Per-backend breaker state, latency percentiles, error rate and how often it was chosen"""
+        with self._lock:
+            stats = {
+                b.name: {
+                    "state": self.breakers[b.name].state,
+                    "p50": self.stats[b.name].p50,
+                    "p95": self.stats[b.name].p95,
+                    "error_rate": round(self.stats[b.name].error_rate, 3),
+                    "samples": len(self.stats[b.name].outcomes),
+                    "chosen": self.chosen[b.name]
+                }
+                for b in self.backends
+            }
+            choices = sum(self.chosen.values())
+            stats["choose_ms_avg"] = 1000 * self.choose_time_total / choices if choices else 0.0
+            return stats
@@ -0,0 +1,193 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from src.config.settings import Settings
+from src.config.locales import TRANSLATIONS
+from src.utils.logger import logger
+from src.audio.tts_stream import AudioByteStream, fill_stream
+from src.audio.tts_service import TTSService
+
+def locale_phrases(language):
+    """Fixed response strings of a language (templates with {} placeholders are left out)"""
+    strings = TRANSLATIONS.get(language, TRANSLATIONS["en-US"]).values()
+    return sorted({text for text in strings if isinstance(text, str) and "{" not in text})
+
+class TTSCache:
+    """
+    Content-addressed disk cache of synthesized speech. Each entry is the
+    MP3 of one (voice, text, rate) in Settings.TTS_CACHE_DIR, named by its
+    hash; the oldest used entries are evicted past TTS_CACHE_MAX_MB.
+
+    Fixed locale phrases are pre-warmed; other texts are only stored once
+    they have been synthesized `admit_after` times, so one-off chat replies
+    do not churn the disk. Misses and pre-warming are synthesized on the
+    given TTSService's loop (a private one, started on first use, if none).
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None, admit_after=2, service=None):
+        self.cache_dir = cache_dir or Settings.TTS_CACHE_DIR
+        self.max_bytes = max_bytes or Settings.TTS_CACHE_MAX_MB * 1024 * 1024
+        self.admit_after = admit_after
+        self.service = service or TTSService()
+
+        self._entries = OrderedDict()  # key -> size, least recently used first
+        self._seen = OrderedDict()  # key -> misses, for admission
+        self._lock = threading.Lock()
+        self._clock = 0
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "miss_latency_total": 0.0,
+            "misses_timed": 0,
+            "stored": 0,
+            "evicted": 0
+        }
+        self._load()
+
+    def _load(self):
+        """Index the entries on disk, least recently used first"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            files = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".mp3")]
+            for entry in sorted(files, key=lambda e: e.stat().st_mtime_ns):
+                self._entries[entry.name[:-4]] = entry.stat().st_size
+            self._evict()
+        except Exception as e:
+            logger.error(f"Failed to load TTS cache: {e}")
+
+    @staticmethod
+    def make_key(voice, text, rate):
+        return hashlib.sha1(f"{voice}|{rate}|{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    @property
+    def size(self):
+        return sum(self._entries.values())
+
+    def __contains__(self, item):
+        return self.make_key(*item) in self._entries
+
+    def get(self, voice, text, rate):
+        """Cached MP3 bytes or None"""
+        key = self.make_key(voice, text, rate)
+        with self._lock:
+            if key in self._entries:
+                try:
+                    with open(self._path(key), "rb") as f:
+                        data = f.read()
+                    self._entries.move_to_end(key)
+                    self._touch(key)
+                    self.stats["hits"] += 1
+                    return data
+                except OSError as e:
+                    logger.warning(f"TTS cache read failed: {e}")
+                    self._entries.pop(key, None)
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, voice, text, rate, data, latency=None, force=False):
+        """
+        Store synthesized audio. latency is the miss's time to first chunk,
+        what each later hit saves. Returns True if it was stored.
+        """
+        key = self.make_key(voice, text, rate)
+        with self._lock:
+            if latency is not None:
+                self.stats["miss_latency_total"] += latency
+                self.stats["misses_timed"] += 1
+            if not data or key in self._entries:
+                return False
+            if not force:
+                self._seen[key] = self._seen.pop(key, 0) + 1
+                while len(self._seen) > 1000:
+                    self._seen.popitem(last=False)
+                if self._seen[key] < self.admit_after:
+                    return False
+            try:
+                temp = self._path(key) + ".tmp"
+                with open(temp, "wb") as f:
+                    f.write(data)
+                os.replace(temp, self._path(key))
+                self._touch(key)
+            except OSError as e:
+                logger.warning(f"TTS cache write failed: {e}")
+                return False
+            self._seen.pop(key, None)
+            self._entries[key] = len(data)
+            self.stats["stored"] += 1
+            self._evict()
+            return True
+
+    def _touch(self, key):
+        """Recency survives restarts as the file's mtime (set explicitly: file system clocks can be coarse)"""
+        self._clock = max(self._clock + 1, time.time_ns())
+        os.utime(self._path(key), ns=(self._clock, self._clock))
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits"""
+        total = sum(self._entries.values())
+        while total > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            total -= size
+            self.stats["evicted"] += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stream(self, voice, text, rate, make_communicate):
+        """
+        AudioByteStream for the text: already complete on a hit, otherwise
+        synthesized with make_communicate(text) on the service and stored
+        once it is done.
+        """
+        data = self.get(voice, text, rate)
+        if data is not None:
+            stream = AudioByteStream(text)
+            stream.write(data)
+            stream.close()
+            return stream
+
+        def store(stream):
+            if stream.first_chunk is not None:
+                self.put(voice, text, rate, stream.getvalue(), latency=stream.first_chunk - stream.created)
+
+        return self.service.synthesize(make_communicate(text), text, on_complete=store)
+
+    async def prewarm_async(self, voice, texts, rate, make_communicate):
+        """Synthesize and store the texts that are not cached yet; returns how many were stored"""
+        stored = 0
+        for text in texts:
+            if (voice, text, rate) in self:
+                continue
+            stream = AudioByteStream(text)
+            try:
+                await fill_stream(make_communicate(text), stream)
+                stored += self.put(voice, text, rate, stream.getvalue(), force=True)
+            except Exception as e:
+                logger.warning(f"TTS cache pre-warm failed for '{text}': {e}")
+                break  # Offline: try again next start
+        return stored
+
+    def prewarm(self, voice, texts, rate, make_communicate):
+        """Synthesize and store the texts that are not cached yet (blocking)"""
+        started = time.perf_counter()
+        stored = self.service.run(self.prewarm_async(voice, texts, rate, make_communicate)).result()
+        if stored:
+            logger.info(f"TTS cache pre-warmed {stored} phrases in {time.perf_counter() - started:.1f}s")
+        return stored
+
+    def get_stats(self):
+        """Hit/miss counters plus estimated time to first audio saved"""
+        stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        avg_miss_latency = stats["miss_latency_total"] / stats["misses_timed"] if stats["misses_timed"] else 0.0
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["estimated_latency_saved"] = stats["hits"] * avg_miss_latency
+        stats["entries"] = len(self._entries)
+        stats["bytes"] = self.size
+        return stats
@@ -0,0 +1,102 @@
+import time
+import asyncio
+import threading
+from src.config.settings import Settings
+from src.utils.logger import logger
+from src.audio.tts_stream import AudioByteStream, fill_stream
+
+class TTSService:
+    """
+    One long-lived thread running one asyncio event loop for all speech
+    synthesis, instead of a new thread and asyncio.run() per utterance.
+
+    synthesize() queues a request and returns its AudioByteStream right
+    away; `workers` coroutines take requests in order, so while sentence N
+    plays, sentence N+1 is already being synthesized. Requests whose stream
+    was cancelled before their turn are skipped.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or Settings.TTS_SYNTHESIS_WORKERS
+        self.loop = None
+        self._queue = None
+        self._thread = None
+        self._ready = threading.Event()
+        self.stats = {"requests": 0, "skipped": 0, "failed": 0, "queue_wait_total": 0.0}
+
+    def start(self):
+        """Start the service thread (idempotent); returns self"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name="TTSService", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._queue = asyncio.Queue()
+        workers = [self.loop.create_task(self._worker()) for _ in range(self.workers)]
+        self.loop.call_soon(self._ready.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            for task in workers:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*workers, return_exceptions=True))
+            while not self._queue.empty():
+                _, stream, _ = self._queue.get_nowait()
+                stream.close(RuntimeError("TTS service stopped"))
+            self.loop.close()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    async def _worker(self):
+        while True:
+            communicate, stream, on_complete = await self._queue.get()
+            if stream.cancelled:
+                self.stats["skipped"] += 1
+                continue
+            self.stats["queue_wait_total"] += time.perf_counter() - stream.created
+            error = None
+            try:
+                await fill_stream(communicate, stream)
+            except asyncio.CancelledError:
+                stream.close(RuntimeError("TTS service stopped"))
+                raise
+            except Exception as e:
+                error = e
+                self.stats["failed"] += 1
+                logger.error(f"Error synthesizing speech: {e}")
+            complete = error is None and not stream.cancelled
+            stream.close(error)
+            if complete and on_complete is not None:
+                try:
+                    on_complete(stream)
+                except Exception as e:
+                    logger.error(f"Error after synthesizing speech: {e}")
+
+    def synthesize(self, communicate, text="", on_complete=None):
+        """
+        Queue an edge_tts.Communicate-like object; returns its AudioByteStream
+        right away. on_complete(stream) is called once it was fully synthesized.
+        """
+        self.start()
+        stream = AudioByteStream(text)
+        self.stats["requests"] += 1
+        self.loop.call_soon_threadsafe(self._queue.put_nowait, (communicate, stream, on_complete))
+        return stream
+
+    def run(self, coroutine):
+        """Run any coroutine on the service loop; returns a concurrent.futures.Future"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def stop(self):
+        if self.running:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=2.0)
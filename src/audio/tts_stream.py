@@ -0,0 +1,213 @@
+import io
+import time
+import threading
+from src.utils.logger import logger
+
+# MPEG audio layer III: kbps by bitrate index, Hz by sample rate index
+_BITRATES = {
+    "1": [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    "2": [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+def mp3_frame_length(data, pos):
+    """Length of the layer III frame whose header starts at `pos` (None if there is no valid header)"""
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    version = (data[pos + 1] >> 3) & 0x03
+    layer = (data[pos + 1] >> 1) & 0x03
+    bitrate_index = data[pos + 2] >> 4
+    rate_index = (data[pos + 2] >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = _BITRATES["1" if version == 3 else "2"][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (data[pos + 2] >> 1) & 0x01
+    return (144 if version == 3 else 72) * bitrate // sample_rate + padding
+
+def mp3_frame_starts(data, start=0):
+    """Offsets of the complete MP3 frames in data[start:], then the end of the last one"""
+    pos = start
+    if data[pos:pos + 3] == b"ID3" and len(data) >= pos + 10:
+        size = (data[pos + 6] << 21) | (data[pos + 7] << 14) | (data[pos + 8] << 7) | data[pos + 9]
+        pos += 10 + size
+    starts = []
+    end = pos if pos <= len(data) else start
+    while pos + 4 <= len(data):
+        length = mp3_frame_length(data, pos)
+        if length is None:
+            pos += 1  # Resync on the next frame header
+            continue
+        if pos + length > len(data):
+            break
+        starts.append(pos)
+        pos += length
+        end = pos
+    return starts, end
+
+def mp3_frames_end(data, start=0):
+    """End of the last complete MP3 frame in data[start:] (where a decodable prefix can be cut)"""
+    return mp3_frame_starts(data, start)[1]
+
+class AudioByteStream:
+    """
+    In-memory audio being synthesized: a producer thread write()s chunks
+    as they arrive and close()s it; a player reads data while it grows.
+    """
+
+    def __init__(self, text=""):
+        self.text = text
+        self.created = time.perf_counter()
+        self.first_chunk = None
+        self.error = None
+        self._buffer = io.BytesIO()
+        self._size = 0
+        self._closed = False
+        self._cancelled = False
+        self._cond = threading.Condition()
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def closed(self):
+        return self._closed
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def write(self, chunk):
+        with self._cond:
+            if self.first_chunk is None:
+                self.first_chunk = time.perf_counter()
+            self._buffer.write(chunk)
+            self._size += len(chunk)
+            self._cond.notify_all()
+
+    def close(self, error=None):
+        with self._cond:
+            self.error = error
+            self._closed = True
+            self._cond.notify_all()
+
+    def cancel(self):
+        """Playback no longer wants it: the producer stops at its next chunk"""
+        self._cancelled = True
+        self.close(self.error)
+
+    def wait(self, size, timeout=None):
+        """Waits until at least `size` bytes are written or the stream is closed"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._size >= size or self._closed, timeout)
+
+    def getvalue(self, start=0):
+        """The bytes written so far, from offset start"""
+        with self._cond:
+            return bytes(self._buffer.getbuffer()[start:])
+
+async def fill_stream(communicate, stream):
+    """Writes the audio chunks of an edge_tts.Communicate-like object into the stream as they arrive"""
+    async for chunk in communicate.stream():
+        if stream.cancelled:
+            break
+        if chunk["type"] == "audio":
+            stream.write(chunk["data"])
+
+class StreamPlayer:
+    """
+    Plays an AudioByteStream while it is still being synthesized: as soon as
+    `first_bytes` of complete MP3 frames are in memory they are decoded and
+    started, and every time the output's queue slot frees up the frames that
+    arrived meanwhile (at least a quarter of that) are queued behind.
+
+    Only the new frames are decoded, behind a few already played ones
+    (`context_bytes`, more than the 511 byte bit reservoir a frame may borrow
+    from) whose PCM is dropped, so frame boundaries never glitch and a long
+    reply costs linear time.
+
+    Subclasses provide the output: _decode(mp3) -> pcm bytes, _start(pcm),
+    _can_queue(), _queue(pcm), busy() and halt().
+    """
+
+    def __init__(self, first_bytes=2048, poll=0.01, context_bytes=1024):
+        self.first_bytes = first_bytes
+        self.poll = poll
+        self.context_bytes = context_bytes
+        self.metrics = {}
+
+    def _context(self, segment):
+        """The last whole frames of a decoded segment, at least context_bytes long"""
+        starts, end = mp3_frame_starts(segment)
+        for start in reversed(starts):
+            if end - start >= self.context_bytes:
+                return segment[start:end]
+        return segment[starts[0]:end] if starts else b""
+
+    def play(self, stream, stop_flag):
+        """Blocks until the stream has been played or stop_flag is set"""
+        self.metrics = {"first_audio": None, "segments": 0}
+        decoded_end, context = 0, b""
+        started = False
+        while not stop_flag.is_set():
+            if started and not self._can_queue():
+                time.sleep(self.poll)
+                continue
+            wanted = decoded_end + (self.first_bytes if not started else self.first_bytes // 4)
+            stream.wait(wanted, timeout=self.poll)
+            closed = stream.closed  # Read first: a stream closed after the read may have more data
+            new = stream.getvalue(decoded_end)
+            end = decoded_end + (len(new) if closed else mp3_frames_end(new))
+            if end < wanted and not (closed and end > decoded_end):
+                if closed:
+                    break  # Everything is queued
+                continue
+            segment = context + new[:end - decoded_end]
+            chunk = self._decode(segment)[len(self._decode(context)) if context else 0:]
+            context, decoded_end = self._context(segment), end
+            if not chunk:
+                continue
+            if not started:
+                self._start(chunk)
+                started = True
+                self.metrics["first_audio"] = time.perf_counter() - stream.created
+            else:
+                self._queue(chunk)
+            self.metrics["segments"] += 1
+        if stream.error is not None and not started:
+            raise stream.error
+        while started and self.busy() and not stop_flag.is_set():
+            time.sleep(self.poll)
+        if stop_flag.is_set():
+            stream.cancel()
+            self.halt()
+
+class PygameStreamPlayer(StreamPlayer):
+    """StreamPlayer on a pygame mixer channel (pygame decodes MP3 from memory)"""
+
+    def __init__(self, first_bytes=2048, poll=0.01):
+        super().__init__(first_bytes, poll)
+        import pygame
+        self._pygame = pygame
+        self._channel = None
+
+    def _decode(self, mp3):
+        return self._pygame.mixer.Sound(file=io.BytesIO(mp3)).get_raw()
+
+    def _start(self, pcm):
+        self._channel = self._pygame.mixer.Sound(buffer=pcm).play()
+
+    def _can_queue(self):
+        return self._channel is not None and self._channel.get_queue() is None
+
+    def _queue(self, pcm):
+        self._channel.queue(self._pygame.mixer.Sound(buffer=pcm))
+
+    def busy(self):
+        return self._channel is not None and self._channel.get_busy()
+
+    def halt(self):
+        if self.busy():
+            self._channel.stop()
+            logger.info("Speech stopped")
@@ -0,0 +1,186 @@
+from collections import deque
+import numpy as np
+
+def frame_rms(frame):
+    return float(np.sqrt(np.mean(frame.astype(np.float32) ** 2))) if len(frame) else 0.0
+
+class NoiseFloor:
+    """
+    Ambient level by minimum statistics: the lowest frame RMS over the last
+    `window` seconds (kept per `block`), so it follows noise that rises as
+    well as noise that falls, and speech (which has pauses) does not lift it.
+    """
+
+    def __init__(self, sample_rate=16000, window=3.0, block=0.5):
+        self.block_samples = int(block * sample_rate)
+        self.blocks = deque(maxlen=max(1, int(round(window / block))))
+        self.rms = None
+        self._block_min = None
+        self._block_count = 0
+
+    def update(self, frame):
+        return self.add(frame_rms(frame), len(frame))
+
+    def add(self, rms, samples):
+        """Feed the RMS of a frame of `samples` samples"""
+        self._block_min = rms if self._block_min is None else min(self._block_min, rms)
+        self._block_count += samples
+        if self._block_count >= self.block_samples:
+            self.blocks.append(self._block_min)
+            self._block_min, self._block_count = None, 0
+            self.rms = min(self.blocks)
+        elif not self.blocks:
+            self.rms = self._block_min  # Lowest level so far, until the first block closes
+        return rms
+
+class EnergyVAD:
+    """
+    Frame-level speech decision from RMS energy against the noise floor of
+    the frames it has seen (minimum statistics, so it follows a louder room too).
+    """
+
+    def __init__(self, ratio=3.0, min_rms=150.0, sample_rate=16000, window=3.0):
+        self.ratio = ratio
+        self.min_rms = min_rms
+        self.floor = NoiseFloor(sample_rate, window)
+
+    @property
+    def noise_rms(self):
+        return self.floor.rms
+
+    def is_speech(self, frame):
+        rms = self.floor.update(frame)
+        return rms > max(self.min_rms, self.floor.rms * self.ratio)
+
+class SpectralVAD:
+    """
+    Speech detector for noisy rooms: a frame counts as speech when it is
+    louder than the noise floor AND looks voiced (low spectral flatness,
+    energy concentrated in the speech band, low zero-crossing rate), which
+    rejects fans, hiss and rumble that the energy gate alone lets through.
+    Decisions are smoothed: `onset` speech frames in a row start speech and
+    it holds for `hangover` frames after the last one (pauses between words).
+    """
+
+    def __init__(self, sample_rate=16000, frame_ms=30, ratio=3.0, min_rms=150.0, max_flatness=0.3,
+                 min_band_ratio=0.6, max_zcr=0.4, onset=3, hangover=8, band=(80, 4000)):
+        self.sample_rate = sample_rate
+        self.frame_samples = int(sample_rate * frame_ms / 1000)
+        self.ratio = ratio
+        self.min_rms = min_rms
+        self.max_flatness = max_flatness
+        self.min_band_ratio = min_band_ratio
+        self.max_zcr = max_zcr
+        self.onset = onset
+        self.hangover = hangover
+        self.nfft = 1 << (self.frame_samples - 1).bit_length()
+        self.window = np.hanning(self.frame_samples).astype(np.float32)
+        freqs = np.fft.rfftfreq(self.nfft, 1.0 / sample_rate)
+        self.band = (freqs >= band[0]) & (freqs <= band[1])
+        self.reset()
+
+    def reset(self):
+        self.floor = NoiseFloor(self.sample_rate)
+        self._run = 0
+        self._hold = 0
+
+    @property
+    def noise_rms(self):
+        return self.floor.rms
+
+    def features(self, frames):
+        """(rms, flatness, band_ratio, zcr) arrays for a (n_frames, frame_samples) block"""
+        frames = frames.astype(np.float32)
+        rms = np.sqrt(np.mean(frames ** 2, axis=1))
+        power = np.abs(np.fft.rfft(frames * self.window, self.nfft, axis=1)) ** 2 + 1e-3
+        in_band = power[:, self.band]
+        flatness = np.exp(np.mean(np.log(in_band), axis=1)) / np.mean(in_band, axis=1)
+        band_ratio = in_band.sum(axis=1) / power.sum(axis=1)
+        zcr = np.mean(np.signbit(frames[:, 1:]) != np.signbit(frames[:, :-1]), axis=1)
+        return rms, flatness, band_ratio, zcr
+
+    def _decide(self, rms, flatness, band_ratio, zcr):
+        """Raw frame decision, then onset/hangover smoothing"""
+        self.floor.add(rms, self.frame_samples)
+        voiced = (rms > max(self.min_rms, self.floor.rms * self.ratio) and flatness < self.max_flatness
+                  and band_ratio > self.min_band_ratio and zcr < self.max_zcr)
+        self._run = self._run + 1 if voiced else 0
+        if self._run >= self.onset:
+            self._hold = self.hangover
+        elif self._hold:
+            self._hold -= 1
+            return True, voiced
+        return self._run >= self.onset, voiced
+
+    def is_speech(self, frame):
+        """Streaming decision for one frame (EnergyVAD interface)"""
+        if len(frame) < self.frame_samples:
+            frame = np.pad(frame, (0, self.frame_samples - len(frame)))
+        features = self.features(frame[np.newaxis, :self.frame_samples])
+        return self._decide(*(float(value[0]) for value in features))[0]
+
+    def speech_mask(self, samples):
+        """(smoothed, raw) per-frame speech decisions for a whole clip (starts from a fresh state)"""
+        self.reset()
+        n = len(samples) // self.frame_samples
+        if n == 0:
+            return np.zeros(0, dtype=bool), np.zeros(0, dtype=bool)
+        features = self.features(np.asarray(samples[:n * self.frame_samples]).reshape(n, self.frame_samples))
+        decisions = [self._decide(*values) for values in zip(*(f.tolist() for f in features))]
+        smoothed, raw = zip(*decisions)
+        return np.array(smoothed), np.array(raw)
+
+class SpeechGate:
+    """
+    Decides whether a captured snippet is worth a cloud recognition call:
+    at least `min_speech` seconds of smoothed speech, and an energy envelope
+    that moves like syllables (`min_modulation`, coefficient of variation of
+    frame RMS across the active region), which steady tones, hum and music
+    chords do not. Counts forwarded and avoided calls.
+    """
+
+    def __init__(self, min_speech=0.2, min_modulation=0.15, **vad_options):
+        self.min_speech = min_speech
+        self.min_modulation = min_modulation
+        self.vad_options = vad_options
+        self._vads = {}
+        self.forwarded = 0
+        self.avoided = 0
+
+    def _vad(self, sample_rate):
+        if sample_rate not in self._vads:
+            self._vads[sample_rate] = SpectralVAD(sample_rate, **self.vad_options)
+        return self._vads[sample_rate]
+
+    def is_speech(self, samples, sample_rate=16000):
+        vad = self._vad(sample_rate)
+        smoothed, raw = vad.speech_mask(samples)
+        if smoothed.sum() * vad.frame_samples < self.min_speech * sample_rate:
+            return False
+        active = np.flatnonzero(raw)
+        n = vad.frame_samples
+        region = np.asarray(samples[active[0] * n:(active[-1] + 1) * n], dtype=np.float32).reshape(-1, n)
+        rms = np.sqrt(np.mean(region ** 2, axis=1))
+        return float(np.std(rms) / (np.mean(rms) + 1e-9)) >= self.min_modulation
+
+    def allows(self, samples, sample_rate=16000):
+        """is_speech() plus the forwarded/avoided counters"""
+        if self.is_speech(samples, sample_rate):
+            self.forwarded += 1
+            return True
+        self.avoided += 1
+        return False
+
+    def allows_audio(self, audio):
+        """Same for an sr.AudioData snippet"""
+        data = audio.frame_data if audio.sample_width == 2 else audio.get_raw_data(convert_width=2)
+        return self.allows(np.frombuffer(data, dtype=np.int16), audio.sample_rate)
+
+    def stats(self):
+        checked = self.forwarded + self.avoided
+        return {
+            "checked": checked,
+            "forwarded": self.forwarded,
+            "avoided": self.avoided,
+            "avoided_pct": 100.0 * self.avoided / checked if checked else 0.0,
+        }
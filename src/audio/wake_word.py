@@ -2,15 +2,32 @@ import speech_recognition as sr
 from difflib import SequenceMatcher
 from src.utils.logger import logger
 from src.config.settings import Settings
+from src.audio.vad import SpeechGate
+import numpy as np
 
 class WakeWordListener:
     """
     Improved Wake Word detection with fuzzy matching and phonetic variations.
     """
     
-    def __init__(self):
+    def __init__(self, pipeline=None, capture=None):
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        # With an AudioPipeline, standby reads its recognized utterances instead of opening the mic
+        self.pipeline = pipeline
+        # Local VAD: noise and TV hum in standby are dropped before recognize_google
+        self.gate = SpeechGate() if Settings.SPEECH_GATE_ENABLED else None
+        # With a CaptureService, standby listens on the shared stream instead of reopening the device
+        self.microphone = None
+        if pipeline is None:
+            self.microphone = capture.microphone() if capture is not None else sr.Microphone()
+        # Offline keyword spotting backend; transcription stays the fallback until it has templates
+        self.spotter = None
+        if Settings.WAKE_WORD_ENGINE == "local" and capture is not None and pipeline is None:
+            from src.audio.kws import KeywordSpotter
+            self.spotter = KeywordSpotter(capture)
+            if not self.spotter.ready():
+                logger.info(f"Wake word local: {len(self.spotter.templates)}/{Settings.WAKE_WORD_MIN_TEMPLATES} "
+                            f"plantillas, usando transcripción mientras aprende")
         
         # Phonetic variations for better recognition
         self.wake_word_variations = {
@@ -27,6 +44,9 @@ class WakeWordListener:
             assistant_variations.extend(self.wake_word_variations['once'])
 
         self.wake_words = []
+        # Utterances clean enough to enroll as local templates: the name alone or with "hey"/"oye"
+        name = Settings.ASSISTANT_NAME.lower()
+        self.enroll_phrases = {name, f"hey {name}", f"oye {name}"}
         
         # Solo el nombre
         self.wake_words.extend(assistant_variations)
@@ -42,11 +62,14 @@ class WakeWordListener:
         self.recognizer.dynamic_energy_adjustment_damping = 0.2 # More damping (was 0.15)
         self.recognizer.dynamic_energy_ratio = 1.5
         
+        logger.info(f"Wake words configurados: {list(set(assistant_variations))}")
+        if pipeline is not None or capture is not None:
+            return
+        
         # Adjust for ambient noise on init
         with self.microphone as source:
             logger.info("Ajustando para ruido ambiental...")
             self.recognizer.adjust_for_ambient_noise(source, duration=1.5)
-            logger.info(f"Wake words configurados: {list(set(assistant_variations))}")
 
     def fuzzy_match(self, text, target, threshold=0.7):
         """
@@ -92,10 +115,34 @@ class WakeWordListener:
         Returns:
             bool: True if wake word detected
         """
+        if self.pipeline is not None:
+            text = self.pipeline.next_text(timeout=3, max_age=Settings.AUDIO_MAX_UTTERANCE_AGE)
+            return bool(text) and self.check_wake_word(text)
+        if self.spotter is not None and self.spotter.ready():
+            if self.spotter.misses < Settings.WAKE_WORD_FALLBACK_MISSES:
+                return self.spotter.listen(timeout=3)
+            # Several segments rejected in a row: maybe the templates no longer match the user
+            self.spotter.misses = 0
+            logger.debug("Wake word local: rechazos seguidos, probando con transcripción")
+        return self._listen_transcription()
+
+    def _enroll(self, audio):
+        """A confirmed detection becomes a template for the local backend"""
+        if self.spotter is None or audio.sample_rate != self.spotter.sample_rate or audio.sample_width != 2:
+            return
+        self.spotter.add_template(np.frombuffer(audio.frame_data, dtype=np.int16))
+
+    def _listen_transcription(self):
+        """Cloud backend: transcribe the snippet and look for the wake word in the text"""
+        if hasattr(self.microphone, "calibrate"):
+            self.microphone.calibrate(self.recognizer)
         with self.microphone as source:
             try:
                 # Reduced timeout for faster response
                 audio = self.recognizer.listen(source, timeout=3, phrase_time_limit=2)
+                if self.gate is not None and not self.gate.allows_audio(audio):
+                    logger.debug(f"Standby: no speech, recognition skipped ({self.gate.avoided} avoided)")
+                    return False
                 
                 try:
                     # Use Google for recognition
@@ -103,6 +150,8 @@ class WakeWordListener:
                     logger.debug(f"Escuchado en standby: '{text}'")
                     
                     if self.check_wake_word(text):
+                        if " ".join(text.split()) in self.enroll_phrases:  # Exactly the wake phrase: a clean template
+                            self._enroll(audio)
                         return True
                         
                 except sr.UnknownValueError:
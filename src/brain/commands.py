@@ -0,0 +1,32 @@
+# Command catalogue shared by the LLM intent prompt and the local intent router
+
+COMMANDS = [
+    {"name": "open_app", "signature": "open_app(app_name)",
+     "description": "Open applications (e.g., vscode, chrome, notepad, spotify)"},
+    {"name": "search_web", "signature": "search_web(query)",
+     "description": "Search Google"},
+    {"name": "system_control", "signature": "system_control(action)",
+     "description": "volume_up, volume_down, mute"},
+    {"name": "system_info", "signature": "system_info()",
+     "description": "Get CPU/RAM status"},
+    {"name": "open_folder", "signature": "open_folder(folder_name)",
+     "description": "Search and open a folder"},
+    {"name": "create_folder", "signature": "create_folder(folder_name, location)",
+     "description": "Create a folder (location optional)"},
+    {"name": "map_folders", "signature": "map_folders()",
+     "description": 'Scan and index all system folders (e.g., "mapear carpetas", "map folders", "update index")'},
+    {"name": "open_file", "signature": "open_file(file_name)",
+     "description": "Search and open a file"},
+    {"name": "analyze_screen", "signature": "analyze_screen(prompt)",
+     "description": 'Analyze screen content (e.g., "what is on my screen", "explain this error")'},
+]
+
+def get_command_names():
+    """Get the names of all catalogued commands"""
+    return [command["name"] for command in COMMANDS]
+
+def format_catalogue(indent="        "):
+    """Render the catalogue as the bullet list used in the intent prompt"""
+    return "\n".join(
+        f"{indent}- {command['signature']}: {command['description']}" for command in COMMANDS
+    )
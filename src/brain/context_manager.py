@@ -1,24 +1,32 @@
+from src.config.settings import Settings
 from src.utils.logger import logger
 
+def estimate_tokens(text):
+    """Cheap local token estimate (~4 characters per token for Gemini-style tokenizers)"""
+    if not text:
+        return 0
+    return max(1, (len(text) + 3) // 4)
+
 class ContextManager:
-    def __init__(self):
-        self.history = []
+    """
+    Assembles the prompt context for each turn within a token budget.
+    Packs, in priority order: system prompt and user input, known facts,
+    recent turns (newest first), relevant older turns recalled from memory
+    and a short summary of the turns that did not fit.
+    """
+
+    def __init__(self, memory, budget=None, max_turns=None):
+        self.memory = memory
+        self.budget = budget or Settings.CONTEXT_TOKEN_BUDGET
+        self.max_turns = max_turns or Settings.CONTEXT_MAX_TURNS
         self.system_state = {}
-        
-    def add_interaction(self, user_input, ai_response):
-        """Add a turn to the conversation history"""
-        self.history.append({
-            "user": user_input,
-            "ai": ai_response
-        })
-        # Keep history manageable (last 20 turns)
-        if len(self.history) > 20:
-            self.history.pop(0)
-            
+        self.history_floor_id = 0
+        self.last_stats = {}
+
     def update_system_state(self, key, value):
         """Update a specific system state value"""
         self.system_state[key] = value
-        
+
     def get_context_string(self):
         """Get a string representation of the current context"""
         context_str = "System State:\n"
@@ -27,4 +35,121 @@ class ContextManager:
         return context_str
 
     def clear_history(self):
-        self.history = []
+        """Start a fresh session: older turns are only reachable through recall"""
+        self.history_floor_id = self.memory.get_last_message_id()
+
+    def _take(self, lines, budget):
+        """Keep lines in order while they fit in budget. Returns (kept, tokens)."""
+        kept, used = [], 0
+        for line in lines:
+            cost = estimate_tokens(line)
+            if used + cost > budget:
+                break
+            kept.append(line)
+            used += cost
+        return kept, used
+
+    def _summarize(self, turns):
+        """Extractive summary of dropped turns: first sentence of each, oldest first"""
+        lines = []
+        for turn in turns:
+            text = " ".join(turn["content"].split())
+            first = text.split(". ")[0][:120]
+            lines.append(f"- {turn['role']}: {first}")
+        return lines
+
+    def build(self, system_prompt, user_prompt, extra_context=None):
+        """
+        Assemble the context for one turn.
+        Returns:
+            dict: {'history': [...] for start_chat, 'prompt': str to send, 'stats': token breakdown}
+        """
+        stats = {"budget": self.budget}
+        remaining = self.budget
+
+        # 1. Mandatory: instructions and the user input
+        stats["system"] = estimate_tokens(system_prompt)
+        stats["prompt"] = estimate_tokens(user_prompt)
+        remaining -= stats["system"] + stats["prompt"]
+
+        sections = []
+        if extra_context:
+            stats["extra"] = estimate_tokens(extra_context)
+            remaining -= stats["extra"]
+            sections.append(extra_context)
+        if self.system_state:
+            state = self.get_context_string()
+            stats["state"] = estimate_tokens(state)
+            remaining -= stats["state"]
+            sections.append(state)
+
+        # 2. Known facts (capped)
+        facts = self.memory.get_all_facts()
+        fact_lines, stats["facts"] = self._take(
+            [f"- {k}: {v}" for k, v in facts.items()],
+            min(remaining, int(self.budget * 0.1))
+        )
+        remaining -= stats["facts"]
+        if fact_lines:
+            sections.append("Known facts about the user:\n" + "\n".join(fact_lines))
+
+        # 3. Recent turns, newest first, leaving room for recall and summary
+        turns = self.memory.get_recent_turns(limit=self.max_turns, after_id=self.history_floor_id)
+        reserve = int(self.budget * 0.2)
+        history, used = [], 0
+        for turn in reversed(turns):
+            cost = estimate_tokens(turn["content"])
+            if used + cost > remaining - reserve:
+                break
+            history.insert(0, turn)
+            used += cost
+        stats["history"] = used
+        remaining -= used
+        dropped = turns[:len(turns) - len(history)]
+
+        # 4. Relevant older turns from long-term memory
+        stats["recalled"] = 0
+        if Settings.MEMORY_RECALL_K:
+            # Only turns older than the packed history are worth recalling
+            matches = self.memory.search_history(
+                user_prompt,
+                k=Settings.MEMORY_RECALL_K,
+                before_id=history[0]["id"] if history else None
+            )
+            recalled, stats["recalled"] = self._take(
+                [f"- [{m['timestamp']}] {m['role']}: {m['content']}" for m in matches],
+                remaining // 2
+            )
+            # Compacted history is only reachable through its summaries
+            summaries, summary_tokens = self._take(
+                [f"- [{s['start_time']} - {s['end_time']}] {s['content']}"
+                 for s in self.memory.search_summaries(user_prompt, k=1)],
+                remaining // 2 - stats["recalled"]
+            )
+            recalled += summaries
+            stats["recalled"] += summary_tokens
+            remaining -= stats["recalled"]
+            if recalled:
+                sections.append("Relevant past conversation:\n" + "\n".join(recalled))
+
+        # 5. Summary of the recent turns that did not fit
+        summary, stats["summary"] = self._take(self._summarize(dropped), remaining)
+        if summary:
+            sections.insert(0, "Earlier in this conversation:\n" + "\n".join(summary))
+
+        prompt = f"System Instructions: {system_prompt}\n"
+        if sections:
+            prompt += "Context:\n" + "\n\n".join(sections) + "\n"
+        prompt += f"\nUser: {user_prompt}"
+
+        stats["turns_included"] = len(history)
+        stats["turns_summarized"] = len(summary)
+        stats["total"] = sum(v for k, v in stats.items() if k not in ("budget", "turns_included", "turns_summarized"))
+        self.last_stats = stats
+        logger.debug(f"Assembled context: {stats}")
+
+        return {
+            "history": [{"role": t["role"], "parts": [t["content"]]} for t in history],
+            "prompt": prompt,
+            "stats": stats
+        }
@@ -0,0 +1,50 @@
+import re
+import zlib
+import unicodedata
+
+try:
+    import numpy as np
+except ImportError:  # Semantic recall is optional
+    np = None
+
+class HashingEmbedder:
+    """
+    Local, dependency-light text embedding.
+    Hashed bag of words and word bigrams projected into a fixed number of
+    dimensions with a sign hash, L2 normalized and stored as float32 blobs.
+    """
+
+    TOKEN = re.compile(r"\w+")
+
+    def __init__(self, dim=128):
+        if np is None:
+            raise ImportError("numpy is required for the semantic memory index")
+        self.dim = dim
+
+    @staticmethod
+    def tokenize(text):
+        text = unicodedata.normalize("NFKD", text.lower())
+        text = "".join(c for c in text if not unicodedata.combining(c))
+        return [t for t in HashingEmbedder.TOKEN.findall(text) if len(t) > 2]
+
+    def embed(self, text):
+        """Embed one text as a normalized float32 vector"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        tokens = self.tokenize(text)
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for feature in features:
+            h = zlib.crc32(feature.encode("utf-8"))
+            vector[h % self.dim] += 1.0 if (h >> 16) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def to_blob(self, vector):
+        return vector.astype(np.float32).tobytes()
+
+    def from_blobs(self, blobs):
+        """Stack float32 blobs into a (n, dim) matrix"""
+        if not blobs:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(-1, self.dim)
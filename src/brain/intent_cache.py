@@ -0,0 +1,192 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from src.config.settings import Settings
+from src.utils.logger import logger
+from src.brain.commands import COMMANDS, format_catalogue
+
+class IntentCache:
+    """
+    Two-level cache for LLM intent classifications.
+    In-memory LRU in front of a SQLite table stored next to memory.db.
+    Entries are keyed on (normalized text, language, model) and are
+    invalidated when the personality or the command catalogue changes
+    (the fingerprint is only rehashed when one of them looks different).
+    """
+
+    def __init__(self, db_path=None, max_entries=None, ttl_seconds=None):
+        self.db_path = db_path or os.path.join(os.path.dirname(Settings.DB_PATH), "intent_cache.db")
+        self.max_entries = max_entries or Settings.INTENT_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else Settings.INTENT_CACHE_TTL_HOURS * 3600
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._fingerprint = None
+        self._fingerprint_inputs = None
+        self._purged_at = 0.0
+
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "miss_latency_total": 0.0,
+            "invalidations": 0
+        }
+        self._init_db()
+
+    def _init_db(self):
+        """Open the cache database and drop entries from an older fingerprint"""
+        try:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS intent_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    result TEXT,
+                    fingerprint TEXT,
+                    created_at REAL
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_intent_cache_created ON intent_cache(created_at)')
+            self._conn.commit()
+            self._check_fingerprint()
+            self._purge_expired(time.time())
+        except Exception as e:
+            logger.error(f"Failed to init intent cache DB: {e}")
+            self._conn = None
+
+    @staticmethod
+    def compute_fingerprint():
+        """Hash of everything that can change a classification besides the input"""
+        source = json.dumps(Settings.PERSONALITY, sort_keys=True) + format_catalogue()
+        return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _snapshot_inputs():
+        """Cheap snapshot of the fingerprint inputs, compared on every lookup"""
+        return tuple(sorted(Settings.PERSONALITY.items())), id(COMMANDS), len(COMMANDS)
+
+    def _check_fingerprint(self):
+        """
+        Invalidate everything if personality or catalogue changed since last check.
+        Returns False while stale rows could not be deleted (retried on the next call).
+        """
+        inputs = self._snapshot_inputs()
+        if inputs == self._fingerprint_inputs:
+            return True
+        fingerprint = self.compute_fingerprint()
+        if fingerprint != self._fingerprint:
+            self._memory.clear()
+            if self._conn:
+                try:
+                    self._conn.execute('DELETE FROM intent_cache WHERE fingerprint != ?', (fingerprint,))
+                    self._conn.commit()
+                except Exception as e:
+                    logger.warning(f"Intent cache invalidation failed: {e}")
+                    return False
+            if self._fingerprint is not None:
+                logger.info("Intent cache invalidated (personality or command catalogue changed)")
+                self.stats["invalidations"] += 1
+            self._fingerprint = fingerprint
+        self._fingerprint_inputs = inputs
+        return True
+
+    def _purge_expired(self, now):
+        """Delete rows past the TTL (skipped on read, they would otherwise stay on disk forever)"""
+        self._purged_at = now
+        deleted = self._conn.execute('DELETE FROM intent_cache WHERE created_at < ?', (now - self.ttl_seconds,)).rowcount
+        self._conn.commit()
+        if deleted:
+            logger.debug(f"Intent cache: {deleted} expired entries deleted")
+
+    @staticmethod
+    def make_key(normalized_text, language, model_name):
+        return f"{language}|{model_name}|{normalized_text}"
+
+    def get(self, normalized_text, language, model_name):
+        """Return the cached classification dict or None"""
+        key = self.make_key(normalized_text, language, model_name)
+        now = time.time()
+        with self._lock:
+            if not self._check_fingerprint():
+                self.stats["misses"] += 1
+                return None
+
+            entry = self._memory.get(key)
+            if entry and now - entry[1] < self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return dict(entry[0])
+
+            if self._conn:
+                try:
+                    row = self._conn.execute(
+                        'SELECT result, created_at FROM intent_cache WHERE cache_key = ? AND fingerprint = ?',
+                        (key, self._fingerprint)
+                    ).fetchone()
+                    if row and now - row[1] < self.ttl_seconds:
+                        result = json.loads(row[0])
+                        self._remember(key, result, row[1])
+                        self.stats["disk_hits"] += 1
+                        return dict(result)
+                except Exception as e:
+                    logger.warning(f"Intent cache read failed: {e}")
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, normalized_text, language, model_name, result, latency=0.0):
+        """Store a classification. latency is the LLM time this entry will save on each hit."""
+        key = self.make_key(normalized_text, language, model_name)
+        now = time.time()
+        with self._lock:
+            self.stats["miss_latency_total"] += latency
+            self._remember(key, result, now)
+            if self._conn and self._fingerprint is not None:
+                try:
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO intent_cache (cache_key, result, fingerprint, created_at) VALUES (?, ?, ?, ?)',
+                        (key, json.dumps(result), self._fingerprint, now)
+                    )
+                    self._conn.commit()
+                    if now - self._purged_at > min(self.ttl_seconds, 3600):
+                        self._purge_expired(now)
+                except Exception as e:
+                    logger.warning(f"Intent cache write failed: {e}")
+
+    def _remember(self, key, result, created_at):
+        """Insert into the in-memory LRU, evicting the oldest entry if full"""
+        self._memory[key] = (result, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def invalidate(self):
+        """Drop every cached classification"""
+        with self._lock:
+            self._memory.clear()
+            self.stats["invalidations"] += 1
+            if self._conn:
+                try:
+                    self._conn.execute('DELETE FROM intent_cache')
+                    self._conn.commit()
+                except Exception as e:
+                    logger.warning(f"Intent cache clear failed: {e}")
+        logger.info("Intent cache cleared")
+
+    def get_stats(self):
+        """Hit/miss counters plus estimated latency and LLM calls saved"""
+        stats = dict(self.stats)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        avg_miss_latency = stats["miss_latency_total"] / stats["misses"] if stats["misses"] else 0.0
+        stats["hits"] = hits
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        stats["llm_calls_saved"] = hits
+        stats["estimated_latency_saved"] = hits * avg_miss_latency
+        stats["memory_entries"] = len(self._memory)
+        return stats
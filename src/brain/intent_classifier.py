@@ -1,6 +1,11 @@
 
 import re
+import json
+import time
+from src.config.settings import Settings
 from src.utils.logger import logger
+from src.brain.intent_router import IntentRouter
+from src.brain.intent_cache import IntentCache
 
 class IntentClassifier:
     """
@@ -15,8 +20,21 @@ class IntentClassifier:
         "ver", "mira", "pantalla", "screen", "look", "see"
     ]
     
-    def __init__(self, llm_client):
+    def __init__(self, llm_client, router=None, threshold=None, cache=None):
         self.llm = llm_client
+        self.router = router or IntentRouter(self.SYSTEM_KEYWORDS)
+        self.cache = cache if cache is not None else IntentCache()
+        self.threshold = threshold if threshold is not None else Settings.INTENT_FAST_PATH_THRESHOLD
+        
+        # How often each classification path is taken
+        self.stats = {
+            "fast_path": 0,
+            "below_threshold": 0,
+            "cache": 0,
+            "llm": 0,
+            "keyword_fallback": 0,
+            "default_chat": 0
+        }
         
     def classify(self, text):
         """
@@ -26,31 +44,66 @@ class IntentClassifier:
         """
         text_lower = text.lower()
         
-        # 1. LLM Classification FIRST (Smarter, handles natural language)
+        # 0. Local fast path (deterministic, no network)
+        routed = self.router.route(text)
+        if routed:
+            if routed["confidence"] >= self.threshold:
+                self.stats["fast_path"] += 1
+                logger.info(f"Fast path classification result: {routed}")
+                return routed
+            self.stats["below_threshold"] += 1
+            logger.debug(f"Fast path below threshold ({routed['confidence']} < {self.threshold}), asking LLM")
+        
+        # 1. Cached LLM classification for repeated utterances
+        cache_args = (IntentRouter.normalize(text), Settings.LANGUAGE, getattr(self.llm, "model_name", ""))
+        if self.cache:
+            cached = self.cache.get(*cache_args)
+            if cached:
+                self.stats["cache"] += 1
+                logger.info(f"Cached classification result: {cached}")
+                return cached
+        
+        # 2. LLM Classification (Smarter, handles natural language)
         # This allows the assistant to understand requests like "cuéntame un chiste"
         try:
             logger.info("Analyzing intent with LLM...")
+            start = time.perf_counter()
             analysis = self.llm.analyze_intent(text)
             
             if analysis:
-                import json
                 # Clean up json string if needed (remove markdown code blocks)
                 analysis = analysis.replace("```json", "").replace("```", "").strip()
                 
                 result = json.loads(analysis)
+                self.stats["llm"] += 1
                 logger.info(f"LLM classification result: {result}")
+                if self.cache:
+                    self.cache.put(*cache_args, result, latency=time.perf_counter() - start)
                 return result
                 
         except Exception as e:
             logger.error(f"LLM classification failed: {e}, falling back to keyword matching")
         
-        # 2. Fallback to Keyword Matching (only if LLM fails)
+        # 3. Fallback to Keyword Matching (only if LLM fails)
         for keyword in self.SYSTEM_KEYWORDS:
             if keyword in text_lower:
+                self.stats["keyword_fallback"] += 1
                 logger.info(f"Intent classified as COMMAND via keyword: {keyword}")
                 return {"type": "command", "confidence": 0.7, "keyword": keyword}
     
-        # 3. Default to chat if nothing else matches
+        # 4. Default to chat if nothing else matches
+        self.stats["default_chat"] += 1
         logger.info("Intent classified as CHAT (default)")
         return {"type": "chat", "confidence": 0.9}
 
+    def get_stats(self):
+        """Get classification path counters, the fast-path hit rate and cache stats"""
+        # below_threshold turns are also counted by the path that finally answered them
+        total = sum(v for k, v in self.stats.items() if k != "below_threshold")
+        stats = dict(self.stats)
+        stats["total"] = total
+        stats["fast_path_rate"] = self.stats["fast_path"] / total if total else 0.0
+        if self.cache:
+            stats["cache_stats"] = self.cache.get_stats()
+        return stats
+
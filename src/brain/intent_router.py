@@ -0,0 +1,226 @@
+import re
+import unicodedata
+from src.config.locales import TRANSLATIONS
+from src.system.windows_controller import WindowsController
+from src.utils.logger import logger
+
+class IntentRouter:
+    """
+    Local, deterministic fast path for common commands.
+    Resolves high-confidence commands (with parameters) without calling the LLM.
+    Returns None when the input is ambiguous so the caller can ask the LLM.
+    """
+
+    def __init__(self, system_keywords=(), app_aliases=None):
+        self.app_aliases = {self.normalize(k): v for k, v in (app_aliases or WindowsController.APP_ALIASES).items()}
+
+        # Merge keyword lists from every language: users often mix them
+        self.words = {}
+        for lang_dict in TRANSLATIONS.values():
+            for key, value in lang_dict.items():
+                if isinstance(value, list):
+                    merged = self.words.setdefault(key, [])
+                    merged.extend(w for w in (self.normalize(v) for v in value) if w not in merged)
+
+        # Longest phrases first so "busca en google" wins over "busca"
+        for key in self.words:
+            self.words[key].sort(key=len, reverse=True)
+
+        # Cheap prefilter: if none of these appear, there is nothing to route
+        trigger_words = set(self.normalize(k) for k in system_keywords)
+        for key in ("volume_up_words", "volume_down_words", "mute_words", "system_info_words",
+                    "screen_words", "open_words", "search_words", "create_folder_words", "map_words"):
+            trigger_words.update(self.words.get(key, []))
+        self.trigger_words = sorted(trigger_words, key=len, reverse=True)
+
+        # Matchers in priority order (most specific first)
+        self.matchers = [
+            self._match_map_folders,
+            self._match_system_control,
+            self._match_system_info,
+            self._match_screen,
+            self._match_create_folder,
+            self._match_open_file,
+            self._match_open_folder,
+            self._match_search,
+            self._match_open_app,
+        ]
+
+    @staticmethod
+    def normalize(text):
+        """Lowercase, strip accents and punctuation, collapse whitespace"""
+        text = unicodedata.normalize("NFKD", text.lower())
+        text = "".join(c for c in text if not unicodedata.combining(c))
+        text = re.sub(r"[^\w\s]", " ", text)
+        return " ".join(text.split())
+
+    @staticmethod
+    def _contains(text, phrase):
+        """Whole-word phrase containment"""
+        return f" {phrase} " in f" {text} "
+
+    def _find(self, text, key):
+        """Return the first (longest) phrase of a keyword list found in text"""
+        for phrase in self.words.get(key, []):
+            if self._contains(text, phrase):
+                return phrase
+        return None
+
+    def _find_leading(self, text, key):
+        """Return the (longest) phrase of a keyword list that the text starts with"""
+        for phrase in self.words.get(key, []):
+            if text == phrase or text.startswith(phrase + " "):
+                return phrase
+        return None
+
+    def _rest(self, text, phrase):
+        """The words after a leading phrase, without fillers"""
+        return self._strip_fillers(text[len(phrase):])
+
+    def _remove(self, text, phrase):
+        """Remove a whole-word phrase from text"""
+        return " ".join(f" {text} ".replace(f" {phrase} ", " ", 1).split())
+
+    def _strip_fillers(self, text):
+        """Remove articles and filler words from both ends of an extracted parameter"""
+        text = " ".join(text.split())
+        stripped = None
+        while stripped != text:
+            stripped = text
+            for phrase in self.words.get("filler_words", []):  # Multi-word fillers too ("por favor")
+                if text == phrase:
+                    return ""
+                if text.startswith(phrase + " "):
+                    text = text[len(phrase) + 1:]
+                if text.endswith(" " + phrase):
+                    text = text[:-len(phrase) - 1]
+        return text
+
+    def _command(self, name, parameters, confidence):
+        return {
+            "type": "command",
+            "command": name,
+            "parameters": parameters,
+            "confidence": confidence,
+            "source": "fast_path"
+        }
+
+    def _match_bare(self, text, key, name, parameters, confidence):
+        """
+        A command without parameters: the phrase must open the utterance.
+        Anything said after it ("what does mute mean") may be a question
+        about the command rather than the command, so it is left below the
+        fast path threshold.
+        """
+        phrase = self._find_leading(text, key)
+        if not phrase:
+            return None
+        if self._rest(text, phrase):
+            confidence = 0.6
+        return self._command(name, parameters, confidence)
+
+    def _match_map_folders(self, text):
+        return self._match_bare(text, "map_words", "map_folders", "", 0.95)
+
+    def _match_system_control(self, text):
+        for key, action in (("volume_up_words", "volume_up"),
+                            ("volume_down_words", "volume_down"),
+                            ("mute_words", "mute")):
+            result = self._match_bare(text, key, "system_control", action, 0.95)
+            if result:
+                return result
+        return None
+
+    def _match_system_info(self, text):
+        return self._match_bare(text, "system_info_words", "system_info", "", 0.9)
+
+    def _match_screen(self, text):
+        phrase = self._find_leading(text, "screen_words")
+        if not phrase:
+            return None
+        # "qué ves en mi pantalla": the rest only names the screen
+        rest = self._rest(text, phrase)
+        if rest and not any(rest.endswith(word) for word in self.words.get("screen_words", [])):
+            return self._command("analyze_screen", text, 0.6)
+        return self._command("analyze_screen", text, 0.9)
+
+    def _match_create_folder(self, text):
+        phrase = self._find_leading(text, "create_folder_words")
+        if not phrase:
+            return None
+        name = self._rest(text, phrase)
+        if not name:
+            return None
+        return self._command("create_folder", name, 0.9)
+
+    def _match_open_target(self, text, target_key):
+        """Extract the target name from '<open> [the] <name> <target>' or '<open> <target> <name>'"""
+        open_word = self._find_leading(text, "open_words")
+        if not open_word:
+            return None
+        remainder = text[len(open_word):]
+        target_word = self._find(remainder, target_key)
+        if not target_word:
+            return None
+        return self._strip_fillers(self._remove(remainder, target_word)) or None
+
+    def _match_open_file(self, text):
+        name = self._match_open_target(text, "file_words")
+        if name:
+            return self._command("open_file", name, 0.9)
+        return None
+
+    def _match_open_folder(self, text):
+        name = self._match_open_target(text, "folder_words")
+        if name:
+            return self._command("open_folder", name, 0.9)
+        return None
+
+    def _match_search(self, text):
+        phrase = self._find_leading(text, "search_words")
+        if not phrase:
+            return None
+        # "busca la carpeta X" is a folder lookup, leave it to the LLM
+        if self._find(text, "folder_words") or self._find(text, "file_words"):
+            return None
+        query = text[len(phrase):]
+        query = re.sub(r"\s+(en|on|in) google$", "", query)
+        query = self._strip_fillers(query)
+        if not query:
+            return None
+        # A bare verb ("busca trabajo...") may just open a sentence: only an explicit
+        # marker ("search for", "busca en google") is sure enough for the fast path
+        confidence = 0.9 if " " in phrase else 0.7
+        return self._command("search_web", query, confidence)
+
+    def _match_open_app(self, text):
+        open_word = self._find_leading(text, "open_words")
+        if not open_word:
+            return None
+        app = self._rest(text, open_word)
+        if not app:
+            return None
+        if app in self.app_aliases:
+            return self._command("open_app", app, 0.95)
+        # Unknown target (could be a website, a folder, a song...): low confidence
+        return self._command("open_app", app, 0.6)
+
+    def route(self, text):
+        """
+        Try to resolve the text locally.
+        Returns:
+            dict | None: intent in the same format as the LLM classifier, or None
+        """
+        normalized = self.normalize(text)
+        if not normalized:
+            return None
+
+        if not any(self._contains(normalized, word) for word in self.trigger_words):
+            return None
+
+        for matcher in self.matchers:
+            result = matcher(normalized)
+            if result:
+                logger.debug(f"Fast path match: {result}")
+                return result
+        return None
@@ -1,8 +1,14 @@
+import itertools
 import google.generativeai as genai
 from src.config.settings import Settings
 from src.utils.logger import logger
 
 from src.brain.memory import MemoryManager
+from src.brain.context_manager import ContextManager
+from src.brain.memory_compactor import MemoryCompactor
+from src.brain.commands import format_catalogue
+from src.brain.model_health import ModelHealthProbe
+from src.brain.model_router import ModelRouter, is_model_error, is_quota_error
 
 class LLMClient:
     def __init__(self):
@@ -15,6 +21,10 @@ class LLMClient:
         
         # Initialize Memory
         self.memory = MemoryManager()
+        self.context = ContextManager(self.memory)
+        self.compactor = MemoryCompactor(self.memory)
+        if Settings.MEMORY_COMPACTION:
+            self.compactor.start()
         
         # Define available models (prioritizing user selection)
         self.available_models = [
@@ -27,49 +37,73 @@ class LLMClient:
             'gemini-1.5-pro'
         ]
         self.current_model_index = 0
+        self._models = {}
+        self.health = ModelHealthProbe(genai, self.available_models, api_key=self.api_key)
+        self.router = ModelRouter(self.available_models)
         
         # Configure model with fallback
         self.model = self._configure_model()
         
-        # Load recent history from DB
-        history = self.memory.get_recent_history(limit=20)
-        self.chat = self.model.start_chat(history=history)
+        # History is assembled per turn within the token budget (see ContextManager)
+        self.chat = self.model.start_chat(history=[])
         
         self.update_system_prompt()
         
-    def _configure_model(self):
-        """Try to configure the best available model"""
-        for i in range(len(self.available_models)):
-            model_name = self.available_models[i]
+    @property
+    def model_name(self):
+        """Name of the model currently in use"""
+        return self.available_models[self.current_model_index]
+
+    def _configure_model(self, force_probe=False):
+        """Configure the best available model (probed concurrently, cached on disk)"""
+        model_name = self.health.select_model(force_probe=force_probe)
+        if model_name is None:
+            logger.error("Could not connect to any Gemini model.")
+            raise RuntimeError("No available Gemini models found. Check API Key.")
+        
+        logger.info(f"Successfully connected to {model_name}")
+        self.router.seed_from_health(self.health.fresh_health())
+        self.current_model_index = self.available_models.index(model_name)
+        return self._get_model(model_name)
+
+    def _get_model(self, model_name):
+        """Get (and reuse) a GenerativeModel instance by name"""
+        if model_name not in self._models:
+            self._models[model_name] = genai.GenerativeModel(model_name)
+        return self._models[model_name]
+
+    def _use_model(self, model_name):
+        """Switch the current model"""
+        if model_name == self.model_name:
+            return
+        logger.info(f"Routing chat to model: {model_name}")
+        self.current_model_index = self.available_models.index(model_name)
+        self.model = self._get_model(model_name)
+
+    def _start_turn(self, model_name, assembled):
+        """Open a chat session on model_name seeded with the assembled history"""
+        self._use_model(model_name)
+        self.chat = self.model.start_chat(history=assembled["history"])
+
+    def _routed(self, fn, operation):
+        """Run fn(model_name) on the fastest healthy model, failing over through the circuit breakers"""
+        def attempt(model_name):
             try:
-                logger.info(f"Attempting to use model: {model_name}")
-                model = genai.GenerativeModel(model_name)
-                # Test the model with a simple prompt
-                model.generate_content("Test")
-                logger.info(f"Successfully connected to {model_name}")
-                self.current_model_index = i
-                return model
+                return fn(model_name)
             except Exception as e:
-                logger.warning(f"Failed to connect to {model_name}: {e}")
-                
-        logger.error("Could not connect to any Gemini model.")
-        raise RuntimeError("No available Gemini models found. Check API Key.")
+                if not is_model_error(e):
+                    # The request itself failed (blocked or empty reply): no failover
+                    logger.warning(f"{operation} failed: {e}")
+                    raise
+                logger.warning(f"{operation} failed on {model_name}: {e}")
+                if is_quota_error(e):
+                    self.health.mark_failed(model_name, e)
+                raise
+        return self.router.call(attempt)
 
-    def _switch_model(self):
-        """Switch to the next available model in the list"""
-        self.current_model_index = (self.current_model_index + 1) % len(self.available_models)
-        new_model_name = self.available_models[self.current_model_index]
-        logger.warning(f"Switching to fallback model: {new_model_name}")
-        
-        try:
-            self.model = genai.GenerativeModel(new_model_name)
-            # Re-initialize chat with history if it exists
-            history = self.chat.history if hasattr(self, 'chat') else []
-            self.chat = self.model.start_chat(history=history)
-            return True
-        except Exception as e:
-            logger.error(f"Failed to switch to {new_model_name}: {e}")
-            return False
+    def get_model_stats(self):
+        """Per-model circuit state, p50/p95 latency and error rate"""
+        return self.router.get_stats()
 
     def update_system_prompt(self):
         """Update the system prompt based on current settings"""
@@ -105,50 +139,88 @@ class LLMClient:
         - Answer general knowledge questions
         """
         
+    def get_context_stats(self):
+        """Token breakdown of the last assembled prompt"""
+        return self.context.last_stats
+
     def generate_response(self, prompt, context=None):
         """
-        Generate a response for the given prompt with fallback logic.
+        Generate a response for the given prompt on the fastest healthy model.
         """
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                full_prompt = prompt
-                
-                if not self.chat.history:
-                    full_prompt = f"{self.system_prompt}\n\nUser: {prompt}"
-                elif context:
-                    full_prompt = f"System Instructions: {self.system_prompt}\nContext: {context}\n\nUser: {prompt}"
-                
-                # Save user message to memory (only on first attempt to avoid dupes)
-                if attempt == 0:
-                    self.memory.add_message("user", prompt)
-                
-                response = self.chat.send_message(full_prompt)
-                
-                # Save AI response to memory
-                self.memory.add_message("model", response.text)
-                
-                return response.text
-                
-            except Exception as e:
-                error_str = str(e)
-                if "429" in error_str or "Quota exceeded" in error_str:
-                    logger.warning(f"Quota exceeded on attempt {attempt+1}. Switching model...")
-                    if self._switch_model():
-                        continue
-                
-                logger.error(f"Error generating response from LLM: {e}")
-                if attempt == max_retries - 1:
-                    return "Lo siento, estoy teniendo problemas de conexión con mis modelos de lenguaje."
+        # Assemble before saving the prompt so it isn't replayed as history
+        assembled = self.context.build(self.system_prompt, prompt, extra_context=context)
+        
+        # Save user message to memory
+        self.memory.add_message("user", prompt)
+        
+        def send(model_name):
+            self._start_turn(model_name, assembled)
+            return self.chat.send_message(assembled["prompt"]).text
+        
+        try:
+            text = self._routed(send, "Chat response")
+        except Exception as e:
+            logger.error(f"Error generating response from LLM: {e}")
+            return "Lo siento, estoy teniendo problemas de conexión con mis modelos de lenguaje."
+        
+        # Save AI response to memory
+        self.memory.add_message("model", text)
+        return text
+
+    def generate_response_stream(self, prompt, context=None):
+        """
+        Generate a response as a stream of text chunks.
+        Model failover only happens before the first chunk (the router measures
+        time to first chunk), afterwards the partial answer is kept.
+        """
+        assembled = self.context.build(self.system_prompt, prompt, extra_context=context)
+        
+        # Save user message to memory
+        self.memory.add_message("user", prompt)
+        
+        def open_stream(model_name):
+            self._start_turn(model_name, assembled)
+            response = self.chat.send_message(assembled["prompt"], stream=True)
+            # Pull the first chunk here so connection/quota errors trigger failover
+            chunks = iter(response)
+            return next(chunks, None), chunks
+        
+        try:
+            first, chunks = self._routed(open_stream, "Streaming response")
+        except Exception as e:
+            logger.error(f"Error streaming response from LLM: {e}")
+            yield "Lo siento, estoy teniendo problemas de conexión con mis modelos de lenguaje."
+            return
+        
+        received = []
+        try:
+            for chunk in itertools.chain([first] if first is not None else [], chunks):
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunk without text parts (e.g. safety metadata)
+                    continue
+                if text:
+                    received.append(text)
+                    yield text
+        except Exception as e:
+            logger.error(f"Response stream interrupted: {e}")
+        finally:
+            # Save AI response to memory, also the part generated (and queued) before a
+            # barge-in closed the stream; a reply with no text is not a turn
+            if received:
+                self.memory.add_message("model", "".join(received))
 
     def generate_vision_response(self, prompt, image):
         """
         Generate a response based on text prompt and image.
         """
-        try:
+        def generate(model_name):
             # Gemini supports [prompt, image] list for input
-            response = self.model.generate_content([prompt, image])
-            return response.text
+            return self._get_model(model_name).generate_content([prompt, image]).text
+        
+        try:
+            return self._routed(generate, "Vision generation")
         except Exception as e:
             logger.error(f"Error in vision generation: {e}")
             raise e
@@ -164,15 +236,7 @@ class LLMClient:
         User Input: "{text}"
         
         Available Commands:
-        - open_app(app_name): Open applications (e.g., vscode, chrome, notepad, spotify)
-        - search_web(query): Search Google
-        - system_control(action): volume_up, volume_down, mute
-        - system_info(): Get CPU/RAM status
-        - open_folder(folder_name): Search and open a folder
-        - create_folder(folder_name, location): Create a folder (location optional)
-        - map_folders(): Scan and index all system folders (e.g., "mapear carpetas", "map folders", "update index")
-        - open_file(file_name): Search and open a file
-        - analyze_screen(prompt): Analyze screen content (e.g., "what is on my screen", "explain this error")
+{format_catalogue()}
         
         Return ONLY a JSON object in this format:
         {{
@@ -186,25 +250,19 @@ class LLMClient:
         Example 2: "What do you see?" -> {{"type": "command", "command": "analyze_screen", "parameters": "Describe what you see", "confidence": 0.95}}
         """
         
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = self.model.generate_content(prompt)
-                return response.text
-            except Exception as e:
-                error_str = str(e)
-                if "429" in error_str or "Quota exceeded" in error_str:
-                    logger.warning(f"Quota exceeded during intent analysis. Switching model...")
-                    if self._switch_model():
-                        continue
-                
-                logger.error(f"Error analyzing intent: {e}")
-                if attempt == max_retries - 1:
-                    return None
+        def generate(model_name):
+            return self._get_model(model_name).generate_content(prompt).text
+        
+        try:
+            return self._routed(generate, "Intent analysis")
+        except Exception as e:
+            logger.error(f"Error analyzing intent: {e}")
+            return None
 
     def reset_chat(self):
         """Reset conversation history"""
         self.chat = self.model.start_chat(history=[])
+        self.context.clear_history()
         logger.info("Conversation history reset.")
 
     def reload_settings(self):
@@ -212,6 +270,9 @@ class LLMClient:
         self.api_key = Settings.GEMINI_API_KEY
         genai.configure(api_key=self.api_key)
         self.update_system_prompt()
-        self.model = self._configure_model() # Re-configure to ensure fresh start
+        self.health = ModelHealthProbe(genai, self.available_models, api_key=self.api_key)
+        self.router = ModelRouter(self.available_models)
+        self._models = {}
+        self.model = self._configure_model(force_probe=True) # Re-configure to ensure fresh start
         self.reset_chat()
         logger.info("LLM Client settings reloaded.")
@@ -1,26 +1,70 @@
 import sqlite3
 import json
 import os
+import re
+import time
+import atexit
+import threading
 from datetime import datetime
 from src.config.settings import Settings
 from src.utils.logger import logger
+from src.brain.embeddings import HashingEmbedder, np
 
 class MemoryManager:
     """
     Manages long-term memory using SQLite.
     Stores conversation history and user preferences.
+    Uses one long-lived WAL connection; messages are written behind in
+    batches by a background thread and flushed before every read.
+    History is searchable through an FTS5 index and, when numpy is
+    available, a hashed bag-of-words vector index. Old turns can be
+    compacted into summary rows (see MemoryCompactor).
     """
-    
-    def __init__(self):
-        self.db_path = os.path.join(Settings.BASE_DIR, "brain", "memory.db")
+
+    VECTOR_BLOCK_ROWS = 50000
+    # Words too common to be useful as full-text search terms
+    STOP_WORDS = {
+        "con", "para", "por", "una", "uno", "del", "los", "las", "que", "como", "pero", "más", "mas",
+        "the", "and", "for", "with", "that", "this", "you", "are", "was", "what", "how"
+    }
+
+    def __init__(self, db_path=None, batch_size=None, flush_interval=None):
+        self.db_path = db_path or os.path.join(Settings.BASE_DIR, "brain", "memory.db")
+        self.batch_size = batch_size or Settings.MEMORY_WRITE_BATCH_SIZE
+        self.flush_interval = flush_interval or Settings.MEMORY_FLUSH_INTERVAL
+
+        self._conn = None
+        self._db_lock = threading.RLock()
+        self._pending = []
+        self._pending_cond = threading.Condition()
+        self._closed = threading.Event()
+        self._maintenance = threading.Event()  # Set while optimize() rewrites the file
+
+        self.fts_enabled = False
+        self.embedder = None
+        if Settings.MEMORY_SEMANTIC_INDEX and np is not None:
+            self.embedder = HashingEmbedder(Settings.MEMORY_EMBEDDING_DIM)
+        self._vector_lock = threading.Lock()
+        self._vector_blocks = []
+        self._vector_loaded_id = 0
+        self.last_activity = time.time()
+        self._archive_attached = False
+
         self._init_db()
-        
+
+        # Background write-behind thread
+        self._writer_thread = threading.Thread(target=self._writer_loop, name="MemoryWriter", daemon=True)
+        self._writer_thread.start()
+        atexit.register(self.close)
+
     def _init_db(self):
-        """Initialize database tables"""
+        """Open the shared connection and initialize database tables"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=64)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            cursor = self._conn.cursor()
+
             # Conversations table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS conversations (
@@ -30,7 +74,7 @@ class MemoryManager:
                     content TEXT
                 )
             ''')
-            
+
             # User Preferences/Facts table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS facts (
@@ -39,39 +83,147 @@ class MemoryManager:
                     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
-            
-            conn.commit()
-            conn.close()
+
+            # Full-text index over message content (kept in sync by triggers)
+            self.fts_enabled = self._init_fts(cursor)
+
+            # Semantic index: one float32 vector blob per message
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS conversation_vectors (
+                    message_id INTEGER PRIMARY KEY,
+                    vector BLOB
+                )
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS conversations_vector_ad AFTER DELETE ON conversations BEGIN
+                    DELETE FROM conversation_vectors WHERE message_id = old.id;
+                END
+            ''')
+
+            # Compacted history: one summary row per rolled-up range of messages
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS conversation_summaries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    start_id INTEGER,
+                    end_id INTEGER,
+                    start_time DATETIME,
+                    end_time DATETIME,
+                    message_count INTEGER,
+                    content TEXT
+                )
+            ''')
+
+            # Internal bookkeeping (e.g. the compaction watermark)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS memory_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+
+            self._conn.commit()
             logger.info("Memory database initialized.")
         except Exception as e:
             logger.error(f"Failed to init memory DB: {e}")
 
-    def add_message(self, role, content):
-        """Add a message to history"""
+    def _init_fts(self, cursor):
+        """Create the FTS5 table and its sync triggers. Returns False if FTS5 is unavailable."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                'INSERT INTO conversations (role, content) VALUES (?, ?)',
-                (role, content)
-            )
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            logger.error(f"Error adding message to memory: {e}")
+            exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'conversations_fts'"
+            ).fetchone()
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
+                    content,
+                    content='conversations',
+                    content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS conversations_ai AFTER INSERT ON conversations BEGIN
+                    INSERT INTO conversations_fts(rowid, content) VALUES (new.id, new.content);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS conversations_ad AFTER DELETE ON conversations BEGIN
+                    INSERT INTO conversations_fts(conversations_fts, rowid, content) VALUES ('delete', old.id, old.content);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS conversations_au AFTER UPDATE ON conversations BEGIN
+                    INSERT INTO conversations_fts(conversations_fts, rowid, content) VALUES ('delete', old.id, old.content);
+                    INSERT INTO conversations_fts(rowid, content) VALUES (new.id, new.content);
+                END
+            ''')
+            if not exists:
+                # Index messages stored before FTS existed
+                cursor.execute("INSERT INTO conversations_fts(conversations_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 not available, history search will use LIKE: {e}")
+            return False
+
+    def _writer_loop(self):
+        """Flush pending messages every flush_interval or as soon as a batch is full"""
+        while not self._closed.is_set():
+            with self._pending_cond:
+                if len(self._pending) < self.batch_size:
+                    self._pending_cond.wait(self.flush_interval)
+            self.flush()
+            self._sync_vectors()
+
+    def flush(self):
+        """Write all pending messages in a single transaction (held back during optimize())"""
+        if self._maintenance.is_set() and not self._closed.is_set():
+            return
+        with self._db_lock:
+            with self._pending_cond:
+                batch, self._pending = self._pending, []
+            if not batch or not self._conn:
+                return
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        'INSERT INTO conversations (timestamp, role, content) VALUES (?, ?, ?)',
+                        batch
+                    )
+            except Exception as e:
+                logger.error(f"Error adding message to memory: {e}")
+
+    def close(self):
+        """Flush pending writes and close the connection (safe to call twice)"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        with self._pending_cond:
+            self._pending_cond.notify_all()
+        self.flush()
+        with self._db_lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+    def add_message(self, role, content):
+        """Add a message to history (written behind in batches)"""
+        # Match CURRENT_TIMESTAMP (UTC) so batching doesn't shift message times
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())
+        self.last_activity = time.time()
+        with self._pending_cond:
+            self._pending.append((timestamp, role, content))
+            if len(self._pending) >= self.batch_size:
+                self._pending_cond.notify()
 
     def get_recent_history(self, limit=10):
         """Get recent conversation history"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                'SELECT role, content FROM conversations ORDER BY id DESC LIMIT ?',
-                (limit,)
-            )
-            rows = cursor.fetchall()
-            conn.close()
-            
+            self.flush()
+            with self._db_lock:
+                rows = self._conn.execute(
+                    'SELECT role, content FROM conversations ORDER BY id DESC LIMIT ?',
+                    (limit,)
+                ).fetchall()
+
             # Return in chronological order
             history = [{"role": row[0], "parts": [row[1]]} for row in reversed(rows)]
             return history
@@ -79,30 +231,343 @@ class MemoryManager:
             logger.error(f"Error fetching history: {e}")
             return []
 
+    def get_recent_turns(self, limit=20, after_id=0):
+        """Recent messages newer than after_id as dicts with ids, oldest first"""
+        try:
+            self.flush()
+            with self._db_lock:
+                rows = self._conn.execute(
+                    'SELECT id, role, content, timestamp FROM conversations WHERE id > ? ORDER BY id DESC LIMIT ?',
+                    (after_id or 0, limit)
+                ).fetchall()
+            return [{"id": r[0], "role": r[1], "content": r[2], "timestamp": r[3]} for r in reversed(rows)]
+        except Exception as e:
+            logger.error(f"Error fetching history: {e}")
+            return []
+
+    def get_last_message_id(self):
+        """Id of the newest stored message (0 if empty)"""
+        self.flush()
+        with self._db_lock:
+            row = self._conn.execute('SELECT MAX(id) FROM conversations').fetchone()
+        return row[0] or 0
+
+    def get_meta(self, key, default=None):
+        with self._db_lock:
+            row = self._conn.execute('SELECT value FROM memory_meta WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        with self._db_lock, self._conn:
+            self._conn.execute('INSERT OR REPLACE INTO memory_meta (key, value) VALUES (?, ?)', (key, json.dumps(value)))
+
+    def get_turns_range(self, after_id, upto_id, limit):
+        """Messages with after_id < id <= upto_id, oldest first"""
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute(
+                'SELECT id, role, content, timestamp FROM conversations WHERE id > ? AND id <= ? ORDER BY id LIMIT ?',
+                (after_id, upto_id, limit)
+            ).fetchall()
+        return [{"id": r[0], "role": r[1], "content": r[2], "timestamp": r[3]} for r in rows]
+
+    def _attach_archive(self):
+        """Attach memory_archive.db (next to memory.db) for compacted raw messages"""
+        if self._archive_attached:
+            return
+        archive_path = os.path.join(os.path.dirname(os.path.abspath(self.db_path)), "memory_archive.db")
+        self._conn.execute('ATTACH DATABASE ? AS archive', (archive_path,))
+        self._conn.execute('PRAGMA archive.journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS archive.conversations (
+                id INTEGER PRIMARY KEY,
+                timestamp DATETIME,
+                role TEXT,
+                content TEXT
+            )
+        ''')
+        self._archive_attached = True
+
+    def compact_range(self, start_id, end_id, summary, watermark_key, archive=True):
+        """
+        Replace messages start_id..end_id with one summary row, in one transaction
+        together with the watermark update so an interrupted run resumes cleanly.
+        Raw messages are moved to memory_archive.db (or dropped if archive is False).
+        Call reset_vector_cache() once the whole run is done: until then searches
+        skip the vectors of deleted messages.
+        """
+        with self._db_lock:
+            if not self._conn:
+                return False
+            if archive:
+                self._attach_archive()
+            with self._conn:
+                bounds = self._conn.execute(
+                    'SELECT COUNT(*), MIN(timestamp), MAX(timestamp) FROM conversations WHERE id BETWEEN ? AND ?',
+                    (start_id, end_id)
+                ).fetchone()
+                if archive:
+                    self._conn.execute(
+                        '''INSERT OR IGNORE INTO archive.conversations (id, timestamp, role, content)
+                           SELECT id, timestamp, role, content FROM conversations WHERE id BETWEEN ? AND ?''',
+                        (start_id, end_id)
+                    )
+                self._conn.execute(
+                    '''INSERT INTO conversation_summaries (start_id, end_id, start_time, end_time, message_count, content)
+                       VALUES (?, ?, ?, ?, ?, ?)''',
+                    (start_id, end_id, bounds[1], bounds[2], bounds[0], summary)
+                )
+                self._conn.execute('DELETE FROM conversations WHERE id BETWEEN ? AND ?', (start_id, end_id))
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO memory_meta (key, value) VALUES (?, ?)',
+                    (watermark_key, json.dumps(end_id))
+                )
+        return True
+
+    def get_summaries(self, limit=3):
+        """Newest summary rows, oldest first"""
+        with self._db_lock:
+            rows = self._conn.execute(
+                'SELECT start_time, end_time, message_count, content FROM conversation_summaries ORDER BY id DESC LIMIT ?',
+                (limit,)
+            ).fetchall()
+        return [{"start_time": r[0], "end_time": r[1], "message_count": r[2], "content": r[3]} for r in reversed(rows)]
+
+    def search_summaries(self, query, k=1):
+        """Summaries mentioning the most query words (the table is small, LIKE is enough)"""
+        tokens = [t for t in re.findall(r"\w+", query.lower()) if len(t) > 2 and t not in self.STOP_WORDS]
+        if not tokens:
+            return []
+        score = " + ".join("(content LIKE ?)" for _ in tokens)
+        try:
+            with self._db_lock:
+                rows = self._conn.execute(
+                    f'''SELECT start_time, end_time, message_count, content, ({score}) AS hits
+                        FROM conversation_summaries WHERE hits > 0 ORDER BY hits DESC, id DESC LIMIT ?''',
+                    [f"%{t}%" for t in tokens] + [k]
+                ).fetchall()
+            return [{"start_time": r[0], "end_time": r[1], "message_count": r[2], "content": r[3]} for r in rows]
+        except Exception as e:
+            logger.error(f"Error searching summaries: {e}")
+            return []
+
+    def get_db_size(self):
+        """Bytes used by memory.db including its WAL"""
+        return sum(os.path.getsize(self.db_path + suffix)
+                   for suffix in ("", "-wal") if os.path.exists(self.db_path + suffix))
+
+    def optimize(self, min_free_ratio=0.25):
+        """
+        Tidy up after compaction: merge FTS segments (drops delete tombstones)
+        and VACUUM when enough of the file is free pages.
+        Runs on the caller's thread with its own connection, not under the
+        shared lock: reads go on (WAL) and new messages wait in the
+        write-behind queue until it is done.
+        """
+        self._maintenance.set()
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                if self.fts_enabled:
+                    with conn:
+                        conn.execute("INSERT INTO conversations_fts(conversations_fts) VALUES ('optimize')")
+                pages = conn.execute('PRAGMA page_count').fetchone()[0]
+                free = conn.execute('PRAGMA freelist_count').fetchone()[0]
+                if not pages or free / pages < min_free_ratio:
+                    return False
+                conn.execute('VACUUM')
+                conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+                return True
+            finally:
+                conn.close()
+        finally:
+            self._maintenance.clear()
+            with self._pending_cond:
+                self._pending_cond.notify()
+
+    def _sync_vectors(self, batch_rows=5000):
+        """Embed messages that don't have a vector yet (runs in the writer thread)"""
+        if not self.embedder:
+            return
+        try:
+            while not self._closed.is_set():
+                with self._db_lock:
+                    rows = self._conn.execute(
+                        '''SELECT id, content FROM conversations
+                           WHERE id > COALESCE((SELECT MAX(message_id) FROM conversation_vectors), 0)
+                           ORDER BY id LIMIT ?''',
+                        (batch_rows,)
+                    ).fetchall()
+                if not rows:
+                    return
+                vectors = [(row[0], self.embedder.to_blob(self.embedder.embed(row[1] or ""))) for row in rows]
+                with self._db_lock, self._conn:
+                    self._conn.executemany(
+                        'INSERT OR REPLACE INTO conversation_vectors (message_id, vector) VALUES (?, ?)',
+                        vectors
+                    )
+        except Exception as e:
+            logger.error(f"Error updating memory vectors: {e}")
+
+    def _load_vectors(self):
+        """Load new vectors into in-memory blocks (incremental)"""
+        with self._vector_lock:
+            while True:
+                with self._db_lock:
+                    rows = self._conn.execute(
+                        'SELECT message_id, vector FROM conversation_vectors WHERE message_id > ? ORDER BY message_id LIMIT ?',
+                        (self._vector_loaded_id, self.VECTOR_BLOCK_ROWS)
+                    ).fetchall()
+                if not rows:
+                    return
+                ids = np.array([row[0] for row in rows], dtype=np.int64)
+                matrix = self.embedder.from_blobs([row[1] for row in rows])
+                self._vector_blocks.append((ids, matrix))
+                self._vector_loaded_id = int(ids[-1])
+
+    def reset_vector_cache(self):
+        """Drop in-memory vectors (call after deleting or rewriting messages)"""
+        with self._vector_lock:
+            self._vector_blocks = []
+            self._vector_loaded_id = 0
+
+    def _boundary_id(self, exclude_recent):
+        """Smallest id among the newest exclude_recent messages (results must be older)"""
+        if not exclude_recent:
+            return None
+        with self._db_lock:
+            row = self._conn.execute(
+                'SELECT id FROM conversations ORDER BY id DESC LIMIT 1 OFFSET ?',
+                (exclude_recent - 1,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def _fetch_messages(self, ids):
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        with self._db_lock:
+            rows = self._conn.execute(
+                f'SELECT id, role, content, timestamp FROM conversations WHERE id IN ({placeholders})',
+                list(ids)
+            ).fetchall()
+        return {row[0]: {"id": row[0], "role": row[1], "content": row[2], "timestamp": row[3]} for row in rows}
+
+    def _fts_search(self, query, k, before_id):
+        tokens = [t for t in re.findall(r"\w+", query.lower()) if len(t) > 2 and t not in self.STOP_WORDS]
+        if not tokens:
+            return []
+        bound = before_id if before_id is not None else -1
+        with self._db_lock:
+            if self.fts_enabled:
+                match = " OR ".join(f'"{t}"' for t in tokens)
+                rows = self._conn.execute(
+                    '''SELECT rowid, bm25(conversations_fts) AS score FROM conversations_fts
+                       WHERE conversations_fts MATCH ? AND (? < 0 OR rowid < ?)
+                       ORDER BY score LIMIT ?''',
+                    (match, bound, bound, k)
+                ).fetchall()
+                # bm25 is lower-is-better, flip so higher is better everywhere
+                return [(row[0], -row[1]) for row in rows]
+
+            like = " OR ".join("content LIKE ?" for _ in tokens)
+            rows = self._conn.execute(
+                f'SELECT id FROM conversations WHERE ({like}) AND (? < 0 OR id < ?) ORDER BY id DESC LIMIT ?',
+                [f"%{t}%" for t in tokens] + [bound, bound, k]
+            ).fetchall()
+            return [(row[0], 0.0) for row in rows]
+
+    def _semantic_search(self, query, k, before_id, min_similarity=0.2):
+        if not self.embedder:
+            return []
+        self._load_vectors()
+        q = self.embedder.embed(query)
+        if not q.any():
+            return []
+
+        candidates = []
+        for ids, matrix in self._vector_blocks:
+            scores = matrix @ q
+            if before_id is not None:
+                scores = np.where(ids < before_id, scores, -1.0)
+            top = np.argpartition(-scores, min(k, len(scores) - 1))[:k]
+            candidates.extend((int(ids[i]), float(scores[i])) for i in top if scores[i] >= min_similarity)
+        candidates.sort(key=lambda c: c[1], reverse=True)
+        return candidates[:k]
+
+    def search_history(self, query, k=5, mode=None, exclude_recent=0, before_id=None):
+        """
+        Search past conversation turns.
+        Args:
+            query (str): text to look for
+            k (int): max results
+            mode (str): 'fts', 'semantic' or 'hybrid' (default: hybrid if vectors are enabled)
+            exclude_recent (int): skip the newest N messages (e.g. those already in the chat)
+            before_id (int): only return messages older than this id
+        Returns:
+            list[dict]: {'id', 'role', 'content', 'timestamp', 'score'} best first
+        """
+        try:
+            self.flush()
+            mode = mode or ("hybrid" if self.embedder else "fts")
+            if before_id is None:
+                before_id = self._boundary_id(exclude_recent)
+
+            if mode == "fts":
+                ranked = self._fts_search(query, k, before_id)
+            elif mode == "semantic":
+                self._sync_vectors()
+                ranked = self._semantic_search(query, k, before_id)
+            else:
+                self._sync_vectors()
+                # Reciprocal rank fusion of keyword and semantic results
+                fused = {}
+                for results in (self._fts_search(query, k * 2, before_id),
+                                self._semantic_search(query, k * 2, before_id)):
+                    for rank, (message_id, _) in enumerate(results):
+                        fused[message_id] = fused.get(message_id, 0.0) + 1.0 / (60 + rank)
+                ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
+
+            messages = self._fetch_messages([message_id for message_id, _ in ranked])
+            results = []
+            for message_id, score in ranked:
+                if message_id in messages:
+                    message = messages[message_id]
+                    message["score"] = score
+                    results.append(message)
+            return results
+        except Exception as e:
+            logger.error(f"Error searching history: {e}")
+            return []
+
     def remember_fact(self, key, value):
         """Store a specific fact or preference"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                'INSERT OR REPLACE INTO facts (key, value) VALUES (?, ?)',
-                (key, json.dumps(value))
-            )
-            conn.commit()
-            conn.close()
+            with self._db_lock, self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO facts (key, value) VALUES (?, ?)',
+                    (key, json.dumps(value))
+                )
             logger.info(f"Remembered fact: {key} = {value}")
         except Exception as e:
             logger.error(f"Error remembering fact: {e}")
 
+    def get_all_facts(self):
+        """All stored facts as a dict"""
+        try:
+            with self._db_lock:
+                rows = self._conn.execute('SELECT key, value FROM facts ORDER BY timestamp DESC').fetchall()
+            return {row[0]: json.loads(row[1]) for row in rows}
+        except Exception as e:
+            logger.error(f"Error recalling facts: {e}")
+            return {}
+
     def recall_fact(self, key):
         """Recall a specific fact"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('SELECT value FROM facts WHERE key = ?', (key,))
-            row = cursor.fetchone()
-            conn.close()
-            
+            with self._db_lock:
+                row = self._conn.execute('SELECT value FROM facts WHERE key = ?', (key,)).fetchone()
+
             if row:
                 return json.loads(row[0])
             return None
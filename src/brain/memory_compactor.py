@@ -0,0 +1,150 @@
+import time
+import threading
+from src.config.settings import Settings
+from src.utils.logger import logger
+
+WATERMARK_KEY = "compaction_watermark"
+
+def summarize_turns(turns, max_chars=600):
+    """
+    Extractive summary of a range of turns: what the user asked about
+    (first sentence of each request) plus the last answer, deduplicated.
+    """
+    points, seen = [], set()
+    for turn in turns:
+        if turn["role"] != "user":
+            continue
+        first = " ".join((turn["content"] or "").split()).split(". ")[0][:120]
+        if first and first.lower() not in seen:
+            seen.add(first.lower())
+            points.append(first)
+
+    summary = "User asked about: " + "; ".join(points) if points else ""
+    answers = [t for t in turns if t["role"] == "model" and t["content"]]
+    if answers:
+        last = " ".join(answers[-1]["content"].split())[:160]
+        summary = f"{summary}. Last answer: {last}" if summary else f"Last answer: {last}"
+    return summary[:max_chars]
+
+class MemoryCompactor:
+    """
+    Rolls old conversation turns into summary rows while the assistant is idle.
+    Works in small chunks, each committed together with a watermark (the last
+    compacted message id), so runs are incremental, resumable and never rescan
+    processed rows. The newest keep_recent messages are always left untouched.
+    With a probe_query, each report also times search_history for it.
+    """
+
+    def __init__(self, memory, keep_recent=None, chunk_size=None, idle_seconds=None,
+                 archive=None, summarize=None, probe_query=None):
+        self.memory = memory
+        self.keep_recent = keep_recent or Settings.MEMORY_COMPACT_KEEP_RECENT
+        self.chunk_size = chunk_size or Settings.MEMORY_COMPACT_CHUNK
+        self.idle_seconds = idle_seconds if idle_seconds is not None else Settings.MEMORY_COMPACT_IDLE_SECONDS
+        self.archive = Settings.MEMORY_ARCHIVE_COMPACTED if archive is None else archive
+        self.summarize = summarize or summarize_turns
+        self.probe_query = probe_query
+        self.last_report = {}
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def watermark(self):
+        return self.memory.get_meta(WATERMARK_KEY, 0)
+
+    def is_idle(self):
+        return time.time() - self.memory.last_activity >= self.idle_seconds
+
+    def has_work(self):
+        """True when at least one full chunk is eligible for compaction"""
+        cutoff = self.memory.get_last_message_id() - self.keep_recent
+        return len(self.memory.get_turns_range(self.watermark, cutoff, self.chunk_size)) >= self.chunk_size
+
+    def compact_chunk(self):
+        """Compact the next full chunk past the watermark. Returns messages compacted."""
+        cutoff = self.memory.get_last_message_id() - self.keep_recent
+        turns = self.memory.get_turns_range(self.watermark, cutoff, self.chunk_size)
+        # Only full chunks, so summaries cover comparable spans
+        if len(turns) < self.chunk_size:
+            return 0
+        summary = self.summarize(turns)
+        if not self.memory.compact_range(turns[0]["id"], turns[-1]["id"], summary, WATERMARK_KEY, archive=self.archive):
+            return 0
+        return len(turns)
+
+    def measure(self, samples=5):
+        """DB size and average latency of the hot history queries (search only with a probe_query)"""
+        start = time.perf_counter()
+        for _ in range(samples):
+            self.memory.get_recent_history(limit=20)
+        recent_ms = (time.perf_counter() - start) / samples * 1000
+
+        search_ms = None
+        if self.probe_query:
+            start = time.perf_counter()
+            for _ in range(samples):
+                self.memory.search_history(self.probe_query, k=5, mode="fts")
+            search_ms = (time.perf_counter() - start) / samples * 1000
+        return {"db_bytes": self.memory.get_db_size(), "recent_ms": recent_ms, "search_ms": search_ms}
+
+    def run(self, max_chunks=None, should_stop=None):
+        """
+        Compact chunk by chunk until caught up, max_chunks is reached or
+        should_stop() returns True. Returns a before/after report.
+        """
+        before = self.measure()
+        messages = chunks = 0
+        started = time.perf_counter()
+        while max_chunks is None or chunks < max_chunks:
+            if self._stop.is_set() or (should_stop and should_stop()):
+                break
+            compacted = self.compact_chunk()
+            if not compacted:
+                break
+            messages += compacted
+            chunks += 1
+
+        if chunks:
+            # Once per run: rebuilding the vector matrix after every chunk adds up
+            self.memory.reset_vector_cache()
+            self.memory.optimize()
+        after = self.measure()
+
+        self.last_report = {
+            "messages": messages,
+            "summaries": chunks,
+            "seconds": time.perf_counter() - started,
+            "watermark": self.watermark,
+            "before": before,
+            "after": after,
+        }
+        if chunks:
+            logger.info(
+                f"Memory compaction: {messages} messages -> {chunks} summaries, "
+                f"db {before['db_bytes'] / 1e6:.1f} MB -> {after['db_bytes'] / 1e6:.1f} MB, "
+                f"recent {before['recent_ms']:.2f} -> {after['recent_ms']:.2f} ms"
+                + (f", search {before['search_ms']:.2f} -> {after['search_ms']:.2f} ms" if self.probe_query else "")
+            )
+        return self.last_report
+
+    def start(self, check_interval=30):
+        """Run compaction in a background thread whenever the assistant is idle"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.wait(check_interval):
+                try:
+                    if self.is_idle() and self.has_work():
+                        # Yield as soon as the user starts talking again
+                        self.run(should_stop=lambda: not self.is_idle())
+                except Exception as e:
+                    logger.error(f"Memory compaction failed: {e}")
+
+        self._thread = threading.Thread(target=loop, name="MemoryCompactor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,166 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.config.settings import Settings
+from src.utils.logger import logger
+
+class ModelHealthProbe:
+    """
+    Probes Gemini models concurrently and caches their health on disk.
+    The best ranked healthy model wins as soon as every model ranked above it
+    has failed, so startup waits for one round trip instead of several.
+    A fresh cache lets a restart skip probing entirely.
+    """
+
+    def __init__(self, genai_module, models, api_key="", cache_path=None, ttl_seconds=None, timeout=None):
+        self.genai = genai_module
+        self.models = list(models)
+        self.api_key_hash = hashlib.sha1((api_key or "").encode("utf-8")).hexdigest()
+        self.cache_path = cache_path or os.path.join(os.path.dirname(Settings.DB_PATH), "model_health.json")
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else Settings.MODEL_HEALTH_TTL_MINUTES * 60
+        self.timeout = timeout if timeout is not None else Settings.MODEL_PROBE_TIMEOUT
+
+        self._lock = threading.Lock()
+        self.health = self._load_cache()
+
+    def _load_cache(self):
+        """Load cached health entries for this API key"""
+        try:
+            if os.path.exists(self.cache_path):
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("api_key_hash") == self.api_key_hash:
+                    return data.get("models", {})
+        except Exception as e:
+            logger.warning(f"Could not read model health cache: {e}")
+        return {}
+
+    def _save_cache(self):
+        try:
+            with self._lock:
+                data = {"api_key_hash": self.api_key_hash, "models": dict(self.health)}
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.warning(f"Could not write model health cache: {e}")
+
+    def _is_fresh(self, entry, now=None):
+        now = now or time.time()
+        return entry is not None and now - entry.get("checked_at", 0) < self.ttl_seconds
+
+    def fresh_health(self):
+        """Health entries still within the TTL (stale ones say nothing about the model now)"""
+        now = time.time()
+        with self._lock:
+            return {m: entry for m, entry in self.health.items() if self._is_fresh(entry, now)}
+
+    def _record(self, model_name, healthy, latency=None, error=None):
+        with self._lock:
+            self.health[model_name] = {
+                "healthy": healthy,
+                "latency": latency,
+                "error": error,
+                "checked_at": time.time()
+            }
+
+    def mark_failed(self, model_name, error):
+        """Record a runtime failure (e.g. quota exceeded) so the next start skips this model"""
+        self._record(model_name, False, error=str(error)[:200])
+        self._save_cache()
+
+    def probe(self, model_name):
+        """Send a tiny prompt to one model. Returns True if it answered."""
+        start = time.perf_counter()
+        try:
+            model = self.genai.GenerativeModel(model_name)
+            model.generate_content("Test")
+            latency = time.perf_counter() - start
+            self._record(model_name, True, latency=latency)
+            logger.info(f"Model {model_name} healthy ({latency * 1000:.0f} ms)")
+            return True
+        except Exception as e:
+            self._record(model_name, False, error=str(e)[:200])
+            logger.warning(f"Failed to connect to {model_name}: {e}")
+            return False
+
+    def cached_choice(self):
+        """
+        Best ranked model according to the cache, or None if the cache can't decide.
+        Every model ranked above the choice must be freshly known to be unhealthy.
+        """
+        now = time.time()
+        for model_name in self.models:
+            entry = self.health.get(model_name)
+            if not self._is_fresh(entry, now):
+                return None
+            if entry["healthy"]:
+                return model_name
+        return None
+
+    def probe_all(self):
+        """
+        Race all candidates concurrently.
+        Returns the best ranked healthy model name, or None if none answered.
+        """
+        logger.info(f"Probing {len(self.models)} models concurrently...")
+        results = {}
+        decided = threading.Event()
+        done_lock = threading.Lock()
+
+        def run(model_name):
+            ok = self.probe(model_name)
+            with done_lock:
+                results[model_name] = ok
+                if self._winner(results) is not False:
+                    decided.set()
+
+        executor = ThreadPoolExecutor(max_workers=len(self.models), thread_name_prefix="ModelProbe")
+        for model_name in self.models:
+            executor.submit(run, model_name)
+        # Don't wait for slower, lower ranked probes: they finish in background and update the cache
+        executor.shutdown(wait=False)
+
+        decided.wait(self.timeout)
+        with done_lock:
+            winner = self._winner(results)
+            if winner is False:
+                # Timed out: take the best healthy model among those that answered
+                winner = next((m for m in self.models if results.get(m)), None)
+
+        self._save_cache()
+        threading.Thread(target=self._save_when_done, args=(results,), daemon=True).start()
+        return winner
+
+    def _winner(self, results):
+        """Best ranked healthy model, None if all failed, False if still undecided"""
+        for model_name in self.models:
+            if model_name not in results:
+                return False
+            if results[model_name]:
+                return model_name
+        return None
+
+    def _save_when_done(self, results):
+        """Persist the health of the remaining probes once they finish"""
+        deadline = time.time() + self.timeout
+        while len(results) < len(self.models) and time.time() < deadline:
+            time.sleep(0.1)
+        self._save_cache()
+
+    def select_model(self, force_probe=False):
+        """
+        Pick the model to use, skipping the network when the cache is fresh.
+        Returns:
+            str | None: model name
+        """
+        if not force_probe:
+            cached = self.cached_choice()
+            if cached:
+                logger.info(f"Using cached healthy model: {cached}")
+                return cached
+        return self.probe_all()
@@ -0,0 +1,240 @@
+import math
+import time
+import threading
+from collections import deque
+from src.config.settings import Settings
+from src.utils.logger import logger
+
+try:
+    from google.api_core import exceptions as api_exceptions
+except ImportError:  # Only needed to classify Gemini errors
+    api_exceptions = None
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+def is_quota_error(error):
+    error_str = str(error)
+    return "429" in error_str or "Quota exceeded" in error_str
+
+def is_model_error(error):
+    """
+    Transport, timeout, quota and server (5xx) errors: the model is unreachable
+    or overloaded, so they count toward its breaker and fail over. Anything
+    else (a blocked or empty reply, a bad prompt) would fail on every model.
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)) or is_quota_error(error):
+        return True
+    if api_exceptions is not None and isinstance(error, (api_exceptions.ServerError, api_exceptions.TooManyRequests,
+                                                         api_exceptions.RetryError)):
+        return True
+    code = getattr(error, "code", None)  # HTTP status of api_core errors
+    return isinstance(code, int) and (code == 429 or code >= 500)
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+class CircuitBreaker:
+    """
+    Per-model circuit breaker.
+    closed -> open after repeated failures (or one quota error),
+    open -> half_open once the backoff expires (one trial request),
+    half_open -> closed on success, back to open with doubled backoff on failure.
+    """
+
+    def __init__(self, failure_threshold=None, base_backoff=None, max_backoff=None, clock=time.monotonic):
+        self.failure_threshold = failure_threshold or Settings.CIRCUIT_FAILURE_THRESHOLD
+        self.base_backoff = base_backoff or Settings.CIRCUIT_BASE_BACKOFF
+        self.max_backoff = max_backoff or Settings.CIRCUIT_MAX_BACKOFF
+        self.clock = clock
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.backoff = self.base_backoff
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def allow_request(self):
+        """Whether a request may be sent to this model now"""
+        if self.state == OPEN and self.clock() - self.opened_at >= self.backoff:
+            self.state = HALF_OPEN
+            self.trial_in_flight = False
+        if self.state == HALF_OPEN:
+            return not self.trial_in_flight
+        return self.state == CLOSED
+
+    def on_request(self):
+        if self.state == HALF_OPEN:
+            self.trial_in_flight = True
+
+    def record_success(self):
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.backoff = self.base_backoff
+        self.trial_in_flight = False
+
+    def record_failure(self, trip=False):
+        """Count a failure. trip=True opens the circuit immediately (e.g. quota exceeded)."""
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN:
+            # Failed trial: back off longer
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+            self._open()
+        elif trip or self.consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = self.clock()
+        self.trial_in_flight = False
+
+    def retry_in(self):
+        """Seconds until an open circuit allows a trial request"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.backoff - (self.clock() - self.opened_at))
+
+
+class ModelStats:
+    """Rolling latency and error-rate window for one model"""
+
+    def __init__(self, window=50):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+
+    def record(self, ok, latency=None):
+        self.outcomes.append(ok)
+        if ok and latency is not None:
+            self.latencies.append(latency)
+
+    @property
+    def p50(self):
+        return percentile(list(self.latencies), 50)
+
+    @property
+    def p95(self):
+        return percentile(list(self.latencies), 95)
+
+    @property
+    def error_rate(self):
+        if not self.outcomes:
+            return 0.0
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+
+class ModelRouter:
+    """
+    Sends each request to the fastest healthy model.
+    Models are scored by rolling p50 latency, penalized by error rate, with the
+    configured priority order as tie-breaker. Models without samples use a
+    prior latency so they still get tried, and half-open models get their trial.
+    """
+
+    def __init__(self, models, clock=time.monotonic, prior_latency=None, rank_penalty=0.05, **breaker_args):
+        self.models = list(models)
+        self.clock = clock
+        self.prior_latency = prior_latency if prior_latency is not None else Settings.MODEL_PRIOR_LATENCY
+        self.rank_penalty = rank_penalty
+        self.breakers = {m: CircuitBreaker(clock=clock, **breaker_args) for m in self.models}
+        self.stats = {m: ModelStats() for m in self.models}
+        self._lock = threading.Lock()
+
+    def score(self, model_name):
+        """Lower is better"""
+        stats = self.stats[model_name]
+        latency = stats.p50 if stats.latencies else self.prior_latency
+        rank = self.models.index(model_name)
+        return latency * (1 + 2 * stats.error_rate) + rank * self.rank_penalty
+
+    def choose(self, exclude=()):
+        """
+        Pick the best model whose circuit allows a request.
+        Returns None if every circuit is open.
+        """
+        with self._lock:
+            candidates = [m for m in self.models if m not in exclude and self.breakers[m].allow_request()]
+            if not candidates:
+                return None
+            # A recovering model gets its single trial request, otherwise it could never close again
+            trials = [m for m in candidates if self.breakers[m].state == HALF_OPEN]
+            best = min(trials or candidates, key=self.score)
+            self.breakers[best].on_request()
+            return best
+
+    def record_success(self, model_name, latency):
+        with self._lock:
+            self.breakers[model_name].record_success()
+            self.stats[model_name].record(True, latency)
+
+    def release(self, model_name):
+        """The request ended without saying anything about the model's health"""
+        with self._lock:
+            self.breakers[model_name].trial_in_flight = False
+
+    def record_failure(self, model_name, error=None, trip=False):
+        with self._lock:
+            breaker = self.breakers[model_name]
+            breaker.record_failure(trip=trip or is_quota_error(error))
+            self.stats[model_name].record(False)
+            if breaker.state == OPEN:
+                logger.warning(f"Circuit open for {model_name} (retry in {breaker.retry_in():.0f}s): {error}")
+
+    def seed_from_health(self, health):
+        """Prime the router with probe results ({model: {'healthy', 'latency'}})"""
+        for model_name, entry in health.items():
+            if model_name not in self.stats:
+                continue
+            if entry.get("healthy"):
+                self.record_success(model_name, entry.get("latency") or self.prior_latency)
+            else:
+                self.record_failure(model_name, entry.get("error"), trip=True)
+
+    def call(self, fn, max_attempts=3):
+        """
+        Run fn(model_name) on the best model, failing over to the next best.
+        Only model errors (see is_model_error) fail over; any other error is
+        raised right away without counting against the model.
+        Raises the last error if every attempt fails.
+        """
+        tried = set()
+        last_error = RuntimeError("No healthy Gemini model available")
+        for _ in range(max_attempts):
+            model_name = self.choose(exclude=tried)
+            if model_name is None:
+                break
+            start = time.perf_counter()
+            try:
+                result = fn(model_name)
+            except Exception as e:
+                if not is_model_error(e):
+                    self.release(model_name)
+                    raise
+                self.record_failure(model_name, e)
+                tried.add(model_name)
+                last_error = e
+                continue
+            self.record_success(model_name, time.perf_counter() - start)
+            return result
+        raise last_error
+
+    def get_stats(self):
+        """Per-model breaker state, latency percentiles and error rate"""
+        with self._lock:
+            return {
+                m: {
+                    "state": self.breakers[m].state,
+                    "retry_in": round(self.breakers[m].retry_in(), 1),
+                    "p50": self.stats[m].p50,
+                    "p95": self.stats[m].p95,
+                    "error_rate": round(self.stats[m].error_rate, 3),
+                    "samples": len(self.stats[m].outcomes),
+                    "score": round(self.score(m), 3)
+                }
+                for m in self.models
+            }
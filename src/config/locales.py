@@ -7,7 +7,8 @@ TRANSLATIONS = {
         "sleep_response": "Entendido. Me duermo.",
         "shutdown_response": "Apagando sistemas. Hasta luego.",
         "stopped_response": "Detenido.",
-        "mapping_start": "Iniciando mapeo de carpetas. Esto puede tomar varios minutos.",
+        "mapping_start": "Iniciando mapeo de carpetas en segundo plano. Puedes seguir hablándome.",
+        "mapping_running": "El mapeo ya está en curso: {} carpetas revisadas.",
         "mapping_end": "Mapeo completo. {} carpetas indexadas.",
         "open_gui": "Abriendo interfaz de configuración.",
         "gui_error": "Lo siento, no pude abrir la interfaz.",
@@ -30,6 +31,17 @@ TRANSLATIONS = {
         "shutdown_words": ["apagar sistema", "apágate", "cerrar programa", "shutdown", "terminate", "turn off"],
         "map_words": ["mapear carpetas", "map folders", "update index", "actualizar indice"],
         "gui_words": ["mostrar interfaz", "abre la configuración", "show interface", "open settings"],
+        "volume_up_words": ["sube el volumen", "subir el volumen", "subir volumen", "más volumen", "volume up"],
+        "volume_down_words": ["baja el volumen", "bajar el volumen", "bajar volumen", "menos volumen", "volume down"],
+        "mute_words": ["silencia el volumen", "silenciar", "quita el sonido", "mutea", "mute"],
+        "system_info_words": ["estado del sistema", "uso de cpu", "uso de memoria", "información del sistema", "system status"],
+        "screen_words": ["qué ves", "qué hay en mi pantalla", "mira mi pantalla", "mi pantalla", "what do you see", "my screen"],
+        "open_words": ["abre", "abrir", "ejecuta", "inicia", "open"],
+        "search_words": ["busca en google", "buscar en google", "busca", "buscar", "search google for", "search for"],
+        "create_folder_words": ["crea una carpeta", "crear una carpeta", "crea la carpeta", "crear carpeta", "create folder"],
+        "folder_words": ["carpeta", "folder"],
+        "file_words": ["archivo", "documento", "file"],
+        "filler_words": ["la", "el", "los", "las", "mi", "mis", "de", "del", "una", "un", "llamada", "llamado", "que se llama", "por favor"],
     },
     "en-US": {
         # Responses
@@ -37,7 +49,8 @@ TRANSLATIONS = {
         "sleep_response": "Understood. Going to sleep.",
         "shutdown_response": "Shutting down systems. Goodbye.",
         "stopped_response": "Stopped.",
-        "mapping_start": "Starting folder mapping. This may take a few minutes.",
+        "mapping_start": "Starting folder mapping in the background. You can keep talking to me.",
+        "mapping_running": "Folder mapping is already running: {} folders checked.",
         "mapping_end": "Mapping complete. {} folders indexed.",
         "open_gui": "Opening settings interface.",
         "gui_error": "Sorry, I couldn't open the interface.",
@@ -60,6 +73,17 @@ TRANSLATIONS = {
         "shutdown_words": ["shutdown", "turn off", "terminate", "apagar"],
         "map_words": ["map folders", "index folders", "update index", "mapear carpetas"],
         "gui_words": ["show interface", "open settings", "open config", "mostrar interfaz"],
+        "volume_up_words": ["volume up", "turn up the volume", "turn the volume up", "louder", "sube el volumen"],
+        "volume_down_words": ["volume down", "turn down the volume", "turn the volume down", "quieter", "baja el volumen"],
+        "mute_words": ["mute", "mute the volume", "silenciar"],
+        "system_info_words": ["system status", "system info", "cpu usage", "memory usage", "ram usage"],
+        "screen_words": ["what do you see", "what is on my screen", "what's on my screen", "look at my screen", "my screen"],
+        "open_words": ["open", "launch", "start", "run", "abre"],
+        "search_words": ["search google for", "google search for", "search for", "search", "look up", "busca"],
+        "create_folder_words": ["create a folder", "create folder", "make a folder", "new folder"],
+        "folder_words": ["folder", "directory", "carpeta"],
+        "file_words": ["file", "document", "archivo"],
+        "filler_words": ["the", "my", "a", "an", "called", "named", "please"],
     }
 }
 
@@ -20,7 +20,10 @@ class Settings:
     VOICE_ID = int(os.getenv("VOICE_ID", "0"))
     VOICE_NAME = os.getenv("VOICE_NAME", "es-ES-AlvaroNeural")
     SPEECH_RATE = 500
+    NEURAL_SPEECH_RATE = "+0%"  # edge-tts rate
     VOLUME = 1.0
+    # Stream chat replies from the LLM and speak them sentence by sentence
+    STREAM_RESPONSES = os.getenv("STREAM_RESPONSES", "true").lower() == "true"
     
     # Personality
     PERSONALITY = {
@@ -30,6 +33,86 @@ class Settings:
         "professionalism": 80
     }
     
+    # Model health probing (startup skips probing while the cached result is fresh)
+    MODEL_HEALTH_TTL_MINUTES = 30
+    MODEL_PROBE_TIMEOUT = 15
+    # Per-model circuit breaker and latency-aware routing
+    CIRCUIT_FAILURE_THRESHOLD = 3
+    CIRCUIT_BASE_BACKOFF = 30
+    CIRCUIT_MAX_BACKOFF = 600
+    MODEL_PRIOR_LATENCY = 1.5
+    
+    # Conversation memory write-behind (messages per transaction / max seconds buffered)
+    MEMORY_WRITE_BATCH_SIZE = 100
+    MEMORY_FLUSH_INTERVAL = 0.5
+    # Long-term recall: hashed bag-of-words vectors (needs numpy) and past turns added to each prompt
+    MEMORY_SEMANTIC_INDEX = True
+    MEMORY_EMBEDDING_DIM = 128
+    MEMORY_RECALL_K = 3
+    # Prompt context assembly: estimated token budget per turn and max recent turns considered
+    CONTEXT_TOKEN_BUDGET = 3000
+    CONTEXT_MAX_TURNS = 40
+    # Idle compaction: roll messages older than the newest KEEP_RECENT into summary rows
+    MEMORY_COMPACTION = True
+    MEMORY_COMPACT_KEEP_RECENT = 1000
+    MEMORY_COMPACT_CHUNK = 40
+    MEMORY_COMPACT_IDLE_SECONDS = 120
+    MEMORY_ARCHIVE_COMPACTED = True  # move raw rows to memory_archive.db instead of deleting them
+    
+    # Folder index: crawler threads (directory listing is I/O bound)
+    FOLDER_CRAWL_WORKERS = 8
+    # Open the best ranked folder directly when it scores this high and leads the next one by the margin
+    FOLDER_CONFIDENT_SCORE = 0.9
+    FOLDER_CONFIDENT_MARGIN = 0.1
+    # Index files (name, extension, size, mtime) in the same crawl, for instant file search
+    FILE_INDEX_ENABLED = True
+    # Keep the index current from filesystem events (inotify, polling elsewhere) instead of a 30 min rescan
+    FOLDER_WATCHER_ENABLED = os.getenv("FOLDER_WATCHER", "false").lower() == "true"
+    FOLDER_WATCH_DEBOUNCE_SECONDS = 2.0
+    FOLDER_WATCH_POLL_SECONDS = 300
+    # Audio pipeline: one capture thread, VAD segmentation and recognition workers instead of
+    # opening the microphone for every listen() call
+    AUDIO_PIPELINE = os.getenv("AUDIO_PIPELINE", "false").lower() == "true"
+    AUDIO_BUFFER_SECONDS = 30
+    # One always-open microphone stream shared by wake word, commands and barge-in
+    SHARED_MICROPHONE = os.getenv("SHARED_MICROPHONE", "true").lower() == "true"
+    # Spectral VAD in front of recognize_google for standby, barge-in and pipeline snippets
+    SPEECH_GATE_ENABLED = os.getenv("SPEECH_GATE", "true").lower() == "true"
+    # Wake word engine: "transcription" (cloud, check_wake_word on the text) or "local" (offline
+    # MFCC/DTW keyword spotting on the shared stream; enrolls itself from transcription detections)
+    WAKE_WORD_ENGINE = os.getenv("WAKE_WORD_ENGINE", "transcription").lower()
+    WAKE_WORD_MIN_TEMPLATES = 3
+    WAKE_WORD_MAX_TEMPLATES = 10
+    WAKE_WORD_KWS_THRESHOLD = 9.0
+    # After this many speech segments in a row rejected by the local spotter, one snippet goes
+    # through transcription (a bad template cannot lock the user out; a detection re-enrolls)
+    WAKE_WORD_FALLBACK_MISSES = 3
+    # Utterances recognized while the assistant was busy are dropped after this many seconds
+    AUDIO_MAX_UTTERANCE_AGE = 10
+    # Disk cache of synthesized speech for recurring phrases (locale strings are pre-warmed at startup)
+    TTS_CACHE_ENABLED = os.getenv("TTS_CACHE", "true").lower() == "true"
+    TTS_CACHE_MAX_MB = 50
+    # Utterances synthesized at once by the TTS service (2: the next sentence while one plays)
+    TTS_SYNTHESIS_WORKERS = 2
+    # Offline voice (pyttsx3: SAPI5, NSSpeech or espeak) used when the network is down or edge-tts keeps failing
+    TTS_LOCAL_ENGINE = os.getenv("TTS_LOCAL_ENGINE", "true").lower() == "true"
+    # Also speak short single utterances with the local voice when it answers faster (mixes two voices)
+    TTS_LOCAL_SHORT_TEXTS = os.getenv("TTS_LOCAL_SHORT_TEXTS", "false").lower() == "true"
+    # The local voice's quality cost: texts up to this length are spoken by the fastest engine,
+    # every further character adds this many seconds to its score
+    TTS_SHORT_TEXT_CHARS = 40
+    TTS_LOCAL_PENALTY_PER_CHAR = 0.02
+    TTS_NETWORK_CHECK_SECONDS = 30
+    # Background indexing job throttle (directories per second, 0 = unlimited)
+    INDEX_MAX_DIRS_PER_SECOND = 5000
+    
+    # Intent classification
+    # Minimum confidence for the local fast path to skip the LLM
+    INTENT_FAST_PATH_THRESHOLD = 0.85
+    # LLM classification cache (in-memory LRU + SQLite next to memory.db)
+    INTENT_CACHE_MAX_ENTRIES = 512
+    INTENT_CACHE_TTL_HOURS = 24 * 7
+    
     # Paths - Use AppData for persistence when running as .exe
     if getattr(sys, 'frozen', False):
         # Running as compiled executable - use AppData for persistence
@@ -37,11 +120,15 @@ class Settings:
         BASE_DIR = APP_DATA_DIR
         LOGS_DIR = os.path.join(APP_DATA_DIR, "logs")
         DB_PATH = os.path.join(APP_DATA_DIR, "brain", "memory.db")
+        WAKE_WORD_TEMPLATES_DIR = os.path.join(APP_DATA_DIR, "brain", "wake_word")
+        TTS_CACHE_DIR = os.path.join(APP_DATA_DIR, "brain", "tts_cache")
     else:
         # Running as Python script - use project directory
         BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         LOGS_DIR = os.path.join(os.path.dirname(BASE_DIR), "logs")
         DB_PATH = os.path.join(BASE_DIR, "brain", "memory.db")
+        WAKE_WORD_TEMPLATES_DIR = os.path.join(BASE_DIR, "brain", "wake_word")
+        TTS_CACHE_DIR = os.path.join(BASE_DIR, "brain", "tts_cache")
     
     # Safety
     SAFE_MODE = os.getenv("SAFE_MODE", "true").lower() == "true"
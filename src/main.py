@@ -10,6 +10,7 @@ from src.config.settings import Settings
 from src.utils.logger import logger
 from src.gui.interface import SettingsGUI
 from src.config.locales import get_text, get_keywords
+from src.audio.speech_queue import BARGE_IN
 
 def run_assistant():
     """
@@ -41,7 +42,7 @@ def run_assistant():
         browser = WebBrowser()
         vision = VisionSystem(llm)
         file_manager = FileSystemManager()
-        wake_word = WakeWordListener()
+        wake_word = WakeWordListener(pipeline=audio.pipeline, capture=audio.capture)
         
         conversation_active = False
         last_interaction = time.time()
@@ -82,6 +83,8 @@ def run_assistant():
                 if any(word in user_text.lower() for word in get_keywords("shutdown_words", lang)):
                     audio.speak(get_text("shutdown_response", lang))
                     logger.info("Shutdown command received.")
+                    llm.compactor.stop()
+                    llm.memory.close() # os._exit skips atexit, flush pending memory writes
                     os._exit(0) # Force exit
                 
                 # Check for SHOW GUI command
@@ -115,7 +118,7 @@ def run_assistant():
                 # Check for STOP command explicitly before LLM
                 if any(w in user_text.lower() for w in get_keywords("stop_words", lang)):
                     audio.stop_speaking()
-                    audio.speak(get_text("stopped_response", lang))
+                    audio.speak(get_text("stopped_response", lang), priority=BARGE_IN)
                     continue
 
                 logger.info(f"User said: {user_text}")
@@ -125,6 +128,7 @@ def run_assistant():
                 
                 # 3. Handle action
                 response_text = ""
+                response_stream = None
                 
                 if intent["type"] == "command":
                     # 1. Try LLM-based command first
@@ -162,20 +166,19 @@ def run_assistant():
                             if isinstance(result, tuple) and result[1]:  # requires_selection = True
                                 message, _, options = result
                                 
-                                # Present options to user
-                                audio.speak(message)
-                                time.sleep(0.5)  # Brief pause
-                                
+                                # Present options to user as one queued batch (synthesized ahead, no gaps)
+                                menu = [message]
                                 for i, path in enumerate(options[:5], 1): # Limit to 5 options
                                     # Extract just the folder name and parent for clarity
                                     folder_name = os.path.basename(path)
                                     parent_name = os.path.basename(os.path.dirname(path))
                                     # Speak cleaner text: "Option X: Documents in Users"
-                                    audio.speak(get_text("option_prefix", lang, i, folder_name, parent_name))
-                                    time.sleep(0.3)
+                                    menu.append(get_text("option_prefix", lang, i, folder_name, parent_name))
                                 
-                                # Ask for selection
-                                audio.speak(get_text("ask_selection", lang))
+                                # Ask for selection once the menu has been read out
+                                menu.append(get_text("ask_selection", lang))
+                                audio.speak_all(menu)
+                                audio.wait_speaking(timeout=60)
                                 selection_text = audio.listen()
                                 
                                 if selection_text:
@@ -187,6 +190,7 @@ def run_assistant():
                                             choice = int(numbers[0]) - 1
                                             if 0 <= choice < len(options):
                                                 os.startfile(options[choice])
+                                                file_manager.mapper.record_open(options[choice])
                                                 response_text = get_text("opening", lang, options[choice])
                                             else:
                                                 response_text = get_text("invalid_selection", lang)
@@ -208,9 +212,18 @@ def run_assistant():
                         elif cmd_name == "open_file":
                             response_text = file_manager.open_file(params)
                         elif cmd_name == "map_folders":
-                            audio.speak(get_text("mapping_start", lang))
-                            total = file_manager.mapper.map_all_folders()
-                            response_text = get_text("mapping_end", lang, total)
+                            # Runs in the background; progress goes to the log / GUI console
+                            job = file_manager.mapper.current_job
+                            if job is not None and job.is_active():
+                                response_text = get_text("mapping_running", lang, job.progress()["checked"])
+                            else:
+                                def announce_mapping(progress, lang=lang):
+                                    # Queued behind whatever is being said
+                                    if progress["state"] == "done":
+                                        audio.speak(get_text("mapping_end", lang, progress["total"]), interrupt=False)
+
+                                file_manager.mapper.start_index_job(full=True, listener=announce_mapping)
+                                response_text = get_text("mapping_start", lang)
                         else:
                             # Unknown LLM command
                             response_text = get_text("error_generic", lang)
@@ -283,7 +296,11 @@ def run_assistant():
                 elif intent["type"] == "chat":
                     # General conversation - use LLM to think and respond
                     logger.info("Chat mode: Using LLM for intelligent response")
-                    response_text = llm.generate_response(user_text)
+                    if Settings.STREAM_RESPONSES:
+                        # Speak sentence by sentence while the reply is still generating
+                        response_stream = llm.generate_response_stream(user_text)
+                    else:
+                        response_text = llm.generate_response(user_text)
                 
                 else:
                     # Unknown intent type - default to LLM
@@ -291,7 +308,7 @@ def run_assistant():
                     response_text = llm.generate_response(user_text)
                 
                 # 4. Respond with interruption support
-                if response_text:
+                if response_text or response_stream:
                     from threading import Thread, Event
                     
                     interruption_detected = Event()
@@ -337,8 +354,11 @@ def run_assistant():
                     monitor_thread.start()
                     
                     # Speak the response
-                    audio.speak(response_text)
-                    logger.info(f"Assistant: {response_text}")
+                    if response_stream:
+                        audio.speak_stream(response_stream)
+                    else:
+                        audio.speak(response_text)
+                        logger.info(f"Assistant: {response_text}")
                     
                     # Wait for monitoring to finish
                     monitor_thread.join(timeout=0.5)
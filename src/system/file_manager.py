@@ -5,6 +5,8 @@ from src.utils.logger import logger
 from src.config.settings import Settings
 
 from src.system.folder_mapper import FolderMapper
+from src.system.folder_ranker import FolderRanker
+from src.system.folder_watcher import FolderWatcher
 
 class FileSystemManager:
     """
@@ -23,19 +25,25 @@ class FileSystemManager:
         ]
         self.common_paths = [p for p in self.common_paths if p and p.exists()]
         self.mapper = FolderMapper()
+        self.ranker = FolderRanker(self.mapper)
+        self.watcher = None
         
-        # Start periodic update automatically
-        self.mapper.start_periodic_update()
+        # Keep the index fresh: live filesystem events, or the periodic update
+        if Settings.FOLDER_WATCHER_ENABLED:
+            self.watcher = FolderWatcher(self.mapper)
+            self.watcher.start()
+        else:
+            self.mapper.start_periodic_update()
         
     def search_folder(self, folder_name, max_depth=4):
         """
         Search for a folder by name.
         Uses database mapping first, falls back to os.walk if empty.
         """
-        # Try DB first
-        matches = self.mapper.search_folders(folder_name)
-        if matches:
-            return matches[0]
+        # Try DB first (typo tolerant, best match first)
+        ranked = self.ranker.rank(folder_name, limit=1)
+        if ranked:
+            return ranked[0][0]
             
         logger.info(f"Searching for folder (fallback): {folder_name}")
         folder_name_lower = folder_name.lower()
@@ -61,10 +69,10 @@ class FileSystemManager:
     def search_folder_all(self, folder_name, max_depth=4):
         """
         Search for ALL folders matching the name.
-        Uses database mapping for fast results.
+        Uses database mapping for fast results, best match first.
         """
         # Try DB first (fast)
-        matches = self.mapper.search_folders(folder_name)
+        matches = [path for path, _ in self.ranker.rank(folder_name)]
         if matches:
             return matches
             
@@ -97,15 +105,17 @@ class FileSystemManager:
         Search and open a folder, with interactive selection if multiple matches.
         Returns tuple: (message, requires_selection, options)
         """
-        matches = self.search_folder_all(folder_name)
+        ranked = self.ranker.rank(folder_name)
+        matches = [path for path, _ in ranked] or self.search_folder_all(folder_name)
         
         if not matches:
             return (f"No encontré ninguna carpeta llamada '{folder_name}'", False, [])
         
-        if len(matches) == 1:
-            # Only one match, open it directly
+        if len(matches) == 1 or self.ranker.is_confident(ranked):
+            # Only one match (or a clear winner), open it directly
             try:
                 os.startfile(matches[0])
+                self.mapper.record_open(matches[0])
                 return (f"Abriendo carpeta: {matches[0]}", False, [])
             except Exception as e:
                 logger.error(f"Error opening folder: {e}")
@@ -140,22 +150,48 @@ class FileSystemManager:
             logger.error(f"Error creating folder: {e}")
             return f"No pude crear la carpeta: {e}"
             
-    def search_file(self, file_name, max_depth=4):
+    # Extensions that can end a spoken file request ("abre el informe pdf")
+    SPOKEN_EXTENSIONS = {'pdf', 'doc', 'docx', 'xls', 'xlsx', 'ppt', 'pptx', 'txt', 'csv',
+                         'jpg', 'jpeg', 'png', 'gif', 'mp3', 'mp4', 'zip', 'rar', 'py', 'exe'}
+    
+    def _split_extension(self, file_name):
+        """'informe pdf' / 'informe en pdf' -> ('informe', ['pdf']); 'informe.pdf' is left as is"""
+        words = file_name.strip().split()
+        if len(words) >= 2 and words[-1].lower().lstrip('.') in self.SPOKEN_EXTENSIONS:
+            extension = words.pop().lower().lstrip('.')
+            if len(words) >= 2 and words[-1].lower() in ('en', 'in'):
+                words.pop()
+            return " ".join(words), [extension]
+        return file_name, None
+    
+    def search_file(self, file_name, max_depth=4, extensions=None):
         """
         Search for a file by name.
+        Uses the file index (built with the folder map); os.walk is the
+        fallback when the index has no match (nothing indexed yet, or a
+        file outside the indexed roots or past the crawl depth).
         """
-        logger.info(f"Searching for file: {file_name}")
+        if extensions is None:
+            file_name, extensions = self._split_extension(file_name)
+        matches = self.mapper.search_files(file_name, extensions=extensions, limit=1)
+        if matches:
+            return matches[0]
+        
+        logger.info(f"Searching for file (fallback): {file_name}")
         file_name_lower = file_name.lower()
         
         for base_path in self.common_paths:
             try:
-                for root, _, files in os.walk(base_path):
+                for root, dirs, files in os.walk(base_path):
                     depth = root[len(str(base_path)):].count(os.sep)
+                    if depth >= max_depth:
+                        dirs[:] = []  # Nothing deeper will be read
                     if depth > max_depth:
                         continue
                         
                     for file in files:
-                        if file_name_lower in file.lower():
+                        if file_name_lower in file.lower() and (
+                                not extensions or os.path.splitext(file)[1][1:].lower() in extensions):
                             full_path = os.path.join(root, file)
                             logger.info(f"Found file: {full_path}")
                             return full_path
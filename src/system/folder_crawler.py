@@ -0,0 +1,98 @@
+import queue
+import threading
+from src.utils.logger import logger
+
+_DONE = object()
+
+class FolderCrawler:
+    """
+    Parallel tree crawler.
+    A pool of worker threads pulls directories from a shared task queue, so
+    work spreads across roots and subtrees (scandir/stat release the GIL).
+    Each worker walks its subtree from a local stack and only hands children
+    back to the shared queue when it runs low, which keeps queue traffic small.
+    Results travel in batches through a bounded queue to a single writer
+    thread, so a slow database applies backpressure to the workers.
+
+    visit(task) -> (list of child tasks, result or None)
+    write(result) is called for every result, in the writer thread
+    """
+
+    def __init__(self, visit, write, workers=8, queue_size=64, batch_size=512):
+        self.visit = visit
+        self.write = write
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.errors = 0
+
+    def run(self, roots, stop_flag=None):
+        """Crawl from the root tasks until the tree is exhausted (or stop_flag is set)"""
+        tasks = queue.Queue()
+        results = queue.Queue(maxsize=self.queue_size)
+
+        def worker():
+            while True:
+                task = tasks.get()
+                if task is _DONE:
+                    tasks.task_done()
+                    return
+                local, batch = [task], []
+                try:
+                    while local:
+                        if stop_flag is not None and stop_flag.is_set():
+                            break
+                        try:
+                            children, result = self.visit(local.pop())
+                        except Exception as e:
+                            self.errors += 1
+                            logger.error(f"Crawler error: {e}")
+                            continue
+                        if result is not None:
+                            batch.append(result)
+                            if len(batch) >= self.batch_size:
+                                results.put(batch)
+                                batch = []
+                        if not children:
+                            continue
+                        # Share work while other workers may be idle
+                        if tasks.qsize() < self.workers:
+                            half = len(children) // 2
+                            for child in children[:half]:
+                                tasks.put(child)
+                            children = children[half:]
+                        local.extend(children)
+                finally:
+                    if batch:
+                        results.put(batch)
+                    tasks.task_done()
+
+        def writer():
+            while True:
+                batch = results.get()
+                if batch is _DONE:
+                    return
+                for result in batch:
+                    try:
+                        self.write(result)
+                    except Exception as e:
+                        self.errors += 1
+                        logger.error(f"Crawler writer error: {e}")
+
+        writer_thread = threading.Thread(target=writer, name="FolderCrawlerWriter", daemon=True)
+        writer_thread.start()
+        threads = [threading.Thread(target=worker, name=f"FolderCrawler-{i}", daemon=True)
+                   for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        for root in roots:
+            tasks.put(root)
+        tasks.join()
+
+        for _ in threads:
+            tasks.put(_DONE)
+        for thread in threads:
+            thread.join()
+        results.put(_DONE)
+        writer_thread.join()
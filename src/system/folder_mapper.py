@@ -5,18 +5,53 @@ import time
 from pathlib import Path
 from src.config.settings import Settings
 from src.utils.logger import logger
+from src.system.folder_crawler import FolderCrawler
+from src.system.folder_ranker import phonetic_key
+from src.system.index_job import IndexJob
+
+def prefix_end(prefix):
+    """
+    Smallest string above every string that starts with prefix, for indexed
+    range scans. SQLite compares text by code point, so a fixed '\uffff'
+    bound would miss names with emoji or other characters past the BMP.
+    """
+    if not prefix:
+        return chr(0x10FFFF)
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
 
 class FolderMapper:
     """
     Maps all folders on the system to database for fast searching.
     Updates periodically in background.
+    Names are searched through an FTS5 trigram index (substring matches
+    without a full table scan), falling back to LIKE if it's unavailable.
+    The index is incremental: every mapped directory keeps its mtime, and an
+    update only re-lists directories whose mtime changed (children added,
+    removed or renamed), applying just the differences.
+    Files are indexed in the same crawl (file_map): a re-listed directory has
+    its files replaced. Size and mtime are refreshed when the directory changes,
+    so an edit that doesn't touch the directory leaves them stale until then.
     """
     
-    def __init__(self):
-        self.db_path = Settings.DB_PATH
+    # Directory mtimes are coarse: a directory modified this close to the scan
+    # could change again without its mtime moving, so it is listed again next time
+    RACY_MTIME_NS = 2 * 10**9
+    
+    # System folders to exclude
+    EXCLUDED_FOLDERS = {'windows', 'program files', 'program files (x86)', 'appdata', 'application data', '$recycle.bin', 'system volume information'}
+    
+    def __init__(self, db_path=None, roots=None, index_files=None):
+        self.db_path = db_path or Settings.DB_PATH
+        self.roots = roots
+        self.index_files = Settings.FILE_INDEX_ENABLED if index_files is None else index_files
         self.init_db()
         self._update_thread = None
         self._stop_flag = threading.Event()
+        self._index_lock = threading.Lock()
+        self._search_conn = None
+        self._search_lock = threading.Lock()
+        self._job_lock = threading.Lock()
+        self.current_job = None
     
     def init_db(self):
         """Create folder mapping table"""
@@ -31,96 +66,528 @@ class FolderMapper:
                 last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        # Incremental indexing: mtime (ns) of each directory when it was last listed, NULL = never listed
+        columns = {row[1] for row in cursor.execute('PRAGMA table_info(folder_map)')}
+        if 'mtime' not in columns:
+            cursor.execute('ALTER TABLE folder_map ADD COLUMN mtime INTEGER')
+        if 'depth' not in columns:
+            cursor.execute('ALTER TABLE folder_map ADD COLUMN depth INTEGER')
+        # Sound-alike key for typo-tolerant lookups (see FolderRanker)
+        if 'phonetic_key' not in columns:
+            cursor.execute('ALTER TABLE folder_map ADD COLUMN phonetic_key TEXT')
+            conn.create_function('phonetic_key', 1, phonetic_key, deterministic=True)
+            cursor.execute('UPDATE folder_map SET phonetic_key = phonetic_key(folder_name)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_folder_phonetic ON folder_map(phonetic_key)')
+        # Folders the user actually opens (recency/frequency boost when ranking)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS folder_usage (
+                full_path TEXT PRIMARY KEY,
+                open_count INTEGER DEFAULT 0,
+                last_opened REAL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS folder_roots (
+                path TEXT PRIMARY KEY,
+                mtime INTEGER
+            )
+        ''')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_folder_name ON folder_map(folder_name)')
+        # Files of every mapped directory (depth counts like folders: a file in a root has depth 1)
+        if self.index_files:
+            exists = cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'file_map'").fetchone()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS file_map (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_name TEXT,
+                    extension TEXT,
+                    full_path TEXT UNIQUE,
+                    parent_path TEXT,
+                    depth INTEGER,
+                    size INTEGER,
+                    mtime INTEGER
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_file_name ON file_map(file_name)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_file_parent ON file_map(parent_path)')
+            if not exists:
+                # Unchanged directories are never listed again: forget their mtimes so the next update fills file_map
+                cursor.execute('UPDATE folder_map SET mtime = NULL')
+                cursor.execute('DELETE FROM folder_roots')
+        self.fts_enabled = self._init_fts(cursor)
         conn.commit()
         conn.close()
         logger.info("FolderMapper database initialized")
     
-    def map_all_folders(self, max_depth=5):
-        """
-        Scan entire system and map all folders to database.
-        This is a one-time operation triggered by user command.
-        """
-        logger.info("Starting full folder mapping...")
-        
+    def _init_fts(self, cursor):
+        """Create the trigram FTS5 table and its sync triggers. Returns False if unavailable."""
+        try:
+            exists = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'folder_map_fts'"
+            ).fetchone()
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS folder_map_fts USING fts5(
+                    folder_name,
+                    content='folder_map',
+                    content_rowid='id',
+                    tokenize='trigram'
+                )
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS folder_map_ai AFTER INSERT ON folder_map BEGIN
+                    INSERT INTO folder_map_fts(rowid, folder_name) VALUES (new.id, new.folder_name);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS folder_map_ad AFTER DELETE ON folder_map BEGIN
+                    INSERT INTO folder_map_fts(folder_map_fts, rowid, folder_name) VALUES ('delete', old.id, old.folder_name);
+                END
+            ''')
+            # Only renames touch the index (mtime updates don't)
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS folder_map_au AFTER UPDATE OF folder_name ON folder_map BEGIN
+                    INSERT INTO folder_map_fts(folder_map_fts, rowid, folder_name) VALUES ('delete', old.id, old.folder_name);
+                    INSERT INTO folder_map_fts(rowid, folder_name) VALUES (new.id, new.folder_name);
+                END
+            ''')
+            if not exists:
+                # Index folders mapped before the trigram table existed
+                cursor.execute("INSERT INTO folder_map_fts(folder_map_fts) VALUES ('rebuild')")
+            if self.index_files:
+                # Files are only ever inserted and deleted (a re-listed directory replaces its files)
+                cursor.execute('''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS file_map_fts USING fts5(
+                        file_name,
+                        content='file_map',
+                        content_rowid='id',
+                        tokenize='trigram'
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS file_map_ai AFTER INSERT ON file_map BEGIN
+                        INSERT INTO file_map_fts(rowid, file_name) VALUES (new.id, new.file_name);
+                    END
+                ''')
+                cursor.execute('''
+                    CREATE TRIGGER IF NOT EXISTS file_map_ad AFTER DELETE ON file_map BEGIN
+                        INSERT INTO file_map_fts(file_map_fts, rowid, file_name) VALUES ('delete', old.id, old.file_name);
+                    END
+                ''')
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 trigram tokenizer not available, folder search will use LIKE: {e}")
+            return False
+    
+    def get_roots(self):
+        """Base paths to map"""
+        if self.roots is not None:
+            return [Path(p) for p in self.roots if Path(p).exists()]
         common_paths = [
             Path.home(),
             Path("C:/"),
             Path("D:/") if Path("D:/").exists() else None,
             Path("E:/") if Path("E:/").exists() else None
         ]
-        common_paths = [p for p in common_paths if p and p.exists()]
-        
+        return [p for p in common_paths if p and p.exists()]
+    
+    def _is_mappable(self, name):
+        """Filter out hidden folders and system folders"""
+        return not name.startswith('.') and name.lower() not in self.EXCLUDED_FOLDERS
+    
+    def _list_dir(self, path):
+        """
+        Mappable child directory names and, when files are indexed,
+        (name, size, mtime_ns) of its files. (None, None) if it can't be read.
+        """
+        dirs, files = [], []
+        try:
+            with os.scandir(path) as entries:
+                for e in entries:
+                    if not self._is_mappable(e.name):
+                        continue
+                    if e.is_dir(follow_symlinks=False):
+                        dirs.append(e.name)
+                    elif self.index_files and e.is_file(follow_symlinks=False):
+                        try:
+                            st = e.stat(follow_symlinks=False)
+                            files.append((e.name, st.st_size, st.st_mtime_ns))
+                        except OSError:
+                            continue
+        except (PermissionError, OSError):
+            return None, None
+        return dirs, files
+    
+    def map_all_folders(self, max_depth=5, full=True):
+        """
+        Map all folders under the roots to the database.
+        full=True forgets every stored mtime so each directory is listed again
+        (a rebuild on demand, e.g. the "map folders" command); the index stays
+        searchable while it runs. Returns the number of mapped folders.
+        """
+        stats = self.update_index(max_depth=max_depth, full=full)
+        return stats["total"]
+    
+    def update_index(self, max_depth=5, full=False, workers=None, job=None):
+        """
+        Incrementally bring the index up to date.
+        Each known directory costs one stat(); only directories whose mtime
+        changed are listed, and only their differences are written.
+        Roots and subtrees are crawled in parallel (see FolderCrawler).
+        job (IndexJob) receives progress and can pause, throttle or cancel the crawl.
+        Returns:
+            dict: listed, checked, added, removed, total, files, seconds
+        """
+        with self._index_lock:
+            started = time.perf_counter()
+            logger.info("Starting full folder mapping..." if full else "Updating folder map...")
+            
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            cursor = conn.cursor()
+            if full:
+                cursor.execute('UPDATE folder_map SET mtime = NULL')
+                cursor.execute('DELETE FROM folder_roots')
+                conn.commit()
+            
+            # Known children per parent: {parent_path: {full_path: mtime}} (read-only while crawling)
+            children = {}
+            for full_path, parent_path, mtime in cursor.execute('SELECT full_path, parent_path, mtime FROM folder_map'):
+                children.setdefault(parent_path, {})[full_path] = mtime
+            root_mtimes = dict(cursor.execute('SELECT path, mtime FROM folder_roots'))
+            
+            roots = [(str(p), 0, root_mtimes.get(str(p)), True) for p in self.get_roots()]
+            if job is not None:
+                job._begin()
+            stats = self._crawl(conn, roots, children, root_mtimes, max_depth,
+                                workers or Settings.FOLDER_CRAWL_WORKERS, job=job)
+            conn.close()
+            
+            stats["seconds"] = time.perf_counter() - started
+            logger.info(
+                f"Folder mapping complete! Total: {stats['total']} folders, {stats['files']} files "
+                f"(+{stats['added']} / -{stats['removed']}, listed {stats['listed']} of {stats['checked']} dirs "
+                f"in {stats['seconds']:.1f}s)"
+            )
+            return stats
+    
+    def refresh_directories(self, paths, max_depth=5):
+        """
+        Re-list just these directories (e.g. reported by FolderWatcher).
+        Their known subfolders are not descended into; new ones are crawled.
+        Paths that aren't roots or mapped folders are ignored.
+        Returns:
+            dict: listed, checked, added, removed, total, files, seconds
+        """
+        with self._index_lock:
+            started = time.perf_counter()
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            roots = {str(p) for p in self.get_roots()}
+            tasks, children = [], {}
+            for path in set(map(str, paths)):
+                if path in roots:
+                    depth, is_root = 0, True
+                else:
+                    row = conn.execute('SELECT depth FROM folder_map WHERE full_path = ?', (path,)).fetchone()
+                    if row is None:
+                        continue
+                    depth, is_root = row[0] or 0, False
+                tasks.append((path, depth, None, is_root))  # No stored mtime: always listed
+                children[path] = dict(conn.execute(
+                    'SELECT full_path, mtime FROM folder_map WHERE parent_path = ?', (path,)
+                ))
+            root_mtimes = dict(conn.execute('SELECT path, mtime FROM folder_roots'))
+            stats = self._crawl(conn, tasks, children, root_mtimes, max_depth, workers=1, descend_known=False)
+            conn.close()
+            stats["seconds"] = time.perf_counter() - started
+            logger.info(
+                f"Refreshed {len(tasks)} folders (+{stats['added']} / -{stats['removed']}) in {stats['seconds'] * 1000:.0f} ms"
+            )
+            return stats
+    
+    def count_indexed_dirs(self):
+        """Directories an update checks (roots and mapped folders), for progress estimates"""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        count = conn.execute('SELECT COUNT(*) FROM folder_map').fetchone()[0]
+        conn.close()
+        return count + len(self.get_roots())
+    
+    def start_index_job(self, full=True, listener=None, **kwargs):
+        """
+        Index in the background and return the IndexJob right away.
+        While a job is running (or paused) the same job is returned instead
+        of starting another one. A listener is added before the job starts,
+        so it also sees the final progress of a quick run.
+        """
+        with self._job_lock:
+            if self.current_job is not None and self.current_job.is_active():
+                return self.current_job
+            job = IndexJob(self, full=full, **kwargs)
+            if listener:
+                job.add_listener(listener)
+            self.current_job = job.start()
+            return self.current_job
+    
+    def get_watch_dirs(self, max_depth=5):
+        """{path: depth} of every directory an update would list (roots and mapped folders)"""
+        dirs = {str(p): 0 for p in self.get_roots()}
+        conn = sqlite3.connect(self.db_path)
+        dirs.update(conn.execute('SELECT full_path, depth FROM folder_map WHERE depth <= ?', (max_depth,)))
+        conn.close()
+        return dirs
+    
+    def _crawl(self, conn, tasks, children, root_mtimes, max_depth, workers, descend_known=True, job=None):
+        """Crawl from the given tasks and write the differences (caller holds _index_lock)"""
+        stats = {"listed": 0, "checked": 0, "added": 0, "removed": 0}
+        pending = {"inserts": [], "mtimes": [], "removed": [], "listed": [], "files": []}
         
-        # Clear old mappings
-        cursor.execute('DELETE FROM folder_map')
+        def visit(task):
+            if job is not None:
+                job._checkpoint()
+            return self._visit(task, children, max_depth, descend_known)
         
-        # System folders to exclude
-        excluded_folders = {'windows', 'program files', 'program files (x86)', 'appdata', 'application data', '$recycle.bin', 'system volume information'}
+        def write(result):
+            # Runs in the single writer thread
+            checked, listed, inserts, mtime_row, removed, files = result
+            stats["checked"] += checked
+            stats["listed"] += listed
+            stats["added"] += len(inserts)
+            stats["removed"] += len(removed)
+            pending["inserts"].extend(inserts)
+            pending["removed"].extend(removed)
+            if files is not None:
+                pending["listed"].append((mtime_row[1],))
+                pending["files"].extend(files)
+            if mtime_row is None:
+                pass
+            elif mtime_row[3] == 0:
+                root_mtimes[mtime_row[1]] = mtime_row[4]
+            else:
+                pending["mtimes"].append(mtime_row)
+            if len(pending["inserts"]) + len(pending["mtimes"]) + len(pending["files"]) >= 10000:
+                self._apply(conn, pending)
+                if job is None:
+                    logger.info(f"Mapped {stats['added']} new folders...")
+            if job is not None:
+                job._report(stats)
         
-        total_folders = 0
-        for base_path in common_paths:
-            try:
-                for root, dirs, _ in os.walk(base_path):
-                    # Filter out hidden folders and system folders
-                    dirs[:] = [d for d in dirs if not d.startswith('.') and d.lower() not in excluded_folders]
-                    
-                    # Also check if current root is inside an excluded path (e.g. inside Windows)
-                    if any(ex in root.lower().split(os.sep) for ex in excluded_folders):
-                        dirs.clear()
-                        continue
-
-                    depth = root[len(str(base_path)):].count(os.sep)
-                    if depth > max_depth:
-                        dirs.clear()  # Don't go deeper
-                        continue
-                    
-                    for dir_name in dirs:
-                        full_path = os.path.join(root, dir_name)
-                        parent_path = root
-                        
-                        try:
-                            cursor.execute(
-                                'INSERT OR IGNORE INTO folder_map (folder_name, full_path, parent_path) VALUES (?, ?, ?)',
-                                (dir_name.lower(), full_path, parent_path)
-                            )
-                            total_folders += 1
-                            
-                            # Commit every 1000 folders
-                            if total_folders % 1000 == 0:
-                                conn.commit()
-                                logger.info(f"Mapped {total_folders} folders...")
-                        except:
-                            continue
-            except (PermissionError, OSError):
-                continue
+        crawler = FolderCrawler(visit, write, workers=workers)
+        crawler.run(tasks, stop_flag=job.cancel_flag if job is not None else None)
         
+        self._apply(conn, pending)
+        conn.executemany('INSERT OR REPLACE INTO folder_roots (path, mtime) VALUES (?, ?)', root_mtimes.items())
         conn.commit()
-        conn.close()
-        logger.info(f"Folder mapping complete! Total: {total_folders} folders")
-        return total_folders
+        stats["total"] = conn.execute('SELECT COUNT(*) FROM folder_map').fetchone()[0]
+        stats["files"] = conn.execute('SELECT COUNT(*) FROM file_map').fetchone()[0] if self.index_files else 0
+        return stats
     
-    def search_folders(self, folder_name):
+    def _visit(self, task, children, max_depth, descend_known=True):
         """
-        Fast search in database instead of os.walk()
-        Returns list of matching paths.
+        Check one directory (runs in a crawler worker).
+        descend_known=False only crawls into subfolders that weren't mapped yet.
+        Returns (child tasks, (checked, listed, inserts, mtime_row, removed, files)),
+        files being the directory's file rows when it was listed (None otherwise).
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        path, depth, stored_mtime, is_root = task
+        if depth > max_depth:
+            return [], None  # Indexed but not descended into
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return [], (0, 0, [], None, [] if is_root else [path], None)
         
-        cursor.execute(
-            'SELECT full_path FROM folder_map WHERE folder_name LIKE ? LIMIT 10',
-            (f'%{folder_name.lower()}%',)
-        )
+        known = children.get(path, {})
+        if mtime == stored_mtime:
+            # Same direct children as last time
+            return [(child, depth + 1, child_mtime, False) for child, child_mtime in known.items()], (1, 0, [], None, [], None)
         
-        results = [row[0] for row in cursor.fetchall()]
-        conn.close()
+        names, files = self._list_dir(path)
+        if names is None:
+            return [], (1, 1, [], None, [], None)  # Unreadable, retried next update (mtime stays unset)
+        current = {os.path.join(path, name): name for name in names}
+        
+        removed = list(known.keys() - current.keys())
+        tasks, inserts = [], []
+        for child, name in current.items():
+            if child in known:
+                if descend_known:
+                    tasks.append((child, depth + 1, known[child], False))
+            else:
+                inserts.append((name.lower(), child, path, depth + 1, phonetic_key(name)))
+                tasks.append((child, depth + 1, None, False))
+        
+        if time.time_ns() - mtime < self.RACY_MTIME_NS:
+            mtime = None
+        name = os.path.basename(path)
+        mtime_row = (name.lower(), path, os.path.dirname(path), depth, mtime, phonetic_key(name))
+        file_rows = [
+            (file_name.lower(), os.path.splitext(file_name)[1][1:].lower(), os.path.join(path, file_name),
+             path, depth + 1, size, file_mtime)
+            for file_name, size, file_mtime in files
+        ] if self.index_files else None
+        return tasks, (1, 1, inserts, mtime_row, removed, file_rows)
+    
+    def _apply(self, conn, pending):
+        """Write the pending differences in a single transaction and clear them"""
+        with conn:
+            conn.executemany(
+                'INSERT OR IGNORE INTO folder_map (folder_name, full_path, parent_path, depth, phonetic_key) VALUES (?, ?, ?, ?, ?)',
+                pending["inserts"]
+            )
+            # Rows are created by their parent's listing; when a child's result
+            # arrives first (another worker), the upsert creates the row itself
+            conn.executemany(
+                '''INSERT INTO folder_map (folder_name, full_path, parent_path, depth, mtime, phonetic_key)
+                   VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(full_path) DO UPDATE SET mtime = excluded.mtime, last_updated = CURRENT_TIMESTAMP''',
+                pending["mtimes"]
+            )
+            # A removed folder takes its whole subtree with it
+            subtrees = [(path, path + os.sep, prefix_end(path + os.sep)) for path in pending["removed"]]
+            conn.executemany(
+                'DELETE FROM folder_map WHERE full_path = ? OR (full_path >= ? AND full_path < ?)', subtrees
+            )
+            if self.index_files:
+                conn.executemany(
+                    'DELETE FROM file_map WHERE full_path >= ? AND full_path < ?', [row[1:] for row in subtrees]
+                )
+                # A listed directory's files are replaced by the fresh listing
+                conn.executemany('DELETE FROM file_map WHERE parent_path = ?', pending["listed"])
+                conn.executemany(
+                    '''INSERT OR REPLACE INTO file_map (file_name, extension, full_path, parent_path, depth, size, mtime)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                    pending["files"]
+                )
+        for rows in pending.values():
+            rows.clear()
+    
+    def search_folders(self, folder_name, limit=10):
+        """
+        Fast search in database instead of os.walk()
+        Returns list of matching paths, best first: exact name, then prefix,
+        then other substring matches (shorter names and shallower paths first).
+        Every step is bounded by an index, so common words stay fast.
+        """
+        name = folder_name.lower().strip()
+        with self._search_lock:
+            if self._search_conn is None:
+                # Long-lived read connection: opening one costs more than the query
+                self._search_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            cursor = self._search_conn.cursor()
+            
+            # Exact and prefix matches straight from idx_folder_name
+            rows = cursor.execute(
+                'SELECT full_path FROM folder_map WHERE folder_name = ? ORDER BY depth LIMIT ?',
+                (name, limit)
+            ).fetchall()
+            rows += cursor.execute(
+                'SELECT full_path FROM folder_map WHERE folder_name > ? AND folder_name < ? ORDER BY folder_name LIMIT ?',
+                (name, prefix_end(name), limit)
+            ).fetchall()
+            
+            # Substring matches: a bounded candidate set, shortest names first
+            if self.fts_enabled and len(name) >= 3:  # Trigrams need at least 3 characters
+                candidates = cursor.execute(
+                    '''SELECT m.full_path, m.folder_name, m.depth FROM folder_map_fts f JOIN folder_map m ON m.id = f.rowid
+                       WHERE folder_map_fts MATCH ? LIMIT ?''',
+                    ('"' + name.replace('"', '""') + '"', limit * 5)
+                ).fetchall()
+            else:
+                candidates = cursor.execute(
+                    'SELECT full_path, folder_name, depth FROM folder_map WHERE folder_name LIKE ? LIMIT ?',
+                    (f'%{name}%', limit * 5)
+                ).fetchall()
+            candidates.sort(key=lambda row: (len(row[1]), row[2] or 0))
+            
+            results = []
+            for row in rows + candidates:
+                if row[0] not in results:
+                    results.append(row[0])
+                    if len(results) >= limit:
+                        break
         
         logger.info(f"Found {len(results)} folders matching '{folder_name}' in database")
         return results
     
+    def search_files(self, file_name, extensions=None, limit=10):
+        """
+        Search the file index by name, optionally only some extensions
+        (e.g. ["pdf", "docx"]). Returns matching paths, best first: exact name
+        (with or without extension), then prefix, then substring matches;
+        ties go to shorter names, shallower paths and newer files.
+        """
+        name = file_name.lower().strip()
+        if not self.index_files or not name:
+            return []
+        extensions = [e.lower().lstrip('.') for e in extensions or []]
+        ext_filter, ext_params = '', []
+        if extensions:
+            ext_filter = f" AND extension IN ({','.join('?' * len(extensions))})"
+            ext_params = extensions
+        
+        with self._search_lock:
+            if self._search_conn is None:
+                self._search_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            cursor = self._search_conn.cursor()
+            
+            # Exact and prefix matches from idx_file_name ("informe" also finds "informe.pdf")
+            rows = cursor.execute(
+                f'SELECT full_path, file_name, depth, mtime FROM file_map WHERE file_name >= ? AND file_name < ?{ext_filter} '
+                'ORDER BY file_name LIMIT ?',
+                [name, prefix_end(name)] + ext_params + [limit * 5]
+            ).fetchall()
+            if self.fts_enabled and len(name) >= 3:
+                rows += cursor.execute(
+                    f'''SELECT m.full_path, m.file_name, m.depth, m.mtime FROM file_map_fts f JOIN file_map m ON m.id = f.rowid
+                       WHERE file_map_fts MATCH ?{ext_filter} LIMIT ?''',
+                    ['"' + name.replace('"', '""') + '"'] + ext_params + [limit * 5]
+                ).fetchall()
+            else:
+                rows += cursor.execute(
+                    f'SELECT full_path, file_name, depth, mtime FROM file_map WHERE file_name LIKE ?{ext_filter} LIMIT ?',
+                    [f'%{name}%'] + ext_params + [limit * 5]
+                ).fetchall()
+        
+        def rank(row):
+            full_path, indexed_name, depth, mtime = row
+            if indexed_name == name or os.path.splitext(indexed_name)[0] == name:
+                kind = 0
+            elif indexed_name.startswith(name):
+                kind = 1
+            else:
+                kind = 2
+            return (kind, len(indexed_name), depth or 0, -(mtime or 0))
+        
+        results = []
+        for row in sorted(set(rows), key=rank):
+            results.append(row[0])
+            if len(results) >= limit:
+                break
+        
+        logger.info(f"Found {len(results)} files matching '{file_name}' in database")
+        return results
+    
+    def has_file_index(self):
+        """True once a crawl has indexed at least one file"""
+        if not self.index_files:
+            return False
+        with self._search_lock:
+            if self._search_conn is None:
+                self._search_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            return self._search_conn.execute('SELECT 1 FROM file_map LIMIT 1').fetchone() is not None
+    
+    def record_open(self, full_path):
+        """Remember that the user opened a folder (ranking boost)"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            with conn:
+                conn.execute(
+                    '''INSERT INTO folder_usage (full_path, open_count, last_opened) VALUES (?, 1, ?)
+                       ON CONFLICT(full_path) DO UPDATE SET open_count = open_count + 1, last_opened = excluded.last_opened''',
+                    (str(full_path), time.time())
+                )
+            conn.close()
+        except Exception as e:
+            logger.error(f"Error recording folder usage: {e}")
+    
     def start_periodic_update(self, interval_minutes=30):
         """
         Start background thread to update mappings periodically.
@@ -145,10 +612,12 @@ class FolderMapper:
             # Wait for interval
             self._stop_flag.wait(interval_minutes * 60)
             
+            if self.current_job is not None and self.current_job.is_active():
+                continue  # A manual run is already bringing the index up to date
             if not self._stop_flag.is_set():
                 logger.info("Running periodic folder map update...")
                 try:
-                    self.map_all_folders()
+                    self.update_index()
                 except Exception as e:
                     logger.error(f"Error in periodic update: {e}")
     
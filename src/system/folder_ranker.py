@@ -0,0 +1,246 @@
+import re
+import math
+import time
+import sqlite3
+import threading
+import itertools
+import functools
+import unicodedata
+from src.config.settings import Settings
+from src.utils.logger import logger
+
+@functools.lru_cache(maxsize=4096)
+def normalize_name(text):
+    """Lowercase, strip accents, turn separators (_ - . etc.) into single spaces"""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(re.sub(r"[\W_]+", " ", text).split())
+
+# Spanish/English spellings that sound alike, applied in order
+_PHONETIC_RULES = [
+    (r"qu(?=[ei])", "k"), (r"q", "k"), (r"ck", "k"), (r"ph", "f"), (r"sh", "x"), (r"ch", "x"),
+    (r"ll", "y"), (r"c(?=[ei])", "s"), (r"c", "k"), (r"g(?=[ei])", "j"), (r"z", "s"),
+    (r"v", "b"), (r"w", "b"), (r"(?<![sx])h", ""), (r"y(?![aeiou])", "i"), (r"(\w)\1+", r"\1"),
+]
+_PHONETIC_RULES = [(re.compile(pattern), repl) for pattern, repl in _PHONETIC_RULES]
+
+@functools.lru_cache(maxsize=4096)
+def phonetic_key(text):
+    """
+    Sound-alike key for speech transcriptions: "Proyectos_Nuebos" and
+    "proyecto nuevos" share a key. Words are joined without separators
+    and a plural "s" is dropped.
+    """
+    words = []
+    for word in normalize_name(text).split():
+        for pattern, repl in _PHONETIC_RULES:
+            word = pattern.sub(repl, word)
+        if len(word) > 3 and word.endswith("s"):
+            word = word[:-1]
+        words.append(word)
+    return "".join(words)
+
+def levenshtein(a, b):
+    """Edit distance (bit-parallel, Hyyrö 2001): one pass over b with integer bit vectors"""
+    if not a:
+        return len(b)
+    if not b:
+        return len(a)
+    peq = {}
+    for i, c in enumerate(a):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, score = full, 0, len(a)
+    for c in b:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & full) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & full
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv
+    return score
+
+def similarity(a, b):
+    """1.0 for identical strings, 0.0 for completely different ones"""
+    if not a or not b:
+        return 0.0
+    return 1.0 - levenshtein(a, b) / max(len(a), len(b))
+
+class FolderRanker:
+    """
+    Typo-tolerant, ranked folder resolution on top of FolderMapper.
+    Candidates come from indexes only (substring trigrams, phonetic keys and
+    their sorted neighbours, typo-tolerant trigram pieces, usage history),
+    then each is scored by text similarity, whole-word hits, path depth and
+    how recently and often it was opened.
+    """
+
+    MIN_TEXT_SCORE = 0.6
+    # Words people drop or add when naming a folder ("recetas abuela" / "Recetas de la Abuela")
+    FILLER_WORDS = {"de", "del", "la", "el", "los", "las", "y", "en", "mi", "mis", "the", "of", "and", "my"}
+    NEIGHBOURS = 30
+
+    def __init__(self, mapper):
+        self.mapper = mapper
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _pieces(query):
+        """Chunks of at least 3 characters that don't cross word boundaries (at most 4)"""
+        pieces = []
+        for word in re.sub(r"[\W_]+", " ", query.lower()).split():
+            if len(word) >= 6:
+                pieces += [word[:len(word) // 2], word[len(word) // 2:]]
+            elif len(word) >= 3:
+                pieces.append(word)
+        return sorted(pieces, key=len, reverse=True)[:4]
+
+    def _candidates(self, query, conn):
+        """{full_path: (folder_name, depth)} from the indexes"""
+        found = {}
+        key = phonetic_key(query)
+
+        for path in self.mapper.search_folders(query, limit=50):
+            found[path] = None
+
+        # Same phonetic key, plus its sorted neighbours (catches edits near the end)
+        if key:
+            rows = conn.execute(
+                'SELECT full_path, folder_name, depth FROM folder_map WHERE phonetic_key >= ? ORDER BY phonetic_key LIMIT ?',
+                (key, self.NEIGHBOURS)
+            ).fetchall()
+            rows += conn.execute(
+                'SELECT full_path, folder_name, depth FROM folder_map WHERE phonetic_key < ? ORDER BY phonetic_key DESC LIMIT ?',
+                (key, self.NEIGHBOURS)
+            ).fetchall()
+            found.update((row[0], (row[1], row[2])) for row in rows)
+
+        # One typo breaks at most one piece: with 3+ pieces any intact pair must still match
+        pieces = ['"' + p + '"' for p in self._pieces(query)]
+        if self.mapper.fts_enabled and len(pieces) >= 2:
+            if len(pieces) == 2:
+                match = " OR ".join(pieces)
+            else:
+                match = " OR ".join(f"({a} AND {b})" for a, b in itertools.combinations(pieces, 2))
+            rows = conn.execute(
+                '''SELECT m.full_path, m.folder_name, m.depth FROM folder_map_fts f JOIN folder_map m ON m.id = f.rowid
+                   WHERE folder_map_fts MATCH ? LIMIT 100''',
+                (match,)
+            ).fetchall()
+            found.update((row[0], (row[1], row[2])) for row in rows)
+
+        # Folders the user opens are few: always consider them
+        for path, folder_name, depth in conn.execute(
+            'SELECT u.full_path, m.folder_name, m.depth FROM folder_usage u JOIN folder_map m ON m.full_path = u.full_path'
+        ):
+            found[path] = (folder_name, depth)
+
+        missing = [path for path, info in found.items() if info is None]
+        if missing:
+            placeholders = ",".join("?" * len(missing))
+            for path, folder_name, depth in conn.execute(
+                f'SELECT full_path, folder_name, depth FROM folder_map WHERE full_path IN ({placeholders})', missing
+            ):
+                found[path] = (folder_name, depth)
+        return {path: info for path, info in found.items() if info is not None}
+
+    def text_score(self, query, folder_name):
+        """How well a folder name matches the spoken query (0..1)"""
+        q, n = normalize_name(query), normalize_name(folder_name)
+        if not q or not n:
+            return 0.0
+        if q == n:
+            return 1.0
+        if phonetic_key(q) == phonetic_key(n):
+            return 0.95
+        coverage = len(q) / len(n)
+        if f" {q} " in f" {n} ":
+            return 0.85 + 0.1 * coverage  # Whole-word hit
+        if q in n:
+            return 0.75 + 0.1 * coverage
+
+        # Fuzzy: best window of the name with as many words as the query
+        q_words, n_words = q.split(), n.split()
+        size = len(q_words)
+        windows = [" ".join(n_words[i:i + size]) for i in range(max(1, len(n_words) - size + 1))]
+        best = 0.0
+        for window in windows:
+            sim = max(similarity(q, window), similarity(phonetic_key(q), phonetic_key(window)))
+            if window != n:
+                sim *= 0.9 + 0.1 * len(window) / len(n)
+            best = max(best, sim)
+        return max(0.85 * best, self._word_score(q_words, n_words))
+
+    def _word_score(self, q_words, n_words, min_similarity=0.75):
+        """Share of the query's words found (fuzzily) in the name, in any order"""
+        q_words = [w for w in q_words if w not in self.FILLER_WORDS]
+        n_words = [w for w in n_words if w not in self.FILLER_WORDS]
+        if not q_words or not n_words:
+            return 0.0
+        n_keys = [phonetic_key(w) for w in n_words]
+        matched, total = 0, 0.0
+        for word in q_words:
+            key = phonetic_key(word)
+            best = max(1.0 if key == n_key else similarity(word, n_word) for n_word, n_key in zip(n_words, n_keys))
+            if best >= min_similarity:
+                matched += 1
+                total += best
+        name_coverage = matched / len(n_words)
+        return 0.8 * (total / len(q_words)) * (0.8 + 0.2 * name_coverage)
+
+    def usage_boost(self, usage, now):
+        """Small boost for folders opened often and recently (never beats a clearly better name)"""
+        if not usage:
+            return 0.0
+        count, last_opened = usage
+        frequency = min(0.1, 0.04 * math.log1p(count))
+        recency = 0.08 * math.exp(-(now - last_opened) / (14 * 86400))
+        return frequency + recency
+
+    def rank(self, query, limit=10):
+        """
+        Best matching folders for a (possibly misheard) name.
+        Returns:
+            list[tuple]: (full_path, score) best first
+        """
+        started = time.perf_counter()
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.mapper.db_path, check_same_thread=False)
+            candidates = self._candidates(query, self._conn)
+            usage = {row[0]: (row[1], row[2]) for row in self._conn.execute(
+                'SELECT full_path, open_count, last_opened FROM folder_usage'
+            )}
+
+        now = time.time()
+        scored = []
+        for path, (folder_name, depth) in candidates.items():
+            text = self.text_score(query, folder_name)
+            if text < self.MIN_TEXT_SCORE:
+                continue
+            depth_penalty = min(0.1, 0.015 * (depth or 0))
+            scored.append((path, text - depth_penalty + self.usage_boost(usage.get(path), now)))
+        scored.sort(key=lambda item: item[1], reverse=True)
+
+        logger.info(
+            f"Ranked {len(candidates)} candidates for '{query}' in {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+        return scored[:limit]
+
+    def is_confident(self, ranked):
+        """True when the best match is clearly ahead of the rest"""
+        if not ranked:
+            return False
+        if len(ranked) == 1:
+            return ranked[0][1] >= Settings.FOLDER_CONFIDENT_SCORE
+        return (ranked[0][1] >= Settings.FOLDER_CONFIDENT_SCORE
+                and ranked[0][1] - ranked[1][1] >= Settings.FOLDER_CONFIDENT_MARGIN)
@@ -0,0 +1,369 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from src.config.settings import Settings
+from src.utils.logger import logger
+
+class WatchBackend:
+    """
+    Source of filesystem change notifications.
+    start(dirs, on_change, accept) watches {path: depth} and calls
+    on_change(directory) whenever a directory's children are created,
+    deleted or renamed, or on_change(None) when events were lost and
+    everything should be checked. accept(name) filters hidden/system names.
+    """
+
+    name = "base"
+
+    def __init__(self, max_depth=5):
+        self.max_depth = max_depth
+        self.complete = True  # False when some directories couldn't be watched
+
+    def start(self, dirs, on_change, accept):
+        raise NotImplementedError
+
+    def stop(self):
+        raise NotImplementedError
+
+class InotifyBackend(WatchBackend):
+    """
+    Linux inotify through libc (no extra dependency).
+    One watch per directory; the thread sleeps in select() until the kernel
+    has events, so an idle tree costs no CPU. New subfolders are watched as
+    they appear, moved-away ones are forgotten.
+    """
+
+    name = "inotify"
+
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_DONT_FOLLOW = 0x02000000
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR | IN_DONT_FOLLOW
+    EVENT = struct.Struct("iIII")
+
+    @classmethod
+    def available(cls):
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            return hasattr(ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6"), "inotify_init1")
+        except OSError:
+            return False
+
+    def __init__(self, max_depth=5):
+        super().__init__(max_depth)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = None
+        self._wake_r = self._wake_w = None
+        self._paths = {}   # wd -> path
+        self._wds = {}     # path -> wd
+        self._depths = {}  # path -> depth
+        self._thread = None
+
+    def start(self, dirs, on_change, accept):
+        self._on_change, self._accept = on_change, accept
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._wake_r, self._wake_w = os.pipe()
+        for path, depth in dirs.items():
+            self._add_watch(path, depth)
+        self._thread = threading.Thread(target=self._read_loop, name="FolderWatcher-inotify", daemon=True)
+        self._thread.start()
+        logger.info(f"inotify watching {len(self._wds)} folders")
+
+    def _add_watch(self, path, depth):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC and self.complete:
+                self.complete = False
+                logger.warning("inotify watch limit reached (fs.inotify.max_user_watches), some folders are not watched")
+            return False
+        self._paths[wd] = path
+        self._wds[path] = wd
+        self._depths[path] = depth
+        return True
+
+    def _watch_tree(self, path, depth):
+        """Watch a new folder and whatever was created inside it before the watch existed"""
+        stack = [(path, depth)]
+        while stack:
+            current, current_depth = stack.pop()
+            if current_depth > self.max_depth or not self._add_watch(current, current_depth):
+                continue
+            try:
+                with os.scandir(current) as entries:
+                    stack.extend((e.path, current_depth + 1) for e in entries
+                                 if self._accept(e.name) and e.is_dir(follow_symlinks=False))
+            except OSError:
+                continue
+
+    def _forget_tree(self, path):
+        prefix = path + os.sep
+        for watched in [p for p in self._wds if p == path or p.startswith(prefix)]:
+            wd = self._wds.pop(watched)
+            self._paths.pop(wd, None)
+            self._depths.pop(watched, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def _read_loop(self):
+        while True:
+            try:
+                ready, _, _ = select.select([self._fd, self._wake_r], [], [])
+                if self._wake_r in ready:
+                    return
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                logger.error(f"inotify read error: {e}")
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+                name = data[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b"\0")
+                offset += self.EVENT.size + length
+                try:
+                    self._handle(wd, mask, os.fsdecode(name))
+                except Exception as e:
+                    logger.error(f"inotify event error: {e}")
+
+    def _handle(self, wd, mask, name):
+        if mask & self.IN_Q_OVERFLOW:
+            self._on_change(None)
+            return
+        if mask & self.IN_IGNORED:
+            path = self._paths.pop(wd, None)
+            if path is not None and self._wds.get(path) == wd:
+                del self._wds[path]
+                self._depths.pop(path, None)
+            return
+        parent = self._paths.get(wd)
+        if parent is None or not name or not self._accept(name):
+            return
+        self._on_change(parent)
+        if mask & self.IN_ISDIR:
+            path = os.path.join(parent, name)
+            if mask & self.IN_MOVED_FROM:
+                self._forget_tree(path)
+            elif mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                self._watch_tree(path, self._depths[parent] + 1)
+
+    def stop(self):
+        if self._thread is None:
+            return
+        os.write(self._wake_w, b"x")
+        self._thread.join(timeout=2)
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            os.close(fd)
+        self._thread = None
+        self._paths.clear()
+        self._wds.clear()
+
+class PollingBackend(WatchBackend):
+    """
+    Portable fallback: stats every watched directory each interval and
+    reports those whose mtime moved (one stat per directory, no listing
+    unless something changed).
+    """
+
+    name = "polling"
+
+    def __init__(self, max_depth=5, interval=None):
+        super().__init__(max_depth)
+        self.interval = interval or Settings.FOLDER_WATCH_POLL_SECONDS
+        self._mtimes = {}  # path -> (depth, mtime_ns)
+        self._stop_flag = threading.Event()
+        self._thread = None
+
+    def start(self, dirs, on_change, accept):
+        self._on_change, self._accept = on_change, accept
+        for path, depth in dirs.items():
+            self._mtimes[path] = (depth, self._stat(path))
+        self._stop_flag.clear()
+        self._thread = threading.Thread(target=self._poll_loop, name="FolderWatcher-polling", daemon=True)
+        self._thread.start()
+        logger.info(f"Polling {len(self._mtimes)} folders every {self.interval}s")
+
+    @staticmethod
+    def _stat(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _poll_loop(self):
+        while not self._stop_flag.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Folder polling error: {e}")
+
+    def poll(self):
+        """Check every directory once; returns how many changed"""
+        changed = []
+        for path, (depth, mtime) in list(self._mtimes.items()):
+            current = self._stat(path)
+            if current != mtime:
+                changed.append((path, depth, current))
+        for path, depth, current in changed:
+            if current is None:
+                # Gone: its parent reports the change
+                prefix = path + os.sep
+                for watched in [p for p in self._mtimes if p == path or p.startswith(prefix)]:
+                    del self._mtimes[watched]
+                continue
+            self._mtimes[path] = (depth, current)
+            self._on_change(path)
+            if depth < self.max_depth:
+                self._add_new_children(path, depth)
+        return len(changed)
+
+    def _add_new_children(self, path, depth):
+        try:
+            with os.scandir(path) as entries:
+                for e in entries:
+                    if e.path not in self._mtimes and self._accept(e.name) and e.is_dir(follow_symlinks=False):
+                        self._mtimes[e.path] = (depth + 1, self._stat(e.path))
+                        if depth + 1 < self.max_depth:
+                            self._add_new_children(e.path, depth + 1)
+        except OSError:
+            pass
+
+    def stop(self):
+        self._stop_flag.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+class FolderWatcher:
+    """
+    Keeps folder_map current from filesystem events instead of a fixed timer.
+    Events only mark directories dirty; a single updater thread waits until
+    they stop arriving for `debounce` seconds (or `max_delay` has passed since
+    the first one) and refreshes the whole batch with
+    FolderMapper.refresh_directories(). Lost events trigger update_index().
+    """
+
+    def __init__(self, mapper, backend=None, debounce=None, max_delay=None, max_depth=5):
+        self.mapper = mapper
+        self.max_depth = max_depth
+        self.backend = backend
+        self.debounce = Settings.FOLDER_WATCH_DEBOUNCE_SECONDS if debounce is None else debounce
+        self.max_delay = max_delay or max(self.debounce * 5, 10.0)
+        self._dirty = set()
+        self._rescan = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_flag = threading.Event()
+        self._thread = None
+        self._ready = threading.Event()
+        self._periodic = False
+        self.stats = {"events": 0, "batches": 0, "refreshed": 0, "rescans": 0}
+
+    def start(self, catch_up=True):
+        """Catch up with offline changes (incremental update), then start watching"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_flag.clear()
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, args=(catch_up,), name="FolderWatcher", daemon=True)
+        self._thread.start()
+
+    def wait_ready(self, timeout=None):
+        """True once the backend is watching"""
+        return self._ready.wait(timeout)
+
+    def _start_backend(self):
+        if self.backend is None:
+            self.backend = InotifyBackend(self.max_depth) if InotifyBackend.available() else PollingBackend(self.max_depth)
+        dirs = self.mapper.get_watch_dirs(self.max_depth)
+        try:
+            self.backend.start(dirs, self._on_change, self.mapper._is_mappable)
+        except OSError as e:
+            logger.warning(f"{self.backend.name} watcher unavailable ({e}), polling instead")
+            self.backend = PollingBackend(self.max_depth)
+            self.backend.start(dirs, self._on_change, self.mapper._is_mappable)
+        if not self.backend.complete:
+            # Unwatched folders are still caught by the slow timer
+            self.mapper.start_periodic_update()
+            self._periodic = True
+        logger.info(f"Folder watcher started ({self.backend.name})")
+
+    def _on_change(self, path):
+        with self._lock:
+            self.stats["events"] += 1
+            if path is None:
+                self._rescan = True
+            else:
+                self._dirty.add(path)
+        self._wake.set()
+
+    def _run(self, catch_up):
+        try:
+            if catch_up:
+                self.mapper.update_index()
+            self._start_backend()
+        except Exception as e:
+            logger.error(f"Error starting folder watcher: {e}")
+            return
+        finally:
+            self._ready.set()
+
+        while not self._stop_flag.is_set():
+            self._wake.wait()
+            if self._stop_flag.is_set():
+                break
+            # Debounce: wait for a quiet period, but never longer than max_delay
+            first = time.monotonic()
+            while not self._stop_flag.is_set():
+                self._wake.clear()
+                remaining = self.max_delay - (time.monotonic() - first)
+                if remaining <= 0 or not self._wake.wait(min(self.debounce, remaining)):
+                    break
+            self.flush()
+
+    def flush(self):
+        """Apply the pending batch now"""
+        with self._lock:
+            batch, self._dirty = self._dirty, set()
+            rescan, self._rescan = self._rescan, False
+        if not batch and not rescan:
+            return
+        try:
+            if rescan:
+                self.stats["rescans"] += 1
+                self.mapper.update_index(max_depth=self.max_depth)
+            else:
+                self.mapper.refresh_directories(batch, max_depth=self.max_depth)
+            self.stats["batches"] += 1
+            self.stats["refreshed"] += len(batch)
+        except Exception as e:
+            logger.error(f"Error applying folder changes: {e}")
+
+    def stop(self):
+        """Stop watching (pending changes are applied first)"""
+        self._stop_flag.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self.backend is not None:
+            self.backend.stop()
+        if self._periodic:
+            self.mapper.stop_periodic_update()
+        self.flush()
+        logger.info("Folder watcher stopped")
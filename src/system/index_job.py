@@ -0,0 +1,181 @@
+import time
+import threading
+from src.config.settings import Settings
+from src.utils.logger import logger
+
+class IndexJob:
+    """
+    Folder indexing in a background thread (see FolderMapper.start_index_job).
+    Progress (folders checked, folders per second, ETA) goes to listeners
+    and the log, at most once per `progress_interval` seconds.
+    The crawl can be paused, resumed or cancelled at any directory, and
+    throttled to `max_rate` directories per second so it doesn't compete with
+    the assistant for disk and CPU. A cancelled run leaves the index
+    consistent: directories it didn't reach are simply listed next time.
+    Runs are serialized with every other update through the mapper's index lock.
+    """
+
+    def __init__(self, mapper, full=True, max_depth=5, workers=None, max_rate=None, progress_interval=2.0):
+        self.mapper = mapper
+        self.full = full
+        self.max_depth = max_depth
+        self.workers = workers
+        self.max_rate = Settings.INDEX_MAX_DIRS_PER_SECOND if max_rate is None else max_rate
+        self.progress_interval = progress_interval
+        self.state = "idle"  # idle, waiting, running, paused, cancelled, done, failed
+        self.result = None
+        self.error = None
+        self._listeners = []
+        self._cancelled = threading.Event()
+        self._resume = threading.Event()
+        self._resume.set()
+        self._finished = threading.Event()
+        self._thread = None
+        self._rate_lock = threading.Lock()
+        self._next_slot = 0.0
+        self._visited = 0  # Counted by the workers: results reach the writer in batches
+        self._stats = {}
+        self._started = None
+        self._paused_at = None
+        self._paused_total = 0.0
+        self._last_report = 0.0
+        self._expected = None
+
+    def add_listener(self, callback):
+        """callback(progress_dict), called from the crawler's writer thread"""
+        self._listeners.append(callback)
+
+    def start(self):
+        if self._thread is not None:
+            return self
+        self._expected = self.mapper.count_indexed_dirs()
+        self.state = "waiting"
+        self._thread = threading.Thread(target=self._run, name="IndexJob", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.result = self.mapper.update_index(
+                max_depth=self.max_depth, full=self.full, workers=self.workers, job=self
+            )
+            self.state = "cancelled" if self._cancelled.is_set() else "done"
+        except Exception as e:
+            self.error = e
+            self.state = "failed"
+            logger.error(f"Indexing job failed: {e}")
+        finally:
+            self._finished.set()
+            self._notify(self.progress())
+            progress = self.progress()
+            logger.info(
+                f"Indexing job {self.state}: {progress['checked']} folders checked in {progress['elapsed']:.1f}s "
+                f"({progress['rate']:.0f} folders/s), {progress['total'] if progress['total'] is not None else '?'} indexed"
+            )
+
+    # Hooks called by FolderMapper while crawling
+
+    def _begin(self):
+        """The index lock is held: the crawl starts now"""
+        self._started = time.monotonic()
+        if self.state == "waiting":
+            self.state = "running"
+
+    def _checkpoint(self):
+        """Before each directory (crawler workers): honour pause and the rate limit"""
+        self._resume.wait()
+        rate = self.max_rate
+        with self._rate_lock:
+            self._visited += 1
+            if not rate or self._cancelled.is_set():
+                return
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + 1.0 / rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _report(self, stats):
+        """After each written result (writer thread)"""
+        self._stats = stats
+        now = time.monotonic()
+        if now - self._last_report >= self.progress_interval:
+            self._last_report = now
+            progress = self.progress()
+            eta = "?" if progress["eta"] is None else f"{progress['eta']:.0f}s"
+            logger.info(
+                f"Indexing: {progress['checked']} folders checked (+{progress['added']} / -{progress['removed']}), "
+                f"{progress['rate']:.0f} folders/s, ETA {eta}"
+            )
+            self._notify(progress)
+
+    def _notify(self, progress):
+        for callback in self._listeners:
+            try:
+                callback(progress)
+            except Exception as e:
+                logger.error(f"Indexing progress listener error: {e}")
+
+    # Control
+
+    @property
+    def cancel_flag(self):
+        return self._cancelled
+
+    def pause(self):
+        if self.state == "running":
+            self._resume.clear()
+            self._paused_at = time.monotonic()
+            self.state = "paused"
+            logger.info("Indexing paused")
+
+    def resume(self):
+        if self.state == "paused":
+            self._paused_total += time.monotonic() - self._paused_at
+            self._paused_at = None
+            self.state = "running"
+            self._resume.set()
+            logger.info("Indexing resumed")
+
+    def cancel(self):
+        if not self._finished.is_set():
+            self._cancelled.set()
+            self._resume.set()  # Let paused workers see the cancellation
+            logger.info("Indexing cancel requested")
+
+    def set_max_rate(self, max_rate):
+        """Change the throttle while running (0 = unlimited)"""
+        self.max_rate = max_rate
+
+    def is_active(self):
+        return self._thread is not None and not self._finished.is_set()
+
+    def wait(self, timeout=None):
+        """True once the job has finished (done, cancelled or failed)"""
+        return self._finished.wait(timeout)
+
+    def progress(self):
+        """Snapshot: state, checked, listed, added, removed, rate (folders/s), elapsed and eta (s, None if unknown)"""
+        stats = dict(self._stats)
+        elapsed = 0.0
+        if self._started is not None:
+            paused = self._paused_total + (time.monotonic() - self._paused_at if self._paused_at else 0.0)
+            elapsed = time.monotonic() - self._started - paused
+        checked = (self.result or {}).get("checked", self._visited)
+        rate = checked / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if self.state in ("done", "cancelled", "failed"):
+            eta = 0.0
+        elif rate > 0 and self._expected and checked <= self._expected:
+            eta = (self._expected - checked) / rate
+        return {
+            "state": self.state,
+            "checked": checked,
+            "listed": stats.get("listed", 0),
+            "added": stats.get("added", 0),
+            "removed": stats.get("removed", 0),
+            "rate": rate,
+            "elapsed": elapsed,
+            "eta": eta,
+            "total": (self.result or {}).get("total"),
+        }
@@ -15,6 +15,21 @@ class WindowsController:
     Controls Windows-specific features using pywin32 or ctypes.
     """
     
+    # Common aliases mapping (also used by the local intent router)
+    APP_ALIASES = {
+        "vscode": "code",
+        "visual studio code": "code",
+        "chrome": "chrome",
+        "google chrome": "chrome",
+        "notepad": "notepad",
+        "bloc de notas": "notepad",
+        "calculator": "calc",
+        "calculadora": "calc",
+        "spotify": "spotify",
+        "explorer": "explorer",
+        "explorador": "explorer"
+    }
+    
     def set_volume(self, level):
         """
         Set system volume (0-100).
@@ -44,24 +59,9 @@ class WindowsController:
         """Open an application by name"""
         logger.info(f"Opening app: {app_name}")
         
-        # Common aliases mapping
-        app_map = {
-            "vscode": "code",
-            "visual studio code": "code",
-            "chrome": "chrome",
-            "google chrome": "chrome",
-            "notepad": "notepad",
-            "bloc de notas": "notepad",
-            "calculator": "calc",
-            "calculadora": "calc",
-            "spotify": "spotify",
-            "explorer": "explorer",
-            "explorador": "explorer"
-        }
-        
         # Normalize app name
         clean_name = app_name.lower().strip()
-        cmd = app_map.get(clean_name, clean_name)
+        cmd = self.APP_ALIASES.get(clean_name, clean_name)
         
         try:
             # Use start with empty title argument to handle quotes correctly
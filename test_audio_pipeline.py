@@ -0,0 +1,75 @@
+import os
+import time
+import shutil
+import tempfile
+import numpy as np
+from src.audio.audio_source import WavFileSource, write_wav
+from src.audio.audio_pipeline import AudioPipeline
+from src.audio.ring_buffer import AudioRingBuffer
+from benchmarks.audio_fixtures import speech_like, silence, compose
+
+def test_ring_buffer():
+    print("Testing AudioRingBuffer...")
+    ring = AudioRingBuffer(10)
+    fast, slow = ring.reader(), ring.reader()
+    ring.write(np.arange(6))
+    assert list(fast.read(4)) == [0, 1, 2, 3]
+    ring.write(np.arange(6, 14))  # Wraps; the slow reader falls behind
+    assert list(fast.read(4)) == [4, 5, 6, 7]
+    assert list(slow.read(3)) == [4, 5, 6] and slow.dropped == 4
+    assert fast.read(100, timeout=0.01) is None  # Not written yet
+    ring.close()
+    assert list(fast.read(100)) == list(range(8, 14))
+    assert fast.read(1) is None
+    print("AudioRingBuffer test passed!")
+
+def test_audio_pipeline():
+    print("Testing AudioPipeline with a WAV input...")
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, "dos_frases.wav")
+    rng = np.random.default_rng(3)
+    write_wav(path, compose(silence(0.5), speech_like(1.0, rng), silence(1.0),
+                            speech_like(0.6, rng), silence(1.0), background=100))
+
+    heard, spoken = [], []
+
+    def recognize(item):
+        heard.append(len(item["audio"]) / item["sample_rate"])
+        item["text"] = f"frase {len(heard)}"
+        return item
+
+    def intent(item):
+        item["intent"] = {"type": "chat"}
+        return item
+
+    def speak(item):
+        spoken.append(item["text"])
+        return item
+
+    pipeline = AudioPipeline(WavFileSource(path, realtime=False), recognize,
+                             workers=[("intent", intent), ("speak", speak)]).start()
+    items = []
+    while True:
+        item = pipeline.next_item(timeout=5)
+        if item is None:
+            break
+        items.append(item)
+    assert pipeline.finished
+    assert [item["text"] for item in items] == ["frase 1", "frase 2"] == spoken
+    assert 1.0 <= heard[0] <= 1.8 and 0.6 <= heard[1] <= 1.4  # Speech plus pre-roll and some trailing silence
+    assert all(item["intent"]["type"] == "chat" for item in items)
+
+    stats = pipeline.stats()
+    assert stats["utterances"] == 2
+    for stage in ("segment", "recognize", "intent", "speak", "end_to_end"):
+        assert stats[stage]["count"] == 2
+    # Nothing recognized: the item is dropped by the stage and never reaches the output
+    pipeline = AudioPipeline(WavFileSource(path, realtime=False), lambda item: None).start()
+    assert pipeline.next_item(timeout=5) is None and pipeline.finished
+    assert pipeline.stats()["dropped"]["recognize"] == 2
+    shutil.rmtree(workdir)
+    print("AudioPipeline test passed!")
+
+if __name__ == "__main__":
+    test_ring_buffer()
+    test_audio_pipeline()
@@ -0,0 +1,72 @@
+import numpy as np
+from src.audio.capture_service import CaptureService
+from src.audio.audio_pipeline import AudioPipeline
+from benchmarks.audio_fixtures import speech_like, noise, compose
+
+class FakeMicrophone:
+    """Audio source that counts device opens and closes"""
+    opens = 0
+
+    def __init__(self, samples, frame_samples=480):
+        FakeMicrophone.opens += 1
+        self.sample_rate = 16000
+        self.frame_samples = frame_samples
+        self.samples = samples
+        self.position = 0
+        self.closes = 0
+
+    def read(self):
+        if self.position >= len(self.samples):
+            return None
+        frame = self.samples[self.position:self.position + self.frame_samples]
+        self.position += self.frame_samples
+        return frame
+
+    def close(self):
+        self.closes += 1
+
+def test_capture_service():
+    print("Testing CaptureService...")
+    rng = np.random.default_rng(5)
+    audio = compose(noise(1.0, rng, level=200), speech_like(0.5, rng), noise(1.0, rng, level=200),
+                    noise(4.0, rng, level=800))
+    source = FakeMicrophone(audio)
+    service = CaptureService(source, buffer_seconds=10)
+
+    # Fan-out: wake word, command capture and barge-in read the same stream
+    wake, command, barge_in = service.microphone(), service.microphone(), service.reader()
+    pipeline = AudioPipeline(service, lambda item: dict(item, text="hola"))
+    with wake as wake_source, command as command_source:
+        pipeline.start()  # Starts the shared capture once
+        seen = [np.frombuffer(mic.stream.read(16000), dtype=np.int16) for mic in (wake_source, command_source)]
+    assert np.array_equal(seen[0], audio[:16000]) and np.array_equal(seen[1], audio[:16000])
+    view = barge_in.read(16000)
+    assert np.array_equal(view, audio[:16000])
+    assert np.shares_memory(view, service.ring._data) and not view.flags.writeable  # Zero-copy
+
+    service._thread.join(timeout=5)
+    item = pipeline.next_item(timeout=5)
+    assert item["text"] == "hola" and 0.5 <= len(item["audio"]) / 16000 <= 1.4
+    pipeline.stop()  # Leaves the shared stream to the other consumers
+    while pipeline.next_item(timeout=5) is not None:
+        pass
+    assert pipeline.finished
+    # Re-entering the microphone opens nothing and skips audio older than the backlog
+    for _ in range(10):
+        with wake as stream:
+            pass
+    assert FakeMicrophone.opens == 1 and source.closes == 0
+    with wake as stream:
+        rest = stream.stream.read(len(audio))
+    assert len(rest) // 2 == wake.max_backlog
+
+    # Noise floor follows the live stream, also when the noise gets louder
+    assert 600 < service.noise_rms < 1000
+    assert wake.energy_threshold(1.5) == service.noise_rms * 1.5
+    service.stop()
+    assert source.closes == 1
+    assert barge_in.read(480) is not None and command.reader.read(10 ** 6) is not None
+    print("CaptureService test passed!")
+
+if __name__ == "__main__":
+    test_capture_service()
@@ -0,0 +1,73 @@
+from src.brain.context_manager import ContextManager, estimate_tokens
+
+class StubMemory:
+    """In-memory stand-in for MemoryManager with more history than fits the budget"""
+
+    def __init__(self, turns=40, facts=50):
+        self.turns = [{"id": i, "role": "user" if i % 2 else "model", "timestamp": "2026-01-01 10:00:00",
+                       "content": f"Mensaje número {i}. " + "Detalle de la conversación sobre la receta. " * 4}
+                      for i in range(1, turns + 1)]
+        self.facts = {f"dato_{i}": f"valor del dato número {i}" for i in range(facts)}
+        self.recall_before = []
+
+    def get_all_facts(self):
+        return self.facts
+
+    def get_last_message_id(self):
+        return self.turns[-1]["id"] if self.turns else 0
+
+    def get_recent_turns(self, limit=20, after_id=0):
+        return [t for t in self.turns if t["id"] > after_id][-limit:]
+
+    def search_history(self, query, k=5, before_id=None):
+        self.recall_before.append(before_id)
+        older = [t for t in self.turns if before_id is None or t["id"] < before_id]
+        return older[:k]
+
+    def search_summaries(self, query, k=1):
+        return [{"start_time": "2025-12-01", "end_time": "2025-12-02", "message_count": 40,
+                 "content": "Hablamos de recetas y de la reunión del lunes."}][:k]
+
+def test_context_manager():
+    print("Testing ContextManager...")
+    memory = StubMemory()
+    context = ContextManager(memory, budget=1000, max_turns=40)
+    system_prompt, user_prompt = "Eres ELEVEN, un asistente.", "¿Qué receta te pedí?"
+    result = context.build(system_prompt, user_prompt)
+    stats = result["stats"]
+    fixed = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+
+    # Facts are capped at 10% of the budget
+    assert 0 < stats["facts"] <= 100
+    assert result["prompt"].count("- dato_") < len(memory.facts)
+
+    # Recent turns leave a 20% reserve, and the newest turns are the ones kept
+    assert 0 < stats["history"] <= 1000 - fixed - stats["facts"] - 200
+    history = result["history"]
+    assert history[-1]["parts"][0] == memory.turns[-1]["content"]
+    assert stats["turns_included"] == len(history) < len(memory.turns)
+
+    # Recall only looks before the packed history and gets half of what is left
+    assert memory.recall_before == [memory.turns[-len(history)]["id"]]
+    after_history = 1000 - fixed - stats["facts"] - stats["history"]
+    assert 0 < stats["recalled"] <= after_history // 2
+    assert "Relevant past conversation:" in result["prompt"] and "reunión del lunes" in result["prompt"]
+
+    # Dropped turns are summarized in what is left
+    assert 0 < stats["summary"] <= after_history - stats["recalled"]
+    assert result["prompt"].index("Earlier in this conversation:") < result["prompt"].index("Known facts")
+    assert stats["total"] <= stats["budget"] == 1000
+
+    # Everything fits: no summary; after clear_history only recall reaches the old turns
+    small = StubMemory(turns=4, facts=2)
+    result = ContextManager(small, budget=1000).build(system_prompt, user_prompt)
+    assert len(result["history"]) == 4 and result["stats"]["summary"] == 0
+    assert "Earlier in this conversation:" not in result["prompt"]
+    context.clear_history()
+    result = context.build(system_prompt, user_prompt)
+    assert result["history"] == [] and memory.recall_before[-1] is None
+    assert result["stats"]["total"] <= 1000
+    print("ContextManager test passed!")
+
+if __name__ == "__main__":
+    test_context_manager()
@@ -0,0 +1,147 @@
+import os
+import time
+import shutil
+import tempfile
+from pathlib import Path
+from src.system.folder_mapper import FolderMapper
+from src.system.file_manager import FileSystemManager
+
+def make_tree(base, width, depth):
+    if depth == 0:
+        return
+    for i in range(width):
+        path = os.path.join(base, f"carpeta_{depth}_{i}")
+        os.mkdir(path)
+        make_tree(path, width, depth - 1)
+
+def age(paths, seconds=10):
+    """Backdate directories so their mtimes are trusted (not racy)"""
+    past = time.time() - seconds
+    for path in paths:
+        os.utime(path, (past, past))
+
+def test_folder_mapper():
+    print("Testing FolderMapper incremental index...")
+    workdir = tempfile.mkdtemp()
+    tree = os.path.join(workdir, "tree")
+    os.mkdir(tree)
+    make_tree(tree, 3, 3)  # 3 + 9 + 27 folders
+    os.mkdir(os.path.join(tree, ".oculta"))
+    age([root for root, _, _ in os.walk(tree)])
+
+    mapper = FolderMapper(db_path=os.path.join(workdir, "memory.db"), roots=[tree])
+    assert mapper.map_all_folders() == 39
+
+    # Nothing changed: every directory is checked, none is listed again
+    stats = mapper.update_index()
+    assert stats["listed"] == 0 and stats["added"] == 0 and stats["removed"] == 0
+    assert stats["total"] == 39
+
+    # Deep change: only the modified directory is listed
+    deep = os.path.join(tree, "carpeta_3_0", "carpeta_2_1")
+    os.mkdir(os.path.join(deep, "Proyectos Nuevos"))
+    shutil.rmtree(os.path.join(tree, "carpeta_3_2"))
+    age([tree, deep, os.path.join(deep, "Proyectos Nuevos")], seconds=5)
+    stats = mapper.update_index()
+    assert stats["added"] == 1
+    assert stats["removed"] == 1
+    assert stats["total"] == 39 + 1 - 13
+    assert stats["listed"] == 3  # deep, tree (removal) and the new folder
+    assert mapper.search_folders("proyectos nuevos") == [os.path.join(deep, "Proyectos Nuevos")]
+    assert mapper.search_folders("carpeta_2") and not any("carpeta_3_2" in p for p in mapper.search_folders("carpeta"))
+
+    # Full rebuild on demand gives the same index
+    assert mapper.map_all_folders() == stats["total"]
+
+    # Ranked substring search: exact name first, then longer names containing it
+    os.mkdir(os.path.join(tree, "Proyectos"))
+    mapper.update_index()
+    results = mapper.search_folders("proyectos")
+    assert results == [os.path.join(tree, "Proyectos"), os.path.join(deep, "Proyectos Nuevos")]
+    assert len(mapper.search_folders("ta_", limit=5)) == 5
+    shutil.rmtree(workdir)
+    print("FolderMapper test passed!")
+
+def test_file_index():
+    print("Testing FolderMapper file index...")
+    workdir = tempfile.mkdtemp()
+    tree = os.path.join(workdir, "tree")
+    docs = os.path.join(tree, "Documentos")
+    deep = os.path.join(docs, "Trabajo", "2024")
+    os.makedirs(deep)
+    for path in (os.path.join(tree, "informe.txt"), os.path.join(docs, "Informe Final.pdf"),
+                 os.path.join(deep, "informe.pdf"), os.path.join(deep, "notas.docx"), os.path.join(docs, ".oculto")):
+        with open(path, "w") as f:
+            f.write("x" * 10)
+    age([root for root, _, _ in os.walk(tree)])
+
+    mapper = FolderMapper(db_path=os.path.join(workdir, "memory.db"), roots=[tree])
+    stats = mapper.update_index(full=True)
+    assert stats["files"] == 4
+
+    # Exact name (with or without extension) first, then prefix, then substring
+    assert mapper.search_files("informe") == [
+        os.path.join(tree, "informe.txt"), os.path.join(deep, "informe.pdf"), os.path.join(docs, "Informe Final.pdf")
+    ]
+    assert mapper.search_files("informe", extensions=["pdf"])[0] == os.path.join(deep, "informe.pdf")
+    assert mapper.search_files("nota", extensions=[".DOCX"]) == [os.path.join(deep, "notas.docx")]
+    assert mapper.search_files("final") == [os.path.join(docs, "Informe Final.pdf")]
+
+    # Only changed directories are re-listed; their files are replaced
+    os.remove(os.path.join(deep, "notas.docx"))
+    with open(os.path.join(deep, "presupuesto.xlsx"), "w") as f:
+        f.write("x")
+    age([deep], seconds=5)
+    stats = mapper.update_index()
+    assert stats["listed"] == 1 and stats["files"] == 4
+    assert mapper.search_files("notas") == []
+    assert mapper.search_files("presupuesto") == [os.path.join(deep, "presupuesto.xlsx")]
+
+    # A removed folder takes its files with it
+    shutil.rmtree(os.path.join(docs, "Trabajo"))
+    age([docs], seconds=5)
+    assert mapper.update_index()["files"] == 2
+    assert mapper.search_files("informe", extensions=["pdf"]) == [os.path.join(docs, "Informe Final.pdf")]
+    assert mapper.has_file_index()
+
+    # Files outside the indexed roots are still found, by walking the common paths
+    outside = os.path.join(workdir, "fuera")
+    os.makedirs(outside)
+    with open(os.path.join(outside, "contrato.pdf"), "w") as f:
+        f.write("x")
+    files = FileSystemManager.__new__(FileSystemManager)
+    files.mapper, files.common_paths = mapper, [Path(outside)]
+    assert files.search_file("informe final") == os.path.join(docs, "Informe Final.pdf")
+    assert files.search_file("contrato en pdf") == os.path.join(outside, "contrato.pdf")
+    assert files.search_file("inexistente") is None
+    shutil.rmtree(workdir)
+    print("File index test passed!")
+
+def test_emoji_paths():
+    print("Testing FolderMapper with emoji names...")
+    workdir = tempfile.mkdtemp()
+    tree = os.path.join(workdir, "tree")
+    trip = os.path.join(tree, "Viajes", "🌴 Playa", "Fotos 📷")
+    os.makedirs(trip)
+    with open(os.path.join(trip, "😎.jpg"), "w") as f:
+        f.write("x")
+    age([root for root, _, _ in os.walk(tree)])
+
+    mapper = FolderMapper(db_path=os.path.join(workdir, "memory.db"), roots=[tree])
+    assert mapper.update_index(full=True)["total"] == 3
+    assert mapper.search_folders("🌴") == [os.path.dirname(trip)]
+    assert mapper.search_files("😎") == [os.path.join(trip, "😎.jpg")]
+
+    # Removing the parent removes every row below it, emoji paths included
+    shutil.rmtree(os.path.join(tree, "Viajes"))
+    age([tree], seconds=5)
+    stats = mapper.update_index()
+    assert stats["total"] == 0 and stats["files"] == 0
+    assert mapper.search_folders("fotos") == [] and mapper.search_files("😎") == []
+    shutil.rmtree(workdir)
+    print("Emoji paths test passed!")
+
+if __name__ == "__main__":
+    test_folder_mapper()
+    test_file_index()
+    test_emoji_paths()
@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+from src.system.folder_mapper import FolderMapper
+from src.system.folder_ranker import FolderRanker, phonetic_key, levenshtein
+from test_folder_mapper import age
+
+def test_folder_ranker():
+    print("Testing FolderRanker...")
+    assert levenshtein("proyectos", "proyetcos") == 2
+    assert levenshtein("", "abc") == 3
+    assert phonetic_key("Proyectos_Nuebos") == phonetic_key("proyecto nuevos")
+
+    workdir = tempfile.mkdtemp()
+    tree = os.path.join(workdir, "tree")
+    names = ["Proyectos", "Fotos Vacaciones", "Recetas de la Abuela", "Facturas 2024", "Música"]
+    paths = {name: os.path.join(tree, name) for name in names}
+    for path in paths.values():
+        os.makedirs(path)
+    backup = os.path.join(tree, "Backup", "Old", "Proyectos")
+    os.makedirs(backup)
+    age([root for root, _, _ in os.walk(tree)])
+
+    mapper = FolderMapper(db_path=os.path.join(workdir, "memory.db"), roots=[tree])
+    mapper.map_all_folders()
+    ranker = FolderRanker(mapper)
+
+    def best(query):
+        ranked = ranker.rank(query, limit=1)
+        return ranked[0][0] if ranked else None
+
+    # Misheard names: typos, accents, sound-alike spellings, dropped words
+    assert best("proyetcos") == paths["Proyectos"]
+    assert best("musica") == paths["Música"]
+    assert best("fotos bacaciones") == paths["Fotos Vacaciones"]
+    assert best("recetas abuela") == paths["Recetas de la Abuela"]
+    assert best("facturas") == paths["Facturas 2024"]
+    assert best("zzqx") is None
+
+    # Shallow wins on a tie, until the user keeps opening the other one
+    assert best("proyectos") == paths["Proyectos"]
+    assert not ranker.is_confident(ranker.rank("proyectos"))
+    for _ in range(5):
+        mapper.record_open(backup)
+    assert best("proyectos") == backup
+
+    ranked = ranker.rank("fotos vacaciones")
+    assert ranker.is_confident(ranked)
+    shutil.rmtree(workdir)
+    print("FolderRanker test passed!")
+
+if __name__ == "__main__":
+    test_folder_ranker()
@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+from src.system.folder_mapper import FolderMapper
+from src.system.folder_watcher import FolderWatcher, InotifyBackend, PollingBackend
+from test_folder_mapper import make_tree, age
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+def check_backend(backend):
+    workdir = tempfile.mkdtemp()
+    tree = os.path.join(workdir, "tree")
+    os.mkdir(tree)
+    make_tree(tree, 2, 2)  # 2 + 4 folders
+    age([root for root, _, _ in os.walk(tree)])
+    mapper = FolderMapper(db_path=os.path.join(workdir, "memory.db"), roots=[tree])
+    watcher = FolderWatcher(mapper, backend=backend, debounce=0.1)
+    watcher.start()
+    assert watcher.wait_ready(5)
+    assert mapper.search_folders("carpeta_1_1")
+
+    # Create: a nested folder appears, including a file created inside it right away
+    deep = os.path.join(tree, "carpeta_2_0", "carpeta_1_1")
+    os.makedirs(os.path.join(deep, "Proyectos", "Clientes"))
+    with open(os.path.join(deep, "Proyectos", "informe.txt"), "w") as f:
+        f.write("x")
+    assert wait_for(lambda: mapper.search_folders("clientes") == [os.path.join(deep, "Proyectos", "Clientes")])
+    assert wait_for(lambda: mapper.search_files("informe") == [os.path.join(deep, "Proyectos", "informe.txt")])
+
+    # Rename: old name disappears with its subtree, new one appears
+    renamed = os.path.join(tree, "Trabajo")
+    os.rename(os.path.join(deep, "Proyectos"), renamed)
+    assert wait_for(lambda: mapper.search_folders("trabajo") == [renamed])
+    assert wait_for(lambda: mapper.search_folders("clientes") == [os.path.join(renamed, "Clientes")])
+    assert mapper.search_folders("proyectos") == []
+
+    # Delete
+    shutil.rmtree(os.path.join(tree, "carpeta_2_1"))
+    assert wait_for(lambda: not any("carpeta_2_1" in p for p in mapper.search_folders("carpeta_2")))
+
+    # Events are batched: far fewer refreshes than events
+    assert watcher.stats["batches"] <= watcher.stats["events"]
+    watcher.stop()
+    shutil.rmtree(workdir)
+    return watcher.stats
+
+def test_folder_watcher():
+    print("Testing FolderWatcher...")
+    if sys.platform.startswith("linux"):
+        assert InotifyBackend.available()
+        print("  inotify:", check_backend(InotifyBackend()))
+    print("  polling:", check_backend(PollingBackend(interval=0.1)))
+    print("FolderWatcher test passed!")
+
+if __name__ == "__main__":
+    test_folder_watcher()
@@ -0,0 +1,52 @@
+import os
+import time
+import shutil
+import tempfile
+from src.system.folder_mapper import FolderMapper
+from test_folder_mapper import make_tree, age
+
+def test_index_job():
+    print("Testing IndexJob...")
+    workdir = tempfile.mkdtemp()
+    tree = os.path.join(workdir, "tree")
+    os.mkdir(tree)
+    make_tree(tree, 5, 3)  # 5 + 25 + 125 folders
+    age([root for root, _, _ in os.walk(tree)])
+    mapper = FolderMapper(db_path=os.path.join(workdir, "memory.db"), roots=[tree], index_files=False)
+
+    # Returns immediately; a second trigger gets the same job
+    events = []
+    start = time.perf_counter()
+    job = mapper.start_index_job(full=True, listener=events.append, workers=2, max_rate=100, progress_interval=0.1)
+    assert time.perf_counter() - start < 0.5
+    assert mapper.start_index_job(full=True) is job
+
+    # Pause: no progress while paused, then resume to the end
+    time.sleep(0.3)
+    job.pause()
+    time.sleep(0.1)
+    paused_at = job.progress()["checked"]
+    time.sleep(0.3)
+    assert job.state == "paused" and job.progress()["checked"] == paused_at
+    assert 0 < paused_at < 156
+    job.resume()
+    assert job.wait(10)
+    assert job.state == "done" and job.result["total"] == 155
+    assert events and events[-1]["state"] == "done"
+    assert any(e["state"] == "running" and e["rate"] > 0 for e in events)
+    assert 50 <= job.progress()["rate"] <= 150  # Throttled to ~100 folders/s
+
+    # Cancel midway: the index stays usable and the next update finishes the job
+    job = mapper.start_index_job(full=True, max_rate=200)
+    time.sleep(0.2)
+    job.cancel()
+    assert job.wait(5) and job.state == "cancelled"
+    assert job.result["checked"] < 156
+    stats = mapper.update_index()
+    assert stats["total"] == 155 and stats["listed"] > 0
+
+    shutil.rmtree(workdir)
+    print("IndexJob test passed!")
+
+if __name__ == "__main__":
+    test_index_job()
@@ -0,0 +1,88 @@
+import os
+import time
+import shutil
+import sqlite3
+import tempfile
+from src.brain.intent_cache import IntentCache
+from src.config.settings import Settings
+
+class LockedConnection:
+    """A connection whose writes fail as if another process held the lock"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=()):
+        if sql.startswith("DELETE"):
+            raise sqlite3.OperationalError("database is locked")
+        return self.conn.execute(sql, params)
+
+    def commit(self):
+        self.conn.commit()
+
+def test_intent_cache():
+    print("Testing IntentCache...")
+    workdir = tempfile.mkdtemp()
+    db_path = os.path.join(workdir, "intent_cache.db")
+    chat = {"type": "chat", "confidence": 0.8}
+    cache = IntentCache(db_path=db_path, max_entries=2, ttl_seconds=3600)
+
+    # In-memory LRU: the least recently used entry is evicted, the disk still has it
+    cache.put("hola", "es-ES", "m", chat, latency=0.5)
+    cache.put("que tal", "es-ES", "m", chat, latency=0.5)
+    assert cache.get("hola", "es-ES", "m") == chat
+    cache.put("buenas", "es-ES", "m", chat, latency=0.5)
+    assert list(cache._memory) == ["es-ES|m|hola", "es-ES|m|buenas"]
+    assert cache.get("que tal", "es-ES", "m") == chat and cache.stats["disk_hits"] == 1
+
+    # Restart: served from disk, then from memory
+    cache = IntentCache(db_path=db_path, max_entries=2, ttl_seconds=3600)
+    assert cache.get("buenas", "es-ES", "m") == chat and cache.get("buenas", "es-ES", "m") == chat
+    assert cache.stats["disk_hits"] == 1 and cache.stats["memory_hits"] == 1
+    assert cache.get("buenas", "en-US", "m") is None  # Language is part of the key
+
+    # Expired entries are not served, and are deleted from disk
+    cache = IntentCache(db_path=db_path, max_entries=2, ttl_seconds=0.05)
+    cache.put("adios", "es-ES", "m", chat)
+    time.sleep(0.1)
+    assert cache.get("adios", "es-ES", "m") is None
+    IntentCache(db_path=db_path, ttl_seconds=0.05)
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM intent_cache").fetchone()[0] == 0
+
+    # A personality change invalidates every entry
+    cache = IntentCache(db_path=db_path, ttl_seconds=3600)
+    cache.put("hola", "es-ES", "m", chat)
+    personality = Settings.PERSONALITY
+    Settings.PERSONALITY = dict(personality, humor=personality["humor"] + 1)
+    try:
+        assert cache.get("hola", "es-ES", "m") is None and cache.stats["invalidations"] == 1
+    finally:
+        Settings.PERSONALITY = personality
+
+    # The fingerprint is only rehashed when its inputs change
+    hashes = []
+    cache.compute_fingerprint = lambda: hashes.append(1) or IntentCache.compute_fingerprint()
+    for _ in range(5):
+        cache.get("hola", "es-ES", "m")
+    assert hashes == [1]  # Once, for the personality restored above
+
+    # A locked database is a cache miss, and the invalidation is retried
+    cache.put("hola", "es-ES", "m", chat)
+    conn = cache._conn
+    cache._conn = LockedConnection(conn)
+    Settings.PERSONALITY = dict(personality, humor=personality["humor"] + 1)
+    try:
+        assert cache.get("hola", "es-ES", "m") is None and cache.get("hola", "es-ES", "m") is None
+        assert cache.stats["invalidations"] == 2  # Not counted until it succeeds
+        cache._conn = conn
+        assert cache.get("hola", "es-ES", "m") is None and cache.stats["invalidations"] == 3
+        assert conn.execute("SELECT COUNT(*) FROM intent_cache").fetchone()[0] == 0
+    finally:
+        Settings.PERSONALITY = personality
+    conn.close()
+    shutil.rmtree(workdir)
+    print("Intent cache test passed!")
+
+if __name__ == "__main__":
+    test_intent_cache()
@@ -0,0 +1,45 @@
+from src.brain.intent_classifier import IntentClassifier
+from src.brain.intent_router import IntentRouter
+
+class NoLLM:
+    def analyze_intent(self, text):
+        raise AssertionError(f"LLM should not be called for: {text}")
+
+def test_intent_router():
+    print("Testing IntentRouter...")
+    router = IntentRouter(IntentClassifier.SYSTEM_KEYWORDS)
+
+    assert router.route("Sube el volumen")["parameters"] == "volume_up"
+    assert router.route("open spotify")["command"] == "open_app"
+
+    folder = router.route("abre la carpeta descargas")
+    assert folder["command"] == "open_folder" and folder["parameters"] == "descargas"
+
+    create = router.route("crea una carpeta llamada facturas en documentos")
+    assert create["parameters"] == "facturas en documentos"
+
+    # Ambiguous or conversational input is left to the LLM
+    assert router.route("cuéntame un chiste") is None
+    assert router.route("abre youtube")["confidence"] < 0.85
+
+    # Command words inside a question or a sentence are not commands
+    for text in ["what does mute mean", "explain what volume up means", "por qué mi perro busca su cola",
+                 "tell me about my screen time habits", "dime qué ves en el futuro",
+                 "the file is corrupted, open it please", "cómo crear una carpeta en windows",
+                 "search results are bad today", "buscar trabajo es difícil"]:
+        result = router.route(text)
+        assert result is None or result["confidence"] < 0.85, (text, result)
+    assert router.route("mute the volume please")["parameters"] == "mute"
+    assert router.route("baja el volumen por favor")["confidence"] >= 0.85
+    assert router.route("qué ves en mi pantalla")["command"] == "analyze_screen"
+    assert router.route("qué ves en mi pantalla")["confidence"] >= 0.85
+    assert router.route("busca recetas de pasta en google")["parameters"] == "recetas de pasta"
+    assert router.route("search for python tutorials")["confidence"] >= 0.85
+
+    classifier = IntentClassifier(NoLLM(), cache=False)
+    assert classifier.classify("mapear carpetas")["command"] == "map_folders"
+    assert classifier.get_stats()["fast_path"] == 1
+    print("Intent router test passed!")
+
+if __name__ == "__main__":
+    test_intent_router()
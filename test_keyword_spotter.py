@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+from src.audio.kws import KeywordSpotter
+from src.audio.audio_source import WavFileSource, write_wav
+from src.audio.capture_service import CaptureService
+from src.config.settings import Settings
+from benchmarks.audio_fixtures import word, speech_like, noise, silence, compose
+
+KEYWORD = (2, 0, 1)
+
+def say(vowels, rng):
+    return word(vowels, rng, syllable_rate=rng.uniform(3.5, 4.5), pitch=rng.uniform(110, 200), level=rng.uniform(3000, 9000))
+
+def test_keyword_spotter():
+    print("Testing KeywordSpotter...")
+    rng = np.random.default_rng(20)
+    workdir = tempfile.mkdtemp()
+    templates = os.path.join(workdir, "templates")
+    spotter = KeywordSpotter(templates_dir=templates)
+    assert not spotter.ready()
+    for _ in range(Settings.WAKE_WORD_MIN_TEMPLATES):
+        assert spotter.add_template(compose(silence(0.4), say(KEYWORD, rng), silence(0.4), background=100))
+    assert not spotter.add_template(noise(1.0, rng, level=100))  # Nothing to enroll
+    spotter = KeywordSpotter(templates_dir=templates)  # Templates persist
+    assert spotter.ready() and len(os.listdir(templates)) == Settings.WAKE_WORD_MIN_TEMPLATES
+
+    # Streaming: other words, noise and the keyword; only the keyword fires
+    stream = compose(silence(0.5), say((0, 3), rng), silence(0.6), noise(0.8, rng, level=2000), silence(0.6),
+                     say((4, 1, 3, 2), rng), silence(0.6), say(KEYWORD, rng), silence(0.6), background=100)
+    keyword_end = len(stream) - int(0.6 * 16000)
+    detections, misses = [], 0
+    for i, frame in enumerate(stream[:len(stream) // 480 * 480].reshape(-1, 480)):
+        if spotter.feed(frame):
+            detections.append(i * 480)
+        misses = max(misses, spotter.misses)
+    assert len(detections) == 1 and 0 <= detections[0] - keyword_end <= 0.4 * 16000
+    assert misses >= 1 and spotter.misses == 0  # Rejected segments are counted until a detection
+
+    # Live: listening on the shared capture stream
+    path = os.path.join(workdir, "live.wav")
+    write_wav(path, compose(silence(0.3), say(KEYWORD, rng), silence(0.5), background=100))
+    capture = CaptureService(WavFileSource(path, realtime=True))
+    spotter = KeywordSpotter(capture, templates_dir=templates)
+    capture.start()
+    assert spotter.listen(timeout=3)
+    capture.stop()
+
+    # Oldest templates are dropped past the cap
+    for _ in range(Settings.WAKE_WORD_MAX_TEMPLATES + 2):
+        spotter.add_template(compose(silence(0.2), say(KEYWORD, rng), silence(0.2)))
+    assert len(spotter.templates) == Settings.WAKE_WORD_MAX_TEMPLATES
+    assert len(os.listdir(templates)) == Settings.WAKE_WORD_MAX_TEMPLATES
+    shutil.rmtree(workdir)
+    print("KeywordSpotter test passed!")
+
+if __name__ == "__main__":
+    test_keyword_spotter()
@@ -0,0 +1,71 @@
+from src.brain.llm_client import LLMClient
+from src.brain.model_router import ModelRouter
+
+class StubMemory:
+    def __init__(self):
+        self.messages = []
+
+    def add_message(self, role, content):
+        self.messages.append((role, content))
+
+class StubContext:
+    def build(self, system_prompt, prompt, extra_context=None):
+        return {"prompt": prompt, "history": []}
+
+class Chunk:
+    def __init__(self, text):
+        self.text = text
+
+class BlockedChunk:
+    @property
+    def text(self):
+        raise ValueError("The response was blocked by the safety filters")
+
+class StubChat:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def send_message(self, prompt, stream=False):
+        return iter(self.chunks)
+
+class StubModel:
+    def __init__(self, chunks=None):
+        self.chunks = chunks or [Chunk("Primera frase. "), Chunk("Segunda frase. "), Chunk("Tercera frase.")]
+
+    def start_chat(self, history):
+        return StubChat(self.chunks)
+
+def make_client(chunks=None):
+    """An LLMClient wired to stubs instead of Gemini"""
+    client = LLMClient.__new__(LLMClient)
+    client.memory = StubMemory()
+    client.context = StubContext()
+    client.system_prompt = ""
+    client.available_models = ["stub"]
+    client.current_model_index = 0
+    client.model = StubModel(chunks)
+    client._models = {"stub": client.model}
+    client.router = ModelRouter(["stub"])
+    return client
+
+def test_llm_client():
+    print("Testing LLMClient streaming...")
+    client = make_client()
+    assert "".join(client.generate_response_stream("hola")) == "Primera frase. Segunda frase. Tercera frase."
+    assert client.memory.messages[-1] == ("model", "Primera frase. Segunda frase. Tercera frase.")
+
+    # A barge-in abandons the stream: the part already received is still saved as the reply
+    client = make_client()
+    stream = client.generate_response_stream("hola")
+    assert next(stream) == "Primera frase. "
+    stream.close()
+    assert client.memory.messages == [("user", "hola"), ("model", "Primera frase. ")]
+
+    # A safety-filtered reply has no text: no empty model turn
+    client = make_client([BlockedChunk()])
+    assert list(client.generate_response_stream("hola")) == []
+    assert client.memory.messages == [("user", "hola")]
+    print("LLMClient streaming test passed!")
+
+if __name__ == "__main__":
+    test_llm_client()
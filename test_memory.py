@@ -1,5 +1,6 @@
 from src.brain.memory import MemoryManager
 import os
+import tempfile
 
 def test_memory():
     print("Testing MemoryManager...")
@@ -23,5 +24,48 @@ def test_memory():
     assert len(history) >= 2
     print("Memory test passed!")
 
+def test_search_history():
+    print("Testing search_history...")
+    mem = MemoryManager(db_path=os.path.join(tempfile.mkdtemp(), "memory.db"))
+    for role, content in [
+        ("user", "¿Cuál es la receta de pasta con tomate?"),                 # 1
+        ("model", "Hierve la pasta y añade salsa de tomate casera."),        # 2
+        ("user", "Recuérdame la reunión con el equipo el lunes."),           # 3
+        ("model", "Anotado: reunión con el equipo el lunes a las diez."),    # 4
+        ("user", "¿Qué tiempo hará el fin de semana?"),                      # 5
+        ("model", "Soleado el sábado y lluvia el domingo."),                 # 6
+        ("user", "Otra vez la receta de pasta, por favor."),                 # 7
+        ("model", "Claro: pasta, tomate, ajo y albahaca."),                  # 8
+    ]:
+        mem.add_message(role, content)
+
+    def ids(results):
+        return [r["id"] for r in results]
+
+    # Keyword search: messages with every query word rank above partial matches
+    results = mem.search_history("receta pasta", k=4, mode="fts")
+    assert set(ids(results)[:2]) == {1, 7} and set(ids(results)) <= {1, 2, 7, 8}
+    assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+    assert set(ids(mem.search_history("reunion", mode="fts"))) == {3, 4}  # Accents are ignored
+
+    # Semantic search ranks by vector similarity
+    assert set(ids(mem.search_history("reunion equipo lunes", k=2, mode="semantic"))) == {3, 4}
+    assert mem.search_history("y el", mode="semantic") == []
+
+    # Hybrid fuses both rankings: messages found by both come first
+    results = mem.search_history("receta de pasta", k=3, mode="hybrid")
+    assert set(ids(results)[:2]) == {1, 7}
+    assert mem.search_history("receta de pasta", k=3) == results  # Hybrid is the default with vectors
+
+    # Newer messages are left out on request
+    for mode in ("fts", "semantic", "hybrid"):
+        found = ids(mem.search_history("receta pasta", mode=mode, exclude_recent=2))
+        assert found[0] == 1 and set(found) <= {1, 2}
+        assert set(ids(mem.search_history("receta pasta tomate", mode=mode, before_id=2))) == {1}
+    assert mem.search_history("soleado", mode="fts", exclude_recent=3) == []
+    mem.close()
+    print("search_history test passed!")
+
 if __name__ == "__main__":
     test_memory()
+    test_search_history()
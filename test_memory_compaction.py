@@ -0,0 +1,57 @@
+import os
+import sqlite3
+import tempfile
+import threading
+from src.brain.memory import MemoryManager
+from src.brain.memory_compactor import MemoryCompactor
+
+def test_memory_compaction():
+    print("Testing MemoryCompactor...")
+    db_path = os.path.join(tempfile.mkdtemp(), "memory.db")
+    mem = MemoryManager(db_path=db_path)
+    for i in range(250):
+        mem.add_message("user", f"Pregunta {i} sobre la receta de pasta")
+        mem.add_message("model", f"Respuesta {i}")
+
+    compactor = MemoryCompactor(mem, keep_recent=100, chunk_size=40, idle_seconds=0)
+    resets = []
+    reset_vector_cache = mem.reset_vector_cache
+    mem.reset_vector_cache = lambda: resets.append(1) or reset_vector_cache()
+
+    # Interrupted run: resumes from the watermark without rescanning
+    report = compactor.run(max_chunks=3)
+    assert report["messages"] == 120
+    assert resets == [1]  # Once per run, not per chunk
+    assert compactor.watermark == 120
+
+    report = compactor.run()
+    # 400 eligible messages -> 10 full chunks; the newest 100 are untouched
+    assert compactor.watermark == 400
+    assert report["summaries"] == 7
+    assert "before" in report and "after" in report
+    assert compactor.run()["messages"] == 0
+
+    history = mem.get_recent_history(limit=200)
+    assert len(history) == 100
+    assert history[-1]["parts"][0] == "Respuesta 249"
+    assert len(mem.get_summaries(limit=20)) == 10
+    assert "receta de pasta" in mem.search_summaries("receta pasta")[0]["content"]
+
+    # optimize() does not take the shared lock; messages written meanwhile wait for it
+    with mem._db_lock:
+        mem.add_message("user", "Mensaje durante el vacuum")
+        worker = threading.Thread(target=mem.optimize, kwargs={"min_free_ratio": 0})
+        worker.start()
+        worker.join(10)
+        assert not worker.is_alive()
+    assert mem.get_recent_history(limit=1)[0]["parts"][0] == "Mensaje durante el vacuum"
+
+    # Raw rows were archived, not lost
+    mem.close()
+    archive = sqlite3.connect(os.path.join(os.path.dirname(db_path), "memory_archive.db"))
+    assert archive.execute("SELECT COUNT(*) FROM conversations").fetchone()[0] == 400
+    archive.close()
+    print("Memory compaction test passed!")
+
+if __name__ == "__main__":
+    test_memory_compaction()
@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+from google.api_core import exceptions as api_exceptions
+from src.brain.model_router import ModelRouter, is_model_error, OPEN, HALF_OPEN, CLOSED
+from src.brain.model_health import ModelHealthProbe
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class ScriptedBackend:
+    """Each model answers with a scripted list of outcomes ('ok' or an error message)"""
+
+    def __init__(self, script):
+        self.script = {model: list(outcomes) for model, outcomes in script.items()}
+        self.calls = []
+
+    def __call__(self, model_name):
+        self.calls.append(model_name)
+        outcome = self.script[model_name].pop(0) if self.script[model_name] else "ok"
+        if outcome != "ok":
+            raise RuntimeError(outcome)
+        return model_name
+
+def test_model_router():
+    print("Testing ModelRouter...")
+    clock = FakeClock()
+    router = ModelRouter(["fast", "slow"], clock=clock, prior_latency=1.0,
+                         failure_threshold=2, base_backoff=10, max_backoff=40)
+
+    # Latency-aware: the faster model wins even though it is ranked first anyway
+    router.record_success("fast", 0.2)
+    router.record_success("slow", 0.9)
+    assert router.choose() == "fast"
+
+    # A quota error opens the circuit immediately and fails over
+    backend = ScriptedBackend({"fast": ["429 Quota exceeded"], "slow": []})
+    assert router.call(backend) == "slow"
+    assert router.get_stats()["fast"]["state"] == OPEN
+
+    # Never cycles back to an open model
+    assert router.choose() == "slow"
+
+    # After the backoff a single trial request is allowed (half-open)
+    clock.now += 10
+    assert router.choose() == "fast"
+    assert router.breakers["fast"].state == HALF_OPEN
+    assert router.choose() == "slow"
+
+    # Failed trial doubles the backoff
+    router.record_failure("fast", "500 Internal")
+    assert router.breakers["fast"].state == OPEN
+    assert router.breakers["fast"].backoff == 20
+
+    # Successful trial closes the circuit again
+    clock.now += 20
+    assert router.call(ScriptedBackend({"fast": [], "slow": []})) == "fast"
+    assert router.breakers["fast"].state == CLOSED
+
+    stats = router.get_stats()
+    assert stats["fast"]["p95"] is not None and stats["fast"]["error_rate"] > 0
+    print("Model router test passed!")
+
+def test_content_errors():
+    print("Testing content errors in ModelRouter...")
+    assert is_model_error(ConnectionError("reset")) and is_model_error(TimeoutError())
+    assert is_model_error(api_exceptions.ServiceUnavailable("overloaded"))
+    assert is_model_error(api_exceptions.DeadlineExceeded("slow"))
+    assert not is_model_error(api_exceptions.InvalidArgument("bad prompt"))
+    assert not is_model_error(ValueError("The response was blocked by the safety filters"))
+
+    clock = FakeClock()
+    router = ModelRouter(["fast", "slow"], clock=clock, failure_threshold=1, base_backoff=10)
+    calls = []
+
+    def blocked(model_name):
+        calls.append(model_name)
+        raise ValueError("The response was blocked by the safety filters")
+
+    # Raised at once: no failover, nothing counted against the model
+    for _ in range(3):
+        try:
+            router.call(blocked)
+            assert False, "content error swallowed"
+        except ValueError:
+            pass
+    assert calls == ["fast"] * 3
+    assert router.breakers["fast"].state == CLOSED and not router.stats["fast"].outcomes
+
+    # A half-open trial that hits one is released for the next request
+    router.record_failure("fast", "503 Service Unavailable")
+    clock.now += 10
+    try:
+        router.call(blocked)
+    except ValueError:
+        pass
+    assert router.breakers["fast"].state == HALF_OPEN and router.choose() == "fast"
+    print("Content errors test passed!")
+
+def test_seed_from_fresh_health():
+    print("Testing router seeding from model health...")
+    workdir = tempfile.mkdtemp()
+    cache_path = os.path.join(workdir, "model_health.json")
+    now = time.time()
+    probe = ModelHealthProbe(None, ["fast", "slow", "old"], cache_path=cache_path, ttl_seconds=600)
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump({"api_key_hash": probe.api_key_hash, "models": {
+            "fast": {"healthy": True, "latency": 0.2, "error": None, "checked_at": now - 60},
+            "slow": {"healthy": False, "latency": None, "error": "429 Quota exceeded", "checked_at": now - 60},
+            "old": {"healthy": False, "latency": None, "error": "429 Quota exceeded", "checked_at": now - 3 * 86400}
+        }}, f)
+    probe = ModelHealthProbe(None, ["fast", "slow", "old"], cache_path=cache_path, ttl_seconds=600)
+    assert set(probe.fresh_health()) == {"fast", "slow"}
+
+    # A failure from days ago does not start with an open circuit
+    router = ModelRouter(["fast", "slow", "old"])
+    router.seed_from_health(probe.fresh_health())
+    assert router.breakers["slow"].state == OPEN
+    assert router.breakers["old"].state == CLOSED and not router.stats["old"].outcomes
+    shutil.rmtree(workdir)
+    print("Router seeding test passed!")
+
+if __name__ == "__main__":
+    test_model_router()
+    test_content_errors()
+    test_seed_from_fresh_health()
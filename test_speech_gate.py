@@ -0,0 +1,37 @@
+import numpy as np
+from src.audio.vad import SpectralVAD, SpeechGate
+from benchmarks.audio_fixtures import speech_like, noise, hum, chord, silence, compose
+
+def test_spectral_vad():
+    print("Testing SpectralVAD...")
+    rng = np.random.default_rng(9)
+    vad = SpectralVAD()
+    audio = compose(silence(0.5), speech_like(1.0, rng), silence(0.6), background=100)
+    decisions = [vad.is_speech(audio[i:i + 480]) for i in range(0, len(audio) - 479, 480)]
+    first, last = decisions.index(True), len(decisions) - 1 - decisions[::-1].index(True)
+    assert 16 <= first <= 22  # Speech starts at frame ~17 (+ onset)
+    assert all(decisions[first:last + 1])  # Pauses between syllables are bridged by the hangover
+    assert 1.0 <= (last - first + 1) * 0.03 <= 1.4
+    # Loud but not voiced: hiss is rejected frame by frame
+    vad.reset()
+    assert not any(vad.is_speech(frame) for frame in compose(silence(0.3), noise(0.9, rng, level=3000)).reshape(-1, 480))
+    print("SpectralVAD test passed!")
+
+def test_speech_gate():
+    print("Testing SpeechGate...")
+    rng = np.random.default_rng(4)
+    gate = SpeechGate()
+    room = lambda event: compose(silence(0.5), event, silence(0.3), background=100)
+    assert gate.allows(room(speech_like(1.2, rng)))
+    assert gate.allows(room(speech_like(0.8, rng, level=1500, pitch=220)))
+    for event in (noise(1.5, rng, 2000), noise(1.5, rng, 2500, "pink"), hum(1.5), chord(1.5)):
+        assert not gate.allows(room(event))
+    assert not gate.allows(silence(1.0))
+    assert gate.stats() == {"checked": 7, "forwarded": 2, "avoided": 5, "avoided_pct": 500 / 7}
+    # Other capture rates (sr.Microphone opens the device at its native rate)
+    assert SpeechGate().is_speech(np.repeat(room(speech_like(1.0, rng)), 3), 48000)
+    print("SpeechGate test passed!")
+
+if __name__ == "__main__":
+    test_spectral_vad()
+    test_speech_gate()
@@ -0,0 +1,90 @@
+import time
+import threading
+from src.audio.speech_queue import SpeechQueue, BARGE_IN, SYSTEM, CHAT
+
+class StubVoice:
+    """synthesize/play/discard that record what happened; each utterance plays for `duration`"""
+
+    def __init__(self, duration=0.1):
+        self.duration = duration
+        self.synthesized = {}
+        self.played = []
+        self.discarded = []
+
+    def synthesize(self, text, group=None):
+        self.synthesized[text] = time.perf_counter()
+        return text
+
+    def play(self, audio, stop):
+        started = time.perf_counter()
+        stopped = stop.wait(self.duration)
+        self.played.append((audio, started, time.perf_counter(), not stopped))
+
+    def discard(self, audio):
+        self.discarded.append(audio)
+
+def test_speech_queue():
+    print("Testing SpeechQueue...")
+    voice = StubVoice()
+    queue = SpeechQueue(voice.synthesize, voice.play, voice.discard, lookahead=2)
+
+    # A batch plays back to back, synthesized ahead of its turn; is_speaking follows the queue
+    items = queue.say_all(["Opción 1", "Opción 2", "Opción 3"])
+    assert queue.is_speaking()
+    assert queue.wait(timeout=2) and not queue.is_speaking()
+    assert [p[0] for p in voice.played] == ["Opción 1", "Opción 2", "Opción 3"] and all(p[3] for p in voice.played)
+    assert voice.synthesized["Opción 2"] < voice.played[0][2] and voice.synthesized["Opción 3"] < voice.played[0][2]
+    assert all(b[1] - a[2] < 0.02 for a, b in zip(voice.played, voice.played[1:]))
+    assert all(item.state == "played" and item.done.is_set() for item in items)
+
+    # Higher priority preempts at once and drops what it outranks; lower priority waits its turn
+    voice.played.clear()
+    voice.duration = 0.5
+    chat = queue.say_all(["Respuesta uno.", "Respuesta dos."], CHAT)
+    time.sleep(0.05)
+    started = time.perf_counter()
+    system = queue.say("Subiendo volumen", SYSTEM)
+    assert chat[1].state == "dropped" and "Respuesta dos." in voice.discarded
+    assert system.done.wait(2) and system.state == "played"
+    assert voice.played[0][0] == "Respuesta uno." and not voice.played[0][3]
+    assert voice.played[1][1] - started < 0.05  # Preempted within a poll
+    first = queue.say("Abriendo chrome", SYSTEM, interrupt=False)
+    later = queue.say("Más tarde", CHAT)
+    assert queue.wait(timeout=3) and first.state == later.state == "played"
+    assert later.started_at >= first.finished_at
+
+    # Streams are read sentence by sentence and cancelled by a higher priority
+    voice.played.clear()
+    voice.duration = 0.1
+    release = threading.Event()
+
+    def reply():
+        yield "Primera frase del modelo. "
+        release.wait(2)
+        yield "Segunda frase que nunca llega."
+
+    queue.say_stream(reply(), CHAT)
+    assert queue.is_speaking()
+    time.sleep(0.05)
+    queue.say("Detenido.", BARGE_IN)
+    release.set()
+    assert queue.wait(timeout=2)
+    assert [p[0] for p in voice.played] == ["Primera frase del modelo.", "Detenido."]
+
+    # interrupt=True replaces everything; stop() drops it all
+    voice.duration = 0.5
+    queue.say_all(["Uno", "Dos"], CHAT)
+    time.sleep(0.05)
+    queue.say("Tres", CHAT, interrupt=True)
+    queue.stop()
+    assert queue.wait(timeout=1)
+    assert queue.stats["dropped"] >= 4 and queue.stats["preempted"] >= 3
+
+    # Failed synthesis marks the utterance failed
+    failing = SpeechQueue(lambda text, group: None, voice.play)
+    item = failing.say("Sin red")
+    assert item.done.wait(1) and item.state == "failed"
+    print("SpeechQueue test passed!")
+
+if __name__ == "__main__":
+    test_speech_queue()
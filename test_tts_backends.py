@@ -0,0 +1,101 @@
+import time
+import threading
+from src.audio.speech_queue import SpeechQueue
+from src.audio.tts_backends import TTSBackendRegistry
+
+class StubBackend:
+    """Speaks instantly, reporting a fixed latency; fails while `failing` is set"""
+
+    def __init__(self, name, latency, quality=1.0, requires_network=False, texts=None):
+        self.name = name
+        self.latency = latency
+        self.quality = quality
+        self.prior_latency = latency
+        self.requires_network = requires_network
+        self.texts = texts
+        self.failing = False
+        self.played = []
+
+    def available(self, text):
+        return self.texts is None or text in self.texts
+
+    def synthesize(self, text):
+        return text
+
+    def play(self, text, stop):
+        if self.failing:
+            raise RuntimeError("connection lost")
+        self.played.append(text)
+        return self.latency
+
+    def discard(self, text):
+        pass
+
+def test_tts_backends():
+    print("Testing TTSBackendRegistry...")
+    online = [True]
+    neural = StubBackend("neural", 0.35, requires_network=True)
+    local = StubBackend("local", 0.05, quality=0.0)
+    cache = StubBackend("cache", 0.001, texts={"Detenido.", "Aquí lo tienes."})
+    for backend in (neural, cache):
+        backend.voice = "neural"
+    local.voice = "local"
+    registry = TTSBackendRegistry([cache, neural, local], network=lambda: online[0], short_chars=40,
+                                  penalty_per_char=0.02, failure_threshold=2, base_backoff=60)
+
+    # By default the local engine only speaks when the neural voice cannot
+    long_reply = "Claro, te explico con calma cómo funciona la memoria de trabajo del asistente."
+    assert registry.choose("Detenido.") is cache
+    assert registry.choose("Abriendo chrome") is neural
+    online[0] = False
+    assert registry.choose(long_reply) is local
+    online[0] = True
+
+    # Opt-in: short single texts to the fastest engine, long ones to the neural voice
+    fast = TTSBackendRegistry([cache, neural, local], short_texts_local=True, short_chars=40, penalty_per_char=0.02)
+    assert fast.choose("Abriendo chrome") is local
+    assert fast.choose(long_reply) is neural
+    # Measured latency moves the choice: a slow local engine loses even short texts
+    for _ in range(5):
+        fast.record_success(local, 0.9)
+    assert fast.choose("Abriendo chrome") is neural
+
+    # A streamed reply or a menu keeps one voice, cached sentences included
+    fast = TTSBackendRegistry([cache, neural, local], short_texts_local=True, short_chars=40, penalty_per_char=0.02)
+    voiced = []
+    queue = SpeechQueue(lambda text, group: voiced.append(fast.synthesize(text, group)) or voiced[-1], fast.play)
+    assert fast.choose("Claro que sí.") is local
+    queue.say_stream(iter(["Claro que sí. ", long_reply, " Aquí lo tienes."]))
+    time.sleep(0.1)
+    assert queue.wait(timeout=2)
+    assert [r.text for r in voiced] == ["Claro que sí.", long_reply, "Aquí lo tienes."]
+    assert {r.backend.voice for r in voiced} == {"neural"} and voiced[2].backend is cache
+    voiced.clear()
+    queue.say_all(["Opción 1: Documentos en Usuarios", "Opción 2: Documentos en el disco de copias de seguridad"])
+    assert queue.wait(timeout=2) and {r.backend.voice for r in voiced} == {"neural"}
+    for _ in range(10):
+        registry.record_success(local, 0.05)
+
+    # A failure mid-utterance replays it on the next backend; the breaker then keeps it away
+    queue = SpeechQueue(registry.synthesize, registry.play, registry.discard)
+    neural.failing = True
+    queue.say_all([long_reply, "Otra respuesta larga que normalmente diría la voz neuronal."])
+    assert queue.wait(timeout=2)
+    assert local.played == [long_reply, "Otra respuesta larga que normalmente diría la voz neuronal."]
+    assert registry.breakers["neural"].state == "open"
+    assert registry.choose(long_reply) is local
+
+    # Nothing left: the utterance is marked failed (and logged)
+    local.failing = True
+    item = queue.say(long_reply)
+    assert item.done.wait(2) and item.state == "failed"
+
+    stats = registry.get_stats()
+    assert stats["neural"]["error_rate"] == 1.0 and stats["local"]["samples"] >= 10
+    assert stats["cache"]["chosen"] == 1 and stats["choose_ms_avg"] < 1
+    registry.play(registry.synthesize("Detenido."), threading.Event())
+    assert cache.played[-1] == "Detenido."
+    print("TTSBackendRegistry test passed!")
+
+if __name__ == "__main__":
+    test_tts_backends()
@@ -0,0 +1,76 @@
+import os
+import time
+import shutil
+import tempfile
+import threading
+from src.audio.tts_cache import TTSCache, locale_phrases
+from benchmarks.tts_fixtures import FakeCommunicate, FakeOutput, mp3_frames
+
+VOICE = "es-ES-AlvaroNeural"
+
+class QuickCommunicate(FakeCommunicate):
+    first_chunk = 0.01
+    speedup = 100.0
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+def test_tts_cache():
+    print("Testing TTSCache...")
+    cache_dir = tempfile.mkdtemp()
+    cache = TTSCache(cache_dir=cache_dir, max_bytes=10000)
+    data = mp3_frames(0.5)  # 2880 bytes
+
+    # Keyed by voice, text and rate; pre-warm (force) stores right away
+    assert cache.put(VOICE, "Detenido.", "+0%", data, force=True)
+    assert cache.get(VOICE, "Detenido.", "+0%") == data
+    assert cache.get(VOICE, "Detenido.", "+10%") is None
+    assert cache.get("en-US-GuyNeural", "Detenido.", "+0%") is None
+
+    # Other phrases are admitted on their second synthesis
+    assert not cache.put(VOICE, "Abriendo chrome", "+0%", data, latency=0.3)
+    assert cache.put(VOICE, "Abriendo chrome", "+0%", data, latency=0.5)
+
+    # LRU past the size cap; recency and entries persist across restarts
+    cache.put(VOICE, "Subiendo volumen", "+0%", data, force=True)
+    cache.get(VOICE, "Detenido.", "+0%")
+    cache.put(VOICE, "Silenciando", "+0%", data, force=True)
+    assert (VOICE, "Abriendo chrome", "+0%") not in cache and cache.size <= 10000
+    assert len(os.listdir(cache_dir)) == 3
+    stats = cache.get_stats()
+    assert stats["hits"] == 2 and stats["misses"] == 2 and stats["evicted"] == 1
+    assert abs(stats["estimated_latency_saved"] - 2 * 0.4) < 1e-9
+    cache = TTSCache(cache_dir=cache_dir, max_bytes=6000)
+    assert (VOICE, "Detenido.", "+0%") in cache and (VOICE, "Silenciando", "+0%") in cache
+    assert (VOICE, "Subiendo volumen", "+0%") not in cache
+
+    # Pre-warm the locale strings, then a hit plays with no synthesis at all
+    shutil.rmtree(cache_dir)
+    cache = TTSCache(cache_dir=cache_dir)
+    phrases = locale_phrases("es-ES")
+    assert "Activado. ¿En qué puedo ayudarte?" in phrases and not any("{" in p for p in phrases)
+    assert cache.prewarm(VOICE, phrases, "+0%", QuickCommunicate) == len(phrases)
+    assert cache.prewarm(VOICE, phrases, "+0%", QuickCommunicate) == 0
+    calls = FakeCommunicate.calls
+    player = FakeOutput(speed=20.0)
+    player.play(cache.stream(VOICE, "Detenido.", "+0%", QuickCommunicate), threading.Event())
+    assert FakeCommunicate.calls == calls and player.metrics["first_audio"] < 0.05
+
+    # Misses stream from the backend and are stored once complete (on the second synthesis)
+    key = (VOICE, "Abriendo spotify", "+0%")
+    for synthesized in (1, 2):
+        FakeOutput(speed=20.0).play(cache.stream(*key, QuickCommunicate), threading.Event())
+        assert wait_until(lambda: cache.stats["misses_timed"] == synthesized)
+    assert key in cache
+    FakeOutput(speed=20.0).play(cache.stream(*key, QuickCommunicate), threading.Event())
+    assert FakeCommunicate.calls - calls == 2
+    shutil.rmtree(cache_dir)
+    print("TTSCache test passed!")
+
+if __name__ == "__main__":
+    test_tts_cache()
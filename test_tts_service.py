@@ -0,0 +1,60 @@
+import time
+import asyncio
+from src.audio.tts_service import TTSService
+from src.audio.speech_queue import SpeechQueue
+from benchmarks.tts_fixtures import FakeCommunicate, FakeOutput
+
+class QuickCommunicate(FakeCommunicate):
+    first_chunk = 0.05
+    speedup = 20.0
+
+def test_tts_service():
+    print("Testing TTSService...")
+    service = TTSService(workers=2).start()
+    loop_thread = service._thread
+
+    # Requests return at once and run on the one service loop, two at a time, in order
+    streams = [service.synthesize(QuickCommunicate(f"Frase número {i}."), str(i)) for i in range(4)]
+    for stream in streams:
+        assert stream.wait(10 ** 9, timeout=5) and stream.error is None and stream.size > 0
+    starts = [stream.first_chunk for stream in streams]
+    assert starts == sorted(starts)
+    assert streams[1].first_chunk < streams[0].first_chunk + 0.04  # Overlapped with the first
+    assert streams[2].first_chunk > streams[0].first_chunk + 0.04  # Waited for a free worker
+
+    # Cancelled before their turn: skipped, never synthesized
+    calls = FakeCommunicate.calls
+    busy = [service.synthesize(QuickCommunicate("Una frase bastante larga para ocupar a los dos."), "") for _ in range(2)]
+    dropped = service.synthesize(QuickCommunicate("Nunca."), "")
+    dropped.cancel()
+    for stream in busy:
+        stream.wait(10 ** 9, timeout=5)
+    time.sleep(0.05)
+    assert FakeCommunicate.calls - calls == 2 and service.stats["skipped"] == 1
+
+    # Sentence N+1 is synthesized while sentence N plays: no gaps between sentences
+    spans = []
+
+    def play(stream, stop):
+        player = FakeOutput(speed=4.0)
+        player.play(stream, stop)
+        spans.append((player.started_at, time.perf_counter()))
+
+    speech = SpeechQueue(synthesize=lambda text, group: service.synthesize(QuickCommunicate(text), text), play=play)
+    speech.say_stream(iter(["Primero abro la carpeta. ", "Después busco el archivo. ", "Y lo abro al momento."]))
+    assert speech.wait(timeout=10) and len(spans) == 3
+    assert all(start - end < 0.02 for (_, end), (start, _) in zip(spans, spans[1:]))
+
+    # Any coroutine can run on the loop; stop() fails what is still queued
+    assert service.run(asyncio.sleep(0, result=7)).result(timeout=1) == 7 and service._thread is loop_thread
+    service.workers = 1
+    service.stop()
+    service.start()
+    pending = [service.synthesize(QuickCommunicate("Una frase bastante larga para tardar un poco."), "") for _ in range(3)]
+    service.stop()
+    assert all(stream.closed for stream in pending)
+    assert any(isinstance(stream.error, RuntimeError) for stream in pending)
+    print("TTSService test passed!")
+
+if __name__ == "__main__":
+    test_tts_service()
@@ -0,0 +1,70 @@
+import os
+import time
+import threading
+from src.audio.tts_service import TTSService
+from src.audio.tts_stream import AudioByteStream, mp3_frames_end
+from benchmarks.tts_fixtures import FakeCommunicate, FakeOutput, mp3_frames, FRAME_BYTES, SECONDS_PER_CHAR
+from src.config.settings import Settings
+
+class CountingOutput(FakeOutput):
+    """FakeOutput that counts the MP3 bytes it is asked to decode"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.decoded = 0
+
+    def _decode(self, mp3):
+        self.decoded += len(mp3)
+        return super()._decode(mp3)
+
+def test_tts_stream():
+    print("Testing in-memory TTS streaming...")
+    data = mp3_frames(0.24)
+    assert len(data) == 10 * FRAME_BYTES and mp3_frames_end(data) == len(data)
+    assert mp3_frames_end(data[:5 * FRAME_BYTES + 50]) == 5 * FRAME_BYTES  # Cut before the partial frame
+    assert mp3_frames_end(b"\x00\x01" + data[:3 * FRAME_BYTES]) == 2 + 3 * FRAME_BYTES  # Resyncs on headers
+
+    logs_before = set(os.listdir(Settings.LOGS_DIR))
+    text = "Hoy la temperatura máxima será de veinticuatro grados."
+    service = TTSService().start()
+    player = FakeOutput(speed=4.0)
+    stream = service.synthesize(FakeCommunicate(text), text)
+    player.play(stream, threading.Event())
+    # Playback starts on the first chunks, long before the whole utterance is synthesized
+    synthesis = FakeCommunicate.first_chunk + len(text) * SECONDS_PER_CHAR / FakeCommunicate.speedup
+    assert player.metrics["first_audio"] < FakeCommunicate.first_chunk + 0.15 < synthesis
+    assert player.metrics["segments"] >= 2 and player.stalls == 0
+    assert abs(player.played - len(stream.getvalue()) // FRAME_BYTES * 0.024 / 4.0) < 1e-6
+    assert set(os.listdir(Settings.LOGS_DIR)) == logs_before  # Nothing written to disk
+
+    # Only new frames are decoded (behind a little context): linear in the reply length
+    player = CountingOutput(speed=20.0)
+    stream = service.synthesize(FakeCommunicate(text * 6), text)
+    player.play(stream, threading.Event())
+    frames = len(stream.getvalue()) // FRAME_BYTES
+    assert player.metrics["segments"] >= 10 and abs(player.played - frames * 0.024 / 20.0) < 1e-6
+    assert player.decoded < 6 * len(stream.getvalue())  # Decoding the whole prefix each time: ~60x
+
+    # Stopping mid-utterance halts playback and cancels the synthesis
+    stop = threading.Event()
+    player = FakeOutput()
+    stream = service.synthesize(FakeCommunicate(text * 3), text)
+    threading.Timer(0.4, stop.set).start()
+    started = time.perf_counter()
+    player.play(stream, stop)
+    assert time.perf_counter() - started < 0.5 and not player.busy()
+    assert stream.cancelled and stream.closed
+
+    # Failed synthesis surfaces to the caller (the speech queue then fails over or marks it failed)
+    failed = AudioByteStream("x")
+    failed.close(ConnectionError("offline"))
+    try:
+        FakeOutput().play(failed, threading.Event())
+        assert False, "expected the synthesis error"
+    except ConnectionError:
+        pass
+    service.stop()
+    print("In-memory TTS streaming test passed!")
+
+if __name__ == "__main__":
+    test_tts_stream()